@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Topology Build Pipeline Benchmarks
+
+Measures how the topology builders scale from a single store to a whole org:
+
+- engine.build         topology_engine.build_topology (typed model, no adapter)
+- engine.lod_d3        level_of_detail + to_d3 on a built topology (what /data
+                       serializes with the default node budget)
+- engine.stream_ndjson stream_d3 chunks serialized as NDJSON lines (/stream); peak
+                       allocation stays at one batch of clients
+- layout.compute       topology_layout.layout_payload on that payload (hierarchical
+                       seed, plus the force pass when NumPy is installed; compare
+                       against a baseline recorded with the same NumPy setup)
+- wire.*               serialization of the full to_d3 payload as the data routes
+                       send it: json (default), json_gzip, columnar, columnar_gzip,
+                       columnar_msgpack and columnar_brotli (topology_wire; the
+                       last two need msgpack / brotli)
+- visualizer.build     utilities/topology_visualizer.build_topology_from_api_data
+- enhanced.build       enhanced_visualizer.build_topology_from_api_data
+- enhanced.serialize   JSON encoding of the enhanced topology (what the API returns)
+- multi_vendor.unified MultiVendorTopologyEngine.build_unified_topology
+- multi_vendor.cross_vendor  the same against one FortiGate per two devices of the
+                       scale and ten Meraki devices per FortiGate (2,500 FortiGates
+                       and 25k Meraki devices at org), linked by subnet
+- meraki.client_link   DeviceIndex client-to-parent linking used by get_network_topology
+- meraki_api.fetch     meraki_api.get_network_topology against the in-process mock
+                       dashboard (HTTP, pagination and parsing included)
+
+Fixtures come from modules.meraki.synthetic_data, so every run sees the same
+devices and clients:
+
+    store   50 devices      10 clients
+    site    200 devices     1k clients
+    region  1,000 devices   10k clients
+    district 2,500 devices  50k clients
+    org     5,000 devices   100k clients
+
+Each stage reports wall time (best of N), peak traced allocation, retained
+allocation blocks, bytes still held per node (devices + clients) by the
+stage's result and the process peak RSS. Stages that produce a response body
+also report its size and the serialization time per 10k nodes. Wall times are also stored
+relative to a fixed calibration workload so the committed baseline carries
+across machines; a stage fails when it is slower or allocates more than the
+baseline allows.
+
+Standalone:
+    python benchmarks/bench_topology.py                     # all scales, compare to baseline
+    python benchmarks/bench_topology.py --scales store,site
+    python benchmarks/bench_topology.py --update-baseline   # after an intended change
+
+pytest-benchmark:
+    python -m pytest benchmarks/bench_topology.py --benchmark-only
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import importlib
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows - peak RSS is reported as None
+    resource = None
+
+# Add the CLI directory to path
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SCALES = {
+    'store': {'devices': 50, 'clients': 10},
+    'site': {'devices': 200, 'clients': 1000},
+    'region': {'devices': 1000, 'clients': 10000},
+    'district': {'devices': 2500, 'clients': 50000},
+    'org': {'devices': 5000, 'clients': 100000},
+}
+
+# Allowed growth over the baseline before a stage counts as a regression
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.25
+# Stages faster than this are too noisy to compare on time
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def make_fixture(scale):
+    """
+    Build the synthetic devices, clients and links for one scale.
+
+    Args:
+        scale (str): Key of SCALES
+
+    Returns:
+        dict: devices (with status), clients, links, network_id and the dataset
+    """
+    size = SCALES[scale]
+    data = SyntheticMerakiData(networks=1, clients=size['clients'], devices_per_network=size['devices'])
+    network_id = data.network_id(0, 0)
+    statuses = {s['serial']: s['status'] for s in data.device_statuses(data.org_id(0))}
+    devices = [dict(d, status=statuses[d['serial']]) for d in data.network_devices(network_id)]
+    # The visualizers take flat serial-to-serial links
+    links = [{'source': link['source']['serial'], 'target': link['destination']['serial'],
+              'linkType': link['linkType'], 'sourcePort': link['source']['port']}
+             for link in data.topology_links(network_id)]
+    return {
+        'scale': scale,
+        'data': data,
+        'network_id': network_id,
+        'devices': devices,
+        'clients': data.clients(network_id, 0, size['clients']),
+        'links': links,
+    }
+
+
+class _FixtureDashboard:
+    """Dashboard-shaped access to a fixture for MultiVendorTopologyEngine."""
+
+    def __init__(self, fixture):
+        self.networks = self
+        self.appliance = self
+        self._fixture = fixture
+
+    def getNetworkDevices(self, network_id):
+        return self._fixture['devices']
+
+    def getNetworkClients(self, network_id, **kwargs):
+        return self._fixture['clients']
+
+    def getNetworkTopologyLinkLayer(self, network_id):
+        return self._fixture['links']
+
+    def getNetworkApplianceVlans(self, network_id):
+        return self._fixture.get('vlans', [])
+
+
+class _FixtureMerakiManager:
+    def __init__(self, fixture):
+        self.dashboard = _FixtureDashboard(fixture)
+
+
+class _FixtureFortinetManager:
+    """One FortiGate in front of the store by default, so cross-vendor linking runs too."""
+
+    def __init__(self, topology_data=None):
+        self._topology_data = topology_data or {
+            'fortigates': [{'id': 'FGT-1', 'name': 'FGT-Store', 'host': '10.0.0.254', 'serial': 'FGT60F0000000001',
+                            'model': 'FortiGate-60F', 'status': 'online'}],
+            'fortiaps': [], 'wifi_clients': [], 'connections': []
+        }
+
+    def get_network_topology_data(self):
+        return self._topology_data
+
+
+def make_cross_vendor_fixture(scale, devices_per_store=10):
+    """
+    Build many stores, each a FortiGate in front of a Meraki network.
+
+    Every store gets its own /24: the FortiGate LAN interface is the lower /25
+    (so a /24 guess is wrong), the Meraki devices sit in it and the MX owns a
+    POS VLAN on the upper /25.
+
+    Args:
+        scale (str): Key of SCALES; one store per two devices of the scale
+        devices_per_store (int): Meraki devices per store
+
+    Returns:
+        tuple: (Meraki fixture for _FixtureMerakiManager, Fortinet topology data)
+    """
+    stores = max(1, SCALES[scale]['devices'] // 2)
+    data = SyntheticMerakiData(networks=stores, clients=0, devices_per_network=devices_per_store)
+    devices, vlans = [], []
+    fortinet = {'fortigates': [], 'fortiaps': [], 'wifi_clients': [], 'interfaces': [], 'connections': []}
+    for store in range(stores):
+        network_id = data.network_id(0, store)
+        prefix = f"10.{store >> 8}.{store & 255}"
+        for position, device in enumerate(data.network_devices(network_id)):
+            devices.append(dict(device, lanIp=f"{prefix}.{2 + position}"))
+        vlans.append({'id': 10, 'name': 'POS', 'networkId': network_id, 'subnet': f"{prefix}.128/25",
+                      'applianceIp': f"{prefix}.129"})
+        host = f"192.168.{store >> 8}.{store & 255}"
+        fortinet['fortigates'].append({'id': host, 'name': f"FGT-{store}", 'host': host,
+                                       'serial': f"FGT60F{store:010d}", 'model': 'FortiGate-60F',
+                                       'status': 'online'})
+        # Shaped like FortinetAPIManager output from monitor/system/interface: ip and mask apart
+        fortinet['interfaces'].append({'fortigate_id': host, 'name': 'lan', 'ip': f"{prefix}.1", 'mask': 25})
+        fortinet['interfaces'].append({'fortigate_id': host, 'name': 'wan2', 'ip': '0.0.0.0', 'mask': 0})
+    return {'devices': devices, 'clients': [], 'links': [], 'vlans': vlans}, fortinet
+
+
+# --- Stages: each returns a zero-argument callable, or raises SkipStage ---
+
+class SkipStage(Exception):
+    """A stage cannot run in this environment (missing optional dependency)."""
+
+
+def _import(module_name):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise SkipStage(f"{module_name} not importable: {e}")
+
+
+def stage_engine_build(fixture):
+    module = _import('topology_engine')
+    return lambda: module.build_topology(fixture['devices'], fixture['clients'], fixture['links'])
+
+
+def stage_engine_lod_d3(fixture):
+    module = _import('topology_engine')
+    topology = module.build_topology(fixture['devices'], fixture['clients'], fixture['links'])
+    return lambda: module.to_d3(module.level_of_detail(topology))
+
+
+def stage_engine_stream_ndjson(fixture):
+    module = _import('topology_engine')
+
+    def run():
+        # Count the bytes instead of keeping them, like a response written to the socket
+        return sum(len(json.dumps(chunk)) + 1
+                   for chunk in module.stream_d3(fixture['devices'], iter(fixture['clients']), fixture['links']))
+    return run
+
+
+def stage_layout_compute(fixture):
+    engine = _import('topology_engine')
+    module = _import('topology_layout')
+    topology = engine.build_topology(fixture['devices'], fixture['clients'], fixture['links'])
+    d3_data = engine.to_d3(engine.level_of_detail(topology))
+    run = lambda: module.layout_payload(d3_data)
+    run.node_count = len(d3_data['nodes'])
+    return run
+
+
+def _wire_stage(media_type=None, encoding=None, requires=None):
+    """Serialize the full D3 payload in one wire format (None = the default JSON)."""
+    def prepare(fixture):
+        engine = _import('topology_engine')
+        wire = _import('topology_wire')
+        if requires and not getattr(wire, requires):
+            raise SkipStage(f"topology_wire.{requires} is False")
+        data = engine.to_d3(engine.build_topology(fixture['devices'], fixture['clients'], fixture['links']))
+        if media_type is None:
+            def run():
+                body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+                return wire.gzip.compress(body, compresslevel=6) if encoding else body
+        else:
+            run = lambda: wire.encode_topology(data, getattr(wire, media_type), encoding)[0]
+        run.node_count = len(data['nodes'])
+        return run
+    return prepare
+
+
+def stage_visualizer_build(fixture):
+    module = _import('utilities.topology_visualizer')
+    return lambda: module.build_topology_from_api_data(fixture['devices'], fixture['clients'], fixture['links'])
+
+
+def stage_enhanced_build(fixture):
+    module = _import('enhanced_visualizer')
+    return lambda: module.build_topology_from_api_data(fixture['devices'], fixture['clients'], fixture['links'])
+
+
+def stage_enhanced_serialize(fixture):
+    module = _import('enhanced_visualizer')
+    topology = module.build_topology_from_api_data(fixture['devices'], fixture['clients'], fixture['links'])
+    return lambda: json.dumps(topology)
+
+
+def stage_multi_vendor_unified(fixture):
+    module = _import('multi_vendor_topology')
+    engine = module.MultiVendorTopologyEngine(_FixtureMerakiManager(fixture), _FixtureFortinetManager())
+    return lambda: engine.build_unified_topology(fixture['network_id'], 'Benchmark Store')
+
+
+def stage_multi_vendor_cross_vendor(fixture):
+    module = _import('multi_vendor_topology')
+    meraki, fortinet = make_cross_vendor_fixture(fixture['scale'])
+    engine = module.MultiVendorTopologyEngine(_FixtureMerakiManager(meraki), _FixtureFortinetManager(fortinet))
+    run = lambda: engine.build_unified_topology('benchmark', 'Benchmark Region')
+    run.node_count = len(meraki['devices']) + len(fortinet['fortigates'])
+    return run
+
+
+def stage_meraki_client_link(fixture):
+    module = _import('modules.meraki.topology_index')
+    nodes = [{'serial': d['serial'], 'mac': d['mac'], 'label': d['name'], 'type': d['productType']}
+             for d in fixture['devices']]
+    links = fixture['data'].topology_links(fixture['network_id'])
+
+    def run():
+        index = module.DeviceIndex(nodes, links)
+        return [index.client_link(client, position) for position, client in enumerate(fixture['clients'])]
+    return run
+
+
+def stage_meraki_api_fetch(fixture):
+    meraki_api = _import('modules.meraki.meraki_api')
+    from mock_meraki_dashboard import MockMerakiDashboard, start_mock_server
+    from modules.meraki.rate_limiter import get_rate_scheduler
+    from modules.meraki.response_cache import get_response_cache
+
+    server, base_url = start_mock_server(MockMerakiDashboard(fixture['data'], rate_limit=0))
+    meraki_api.BASE_URL = base_url
+    # Measure the client pipeline, not the org rate limit or the response cache
+    scheduler = get_rate_scheduler()
+    scheduler.rate = scheduler.burst = 1000000
+    cache = get_response_cache()
+
+    def run():
+        cache.invalidate()
+        return meraki_api.get_network_topology('benchmark-key', fixture['network_id'])
+    run.server = server
+    return run
+
+
+STAGES = [
+    ('engine.build', stage_engine_build),
+    ('engine.lod_d3', stage_engine_lod_d3),
+    ('engine.stream_ndjson', stage_engine_stream_ndjson),
+    ('layout.compute', stage_layout_compute),
+    ('wire.json', _wire_stage()),
+    ('wire.json_gzip', _wire_stage(encoding='gzip')),
+    ('wire.columnar', _wire_stage('COLUMNAR_JSON_MEDIA_TYPE')),
+    ('wire.columnar_gzip', _wire_stage('COLUMNAR_JSON_MEDIA_TYPE', 'gzip')),
+    ('wire.columnar_msgpack', _wire_stage('COLUMNAR_MSGPACK_MEDIA_TYPE', requires='MSGPACK_AVAILABLE')),
+    ('wire.columnar_brotli', _wire_stage('COLUMNAR_JSON_MEDIA_TYPE', 'br', requires='BROTLI_AVAILABLE')),
+    ('visualizer.build', stage_visualizer_build),
+    ('enhanced.build', stage_enhanced_build),
+    ('enhanced.serialize', stage_enhanced_serialize),
+    ('multi_vendor.unified', stage_multi_vendor_unified),
+    ('multi_vendor.cross_vendor', stage_multi_vendor_cross_vendor),
+    ('meraki.client_link', stage_meraki_client_link),
+    ('meraki_api.fetch', stage_meraki_api_fetch),
+]
+
+
+# --- Measurement ---
+
+def calibrate(rounds=5):
+    """
+    Time a fixed pure-Python workload (dict building, hashing, JSON) on this machine.
+
+    Returns:
+        float: Best wall time in seconds; stage times are divided by it
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        rows = [{'id': f"k{i:06x}", 'ip': f"10.0.{i // 250 % 256}.{i % 250}", 'vlan': i % 3} for i in range(100000)]
+        index = {row['id']: row for row in rows}
+        json.dumps(rows[:20000])
+        best = min(best, time.perf_counter() - start)
+        del rows, index
+    return best
+
+
+def peak_rss_mb():
+    """Process peak resident set size in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def measure(func, repeat=3):
+    """
+    Measure one stage.
+
+    Args:
+        func (callable): Stage workload
+        repeat (int): Timed runs; the best is reported
+
+    Returns:
+        dict: wall_seconds, peak_alloc_kb, retained_blocks, retained_bytes, peak_rss_mb
+            and payload_bytes when the stage returns a response body
+    """
+    times = []
+    payload_bytes = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        if isinstance(result, bytes):
+            payload_bytes = len(result)
+        del result
+
+    # One extra traced run for allocations (tracing slows the stage down)
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    held, peak = tracemalloc.get_traced_memory()
+    retained = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+    del result
+
+    stats = {
+        'wall_seconds': round(min(times), 6),
+        'peak_alloc_kb': round(peak / 1024, 1),
+        'retained_blocks': retained,
+        'retained_bytes': held,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if payload_bytes is not None:
+        stats['payload_bytes'] = payload_bytes
+    return stats
+
+
+def run_benchmarks(scales, stages=None, repeat=3, calibration=None):
+    """
+    Run every stage at every scale.
+
+    Args:
+        scales (list): Keys of SCALES
+        stages (list, optional): Stage names to run (default: all)
+        repeat (int): Timed runs per stage
+        calibration (float, optional): Seconds for calibrate(); measured if omitted
+
+    Returns:
+        dict: calibration_seconds and results keyed 'scale/stage'
+    """
+    calibration = calibration or calibrate()
+    results = {}
+    for scale in scales:
+        fixture = make_fixture(scale)
+        node_count = len(fixture['devices']) + len(fixture['clients'])
+        for name, prepare in STAGES:
+            if stages and name not in stages:
+                continue
+            key = f"{scale}/{name}"
+            try:
+                func = prepare(fixture)
+            except SkipStage as e:
+                results[key] = {'skipped': str(e)}
+                continue
+            try:
+                stats = measure(func, repeat)
+            finally:
+                server = getattr(func, 'server', None)
+                if server is not None:
+                    server.shutdown()
+            stats['relative_time'] = round(stats['wall_seconds'] / calibration, 4)
+            stage_nodes = getattr(func, 'node_count', node_count)
+            stats['bytes_per_node'] = round(stats.pop('retained_bytes') / stage_nodes)
+            if 'payload_bytes' in stats:
+                stats['payload_kb_per_10k'] = round(stats['payload_bytes'] / stage_nodes * 10000 / 1024, 1)
+                stats['ms_per_10k'] = round(stats['wall_seconds'] * 1000 / stage_nodes * 10000, 2)
+            results[key] = stats
+    return {'calibration_seconds': round(calibration, 6), 'results': results}
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(report, path=BASELINE_PATH, merge=True):
+    """Store measured stages as the new baseline (skipped stages keep their old entry)."""
+    baseline = (load_baseline(path) if merge else None) or {
+        'time_tolerance': DEFAULT_TIME_TOLERANCE,
+        'memory_tolerance': DEFAULT_MEMORY_TOLERANCE,
+        'results': {}
+    }
+    for key, stats in report['results'].items():
+        if 'skipped' not in stats:
+            baseline['results'][key] = {k: stats[k] for k in ('relative_time', 'wall_seconds', 'peak_alloc_kb')}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return baseline
+
+
+def compare_to_baseline(report, baseline):
+    """
+    Find stages that regressed against the baseline.
+
+    Args:
+        report (dict): Output of run_benchmarks
+        baseline (dict): Stored baseline
+
+    Returns:
+        list: Human-readable regression messages (empty when all stages pass)
+    """
+    time_tolerance = baseline.get('time_tolerance', DEFAULT_TIME_TOLERANCE)
+    memory_tolerance = baseline.get('memory_tolerance', DEFAULT_MEMORY_TOLERANCE)
+    regressions = []
+    for key, stats in report['results'].items():
+        expected = baseline.get('results', {}).get(key)
+        if expected is None or 'skipped' in stats:
+            continue
+        comparable = max(stats['wall_seconds'], expected['wall_seconds']) >= MIN_COMPARABLE_SECONDS
+        if comparable and stats['relative_time'] > expected['relative_time'] * (1 + time_tolerance):
+            regressions.append(f"{key}: relative time {stats['relative_time']} > baseline "
+                               f"{expected['relative_time']} (+{time_tolerance:.0%})")
+        if stats['peak_alloc_kb'] > expected['peak_alloc_kb'] * (1 + memory_tolerance) + 64:
+            regressions.append(f"{key}: peak allocation {stats['peak_alloc_kb']} KB > baseline "
+                               f"{expected['peak_alloc_kb']} KB (+{memory_tolerance:.0%})")
+    return regressions
+
+
+def format_report(report):
+    lines = [f"calibration: {report['calibration_seconds'] * 1000:.1f} ms",
+             f"{'stage':<34}{'wall ms':>10}{'relative':>10}{'peak KB':>12}{'blocks':>10}{'B/node':>8}{'RSS MB':>9}"]
+    for key, stats in report['results'].items():
+        if 'skipped' in stats:
+            lines.append(f"{key:<34}  skipped: {stats['skipped']}")
+            continue
+        lines.append(f"{key:<34}{stats['wall_seconds'] * 1000:>10.2f}{stats['relative_time']:>10.3f}"
+                     f"{stats['peak_alloc_kb']:>12.1f}{stats['retained_blocks']:>10}{stats['bytes_per_node']:>8}{str(stats['peak_rss_mb']):>9}")
+
+    payloads = [(key, stats) for key, stats in report['results'].items() if 'payload_bytes' in stats]
+    if payloads:
+        lines.append('')
+        lines.append(f"{'payload':<34}{'bytes':>12}{'KB/10k':>10}{'ms/10k':>10}")
+        for key, stats in payloads:
+            lines.append(f"{key:<34}{stats['payload_bytes']:>12}{stats['payload_kb_per_10k']:>10.1f}"
+                         f"{stats['ms_per_10k']:>10.2f}")
+    return '\n'.join(lines)
+
+
+# --- pytest-benchmark entry points ---
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+if pytest is not None:
+    PYTEST_SCALES = os.getenv('BENCHMARK_SCALES', 'store,site,region').split(',')
+
+    if importlib.util.find_spec('pytest_benchmark') is None:
+        @pytest.fixture
+        def benchmark():
+            pytest.skip("pytest-benchmark not installed - run python benchmarks/bench_topology.py instead")
+
+    @pytest.fixture(scope='module')
+    def calibration():
+        return calibrate()
+
+    @pytest.mark.parametrize('scale', PYTEST_SCALES)
+    @pytest.mark.parametrize('stage', [name for name, _ in STAGES])
+    def test_topology_stage(benchmark, calibration, scale, stage):
+        """Benchmark one stage and fail if it regressed against the stored baseline"""
+        try:
+            func = dict(STAGES)[stage](make_fixture(scale))
+        except SkipStage as e:
+            pytest.skip(str(e))
+        try:
+            benchmark.pedantic(func, rounds=3, iterations=1)
+            stats = measure(func, repeat=1)
+        finally:
+            server = getattr(func, 'server', None)
+            if server is not None:
+                server.shutdown()
+        stats['wall_seconds'] = benchmark.stats.stats.min
+        stats['relative_time'] = round(stats['wall_seconds'] / calibration, 4)
+
+        baseline = load_baseline()
+        if baseline:
+            report = {'results': {f"{scale}/{stage}": stats}}
+            assert not compare_to_baseline(report, baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the topology build pipeline')
+    parser.add_argument('--scales', default=','.join(SCALES), help='Comma-separated scales (store,site,region,org)')
+    parser.add_argument('--stages', help='Comma-separated stage names (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (best is reported)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--json', help='Also write the full report to this file')
+    args = parser.parse_args()
+
+    scales = [s for s in args.scales.split(',') if s]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    stages = args.stages.split(',') if args.stages else None
+
+    report = run_benchmarks(scales, stages, repeat=args.repeat)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(report, args.baseline)
+        print(f"\n✅ Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("\nNo baseline yet - run with --update-baseline to create one")
+        return 0
+    regressions = compare_to_baseline(report, baseline)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\n✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
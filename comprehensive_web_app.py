@@ -10,10 +10,12 @@ import json
 import logging
 import traceback
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context, g
 import uuid
 import threading
 import time
+from topology_versions import get_topology_versions, input_fingerprint
+from fortimanager_inventory import get_fortimanager_inventory
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -94,6 +96,17 @@ except ImportError as e:
     print(f"[WARNING] QSR device classifier not available: {e}")
     QSR_CLASSIFIER_AVAILABLE = False
 
+# Classifications used when the QSR classifier is unavailable, by topology type
+QSR_FALLBACK_CLASSIFICATIONS = {
+    'switch': {'device_type': 'network_switch', 'category': 'Network Infrastructure', 'icon': 'fas fa-network-wired', 'color': '#28A745', 'display_name': 'Network Switch'},
+    'wireless': {'device_type': 'wifi_access_point', 'category': 'Network Infrastructure', 'icon': 'fas fa-wifi', 'color': '#FD7E14', 'display_name': 'WiFi Access Point'},
+    'appliance': {'device_type': 'security_appliance', 'category': 'Security & Routing', 'icon': 'fas fa-shield-alt', 'color': '#DC3545', 'display_name': 'Security Appliance'},
+    'camera': {'device_type': 'security_camera', 'category': 'Security Systems', 'icon': 'fas fa-video', 'color': '#6C757D', 'display_name': 'Security Camera'},
+    'fortigate': {'device_type': 'security_appliance', 'category': 'Security & Routing', 'icon': 'fas fa-shield-alt', 'color': '#DC3545', 'display_name': 'FortiGate Firewall'},
+    'client': {'device_type': 'unknown', 'category': 'Client Device', 'icon': 'fas fa-laptop', 'color': '#6C757D', 'display_name': 'Client Device'},
+    'unknown': {'device_type': 'unknown', 'category': 'Unknown Device', 'icon': 'fas fa-question-circle', 'color': '#9E9E9E', 'display_name': 'Unknown Device'}
+}
+
 # Import persistent API key storage
 try:
     from api_key_storage import APIKeyStorage, load_meraki_api_key, save_meraki_api_key
@@ -233,6 +246,32 @@ app.config.update({
 app.jinja_env.auto_reload = True
 app.jinja_env.cache = {}
 
+# Meraki calls made for background pollers (AI maintenance engine, explicit
+# X-Request-Priority: background) queue behind interactive UI requests
+@app.before_request
+def set_meraki_request_priority():
+    """Classify the request for the Meraki org rate scheduler"""
+    try:
+        from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, set_request_priority
+    except ImportError:
+        return
+    user_agent = request.headers.get('User-Agent', '')
+    if (request.headers.get('X-Request-Priority', '').lower() == 'background'
+            or user_agent.startswith('AI-Maintenance-Engine')):
+        g.meraki_priority_token = set_request_priority(PRIORITY_BACKGROUND)
+
+@app.teardown_request
+def reset_meraki_request_priority(exc):
+    """Restore the default Meraki priority for the worker thread"""
+    token = g.pop('meraki_priority_token', None)
+    if token is not None:
+        from modules.meraki.rate_limiter import PRIORITY_INTERACTIVE, reset_request_priority, set_request_priority
+        try:
+            reset_request_priority(token)
+        except ValueError:
+            # Token was created in another context - fall back to the default
+            set_request_priority(PRIORITY_INTERACTIVE)
+
 # Add professional-grade cache-busting headers
 @app.after_request
 def add_cache_busting_headers(response):
@@ -472,22 +511,20 @@ def get_fortimanager_devices():
             }), 400
         
         config = session['fortimanager_config']
-        from fortimanager_api import FortiManagerAPI
-        fm = FortiManagerAPI(config['host'], config['username'], config['password'], config.get('port', 443))
-        
-        if fm.login():
-            devices = fm.get_managed_devices()
-            fm.logout()
-            
-            return jsonify({
-                'success': True,
-                'devices': devices or []
-            })
-        else:
+        store = get_fortimanager_inventory().store(config['host'], config['username'], config['password'],
+                                                   port=config.get('port', 443), adom=config.get('adom'))
+        inventory = store.snapshot()
+        if inventory is None:
             return jsonify({
                 'success': False,
-                'error': 'FortiManager authentication failed'
+                'error': store.last_error or 'FortiManager authentication failed'
             }), 401
+        
+        return jsonify({
+            'success': True,
+            'devices': [dict(device) for device in inventory.devices],
+            'inventory': store.status()
+        })
             
     except Exception as e:
         logger.error(f"Get FortiManager devices error: {str(e)}")
@@ -545,54 +582,60 @@ def get_all_fortimanager_devices():
                     'error': 'No FortiManager instances configured'
                 }), 400
         
-        all_devices = []
-        site_status = {}
+        from fortimanager_fanout import DONE, TIMEOUT, fan_out
+        
+        def fetch_site_devices(site, config):
+            """Runs on a fan-out worker; None means authentication failed"""
+            store = get_fortimanager_inventory().store(config['host'], config['username'], config['password'],
+                                                       port=config.get('port', 443), adom=config.get('adom'), site=site)
+            # Warm sites answer from the inventory store; only cold ones reach FortiManager here
+            inventory = store.snapshot()
+            if inventory is None:
+                return None
+            return [dict(device) for device in inventory.devices], store.status()
         
-        from fortimanager_api import FortiManagerAPI
+        # Every site is queried at once; slow sites are reported instead of waited for
+        configs = dict(session['fortimanager_configs'])
+        results = fan_out(configs, fetch_site_devices)
         
-        for site, config in session['fortimanager_configs'].items():
-            try:
-                logger.info(f"Connecting to {site.upper()} FortiManager: {config['host']}")
-                fm = FortiManagerAPI(config['host'], config['username'], config['password'], config.get('port', 443))
+        all_devices = []
+        site_status = {}
+        for site, outcome in results.items():
+            config = configs[site]
+            status = {
+                'device_count': 0,
+                'host': config['host'],
+                'latency_ms': outcome['latency_ms']
+            }
+            devices = None
+            if outcome['status'] == DONE and outcome['result'] is not None:
+                devices, status['inventory'] = outcome['result']
+            
+            if devices is not None:
+                # Add site information to each device
+                for device in devices:
+                    device['fortimanager_site'] = site.upper()
+                    device['fortimanager_host'] = config['host']
                 
-                if fm.login():
-                    devices = fm.get_managed_devices()
-                    fm.logout()
-                    
-                    # Add site information to each device
-                    for device in devices:
-                        device['fortimanager_site'] = site.upper()
-                        device['fortimanager_host'] = config['host']
-                    
-                    all_devices.extend(devices)
-                    site_status[site] = {
-                        'status': 'connected',
-                        'device_count': len(devices),
-                        'host': config['host']
-                    }
-                    
-                    logger.info(f"Successfully retrieved {len(devices)} devices from {site.upper()} FortiManager")
-                else:
-                    site_status[site] = {
-                        'status': 'authentication_failed',
-                        'device_count': 0,
-                        'host': config['host']
-                    }
-                    logger.error(f"Authentication failed for {site.upper()} FortiManager")
-                    
-            except Exception as e:
-                site_status[site] = {
-                    'status': 'connection_error',
-                    'device_count': 0,
-                    'host': config['host'],
-                    'error': str(e)
-                }
-                logger.error(f"Error connecting to {site.upper()} FortiManager: {str(e)}")
+                all_devices.extend(devices)
+                status.update(status='connected', device_count=len(devices))
+                logger.info(f"Successfully retrieved {len(devices)} devices from {site.upper()} FortiManager "
+                            f"in {outcome['latency_ms']}ms")
+            elif outcome['status'] == DONE:
+                status['status'] = 'authentication_failed'
+                logger.error(f"Authentication failed for {site.upper()} FortiManager")
+            elif outcome['status'] == TIMEOUT:
+                status.update(status='timeout', error=outcome['error'])
+            else:
+                status.update(status='connection_error', error=outcome['error'])
+                logger.error(f"Error connecting to {site.upper()} FortiManager: {outcome['error']}")
+            site_status[site] = status
         
         return jsonify({
             'success': True,
             'devices': all_devices,
             'site_status': site_status,
+            'partial': any(status['status'] == 'timeout' for status in site_status.values()),
             'total_devices': len(all_devices),
             'configured_sites': list(session['fortimanager_configs'].keys())
         })
@@ -948,11 +991,25 @@ class ComprehensiveMerakiManager:
             if self.api_mode == 'sdk':
                 try:
                     import meraki
-                    self.dashboard = meraki.DashboardAPI(api_key, suppress_logging=True)
+                    from modules.meraki.rate_limiter import RateLimitedDashboard
+                    from modules.meraki.response_cache import CachedDashboard
+                    # 429s go to the shared org rate scheduler instead of SDK sleeps;
+                    # reads are served from the shared response cache
+                    self.dashboard = CachedDashboard(RateLimitedDashboard(
+                        meraki.DashboardAPI(api_key, suppress_logging=True, wait_on_rate_limit=False,
+                                            base_url=os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1'))
+                    ), api_key)
                 except ImportError:
                     # Fall back to custom API if SDK not available
                     self.api_mode = 'custom'
             
+            if self.api_mode == 'async' and CLI_MODULES_AVAILABLE:
+                # Asyncio client behind a blocking facade - same method surface
+                # as the custom dashboard, with concurrent fan-out via map_networks
+                from modules.meraki.meraki_async_client import create_async_dashboard_object
+                from modules.meraki.response_cache import CachedDashboard
+                self.dashboard = CachedDashboard(create_async_dashboard_object(api_key), api_key)
+            
             if self.api_mode == 'custom' and CLI_MODULES_AVAILABLE:
                 # Use custom API through existing CLI modules
                 from main import create_custom_dashboard_object
@@ -1017,6 +1074,33 @@ class ComprehensiveMerakiManager:
             logger.error(f"Error getting devices: {e}")
             return []
     
+    def get_organization_devices(self, org_id, networks=None):
+        """
+        Get every device in an organization from the org-level bulk endpoints.
+        
+        Uses /devices, /devices/statuses and /inventory/devices (all pages)
+        joined by serial and networkId - a handful of calls per org instead of
+        one getNetworkDevices call per network.
+        
+        Args:
+            org_id (str): Organization ID
+            networks (list, optional): Org networks, used to attach networkName
+            
+        Returns:
+            list: Joined device records
+        """
+        if not self.dashboard:
+            return []
+        from modules.meraki.meraki_inventory import join_organization_inventory
+        
+        # The SDK only returns the first page unless asked for all of them
+        page_kwargs = {'total_pages': 'all'} if self.api_mode == 'sdk' else {}
+        organizations = self.dashboard.organizations
+        devices = organizations.getOrganizationDevices(org_id, **page_kwargs)
+        statuses = organizations.getOrganizationDevicesStatuses(org_id, **page_kwargs)
+        inventory = organizations.getOrganizationInventoryDevices(org_id, **page_kwargs)
+        return join_organization_inventory(devices, statuses, inventory, networks)
+    
     def get_clients(self, network_id, timespan=86400):
         """Get clients for a network"""
         try:
@@ -1027,6 +1111,23 @@ class ComprehensiveMerakiManager:
             logger.error(f"Error getting clients: {e}")
             return []
     
+    def iter_clients(self, network_id, timespan=86400):
+        """
+        Yield clients for a network page by page as the API returns them.
+        
+        Unlike get_clients, errors are raised to the caller so a partial
+        stream is never mistaken for the full client list.
+        """
+        if not self.dashboard:
+            return
+        if self.api_mode in ('custom', 'async') and CLI_MODULES_AVAILABLE:
+            yield from meraki_api.iter_network_clients(self.api_key, network_id, timespan=timespan)
+        else:
+            # The SDK follows Link headers itself when asked for every page
+            yield from self.dashboard.networks.getNetworkClients(
+                network_id, timespan=timespan, perPage=1000, total_pages='all'
+            )
+    
     def create_speed_test(self, device_serial):
         """Create a speed test for a device"""
         try:
@@ -1401,6 +1502,73 @@ def get_networks(org_id):
             'org_id': org_id
         }), 500
 
+@app.route('/api/organizations/<org_id>/topology/jobs', methods=['POST'])
+def start_org_topology_job(org_id):
+    """Build the topology of a whole organization (or the networks with given tags) in the background"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
+        
+        from org_topology import get_org_topology_jobs, selection_key
+        data = request.get_json(silent=True) or {}
+        # Jobs and snapshots are kept per selection, so a region never stands in for the whole org
+        selection = selection_key(data.get('network_ids'), data.get('tags'))
+        networks = meraki_manager.get_networks(org_id)
+        if data.get('network_ids'):
+            wanted = set(data['network_ids'])
+            networks = [n for n in networks if n['id'] in wanted]
+        if data.get('tags'):
+            # A region is usually a network tag
+            tags = set(data['tags'])
+            networks = [n for n in networks if tags & set(n.get('tags') or [])]
+        if not networks:
+            return jsonify({'error': 'No matching networks in this organization'}), 404
+        
+        job = get_org_topology_jobs().submit(session['api_key'], org_id,
+                                             [{'id': n['id'], 'name': n.get('name')} for n in networks],
+                                             selection=selection)
+        logger.info(f"Org topology job {job.id} for {org_id}: {len(job.networks)} networks")
+        return jsonify(job.progress()), 202
+    
+    except Exception as e:
+        logger.error(f"Error starting org topology job for {org_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/organizations/<org_id>/topology/jobs/<job_id>', methods=['GET', 'DELETE'])
+def org_topology_job(org_id, job_id):
+    """Progress of an organization build; DELETE cancels it"""
+    if 'api_key' not in session:
+        return jsonify({'error': 'API key not set'}), 401
+    
+    from org_topology import get_org_topology_jobs
+    jobs = get_org_topology_jobs()
+    job = jobs.cancel(job_id) if request.method == 'DELETE' else jobs.get(job_id)
+    if job is None or job.org_id != org_id:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(job.progress())
+
+@app.route('/api/organizations/<org_id>/topology/snapshot')
+def org_topology_snapshot(org_id):
+    """
+    Page through the latest organization topology (?offset=&limit= sites, ?summary=1 for totals only);
+    ?tags= / ?network_ids= (repeated or comma-separated) select the snapshot of that job selection
+    """
+    if 'api_key' not in session:
+        return jsonify({'error': 'API key not set'}), 401
+    
+    from org_topology import SITES_PER_PAGE, get_org_topology_jobs, selection_key
+    def listed(name):
+        return [value for arg in request.args.getlist(name) for value in arg.split(',') if value]
+    snapshot = get_org_topology_jobs().snapshot(org_id, selection_key(listed('network_ids'), listed('tags')))
+    if snapshot is None:
+        return jsonify({'error': 'No current snapshot - start a topology job first'}), 404
+    if request.args.get('summary'):
+        return jsonify(snapshot.summary())
+    
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = min(max(1, request.args.get('limit', SITES_PER_PAGE, type=int)), 200)
+    return _topology_response(snapshot.page(offset, limit, _node_budget()))
+
 @app.route('/api/devices/<network_id>')
 def get_devices(network_id):
     """Get devices for a network"""
@@ -1423,8 +1591,27 @@ def get_clients(network_id):
             return jsonify({'error': 'API key not set'}), 401
         
         timespan = request.args.get('timespan', 86400, type=int)
-        clients = meraki_manager.get_clients(network_id, timespan)
-        return jsonify({'clients': clients})
+        clients = meraki_manager.iter_clients(network_id, timespan)
+        
+        # Pull the first client before answering so auth and lookup errors
+        # still produce a proper error status instead of a broken stream
+        first_client = next(clients, None)
+        
+        def generate():
+            yield '{"clients": ['
+            if first_client is not None:
+                yield json.dumps(first_client)
+            try:
+                for client in clients:
+                    yield ',' + json.dumps(client)
+            except Exception as e:
+                # Headers are already sent - report the truncation in the body
+                logger.error(f"Client stream for {network_id} interrupted: {e}")
+                yield '], "error": ' + json.dumps(str(e)) + ', "truncated": true}'
+                return
+            yield ']}'
+        
+        return Response(stream_with_context(generate()), mimetype='application/json')
     
     except Exception as e:
         logger.error(f"Error getting clients: {e}")
@@ -1437,13 +1624,12 @@ def get_topology(network_id):
         if 'api_key' not in session:
             return jsonify({'error': 'API key not set'}), 401
         
-        # Get devices and clients
+        # Get devices; clients are streamed into the builder page by page
         devices = meraki_manager.get_devices(network_id)
-        clients = meraki_manager.get_clients(network_id)
         
         # Build topology using enhanced visualizer
         if CLI_MODULES_AVAILABLE:
-            topology_data = build_topology_from_api_data(devices, clients, links=None)
+            topology_data = build_topology_from_api_data(devices, meraki_manager.iter_clients(network_id), links=None)
         else:
             # Fallback topology structure
             topology_data = {
@@ -1451,11 +1637,12 @@ def get_topology(network_id):
                 'links': []
             }
         
+        client_count = sum(1 for n in topology_data.get('nodes', []) if n.get('type') == 'client')
         return jsonify({
             'topology': topology_data,
             'stats': {
                 'devices': len(devices),
-                'clients': len(clients),
+                'clients': client_count,
                 'links': len(topology_data.get('links', []))
             }
         })
@@ -1494,6 +1681,57 @@ def get_visualization_data():
         logger.error(f"Error getting visualization data: {e}")
         return jsonify({'error': str(e)}), 500
 
+def _node_budget():
+    """Node budget for this response: ?budget=N, 0 to send every client, default TOPOLOGY_NODE_BUDGET"""
+    from topology_engine import DEFAULT_NODE_BUDGET
+    return max(0, request.args.get('budget', DEFAULT_NODE_BUDGET, type=int))
+
+def _network_topology(network_id, devices):
+    """Build the topology of a network; clients are streamed into the builder page by page"""
+    from topology_engine import build_topology
+    topology = build_topology(devices, meraki_manager.iter_clients(network_id), [])
+    
+    logger.info(f"Built topology with {len(topology.nodes)} nodes and {len(topology.links)} links")
+    
+    return topology
+
+def _build_network_d3_data(network_id, devices, node_budget):
+    """Build the D3 topology of a network, clients aggregated to fit the node budget"""
+    from topology_engine import level_of_detail, to_d3
+    return to_d3(level_of_detail(_network_topology(network_id, devices), node_budget))
+
+def _wants_server_layout():
+    """Whether the page asked for precomputed coordinates (?layout=server)"""
+    return request.args.get('layout') == 'server'
+
+def _server_layout(key, version, data, node_ids=None):
+    """Node coordinates for one topology version (cached), optionally only for some nodes"""
+    from topology_layout import NUMPY_AVAILABLE, get_layout_cache
+    positions = get_layout_cache().get_or_compute(key, version, data)
+    if node_ids is not None:
+        positions = {node_id: positions[node_id] for node_id in node_ids if node_id in positions}
+    return {'positions': positions, 'relaxed': NUMPY_AVAILABLE}
+
+def _topology_response(data):
+    """
+    Serialize a topology payload in the format the client asked for.
+
+    JSON stays the default; an Accept of application/vnd.topology.columnar+json
+    (or +msgpack) gets the compact columnar encoding, compressed per Accept-Encoding.
+    """
+    from topology_wire import JSON_MEDIA_TYPE, encode_topology, negotiate_encoding, negotiate_media_type
+    media_type = negotiate_media_type(request.headers.get('Accept'))
+    if media_type == JSON_MEDIA_TYPE:
+        response = jsonify(data)
+        response.headers['Vary'] = 'Accept'
+        return response
+    body, headers = encode_topology(data, media_type, negotiate_encoding(request.headers.get('Accept-Encoding')))
+    return Response(body, headers=headers)
+
+def _network_d3_fingerprint(network_id, devices):
+    """Fingerprint the Dashboard inputs of the D3 view (client pages replay from the response cache)"""
+    return input_fingerprint(devices, meraki_manager.iter_clients(network_id))
+
 @app.route('/api/visualization/<network_id>/data')
 def get_network_visualization_data(network_id):
     """Get actual topology data for a specific network"""
@@ -1501,98 +1739,26 @@ def get_network_visualization_data(network_id):
         if 'api_key' not in session:
             return jsonify({'error': 'API key not set'}), 401
         
-        # Use the topology visualizer to get actual network data
-        from utilities.topology_visualizer import build_topology_from_api_data
-        
-        # Get devices and clients for the network
         devices = meraki_manager.get_devices(network_id)
-        clients = meraki_manager.get_clients(network_id)
         
-        logger.info(f"Retrieved {len(devices)} devices and {len(clients)} clients for network {network_id}")
+        logger.info(f"Retrieved {len(devices)} devices for network {network_id}, streaming clients")
         
-        # Create topology data using the existing topology visualizer
-        topology_data = build_topology_from_api_data(devices, clients, [])
+        # Return D3.js formatted data, versioned so the page can poll for deltas
+        node_budget = _node_budget()
+        key = (network_id, 'd3', node_budget)
+        versions = get_topology_versions()
+        # Fingerprint first: an unchanged network is served from its stored version without a rebuild
+        fingerprint = _network_d3_fingerprint(network_id, devices)
+        d3_data = versions.current_payload(key) if versions.is_current(key, fingerprint) else None
+        if d3_data is None:
+            d3_data = _build_network_d3_data(network_id, devices, node_budget)
+            d3_data['version'] = versions.record(key, d3_data, fingerprint)
+        if _wants_server_layout():
+            d3_data['layout'] = _server_layout(key, d3_data['version'], d3_data)
         
-        logger.info(f"Built topology with {len(topology_data.get('nodes', []))} nodes and {len(topology_data.get('links', []))} links")
+        logger.info(f"Returning D3.js data v{d3_data['version']} with {len(d3_data['nodes'])} nodes and {len(d3_data['edges'])} edges")
         
-        # Convert topology data to D3.js format
-        d3_nodes = []
-        d3_edges = []
-        
-        # Process nodes for D3.js
-        for node in topology_data.get('nodes', []):
-            device_type = node.get('type', 'unknown')
-            
-            # Map device types to groups and colors
-            if device_type == 'appliance':
-                group = 'appliance'
-                size = 12
-            elif device_type == 'switch':
-                group = 'switch'
-                size = 10
-            elif device_type == 'wireless':
-                group = 'wireless'
-                size = 10
-            elif device_type == 'client':
-                group = 'client'
-                size = 6
-            else:
-                group = 'unknown'
-                size = 8
-            
-            # Create D3.js node
-            d3_node = {
-                'id': node['id'],
-                'label': node.get('label', node['id']),
-                'group': group,
-                'size': size,
-                'title': f"<b>{node.get('label', 'Unknown')}</b><br>" +
-                        f"Type: {device_type}<br>" +
-                        f"IP: {node.get('ip', 'Unknown')}<br>" +
-                        f"Status: {node.get('status', 'Unknown')}"
-            }
-            d3_nodes.append(d3_node)
-        
-        # Process links/edges for D3.js
-        for link in topology_data.get('links', []):
-            connection_type = link.get('type', 'unknown')
-            
-            # Map connection types
-            if connection_type == 'uplink':
-                edge_type = 'uplink'
-                width = 3
-            elif connection_type == 'switch':
-                edge_type = 'switch'
-                width = 2
-            elif connection_type == 'wireless':
-                edge_type = 'wireless'
-                width = 2
-            elif connection_type == 'wired':
-                edge_type = 'wired'
-                width = 1
-            else:
-                edge_type = 'unknown'
-                width = 1
-            
-            # Create D3.js edge
-            d3_edge = {
-                'source': link['source'],
-                'target': link['target'],
-                'type': edge_type,
-                'width': width,
-                'dashes': connection_type == 'wireless'
-            }
-            d3_edges.append(d3_edge)
-        
-        # Return D3.js formatted data
-        d3_data = {
-            'nodes': d3_nodes,
-            'edges': d3_edges
-        }
-        
-        logger.info(f"Returning D3.js data with {len(d3_nodes)} nodes and {len(d3_edges)} edges")
-        
-        return jsonify(d3_data)
+        return _topology_response(d3_data)
         
     except Exception as e:
         logger.error(f"Error getting network visualization data for {network_id}: {e}")
@@ -1603,6 +1769,123 @@ def get_network_visualization_data(network_id):
             'edges': []
         }), 500
 
+@app.route('/api/visualization/<network_id>/stream')
+def stream_network_visualization_data(network_id):
+    """Stream the D3 topology as NDJSON: devices first, then clients and their links as pages arrive"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
+        
+        from topology_engine import stream_d3
+        devices = meraki_manager.get_devices(network_id)
+        chunks = stream_d3(devices, meraki_manager.iter_clients(network_id))
+        
+        def generate():
+            try:
+                for chunk in chunks:
+                    yield json.dumps(chunk) + '\n'
+            except Exception as e:
+                # Headers are already sent - report the truncation as the last line
+                logger.error(f"Topology stream for {network_id} interrupted: {e}")
+                yield json.dumps({'type': 'error', 'error': str(e), 'truncated': True}) + '\n'
+        
+        # Proxies must not buffer the stream, or the first chunk waits for the last page
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'})
+        
+    except Exception as e:
+        logger.error(f"Error streaming network visualization data for {network_id}: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/visualization/<network_id>/delta')
+def get_network_visualization_delta(network_id):
+    """Get the topology changes since a version the D3 page already holds"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
+        
+        since = request.args.get('since', type=int)
+        view = request.args.get('view', 'd3')
+        if view not in ('d3', 'multi-vendor'):
+            return jsonify({'error': f'Unknown view: {view}'}), 400
+        
+        versions = get_topology_versions()
+        node_budget = _node_budget()
+        key = (network_id, view, node_budget)
+        if view == 'd3':
+            devices = meraki_manager.get_devices(network_id)
+            fingerprint = _network_d3_fingerprint(network_id, devices)
+            if not versions.is_current(key, fingerprint):
+                versions.record(key, _build_network_d3_data(network_id, devices, node_budget), fingerprint)
+        else:
+            from fortigate_poller import POLL_MAX_AGE
+            meraki_devices = meraki_manager.get_devices(network_id)
+            meraki_clients = meraki_manager.get_clients(network_id)
+            # Cheap inputs first: the inventory revision (no FortiManager read) and recent poll results
+            store, inventory = _session_fortimanager_inventory()
+            direct_devices = list(_iter_session_direct_fortigates(max_age=POLL_MAX_AGE))
+            fingerprint = _multi_vendor_fingerprint(meraki_devices, meraki_clients, inventory, direct_devices)
+            if not versions.is_current(key, fingerprint):
+                fortigate_devices = _fortimanager_inventory_devices(store, inventory) + direct_devices
+                versions.record(key, _build_multi_vendor_data(meraki_devices, meraki_clients, fortigate_devices,
+                                                              node_budget), fingerprint)
+        
+        delta = versions.delta_since(key, since)
+        if _wants_server_layout():
+            if delta['full']:
+                delta['layout'] = _server_layout(key, delta['version'], delta)
+            elif delta['nodes']['added']:
+                # Coordinates for the new nodes; existing nodes keep theirs on the page
+                delta['layout'] = _server_layout(key, delta['version'], versions.current_payload(key),
+                                                 [node['id'] for node in delta['nodes']['added']])
+        if not delta['full']:
+            logger.info(f"Topology delta for {network_id} v{since} -> v{delta['version']}: "
+                        f"{sum(len(v) for v in delta['nodes'].values())} node and "
+                        f"{sum(len(v) for v in delta['edges'].values())} edge changes")
+        return jsonify(delta)
+        
+    except Exception as e:
+        logger.error(f"Error getting topology delta for {network_id}: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/visualization/<network_id>/clients')
+def get_network_client_group(network_id):
+    """Drill down into an aggregated client group: its members as D3 nodes, a page at a time"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
+        
+        group_id = request.args.get('group')
+        if not group_id:
+            return jsonify({'error': 'group is required'}), 400
+        view = request.args.get('view', 'd3')
+        if view not in ('d3', 'multi-vendor'):
+            return jsonify({'error': f'Unknown view: {view}'}), 400
+        offset = max(0, request.args.get('offset', 0, type=int))
+        limit = _node_budget() or None
+        
+        from topology_engine import client_group_members, to_d3, to_multi_vendor_d3
+        if view == 'd3':
+            topology = _network_topology(network_id, meraki_manager.get_devices(network_id))
+            members, total = client_group_members(topology, group_id, offset, limit)
+            data = to_d3(members)
+        else:
+            topology, _, _ = _classified_multi_vendor_topology(
+                meraki_manager.get_devices(network_id), meraki_manager.get_clients(network_id),
+                _iter_session_fortigate_devices())
+            members, total = client_group_members(topology, group_id, offset, limit)
+            data = to_multi_vendor_d3(members)
+        
+        data.update({'group': group_id, 'total': total, 'offset': offset,
+                     'next_offset': offset + members.client_count if offset + members.client_count < total else None})
+        return jsonify(data)
+        
+    except Exception as e:
+        logger.error(f"Error getting client group for {network_id}: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
 # Multi-Vendor Topology Routes
 @app.route('/api/fortinet/configure', methods=['POST'])
 def configure_fortinet():
@@ -1884,7 +2167,7 @@ def toggle_api_mode():
         data = request.get_json()
         new_mode = data.get('mode', 'custom')
         
-        if new_mode not in ['custom', 'sdk']:
+        if new_mode not in ['custom', 'sdk', 'async']:
             return jsonify({'error': 'Invalid API mode'}), 400
         
         session['api_mode'] = new_mode
@@ -2514,17 +2797,10 @@ def configure_fortigate():
             # Store FortiGate configs in session
             session['fortigate_configs'] = fortigate_configs
             
-            # Test connections
-            successful_connections = 0
-            for config in fortigate_configs:
-                host = config.get('host')
-                api_key = config.get('api_key')
-                
-                if host and api_key:
-                    fg = FortiGateDirectAPI(host, api_key)
-                    status = fg.get_system_status()
-                    if status:
-                        successful_connections += 1
+            # Test connections concurrently
+            from fortigate_poller import STATUS, get_fortigate_poller
+            successful_connections = sum(1 for polled in get_fortigate_poller().poll(fortigate_configs, [STATUS])
+                                         if polled['results'][STATUS])
             
             return jsonify({
                 'success': True,
@@ -2573,23 +2849,17 @@ def test_fortigate_connection():
                     'devices': 0
                 })
         
-        # Test direct FortiGate connections if configured
+        # Test direct FortiGate connections if configured, all at once
         if 'fortigate_configs' in session:
-            for config in session['fortigate_configs']:
-                host = config.get('host')
-                api_key = config.get('api_key')
-                name = config.get('name', host)
-                
-                if host and api_key:
-                    fg = FortiGateDirectAPI(host, api_key)
-                    status = fg.get_system_status()
-                    
-                    results.append({
-                        'type': 'FortiGate',
-                        'name': name,
-                        'host': host,
-                        'status': 'connected' if status else 'failed'
-                    })
+            from fortigate_poller import STATUS, get_fortigate_poller
+            for polled in get_fortigate_poller().poll_all(session['fortigate_configs'], [STATUS]):
+                results.append({
+                    'type': 'FortiGate',
+                    'name': polled['name'],
+                    'host': polled['host'],
+                    'status': 'connected' if polled['results'][STATUS] else 'failed',
+                    'latency_ms': polled['latency_ms']
+                })
         
         return jsonify({
             'success': True,
@@ -2613,46 +2883,12 @@ def get_fortigate_devices():
         
         all_devices = []
         
-        # Get devices from FortiManager if configured
-        if 'fortimanager_config' in session:
-            config = session['fortimanager_config']
-            fm = FortiManagerAPI(config['host'], config['username'], config['password'])
-            
-            if fm.login():
-                devices = fm.get_managed_devices()
-                
-                # Add interfaces for each device
-                for device in devices:
-                    device_name = device.get('name')
-                    if device_name:
-                        interfaces = fm.get_device_interfaces(device_name)
-                        device['interfaces'] = interfaces
-                
-                all_devices.extend(devices)
-                fm.logout()
+        # Get devices from FortiManager if configured (served from the inventory store)
+        all_devices.extend(_fortimanager_inventory_devices(*_session_fortimanager_inventory()))
         
-        # Get devices from direct FortiGate connections if configured
+        # Get devices from direct FortiGate connections if configured, polled concurrently
         if 'fortigate_configs' in session:
-            for config in session['fortigate_configs']:
-                host = config.get('host')
-                api_key = config.get('api_key')
-                name = config.get('name', host)
-                
-                if host and api_key:
-                    fg = FortiGateDirectAPI(host, api_key)
-                    status = fg.get_system_status()
-                    
-                    if status:
-                        # Create device object from status
-                        device = {
-                            'name': name,
-                            'host': host,
-                            'serial': status.get('results', {}).get('serial', 'unknown'),
-                            'platform_str': status.get('results', {}).get('version', 'unknown'),
-                            'os_ver': status.get('results', {}).get('version', 'unknown'),
-                            'interfaces': fg.get_interfaces()
-                        }
-                        all_devices.append(device)
+            all_devices.extend(_poll_direct_fortigates(session['fortigate_configs']))
         
         return jsonify({
             'success': True,
@@ -2664,276 +2900,220 @@ def get_fortigate_devices():
         logger.error(f"Error getting FortiGate devices: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/visualization/<network_id>/multi-vendor/data')
-def get_multi_vendor_visualization_data(network_id):
-    """Get multi-vendor topology data including FortiGate and Meraki devices with QSR device classification"""
-    try:
-        if 'api_key' not in session:
-            return jsonify({'error': 'API key not set'}), 401
-        
-        # Initialize QSR device classifier
-        qsr_classifier = None
-        if QSR_CLASSIFIER_AVAILABLE:
-            qsr_classifier = QSRDeviceClassifier()
-            logger.info("QSR device classifier initialized for restaurant device identification")
-        
-        # Get Meraki devices and clients
-        meraki_devices = meraki_manager.get_devices(network_id)
-        meraki_clients = meraki_manager.get_clients(network_id)
-        
-        # Get FortiGate devices if available
-        fortigate_devices = []
-        if FORTIGATE_AVAILABLE:
-            # Get devices from FortiManager if configured
-            if 'fortimanager_config' in session:
-                config = session['fortimanager_config']
-                fm = FortiManagerAPI(config['host'], config['username'], config['password'])
-                
-                if fm.login():
-                    devices = fm.get_managed_devices()
-                    
-                    # Add interfaces for each device
-                    for device in devices:
-                        device_name = device.get('name')
-                        if device_name:
-                            interfaces = fm.get_device_interfaces(device_name)
-                            device['interfaces'] = interfaces
-                    
-                    fortigate_devices.extend(devices)
-                    fm.logout()
-            
-            # Get devices from direct FortiGate connections if configured
-            if 'fortigate_configs' in session:
-                for config in session['fortigate_configs']:
-                    host = config.get('host')
-                    api_key = config.get('api_key')
-                    name = config.get('name', host)
-                    
-                    if host and api_key:
-                        fg = FortiGateDirectAPI(host, api_key)
-                        status = fg.get_system_status()
-                        
-                        if status:
-                            # Create device object from status
-                            device = {
-                                'name': name,
-                                'host': host,
-                                'serial': status.get('results', {}).get('serial', 'unknown'),
-                                'platform_str': status.get('results', {}).get('version', 'unknown'),
-                                'os_ver': status.get('results', {}).get('version', 'unknown'),
-                                'interfaces': fg.get_interfaces()
-                            }
-                            fortigate_devices.append(device)
-        
-        logger.info(f"Retrieved {len(meraki_devices)} Meraki devices, {len(fortigate_devices)} FortiGate devices, and {len(meraki_clients)} clients")
-        
-        # Build topology data with QSR device classification
-        topology_data = {
-            'nodes': [],
-            'edges': [],
-            'stats': {},
-            'qsr_stats': {}
+def _session_fortimanager_inventory():
+    """The session FortiManager's inventory store and snapshot; (None, None) when not configured"""
+    if not FORTIGATE_AVAILABLE or 'fortimanager_config' not in session:
+        return None, None
+    config = session['fortimanager_config']
+    store = get_fortimanager_inventory().store(config['host'], config['username'], config['password'],
+                                               port=config.get('port', 443), adom=config.get('adom'))
+    inventory = store.snapshot()
+    if inventory is None:
+        logger.error(f"FortiManager inventory unavailable for {config['host']}: {store.last_error}")
+    return store, inventory
+
+def _fortimanager_inventory_devices(store, inventory):
+    """
+    FortiManager devices of an inventory snapshot as /dvmdb rows with their
+    interfaces; interface tables are re-read only for devices whose row changed.
+    """
+    if inventory is None:
+        return []
+    devices = inventory.raw_rows()
+    interfaces = store.interfaces([device['name'] for device in devices], inventory)
+    for device in devices:
+        device['interfaces'] = interfaces.get(device['name'], [])
+    return devices
+
+def _iter_direct_fortigates(configs, max_age=None):
+    """
+    Poll directly configured FortiGates concurrently, yielding the reachable ones
+    as each completes; results up to max_age seconds old are reused.
+    """
+    from fortigate_poller import INTERFACES, STATUS, get_fortigate_poller
+    for polled in get_fortigate_poller().poll(configs, [STATUS, INTERFACES], max_age=max_age):
+        status = polled['results'][STATUS]
+        if not status:
+            continue
+        # Create device object from status
+        yield {
+            'name': polled['name'],
+            'host': polled['host'],
+            'serial': status.get('results', {}).get('serial', 'unknown'),
+            'platform_str': status.get('results', {}).get('version', 'unknown'),
+            'os_ver': status.get('results', {}).get('version', 'unknown'),
+            'interfaces': (polled['results'][INTERFACES] or {}).get('results', [])
         }
-        
-        classified_devices = []
-        
-        # Process Meraki devices
-        for device in meraki_devices:
+
+def _poll_direct_fortigates(configs):
+    """Poll directly configured FortiGates concurrently; returns the reachable ones in config order"""
+    order = {config.get('host'): position for position, config in enumerate(configs)}
+    return sorted(_iter_direct_fortigates(configs), key=lambda device: order.get(device['host'], len(order)))
+
+def _iter_session_direct_fortigates(max_age=None):
+    """Yield the session's directly configured FortiGates as each poll completes"""
+    if FORTIGATE_AVAILABLE and 'fortigate_configs' in session:
+        yield from _iter_direct_fortigates(session['fortigate_configs'], max_age)
+
+def _iter_session_fortigate_devices():
+    """
+    Yield the FortiGate devices configured in this session: FortiManager devices
+    from the inventory store first, then direct connections as each poll completes.
+    """
+    yield from _fortimanager_inventory_devices(*_session_fortimanager_inventory())
+    yield from _iter_session_direct_fortigates()
+
+def _classified_multi_vendor_topology(meraki_devices, meraki_clients, fortigate_devices):
+    """Build the Meraki + FortiGate topology with every node QSR-classified; returns (topology, counts, classifier)"""
+    # Initialize QSR device classifier
+    qsr_classifier = None
+    if QSR_CLASSIFIER_AVAILABLE:
+        qsr_classifier = QSRDeviceClassifier()
+        logger.info("QSR device classifier initialized for restaurant device identification")
+    
+    # Build the Meraki topology once; FortiGates join as upstream nodes
+    from topology_engine import TopologyNode, VENDOR_FORTINET, build_topology
+    topology = build_topology(meraki_devices, meraki_clients)
+    meraki_appliances = [i for i, n in enumerate(topology.nodes) if n.type == 'appliance']
+    for device in fortigate_devices:
+        fortigate = topology.add_node(TopologyNode(
+            id=device.get('serial') or device.get('name', 'unknown'),
+            label=device.get('name', 'FortiGate'),
+            type='appliance',
+            vendor=VENDOR_FORTINET,
+            model=device.get('platform_str'),
+            ip=device.get('host'),
+            serial=device.get('serial'),
+            status='online'  # Assume online if we can query it
+        ))
+        # Connect FortiGate to Meraki appliances (uplink)
+        for appliance in meraki_appliances:
+            topology.add_link(fortigate, appliance, 'uplink', 'Uplink')
+    
+    # Classify every node; only the interned group/category/label stay on the node
+    classification_counts = {}
+    for node in topology.nodes:
+        if node.is_client:
             device_info = {
-                'name': device.get('name', ''),
-                'mac': device.get('mac', ''),
-                'model': device.get('model', ''),
-                'productType': device.get('productType', ''),
-                'serial': device.get('serial', ''),
-                'networkId': device.get('networkId', ''),
-                'status': device.get('status', 'unknown')
-            }
-            
-            # Classify device using QSR classifier
-            if qsr_classifier:
-                classification = qsr_classifier.classify_device(device_info)
-            else:
-                # Fallback classification
-                product_type = device.get('productType', '').lower()
-                if 'switch' in product_type:
-                    classification = {'device_type': 'network_switch', 'category': 'Network Infrastructure', 'icon': 'fas fa-network-wired', 'color': '#28A745', 'display_name': 'Network Switch'}
-                elif 'wireless' in product_type:
-                    classification = {'device_type': 'wifi_access_point', 'category': 'Network Infrastructure', 'icon': 'fas fa-wifi', 'color': '#FD7E14', 'display_name': 'WiFi Access Point'}
-                elif 'appliance' in product_type:
-                    classification = {'device_type': 'security_appliance', 'category': 'Security & Routing', 'icon': 'fas fa-shield-alt', 'color': '#DC3545', 'display_name': 'Security Appliance'}
-                elif 'camera' in product_type:
-                    classification = {'device_type': 'security_camera', 'category': 'Security Systems', 'icon': 'fas fa-video', 'color': '#6C757D', 'display_name': 'Security Camera'}
-                else:
-                    classification = {'device_type': 'unknown', 'category': 'Unknown Device', 'icon': 'fas fa-question-circle', 'color': '#9E9E9E', 'display_name': 'Unknown Device'}
-            
-            # Create node for visualization
-            node = {
-                'id': f"meraki_{device.get('serial', 'unknown')}",
-                'label': classification.get('display_name', device.get('name', 'Unknown')),
-                'group': classification.get('device_type', 'unknown'),
-                'size': 12 if classification.get('device_type') in ['security_appliance', 'digital_menu'] else 10,
-                'title': f"<b>{classification.get('display_name', 'Unknown')}</b><br>" +
-                        f"Category: {classification.get('category', 'Unknown')}<br>" +
-                        f"Model: {device.get('model', 'Unknown')}<br>" +
-                        f"Serial: {device.get('serial', 'Unknown')}<br>" +
-                        f"Status: {device.get('status', 'Unknown')}<br>" +
-                        f"IP: {device.get('lanIp', 'Unknown')}"
+                'name': node.label,
+                'mac': node.mac or '',
+                'model': (node.manufacturer or '').lower(),
+                'productType': 'client',
+                'ip': node.ip or '',
+                'status': node.status or 'unknown'
             }
-            topology_data['nodes'].append(node)
-            
-            # Store classified device for statistics
-            classified_devices.append({
-                'device_info': device_info,
-                'classification': classification
-            })
-        
-        # Process FortiGate devices
-        for device in fortigate_devices:
+        elif node.vendor == VENDOR_FORTINET:
             device_info = {
-                'name': device.get('name', ''),
+                'name': node.label,
                 'mac': '',  # FortiGate MAC not always available
                 'model': 'fortigate',
                 'productType': 'fortigate',
-                'serial': device.get('serial', ''),
-                'host': device.get('host', ''),
-                'status': 'online'  # Assume online if we can query it
+                'serial': node.serial or '',
+                'host': node.ip or '',
+                'status': 'online'
             }
-            
-            # Classify FortiGate device
-            if qsr_classifier:
-                classification = qsr_classifier.classify_device(device_info)
-            else:
-                classification = {'device_type': 'security_appliance', 'category': 'Security & Routing', 'icon': 'fas fa-shield-alt', 'color': '#DC3545', 'display_name': 'FortiGate Firewall'}
-            
-            # Create node for visualization
-            node = {
-                'id': f"fortigate_{device.get('serial', device.get('name', 'unknown'))}",
-                'label': classification.get('display_name', device.get('name', 'FortiGate')),
-                'group': classification.get('device_type', 'security_appliance'),
-                'size': 14,  # FortiGates are typically central devices
-                'title': f"<b>{classification.get('display_name', 'FortiGate')}</b><br>" +
-                        f"Category: {classification.get('category', 'Security & Routing')}<br>" +
-                        f"Host: {device.get('host', 'Unknown')}<br>" +
-                        f"Serial: {device.get('serial', 'Unknown')}<br>" +
-                        f"Platform: {device.get('platform_str', 'Unknown')}"
+        else:
+            device_info = {
+                'name': node.label,
+                'mac': node.mac or '',
+                'model': node.model or '',
+                'productType': node.type,
+                'serial': node.serial or '',
+                'networkId': node.network_id or '',
+                'status': node.status or 'unknown'
             }
-            topology_data['nodes'].append(node)
-            
-            # Store classified device for statistics
-            classified_devices.append({
-                'device_info': device_info,
-                'classification': classification
-            })
         
-        # Process clients with QSR classification
-        for client in meraki_clients:
-            client_info = {
-                'name': client.get('description', client.get('mac', '')),
-                'mac': client.get('mac', ''),
-                'model': client.get('manufacturer', '').lower(),
-                'productType': 'client',
-                'ip': client.get('ip', ''),
-                'status': client.get('status', 'unknown')
-            }
-            
-            # Classify client device
-            if qsr_classifier:
-                classification = qsr_classifier.classify_device(client_info)
-            else:
-                classification = {'device_type': 'unknown', 'category': 'Client Device', 'icon': 'fas fa-laptop', 'color': '#6C757D', 'display_name': 'Client Device'}
-            
-            # Create client node
-            client_node = {
-                'id': f"client_{client.get('id', client.get('mac', 'unknown'))}",
-                'label': classification.get('display_name', client.get('description', 'Unknown Client')),
-                'group': classification.get('device_type', 'unknown'),
-                'size': 8 if classification.get('device_type') in ['pos_register', 'pos_tablet', 'kitchen_display'] else 6,
-                'title': f"<b>{classification.get('display_name', 'Client Device')}</b><br>" +
-                        f"Category: {classification.get('category', 'Client Device')}<br>" +
-                        f"MAC: {client.get('mac', 'Unknown')}<br>" +
-                        f"IP: {client.get('ip', 'Unknown')}<br>" +
-                        f"VLAN: {client.get('vlan', 'Unknown')}<br>" +
-                        f"Manufacturer: {client.get('manufacturer', 'Unknown')}"
-            }
-            topology_data['nodes'].append(client_node)
-            
-            # Store classified client for statistics
-            classified_devices.append({
-                'device_info': client_info,
-                'classification': classification
-            })
-            
-            # Connect client to appropriate device (simplified logic)
-            if meraki_devices:
-                # Connect to first switch or AP
-                target_device = None
-                connection_type = 'wired'
-                
-                for device in meraki_devices:
-                    device_type = device.get('productType', '').lower()
-                    if 'switch' in device_type:
-                        target_device = f"meraki_{device.get('serial', 'unknown')}"
-                        connection_type = 'wired'
-                        break
-                    elif 'wireless' in device_type:
-                        target_device = f"meraki_{device.get('serial', 'unknown')}"
-                        connection_type = 'wireless'
-                
-                if target_device:
-                    edge = {
-                        'source': target_device,
-                        'target': client_node['id'],
-                        'type': connection_type,
-                        'width': 1,
-                        'dashes': connection_type == 'wireless'
-                    }
-                    topology_data['edges'].append(edge)
-        
-        # Create connections between infrastructure devices
-        # Connect FortiGate to Meraki appliances (uplink)
-        fortigate_nodes = [n for n in topology_data['nodes'] if n['group'] == 'security_appliance' and 'fortigate' in n['id']]
-        meraki_appliances = [n for n in topology_data['nodes'] if n['group'] == 'security_appliance' and 'meraki' in n['id']]
-        
-        for fg_node in fortigate_nodes:
-            for mx_node in meraki_appliances:
-                edge = {
-                    'source': fg_node['id'],
-                    'target': mx_node['id'],
-                    'type': 'uplink',
-                    'width': 3
-                }
-                topology_data['edges'].append(edge)
+        if qsr_classifier:
+            classification = qsr_classifier.classify_device(device_info)
+        elif node.is_client:
+            classification = QSR_FALLBACK_CLASSIFICATIONS['client']
+        elif node.vendor == VENDOR_FORTINET:
+            classification = QSR_FALLBACK_CLASSIFICATIONS['fortigate']
+        else:
+            classification = QSR_FALLBACK_CLASSIFICATIONS.get(node.type, QSR_FALLBACK_CLASSIFICATIONS['unknown'])
+        
+        node.group = sys.intern(classification.get('device_type', 'unknown'))
+        node.category = sys.intern(classification.get('category', 'Unknown'))
+        node.label = classification.get('display_name') or node.label
+        key = (node.group, node.category)
+        classification_counts[key] = classification_counts.get(key, 0) + 1
+    
+    return topology, classification_counts, qsr_classifier
+
+def _multi_vendor_fingerprint(meraki_devices, meraki_clients, inventory, direct_devices):
+    """
+    Fingerprint the multi-vendor inputs from what is cheap to get: the FortiManager
+    inventory revision instead of its rows, and the direct FortiGates sorted since
+    polls arrive in completion order.
+    """
+    revision = {'fortimanager': inventory.changed_at if inventory is not None else None}
+    return input_fingerprint(meraki_devices, meraki_clients, [revision],
+                             sorted(direct_devices, key=lambda d: (str(d.get('host', '')), str(d.get('name', '')))))
+
+def _build_multi_vendor_data(meraki_devices, meraki_clients, fortigate_devices, node_budget=None):
+    """Build the QSR-classified multi-vendor D3 data, clients aggregated to fit the node budget"""
+    from topology_engine import level_of_detail, to_multi_vendor_d3
+    topology, classification_counts, qsr_classifier = _classified_multi_vendor_topology(
+        meraki_devices, meraki_clients, fortigate_devices)
+    
+    # Serialize only at the response boundary, after clients are grouped
+    topology = level_of_detail(topology, node_budget)
+    topology_data = to_multi_vendor_d3(topology)
+    
+    # Generate QSR statistics from the per-type counts
+    if qsr_classifier:
+        classified_devices = []
+        for (device_type, category), count in classification_counts.items():
+            shared = {'classification': {'device_type': device_type, 'category': category}}
+            classified_devices.extend([shared] * count)
+        topology_data['qsr_stats'] = qsr_classifier.get_qsr_statistics(classified_devices)
+        topology_data['recommendations'] = qsr_classifier.get_device_recommendations(classified_devices)
+    else:
+        topology_data['qsr_stats'] = {}
+    
+    # Update general stats
+    topology_data['stats'] = {
+        'devices': topology.device_count,
+        'clients': topology.client_count,
+        'nodes': len(topology_data['nodes']),
+        'edges': len(topology_data['edges'])
+    }
+    
+    return topology_data
+
+@app.route('/api/visualization/<network_id>/multi-vendor/data')
+def get_multi_vendor_visualization_data(network_id):
+    """Get multi-vendor topology data including FortiGate and Meraki devices with QSR device classification"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
         
-        # Connect appliances to switches
-        switches = [n for n in topology_data['nodes'] if n['group'] == 'network_switch']
-        for appliance in meraki_appliances:
-            for switch in switches:
-                edge = {
-                    'source': appliance['id'],
-                    'target': switch['id'],
-                    'type': 'switch',
-                    'width': 2
-                }
-                topology_data['edges'].append(edge)
+        # Get Meraki devices and clients
+        meraki_devices = meraki_manager.get_devices(network_id)
+        meraki_clients = meraki_manager.get_clients(network_id)
         
-        # Generate QSR statistics
-        if qsr_classifier:
-            qsr_stats = qsr_classifier.get_qsr_statistics(classified_devices)
-            recommendations = qsr_classifier.get_device_recommendations(classified_devices)
-            topology_data['qsr_stats'] = qsr_stats
-            topology_data['recommendations'] = recommendations
-        
-        # Update general stats
-        topology_data['stats'] = {
-            'devices': len([n for n in topology_data['nodes'] if not n['id'].startswith('client_')]),
-            'clients': len([n for n in topology_data['nodes'] if n['id'].startswith('client_')]),
-            'nodes': len(topology_data['nodes']),
-            'edges': len(topology_data['edges'])
-        }
+        # FortiGates join the topology as each poll completes instead of after the slowest one
+        store, inventory = _session_fortimanager_inventory()
+        fortimanager_devices = _fortimanager_inventory_devices(store, inventory)
+        direct_devices = []
+        def streamed_fortigates():
+            yield from fortimanager_devices
+            for device in _iter_session_direct_fortigates():
+                direct_devices.append(device)
+                yield device
+        
+        node_budget = _node_budget()
+        key = (network_id, 'multi-vendor', node_budget)
+        topology_data = _build_multi_vendor_data(meraki_devices, meraki_clients, streamed_fortigates(), node_budget)
+        logger.info(f"Retrieved {len(meraki_devices)} Meraki devices, {len(fortimanager_devices) + len(direct_devices)} FortiGate devices, and {len(meraki_clients)} clients")
+        topology_data['version'] = get_topology_versions().record(
+            key, topology_data, _multi_vendor_fingerprint(meraki_devices, meraki_clients, inventory, direct_devices))
+        if _wants_server_layout():
+            topology_data['layout'] = _server_layout(key, topology_data['version'], topology_data)
         
         logger.info(f"Built QSR multi-vendor topology with {len(topology_data['nodes'])} nodes and {len(topology_data['edges'])} edges")
         
-        return jsonify(topology_data)
+        return _topology_response(topology_data)
         
     except Exception as e:
         logger.error(f"Error getting multi-vendor visualization data: {e}")
@@ -2983,6 +3163,30 @@ def get_network_status(network_id):
         logger.error(f"Error getting network status: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache/invalidate', methods=['POST'])
+def invalidate_meraki_cache():
+    """Drop cached Meraki responses for a network, organization or everything"""
+    try:
+        if 'api_key' not in session:
+            return jsonify({'error': 'API key not set'}), 401
+        
+        from modules.meraki.response_cache import get_response_cache
+        cache = get_response_cache()
+        data = request.get_json(silent=True) or {}
+        
+        if data.get('network_id'):
+            removed = cache.invalidate_network(data['network_id'])
+        elif data.get('org_id'):
+            removed = cache.invalidate_organization(data['org_id'])
+        else:
+            removed = cache.invalidate()
+        
+        return jsonify({'success': True, 'removed': removed, 'stats': cache.get_stats()})
+    
+    except Exception as e:
+        logger.error(f"Error invalidating Meraki cache: {e}")
+        return jsonify({'error': str(e)}), 500
+
 # =============================================================================
 # MISSING API ENDPOINTS FOR AI MAINTENANCE ENGINE
 # =============================================================================
@@ -2991,7 +3195,7 @@ def get_network_status(network_id):
 def health_check():
     """Health check endpoint for monitoring"""
     try:
-        return jsonify({
+        health = {
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'version': '1.0.0',
@@ -3001,7 +3205,30 @@ def health_check():
                 'redis_sessions': REDIS_SESSION_AVAILABLE,
                 'fortimanager': bool(app_config.get('fortimanager_host'))
             }
-        })
+        }
+        
+        # Connection pool statistics for the shared Meraki transport
+        if CLI_MODULES_AVAILABLE:
+            from modules.meraki.meraki_transport import get_transport
+            health['meraki_transport'] = get_transport().get_stats()
+            
+            # SSL verification mode currently used for each upstream host
+            from modules.meraki.ssl_strategy import get_ssl_strategy_cache
+            health['ssl_strategies'] = get_ssl_strategy_cache().get_report()
+            
+            # Per-org rate-limit queue depth and wait times
+            from modules.meraki.rate_limiter import get_rate_scheduler
+            health['meraki_rate_limits'] = get_rate_scheduler().get_metrics()
+            
+            # Response cache hit ratio and memory use
+            from modules.meraki.response_cache import get_response_cache
+            health['meraki_response_cache'] = get_response_cache().get_stats()
+            
+            # Identical concurrent upstream calls that shared one request
+            from single_flight import get_single_flight_stats
+            health['single_flight'] = get_single_flight_stats()
+        
+        return jsonify(health)
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
@@ -3017,49 +3244,50 @@ def get_devices_api():
                 orgs = meraki_manager.dashboard.organizations.getOrganizations()
                 for org in orgs:
                     networks = meraki_manager.dashboard.organizations.getOrganizationNetworks(org['id'])
-                    for network in networks:
-                        network_devices = meraki_manager.dashboard.networks.getNetworkDevices(network['id'])
-                        for device in network_devices:
-                            devices.append({
-                                'id': device.get('serial'),
-                                'name': device.get('name', 'Unknown'),
-                                'model': device.get('model'),
-                                'status': device.get('status'),
-                                'type': 'meraki',
-                                'network': network['name'],
-                                'organization': org['name']
-                            })
+                    
+                    # Org-level bulk inventory joined by networkId/serial
+                    for device in meraki_manager.get_organization_devices(org['id'], networks):
+                        devices.append({
+                            'id': device.get('serial'),
+                            'name': device.get('name') or 'Unknown',
+                            'model': device.get('model'),
+                            'status': device.get('status'),
+                            'type': 'meraki',
+                            'network': device.get('networkName'),
+                            'organization': org['name']
+                        })
             except Exception as e:
                 logger.warning(f"Error getting Meraki devices: {e}")
         
         # Get FortiManager devices if available
+        fortimanager_inventory = None
         if app_config.get('fortimanager_host'):
             try:
-                from fortimanager_api import FortiManagerAPI
-                fm_api = FortiManagerAPI(
+                store = get_fortimanager_inventory().store(
                     app_config['fortimanager_host'],
                     app_config['fortimanager_username'],
                     app_config['fortimanager_password']
                 )
-                if fm_api.login():
-                    fm_devices = fm_api.get_device_inventory()
-                    for device in fm_devices:
-                        devices.append({
-                            'id': device.get('name'),
-                            'name': device.get('name'),
-                            'model': device.get('platform_str'),
-                            'status': device.get('conn_status'),
-                            'type': 'fortigate',
-                            'ip': device.get('ip'),
-                            'version': device.get('os_ver')
-                        })
-                    fm_api.logout()
+                inventory = store.snapshot()
+                for device in (inventory.devices if inventory else ()):
+                    devices.append({
+                        'id': device.get('name'),
+                        'name': device.get('name'),
+                        'model': device.get('model'),
+                        'serial': device.get('serial'),
+                        'status': device.get('status'),
+                        'type': 'fortigate',
+                        'ip': device.get('ip'),
+                        'version': device.get('os_ver')
+                    })
+                fortimanager_inventory = store.status()
             except Exception as e:
                 logger.warning(f"Error getting FortiManager devices: {e}")
         
         return jsonify({
             'devices': devices,
             'total': len(devices),
+            'fortimanager_inventory': fortimanager_inventory,
             'timestamp': datetime.now().isoformat()
         })
         
@@ -5,37 +5,10 @@ This module provides an enhanced function to visualize Meraki network topology
 with interactive features and modern UI, as expected by main.py.
 """
 
-import os
 import logging
-from pathlib import Path
-import uuid
-import json
 
-# Device type to icon mapping
-DEVICE_ICONS = {
-    'switch': 'settings_ethernet',
-    'wireless': 'wifi',
-    'appliance': 'security',
-    'camera': 'videocam',
-    'phone': 'phone_iphone',
-    'desktop': 'desktop_windows',
-    'mobile': 'smartphone',
-    'printer': 'print',
-    'server': 'dns',
-    'voip': 'call',
-    'tablet': 'tablet_mac',
-    'gateway': 'router',
-    'client': 'devices_other',
-    'unknown': 'device_unknown'
-}
-
-CONNECTION_STYLES = {
-    'uplink': {'color': '#00C853', 'width': 3, 'dashes': False, 'label': 'Uplink', 'highlight': '#00C853', 'arrow': True},
-    'switch': {'color': '#2196F3', 'width': 2, 'dashes': False, 'label': 'Switch Connection', 'highlight': '#2196F3', 'arrow': True},
-    'wireless': {'color': '#FF9800', 'width': 2, 'dashes': True, 'label': 'Wireless Connection', 'highlight': '#FF9800', 'arrow': False},
-    'wired': {'color': '#607D8B', 'width': 1, 'dashes': False, 'label': 'Wired Client', 'highlight': '#607D8B', 'arrow': True},
-    'unknown': {'color': '#9E9E9E', 'width': 1, 'dashes': True, 'label': 'Unknown Connection', 'highlight': '#9E9E9E', 'arrow': False}
-}
+import topology_engine
+from topology_engine import DEVICE_ICONS, CONNECTION_STYLES
 
 def create_enhanced_visualization(dashboard, network_id, network_name):
     """
@@ -78,198 +51,20 @@ def generate_topology_html(topology_data, network_name=None, output_path=None):
     Returns:
         str: Path to the generated HTML file
     """
-    # Use network name from topology data if not provided
-    if network_name is None and 'network_name' in topology_data:
-        network_name = topology_data['network_name']
-    elif network_name is None:
-        network_name = "Unknown Network"
-    if not output_path:
-        # Create a directory for topology visualizations if it doesn't exist
-        output_dir = Path(os.path.expanduser("~")) / "meraki_visualizations"
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = output_dir / f"{network_name.replace(' ', '_')}_topology.html"
-    # Convert topology data to vis.js format
-    vis_data = create_vis_network_data(topology_data)
-    vis_nodes = vis_data['nodes']
-    vis_edges = vis_data['edges']
-    connection_types = vis_data['connection_types']
-    # (HTML generation code omitted for brevity, but should be copied as-is from topology_visualizer.py)
-    # ...
-    # Write HTML to file
-    html_content = """"""  # The full HTML content from topology_visualizer.py goes here
-    with open(output_path, 'w') as f:
-        f.write(html_content)
-    logging.info(f"Network topology visualization saved to {output_path}")
-    return str(output_path)
+    return topology_engine.write_html(topology_data, network_name, output_path)
 
 def build_topology_from_api_data(devices, clients, links=None):
     """
     Build a network topology from Meraki API data
     Args:
         devices (list): List of network devices
-        clients (list): List of network clients
+        clients (iterable): Network clients - a list or a paginated generator,
+                            consumed once as pages arrive
         links (list, optional): List of topology links. If None, will build manually.
     Returns:
         dict: Network topology data with nodes and links
     """
-    # Defensive type checking
-    if isinstance(devices, str) or not isinstance(devices, list):
-        logging.error(f"build_topology_from_api_data: Expected devices to be a list, got {type(devices)}: {devices}")
-        return {'nodes': [], 'links': []}
-    if isinstance(clients, str) or not isinstance(clients, list):
-        logging.error(f"build_topology_from_api_data: Expected clients to be a list, got {type(clients)}: {clients}")
-        return {'nodes': [], 'links': []}
-    if links is not None and (isinstance(links, str) or not isinstance(links, list)):
-        logging.warning(f"build_topology_from_api_data: Links data is not a list, got {type(links)}. Ignoring links.")
-        links = None
-    topology = {
-        'nodes': [],
-        'links': []
-    }
-    device_map = {}
-    device_relationships = {}
-    for device in devices:
-        device_id = device.get('serial', device.get('mac', str(uuid.uuid4())))
-        device_map[device_id] = device
-        device_type = device.get('type', 'unknown').lower()
-        model = device.get('model', '').lower()
-        name = device.get('name', '').lower()
-        if 'mx' in model or 'security appliance' in name or (device_type == 'appliance'):
-            device_type = 'appliance'
-        elif 'mr' in model or 'access point' in name or (device_type == 'wireless'):
-            device_type = 'wireless'
-        elif 'ms' in model or 'switch' in name or (device_type == 'switch'):
-            device_type = 'switch'
-        node = {
-            'id': device_id,
-            'label': device.get('name', device.get('mac', 'Unknown')),
-            'type': device_type,
-            'model': device.get('model', 'Unknown'),
-            'ip': device.get('lanIp', device.get('ip', 'Unknown')),
-            'mac': device.get('mac', 'Unknown'),
-            'status': device.get('status', 'Unknown'),
-            'network_id': device.get('networkId', 'Unknown')
-        }
-        if device.get('ports'):
-            node['ports'] = device['ports']
-        network_id = device.get('networkId')
-        if network_id:
-            if network_id not in device_relationships:
-                device_relationships[network_id] = {'appliances': [], 'switches': [], 'wireless': []}
-            if device_type == 'appliance':
-                device_relationships[network_id]['appliances'].append(device_id)
-            elif device_type == 'switch':
-                device_relationships[network_id]['switches'].append(device_id)
-            elif device_type == 'wireless':
-                device_relationships[network_id]['wireless'].append(device_id)
-        topology['nodes'].append(node)
-    client_map = {}
-    for client in clients:
-        client_id = client.get('id', client.get('mac', str(uuid.uuid4())))
-        client_map[client_id] = client
-        node = {
-            'id': client_id,
-            'label': client.get('description', client.get('dhcpHostname', client.get('hostname', client.get('mac', 'Unknown')))),
-            'type': 'client',
-            'client_type': client.get('deviceType', 'unknown'),
-            'ip': client.get('ip', 'Unknown'),
-            'mac': client.get('mac', 'Unknown'),
-            'vlan': client.get('vlan', 'Unknown'),
-            'status': client.get('status', 'Unknown'),
-            'last_seen': client.get('lastSeen', 'Unknown'),
-            'connected_device': client.get('recentDeviceName', client.get('deviceName', 'Unknown')),
-            'switchport': client.get('switchport', 'Unknown'),
-            'switchportDesc': client.get('switchportDesc', '')
-        }
-        topology['nodes'].append(node)
-        if client.get('recentDeviceSerial'):
-            device_id = client.get('recentDeviceSerial')
-            if device_id in device_map:
-                connection_type = 'wired'
-                if client.get('ssid'):
-                    connection_type = 'wireless'
-                interface_label = 'Unknown'
-                if client.get('switchport'):
-                    port_info = f"Port {client.get('switchport')}"
-                    if client.get('switchportDesc'):
-                        port_info += f" ({client.get('switchportDesc')})"
-                    interface_label = port_info
-                elif client.get('vlan'):
-                    interface_label = f"VLAN {client.get('vlan')}"
-                link = {
-                    'source': client_id,
-                    'target': device_id,
-                    'type': connection_type,
-                    'interface': interface_label
-                }
-                topology['links'].append(link)
-    if links:
-        for link in links:
-            source = link.get('source', link.get('sourceSerial', link.get('sourceMac')))
-            target = link.get('target', link.get('targetSerial', link.get('targetMac')))
-            if not (source in device_map or source in client_map) or not (target in device_map or target in client_map):
-                continue
-            link_type = 'unknown'
-            if 'linkType' in link:
-                link_type = link['linkType'].lower()
-            interface_label = 'Unknown'
-            if 'sourcePort' in link:
-                interface_label = f"Port {link['sourcePort']}"
-            topology_link = {
-                'source': source,
-                'target': target,
-                'type': link_type,
-                'interface': interface_label
-            }
-            topology['links'].append(topology_link)
-    elif len(topology['links']) == 0:
-        for device_id, device in device_map.items():
-            if device.get('type') == 'switch' and 'ports' in device:
-                for port_number, port_data in device.get('ports', {}).items():
-                    if 'cdp' in port_data and port_data['cdp'].get('deviceId'):
-                        target_name = port_data['cdp'].get('deviceId')
-                        target_id = None
-                        for d_id, d in device_map.items():
-                            if d.get('name') == target_name:
-                                target_id = d_id
-                                break
-                        if target_id:
-                            link = {
-                                'source': device_id,
-                                'target': target_id,
-                                'type': 'switch',
-                                'interface': f"Port {port_number}"
-                            }
-                            topology['links'].append(link)
-        for network_id, devices in device_relationships.items():
-            for appliance_id in devices['appliances']:
-                for switch_id in devices['switches']:
-                    link = {
-                        'source': appliance_id,
-                        'target': switch_id,
-                        'type': 'uplink',
-                        'interface': 'Uplink'
-                    }
-                    topology['links'].append(link)
-                if not devices['switches']:
-                    for ap_id in devices['wireless']:
-                        link = {
-                            'source': appliance_id,
-                            'target': ap_id,
-                            'type': 'uplink',
-                            'interface': 'Uplink'
-                        }
-                        topology['links'].append(link)
-            for switch_id in devices['switches']:
-                for ap_id in devices['wireless']:
-                    link = {
-                        'source': switch_id,
-                        'target': ap_id,
-                        'type': 'switch',
-                        'interface': 'AP Uplink'
-                    }
-                    topology['links'].append(link)
-    return topology
+    return topology_engine.to_dict(topology_engine.build_topology(devices, clients, links))
 
 def create_vis_network_data(topology_data):
     """
@@ -279,119 +74,4 @@ def create_vis_network_data(topology_data):
     Returns:
         dict: Visualization data for network topology
     """
-    vis_nodes = []
-    vis_edges = []
-    for node in topology_data.get('nodes', []):
-        node_type = node.get('type', 'unknown')
-        icon = DEVICE_ICONS.get(node_type, 'device_unknown')
-        shape = 'circularImage'
-        size = 30
-        font_size = 14
-        if node_type == 'client':
-            client_type = node.get('client_type', 'unknown')
-            if client_type in DEVICE_ICONS:
-                icon = DEVICE_ICONS[client_type]
-            size = 20
-            font_size = 12
-        if node_type == 'client':
-            title_content = f"""<b>{node.get('label', 'Unknown')}</b><br>
-<b>Type:</b> {node.get('client_type', 'Unknown')}<br>
-<b>IP:</b> {node.get('ip', 'Unknown')}<br>
-<b>MAC:</b> {node.get('mac', 'Unknown')}<br>
-<b>VLAN:</b> {node.get('vlan', 'Unknown')}<br>
-<b>Status:</b> {node.get('status', 'Unknown')}<br>
-<b>Connected to:</b> {node.get('connected_device', 'Unknown')}"""
-            if node.get('switchport'):
-                port_info = f"{node.get('switchport', 'Unknown')}"
-                if node.get('switchportDesc'):
-                    port_info += f" ({node.get('switchportDesc')})"
-                title_content += f"""<br>
-<b>Switchport:</b> {port_info}"""
-            if node.get('last_seen'):
-                title_content += f"<br><b>Last Seen:</b> {node.get('last_seen', 'Unknown')}"
-        elif node_type == 'appliance':
-            title_content = f"""<b>{node.get('name', 'Unknown')}</b><br>
-<b>Model:</b> {node.get('model', 'Unknown')}<br>
-<b>Type:</b> MX Security Appliance<br>
-<b>IP:</b> {node.get('ip', 'Unknown')}<br>
-<b>MAC:</b> {node.get('mac', 'Unknown')}<br>
-<b>Status:</b> {node.get('status', 'Unknown')}<br>
-<b>Serial:</b> {node.get('id', 'Unknown')}"""
-        elif node_type == 'switch':
-            title_content = f"""<b>{node.get('name', 'Unknown')}</b><br>
-<b>Model:</b> {node.get('model', 'Unknown')}<br>
-<b>Type:</b> MS Switch<br>
-<b>IP:</b> {node.get('ip', 'Unknown')}<br>
-<b>MAC:</b> {node.get('mac', 'Unknown')}<br>
-<b>Status:</b> {node.get('status', 'Unknown')}<br>
-<b>Serial:</b> {node.get('id', 'Unknown')}"""
-        elif node_type == 'wireless':
-            title_content = f"""<b>{node.get('name', 'Unknown')}</b><br>
-<b>Model:</b> {node.get('model', 'Unknown')}<br>
-<b>Type:</b> MR Access Point<br>
-<b>IP:</b> {node.get('ip', 'Unknown')}<br>
-<b>MAC:</b> {node.get('mac', 'Unknown')}<br>
-<b>Status:</b> {node.get('status', 'Unknown')}<br>
-<b>Serial:</b> {node.get('id', 'Unknown')}"""
-        else:
-            title_content = f"""<b>{node.get('label', 'Unknown')}</b><br>
-<b>Model:</b> {node.get('model', 'Unknown')}<br>
-<b>Type:</b> {node_type}<br>
-<b>IP:</b> {node.get('ip', 'Unknown')}<br>
-<b>MAC:</b> {node.get('mac', 'Unknown')}<br>
-<b>Status:</b> {node.get('status', 'Unknown')}"""
-        vis_node = {
-            'id': node['id'],
-            'label': node.get('label', node['id']),
-            'title': title_content,
-            'shape': shape,
-            'image': f"https://img.icons8.com/material/48/{icon}.png",
-            'group': node_type,
-            'size': size,
-            'font': {
-                'size': font_size
-            }
-        }
-        vis_nodes.append(vis_node)
-    connection_types = set()
-    for link in topology_data.get('links', []):
-        link_type = link.get('type', 'unknown')
-        connection_types.add(link_type)
-        style = CONNECTION_STYLES.get(link_type, CONNECTION_STYLES['unknown'])
-        label = ""
-        if link_type == "uplink":
-            label = "Internet Connection"
-        elif link_type == "switch":
-            label = f"{link.get('interface', 'unknown')}"
-        elif link_type == "wireless":
-            label = "Wireless Connection"
-        elif link_type == "wired":
-            interface_info = link.get('interface', 'unknown')
-            label = interface_info
-        vis_edge = {
-            'from': link['source'],
-            'to': link['target'],
-            'label': label,
-            'title': label,
-            'color': {
-                'color': style['color'],
-                'highlight': style['highlight']
-            },
-            'width': style['width'],
-            'dashes': style['dashes'],
-            'arrows': {
-                'to': {
-                    'enabled': style['arrow']
-                }
-            },
-            'font': {
-                'size': 10,
-                'align': 'middle'
-            }
-        }
-        vis_edges.append(vis_edge)
-    return {
-        'nodes': vis_nodes,
-        'edges': vis_edges,
-        'connection_types': connection_types
-    }
+    return topology_engine.to_vis(topology_data)
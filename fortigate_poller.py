@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Concurrent Direct-FortiGate Poller
+
+Direct-managed FortiGates were polled one after another, one REST call at a
+time (system status, interfaces, FortiAPs, AP status, WiFi clients), mostly
+through bare requests.get calls that opened a new TLS connection each time.
+With a few hundred FortiGates a topology refresh took minutes.
+
+FortiGatePoller polls devices on a bounded thread pool:
+
+- one keep-alive requests.Session per FortiGate host, shared by every caller
+  (FortiGateDirectAPI uses it too)
+- at most FORTIGATE_POLL_WORKERS devices in flight across all polls
+- per-endpoint read timeouts (ENDPOINT_TIMEOUTS, default FORTIGATE_POLL_TIMEOUT);
+  a device that cannot be reached is not asked for its remaining endpoints
+- each device starts after a random delay of up to FORTIGATE_POLL_JITTER
+  seconds, so a fleet is not hit in lockstep
+- poll() yields each device as soon as all its endpoints are done, so callers
+  can build topology incrementally
+- poll(..., max_age=N) reuses a device's last result when it is at most N
+  seconds old (FORTIGATE_POLL_MAX_AGE for the topology delta polls), so
+  steady-state refreshes do not hit the fleet every time
+
+Device configs are the FORTIGATE_DEVICES entries: host, api_key (or
+api_token), name and optional verify_ssl.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+POLL_WORKERS = int(os.getenv('FORTIGATE_POLL_WORKERS', 32))
+POLL_JITTER = float(os.getenv('FORTIGATE_POLL_JITTER', 0.2))
+POLL_TIMEOUT = float(os.getenv('FORTIGATE_POLL_TIMEOUT', 15))
+POLL_MAX_AGE = float(os.getenv('FORTIGATE_POLL_MAX_AGE', 60))
+CONNECT_TIMEOUT = 5
+
+STATUS = 'monitor/system/status'
+INTERFACES = 'cmdb/system/interface'
+MONITOR_INTERFACES = 'monitor/system/interface'
+MANAGED_APS = 'monitor/wifi/managed_ap'
+AP_STATUS = 'monitor/wifi/ap_status'
+WIFI_CLIENTS = 'monitor/wifi/client'
+ARP = 'monitor/system/arp'
+
+# Read timeouts in seconds; endpoints not listed use FORTIGATE_POLL_TIMEOUT
+ENDPOINT_TIMEOUTS = {
+    STATUS: 5,
+    INTERFACES: 10,
+    MONITOR_INTERFACES: 10,
+    MANAGED_APS: 10,
+    AP_STATUS: 10,
+}
+
+
+class FortiGateUnreachable(Exception):
+    """Raised when a FortiGate cannot be connected to (the remaining endpoints are skipped)"""
+
+
+def _create_session(pool_size):
+    """Create a keep-alive session for one FortiGate host."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class FortiGatePoller:
+    """
+    Polls FortiGate REST endpoints concurrently over pooled connections.
+    """
+
+    def __init__(self, max_workers=POLL_WORKERS, jitter=POLL_JITTER, timeouts=None, pool_size=4,
+                 session_factory=None):
+        """
+        Initialize the poller.
+
+        Args:
+            max_workers (int): Devices polled at the same time
+            jitter (float): Maximum random start delay per device in seconds
+            timeouts (dict, optional): Read timeouts per endpoint (default: ENDPOINT_TIMEOUTS)
+            pool_size (int): Keep-alive connections kept per host
+            session_factory (callable, optional): Builds the per-host session
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.jitter = jitter
+        self.timeouts = dict(ENDPOINT_TIMEOUTS, **(timeouts or {}))
+        self.pool_size = pool_size
+        self.session_factory = session_factory or (lambda: _create_session(self.pool_size))
+        self._sessions = {}
+        self._latest = {}  # (host, token, endpoints) -> (monotonic time, poll_device result)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.stats = {'devices': 0, 'requests': 0, 'failures': 0, 'unreachable': 0}
+
+    def _count(self, stat):
+        # Called from every worker thread
+        with self._lock:
+            self.stats[stat] += 1
+
+    def session_for(self, host):
+        """
+        Get the keep-alive session for a FortiGate host, creating it on first use.
+
+        Args:
+            host (str): FortiGate host[:port]
+
+        Returns:
+            requests.Session: Shared session for that host
+        """
+        host = host.rstrip('/')
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = self.session_factory()
+            return session
+
+    def get(self, config, endpoint, timeout=None):
+        """
+        GET one REST endpoint of a FortiGate.
+
+        Args:
+            config (dict): Device config (host, api_key/api_token, verify_ssl)
+            endpoint (str): Path below /api/v2/, e.g. 'monitor/system/status'
+            timeout (float, optional): Read timeout (default: per endpoint)
+
+        Returns:
+            dict: Decoded JSON body
+
+        Raises:
+            FortiGateUnreachable: When no connection could be made
+            RuntimeError: On a non-200 response
+        """
+        host = config['host'].rstrip('/')
+        token = config.get('api_key') or config.get('api_token')
+        read_timeout = timeout or self.timeouts.get(endpoint, POLL_TIMEOUT)
+        self._count('requests')
+        try:
+            response = self.session_for(host).get(
+                f"https://{host}/api/v2/{endpoint}",
+                headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+                verify=config.get('verify_ssl', False),
+                timeout=(min(CONNECT_TIMEOUT, read_timeout), read_timeout)
+            )
+        except Exception as e:
+            # requests' ConnectionError covers refused, DNS, SSL and connect timeouts;
+            # a read timeout still means the host is up
+            if any(cls.__name__ == 'ConnectionError' for cls in type(e).__mro__):
+                raise FortiGateUnreachable(str(e)) from e
+            raise
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response.json()
+
+    def poll_device(self, config, endpoints):
+        """
+        Fetch several endpoints of one FortiGate over its keep-alive session.
+
+        Args:
+            config (dict): Device config
+            endpoints (list): Endpoint paths, fetched in order
+
+        Returns:
+            dict: config, host, name, results ({endpoint: body or None}),
+                  errors ({endpoint: message}), reachable, latency_ms
+        """
+        started = time.monotonic()
+        results = {endpoint: None for endpoint in endpoints}
+        errors = {}
+        reachable = True
+        for endpoint in endpoints:
+            if not reachable:
+                errors[endpoint] = 'skipped: device unreachable'
+                continue
+            try:
+                results[endpoint] = self.get(config, endpoint)
+            except FortiGateUnreachable as e:
+                reachable = False
+                errors[endpoint] = str(e)
+                self._count('unreachable')
+            except Exception as e:
+                errors[endpoint] = str(e)
+                self._count('failures')
+        result = {
+            'config': config,
+            'host': config['host'],
+            'name': config.get('name', config['host']),
+            'results': results,
+            'errors': errors,
+            'reachable': reachable,
+            'latency_ms': round((time.monotonic() - started) * 1000, 1)
+        }
+        self._count('devices')
+        with self._lock:
+            self._latest[self._result_key(config, endpoints)] = (time.monotonic(), result)
+        if errors:
+            logger.warning(f"FortiGate {result['name']}: {len(errors)} of {len(endpoints)} "
+                           f"endpoints failed")
+        return result
+
+    @staticmethod
+    def _result_key(config, endpoints):
+        return (config['host'].rstrip('/'), config.get('api_key') or config.get('api_token'), tuple(endpoints))
+
+    def _executor_for(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fg-poller')
+            return self._executor
+
+    def _jittered(self, config, endpoints):
+        if self.jitter > 0:
+            time.sleep(random.uniform(0, self.jitter))
+        return self.poll_device(config, endpoints)
+
+    def poll(self, devices, endpoints, max_age=None):
+        """
+        Poll many FortiGates concurrently, yielding each as it completes.
+
+        Devices without host or API key are skipped. Closing the generator
+        early cancels the devices that have not started yet.
+
+        Args:
+            devices (list): Device configs
+            endpoints (list): Endpoint paths to fetch from each device
+            max_age (float, optional): Reuse results at most this many seconds
+                old instead of polling (yielded first, marked 'cached')
+
+        Yields:
+            dict: poll_device() result, in completion order
+        """
+        devices = [d for d in devices if d.get('host') and (d.get('api_key') or d.get('api_token'))]
+        if not devices:
+            return
+        started = time.monotonic()
+        endpoints = list(endpoints)
+        cached, stale = [], []
+        with self._lock:
+            for config in devices:
+                latest = self._latest.get(self._result_key(config, endpoints)) if max_age is not None else None
+                if latest is not None and started - latest[0] <= max_age:
+                    cached.append(dict(latest[1], config=config, cached=True))
+                else:
+                    stale.append(config)
+        yield from cached
+        if not stale:
+            return
+        executor = self._executor_for()
+        futures = [executor.submit(self._jittered, config, endpoints) for config in stale]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            logger.info(f"Polled {len(stale)} FortiGates ({len(endpoints)} endpoints each) in "
+                        f"{time.monotonic() - started:.2f}s, {len(cached)} served from the last poll")
+
+    def poll_all(self, devices, endpoints, max_age=None):
+        """poll(), collected back into the order of devices (stable for fingerprints)."""
+        order = {id(config): i for i, config in enumerate(devices)}
+        return sorted(self.poll(devices, endpoints, max_age), key=lambda result: order[id(result['config'])])
+
+    def close(self):
+        """Stop the worker pool and drop the keep-alive connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            self._latest.clear()
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for session in sessions:
+            session.close()
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_fortigate_poller():
+    """Get the process-wide FortiGate poller (created on first use)"""
+    global _poller
+    if _poller is None:
+        with _poller_lock:
+            if _poller is None:
+                _poller = FortiGatePoller()
+    return _poller
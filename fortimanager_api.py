@@ -8,6 +8,10 @@ import requests
 import logging
 from typing import Dict, List, Optional, Any
 
+from single_flight import get_single_flight, flight_key
+from fortimanager_batch import collect_batched, interface_url
+from fortimanager_pool import session_rejected
+
 # Apply SSL fixes for corporate environments with self-signed certificates
 try:
     from ssl_universal_fix import apply_all_ssl_fixes
@@ -182,67 +186,131 @@ class FortiManagerAPI:
         except Exception as e:
             logger.error(f"FortiManager logout error: {str(e)}")
     
-    def get_managed_devices(self):
+    def _relogin(self):
         """
-        Get list of managed devices from FortiManager
+        Replace a session FortiManager rejected, skipping the cached Redis token
         
         Returns:
-            list: List of managed devices with details
+            bool: True if a new session was established
+        """
+        logger.info(f"FortiManager session for {self.site} was rejected, logging in again: {self.host}")
+        if self.fm_session_manager:
+            self.fm_session_manager.invalidate_fortimanager_session(self.site, self.host, self.username)
+        self.session_id = None
+        return self.login()
+    
+    def _post_read(self, payload):
+        """
+        POST a read-only JSON-RPC call, sharing it with identical concurrent calls
+        
+        Calls are coalesced on (host/user, method, url params), so several
+        dashboards polling the same FortiManager cost one upstream request.
+        A call rejected for an expired session is repeated once after a new login.
+        
+        Args:
+            payload (dict): JSON-RPC request body
+            
+        Returns:
+            requests.Response: The (possibly shared) response
+        """
+        key = flight_key(f"{self.host}:{self.port}/{self.username}", payload.get('method', 'get'),
+                         self.base_url, payload.get('params'))
+        
+        def post():
+            response = self.session.post(
+                self.base_url,
+                json=payload,
+                timeout=self.timeout
+            )
+            # Read the body once so every waiter can call .json() safely
+            response.content
+            return response
+        
+        def send():
+            response = post()
+            if session_rejected(response) and self._relogin():
+                payload['session'] = self.session_id
+                response = post()
+            return response
+        
+        return get_single_flight('fortimanager').do(key, send)
+    
+    @staticmethod
+    def process_device(device):
+        """Reduce a /dvmdb device row to the fields the dashboards use"""
+        return {
+            'name': device.get('name', 'Unknown'),
+            'serial': device.get('sn', 'N/A'),
+            'model': device.get('platform_str', 'N/A'),
+            'os_ver': device.get('os_ver', 'N/A'),
+            'status': 'online' if device.get('conn_status') == 1 else 'offline',
+            'ip': device.get('ip', 'N/A'),
+            'site': (device.get('meta fields') or {}).get('Company/Organization', 'N/A'),
+            'device_type': 'FortiGate',
+            'vendor': 'Fortinet'
+        }
+    
+    def get_device_rows(self, adom=None, fields=None, filter=None):
+        """
+        Get raw device rows from the device database
+        
+        Args:
+            adom (str): ADOM to read (default: every device the user can see)
+            fields (list): Only return these fields
+            filter (list): JSON-RPC filter, e.g. ["name", "in", "FG-1", "FG-2"]
+            
+        Returns:
+            list: Device rows, or None if the call failed
         """
         try:
             if not self.session_id:
                 logger.error("Not logged into FortiManager")
-                return []
+                return None
             
+            params = {"url": f"/dvmdb/adom/{adom}/device" if adom else "/dvmdb/device"}
+            if fields:
+                params["fields"] = list(fields)
+            if filter:
+                params["filter"] = filter
             payload = {
                 "method": "get",
-                "params": [{
-                    "url": "/dvmdb/device"
-                }],
+                "params": [params],
                 "session": self.session_id,
                 "id": 1
             }
             
-            response = self.session.post(
-                self.base_url,
-                json=payload,
-                timeout=self.timeout
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
-                if result.get('result', [{}])[0].get('status', {}).get('code') == 0:
-                    devices = result.get('result', [{}])[0].get('data', [])
-                    
-                    # Process device information
-                    processed_devices = []
-                    for device in devices:
-                        processed_device = {
-                            'name': device.get('name', 'Unknown'),
-                            'serial': device.get('sn', 'N/A'),
-                            'model': device.get('platform_str', 'N/A'),
-                            'os_ver': device.get('os_ver', 'N/A'),
-                            'status': 'online' if device.get('conn_status') == 1 else 'offline',
-                            'ip': device.get('ip', 'N/A'),
-                            'site': device.get('meta fields', {}).get('Company/Organization', 'N/A'),
-                            'device_type': 'FortiGate',
-                            'vendor': 'Fortinet'
-                        }
-                        processed_devices.append(processed_device)
-                    
-                    logger.info(f"Retrieved {len(processed_devices)} managed devices")
-                    return processed_devices
-                else:
-                    error_msg = result.get('result', [{}])[0].get('status', {}).get('message', 'Unknown error')
-                    logger.error(f"Failed to get managed devices: {error_msg}")
-                    return []
+                status = result.get('result', [{}])[0].get('status', {})
+                if status.get('code') == 0:
+                    return result.get('result', [{}])[0].get('data') or []
+                logger.error(f"Failed to get managed devices: {status.get('message', 'Unknown error')}")
+                return None
             else:
                 logger.error(f"Get managed devices HTTP error: {response.status_code}")
-                return []
+                return None
                 
         except Exception as e:
             logger.error(f"Error getting managed devices: {str(e)}")
+            return None
+    
+    def get_managed_devices(self):
+        """
+        Get list of managed devices from FortiManager
+        
+        Returns:
+            list: List of managed devices with details
+        """
+        devices = self.get_device_rows()
+        if devices is None:
             return []
+        
+        # Process device information
+        processed_devices = [self.process_device(device) for device in devices]
+        logger.info(f"Retrieved {len(processed_devices)} managed devices")
+        return processed_devices
     
     def get_device_interfaces(self, device_name):
         """
@@ -262,17 +330,13 @@ class FortiManagerAPI:
             payload = {
                 "method": "get",
                 "params": [{
-                    "url": f"/pm/config/device/{device_name}/global/system/interface"
+                    "url": interface_url(device_name)
                 }],
                 "session": self.session_id,
                 "id": 1
             }
             
-            response = self.session.post(
-                self.base_url,
-                json=payload,
-                timeout=self.timeout
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -280,18 +344,7 @@ class FortiManagerAPI:
                     interfaces = result.get('result', [{}])[0].get('data', [])
                     
                     # Process interface information
-                    processed_interfaces = []
-                    for interface in interfaces:
-                        processed_interface = {
-                            'name': interface.get('name', 'Unknown'),
-                            'ip': interface.get('ip', ['0.0.0.0', '0.0.0.0'])[0],
-                            'status': interface.get('status', 'down'),
-                            'type': interface.get('type', 'unknown'),
-                            'vdom': interface.get('vdom', 'root')
-                        }
-                        processed_interfaces.append(processed_interface)
-                    
-                    return processed_interfaces
+                    return [self._process_interface(interface) for interface in interfaces]
                 else:
                     logger.error(f"Failed to get interfaces for {device_name}")
                     return []
@@ -303,6 +356,43 @@ class FortiManagerAPI:
             logger.error(f"Error getting interfaces for {device_name}: {str(e)}")
             return []
     
+    @staticmethod
+    def _process_interface(interface):
+        """Reduce a FortiManager interface entry to the fields the topology uses"""
+        return {
+            'name': interface.get('name', 'Unknown'),
+            'ip': interface.get('ip', ['0.0.0.0', '0.0.0.0'])[0],
+            'status': interface.get('status', 'down'),
+            'type': interface.get('type', 'unknown'),
+            'vdom': interface.get('vdom', 'root')
+        }
+    
+    def get_devices_interfaces(self, device_names, batch_size=None):
+        """
+        Get interfaces for many devices with batched JSON-RPC calls
+        
+        Packs up to batch_size device urls into each request instead of one
+        request per device. A device whose entry fails gets an empty list.
+        
+        Args:
+            device_names (list): Names of the devices
+            batch_size (int): Devices per request (default: FORTIMANAGER_BATCH_SIZE)
+            
+        Returns:
+            dict: {device_name: list of device interfaces}
+        """
+        names = [name for name in device_names if name]
+        if not self.session_id:
+            logger.error("Not logged into FortiManager")
+            return {name: [] for name in names}
+        
+        results = collect_batched(self._post_read, self.session_id,
+                                  [interface_url(name) for name in names], batch_size)
+        return {
+            name: [self._process_interface(interface) for interface in results.get(interface_url(name)) or []]
+            for name in names
+        }
+    
     def get_device_inventory(self):
         """
         Get comprehensive device inventory with VLAN information
@@ -324,6 +414,9 @@ class FortiManagerAPI:
                 }
             }
             
+            # Interfaces for connection mapping, batched across devices
+            device_interfaces = self.get_devices_interfaces([device['name'] for device in devices])
+            
             # Process devices into nodes
             for device in devices:
                 node = {
@@ -342,8 +435,7 @@ class FortiManagerAPI:
                 }
                 inventory_data['nodes'].append(node)
                 
-                # Get interfaces for connection mapping
-                interfaces = self.get_device_interfaces(device['name'])
+                interfaces = device_interfaces.get(device['name'], [])
                 for interface in interfaces:
                     if interface['status'] == 'up' and interface['ip'] != '0.0.0.0':
                         # Create VLAN/network information
@@ -387,11 +479,7 @@ class FortiManagerAPI:
                 "id": 1
             }
             
-            response = self.session.post(
-                self.base_url,
-                json=payload,
-                timeout=self.timeout
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Batched FortiManager JSON-RPC Reads
+
+The multi-vendor topology used to ask FortiManager for each FortiGate's
+interfaces in its own request, one round trip per device. FortiManager's
+JSON-RPC takes several entries in ``params`` and answers with one ``result``
+entry per request entry, each with its own status:
+
+    {"method": "get", "params": [{"url": "/pm/config/device/FG-1/..."},
+                                 {"url": "/pm/config/device/FG-2/..."}], ...}
+    {"result": [{"url": "...FG-1/...", "status": {"code": 0}, "data": [...]},
+                {"url": "...FG-2/...", "status": {"code": -3, "message": "Object does not exist"}}]}
+
+collect_batched() packs up to FORTIMANAGER_BATCH_SIZE urls per request and
+hands each url its own data back. A failed entry (unknown device, no
+permission) only loses that device; a failed request only loses its batch.
+Both FortiManagerAPI clients build on it.
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Device urls per JSON-RPC request; FortiManager handles a few hundred, but
+# large batches make a single slow device hold up the rest
+BATCH_SIZE = int(os.getenv('FORTIMANAGER_BATCH_SIZE', 50))
+
+
+def interface_url(device_name):
+    """JSON-RPC url of a managed device's system interface table."""
+    return f"/pm/config/device/{device_name}/global/system/interface"
+
+
+def chunks(items, size):
+    """Split a list into consecutive lists of at most size items."""
+    size = max(1, int(size))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def batch_payload(method, urls, session_id):
+    """
+    Build one JSON-RPC request with an entry per url.
+
+    Args:
+        method (str): JSON-RPC method, e.g. 'get'
+        urls (list): Request urls
+        session_id (str): FortiManager session
+
+    Returns:
+        dict: JSON-RPC request body
+    """
+    return {
+        "id": 1,
+        "method": method,
+        "params": [{"url": url} for url in urls],
+        "session": session_id
+    }
+
+
+def split_batch_result(urls, body):
+    """
+    Match the entries of a batched JSON-RPC response to the requested urls.
+
+    Entries are matched on the url FortiManager echoes back and fall back to
+    their position, so reordered or url-less results still land correctly.
+
+    Args:
+        urls (list): Urls in request order
+        body (dict): Decoded JSON-RPC response
+
+    Returns:
+        dict: {url: (status code, status message, data)}; urls without an
+              entry get code None
+    """
+    wanted = {url.rstrip('/'): url for url in urls}
+    entries = body.get('result') or []
+    split = {}
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        url = wanted.get(str(entry.get('url', '')).rstrip('/'))
+        if url is None or url in split:
+            if position >= len(urls) or urls[position] in split:
+                continue
+            url = urls[position]
+        status = entry.get('status') or {}
+        split[url] = (status.get('code'), status.get('message', 'Unknown error'), entry.get('data'))
+    for url in urls:
+        split.setdefault(url, (None, 'Missing from batched response', None))
+    return split
+
+
+def collect_batched(post, session_id, urls, batch_size=None, method='get'):
+    """
+    Read many JSON-RPC urls with as few requests as possible.
+
+    Args:
+        post (callable): Sends a JSON-RPC payload and returns the HTTP response
+                         (the client's _post_read)
+        session_id (str): FortiManager session
+        urls (list): Urls to read; duplicates are read once
+        batch_size (int, optional): Urls per request (default: BATCH_SIZE)
+        method (str): JSON-RPC method
+
+    Returns:
+        dict: {url: data} for every url; None where the entry or its batch failed
+    """
+    urls = list(dict.fromkeys(urls))
+    results = {}
+    batches = chunks(urls, batch_size or BATCH_SIZE)
+    for batch in batches:
+        try:
+            response = post(batch_payload(method, batch, session_id))
+            if response.status_code != 200:
+                logger.error(f"Batched FortiManager {method} HTTP error: {response.status_code} "
+                             f"({len(batch)} urls)")
+                results.update((url, None) for url in batch)
+                continue
+            split = split_batch_result(batch, response.json())
+        except Exception as e:
+            logger.error(f"Batched FortiManager {method} failed for {len(batch)} urls: {str(e)}")
+            results.update((url, None) for url in batch)
+            continue
+
+        for url, (code, message, data) in split.items():
+            if code == 0:
+                results[url] = data
+            else:
+                logger.warning(f"FortiManager {method} {url} failed: {message} (code {code})")
+                results[url] = None
+
+    failed = sum(1 for data in results.values() if data is None)
+    logger.info(f"Batched FortiManager {method}: {len(urls)} urls in {len(batches)} requests, {failed} failed")
+    return results
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Concurrent Multi-Site FortiManager Fan-Out
+
+/api/fortimanager/devices/all used to log into each configured FortiManager
+(arbys, bww, sonic, ...) one after another, so a single dead instance added
+its whole 30s timeout to the response. fan_out() runs one task per site on a
+shared thread pool and returns when every site has answered or its deadline
+has passed:
+
+- each site gets FORTIMANAGER_SITE_TIMEOUT seconds from the moment it starts
+- the whole call never takes longer than FORTIMANAGER_REQUEST_BUDGET seconds
+- sites still running at their deadline are reported as 'timeout' and left to
+  finish (and log out) in the background; their results are discarded
+
+Every site comes back with its status and latency, so callers can return
+partial results together with per-site status.
+"""
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+SITE_TIMEOUT = float(os.getenv('FORTIMANAGER_SITE_TIMEOUT', 15))
+REQUEST_BUDGET = float(os.getenv('FORTIMANAGER_REQUEST_BUDGET', 20))
+FANOUT_WORKERS = int(os.getenv('FORTIMANAGER_FANOUT_WORKERS', 16))
+
+DONE = 'done'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_fanout_executor():
+    """Get the thread pool shared by all fan-out calls (created on first use)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix='fm-fanout')
+    return _executor
+
+
+def fan_out(sites, task, site_timeout=None, budget=None, executor=None):
+    """
+    Run task(site, config) for every site concurrently, within deadlines.
+
+    Args:
+        sites (dict): {site name: config}
+        task (callable): Called as task(site, config) on a worker thread
+        site_timeout (float, optional): Seconds per site (default: FORTIMANAGER_SITE_TIMEOUT)
+        budget (float, optional): Seconds for the whole call (default: FORTIMANAGER_REQUEST_BUDGET)
+        executor (Executor, optional): Pool to run on (default: the shared pool)
+
+    Returns:
+        dict: {site: {'status': 'done' | 'error' | 'timeout', 'latency_ms': float,
+                      'result': task return value, 'error': message}}
+              in the order of sites
+    """
+    site_timeout = SITE_TIMEOUT if site_timeout is None else site_timeout
+    budget = REQUEST_BUDGET if budget is None else budget
+    executor = executor or get_fanout_executor()
+
+    submitted = time.monotonic()
+    request_deadline = submitted + budget
+    started = {}
+    finished = {}
+
+    def run(site, config):
+        started[site] = time.monotonic()
+        try:
+            return task(site, config)
+        finally:
+            finished[site] = time.monotonic()
+
+    futures = {executor.submit(run, site, config): site for site, config in sites.items()}
+
+    def deadline(future):
+        site = futures[future]
+        # Sites still queued behind a busy pool start their clock when they run
+        return min(request_deadline, started.get(site, time.monotonic()) + site_timeout)
+
+    def latency_ms(site):
+        end = finished.get(site, time.monotonic())
+        return round((end - started.get(site, submitted)) * 1000, 1)
+
+    results = {}
+    pending = set(futures)
+    while pending:
+        timeout = max(0.0, min(deadline(future) for future in pending) - time.monotonic())
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            site = futures[future]
+            try:
+                results[site] = {'status': DONE, 'latency_ms': latency_ms(site), 'result': future.result()}
+            except Exception as e:
+                results[site] = {'status': ERROR, 'latency_ms': latency_ms(site), 'error': str(e)}
+
+        now = time.monotonic()
+        for future in [f for f in pending if deadline(f) <= now]:
+            site = futures[future]
+            future.cancel()
+            pending.discard(future)
+            results[site] = {'status': TIMEOUT, 'latency_ms': latency_ms(site),
+                             'error': f"No response within {min(site_timeout, budget):g}s"}
+            logger.warning(f"{site.upper()} FortiManager timed out after {results[site]['latency_ms']}ms")
+
+    logger.info(f"Fan-out to {len(sites)} sites finished in {(time.monotonic() - submitted) * 1000:.0f}ms "
+                f"({sum(1 for r in results.values() if r['status'] == TIMEOUT)} timed out)")
+    return {site: results[site] for site in sites}
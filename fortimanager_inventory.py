@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+FortiManager Device Inventory Store
+
+get_managed_devices() pulled the whole /dvmdb/device table on every page load,
+although the fleet changes a few times a day. DeviceInventoryStore keeps the
+processed device list per (FortiManager, credentials, ADOM) in memory and
+refreshes it in the background:
+
+- incremental refresh (every FORTIMANAGER_INVENTORY_REFRESH seconds): list
+  only each device's name and change fields (CHANGE_FIELDS: last resync,
+  config/connection status, firmware, IP), then fetch the full rows of the
+  devices whose fields differ from the stored ones, by name filter; devices
+  missing from the listing are dropped
+- full refresh (every FORTIMANAGER_INVENTORY_FULL_REFRESH seconds, on first
+  use, or when an incremental pass fails)
+- a scheduler thread keeps registered stores warm between reads; reads past the
+  refresh interval also start a background refresh
+- stores are keyed by a hash of the password as well, so a snapshot is only
+  served to callers whose credentials loaded it; stores whose login is
+  rejected are not refreshed by the scheduler, and are dropped if they never
+  loaded
+
+Readers get an immutable InventorySnapshot with indexes by name, serial, IP and
+site, so routes answer from memory and report the snapshot's age via status().
+Snapshots also keep the raw /dvmdb rows for the topology routes, and the store
+caches each device's interface table until that device's row changes.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from fortimanager_batch import BATCH_SIZE, chunks, collect_batched, interface_url
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = float(os.getenv('FORTIMANAGER_INVENTORY_REFRESH', 300))
+FULL_REFRESH_INTERVAL = float(os.getenv('FORTIMANAGER_INVENTORY_FULL_REFRESH', 3600))
+
+# Device fields whose change means the stored row is out of date
+CHANGE_FIELDS = ('last_resync', 'conf_status', 'conn_status', 'os_ver', 'ip')
+
+FULL = 'full'
+INCREMENTAL = 'incremental'
+
+
+def _version(row):
+    return tuple(row.get(field) for field in CHANGE_FIELDS)
+
+
+class InventorySnapshot:
+    """
+    One refresh of an ADOM's devices with lookup indexes. Treat as read-only.
+    """
+
+    def __init__(self, rows, versions, refreshed_at, full_refreshed_at, mode, changed=0, raw=None):
+        """
+        Build the indexes.
+
+        Args:
+            rows (dict): {device name: processed device}
+            versions (dict): {device name: CHANGE_FIELDS values}
+            refreshed_at (float): Epoch time of the refresh
+            full_refreshed_at (float): Epoch time of the last full refresh
+            mode (str): FULL or INCREMENTAL
+            changed (int): Devices fetched by this refresh
+            raw (dict, optional): {device name: /dvmdb row}
+        """
+        self.rows = rows
+        self.versions = versions
+        self.raw = raw or {}
+        # Unchanged by renewed(), so it identifies the device data for fingerprints
+        self.changed_at = refreshed_at
+        self.refreshed_at = refreshed_at
+        self.full_refreshed_at = full_refreshed_at
+        self.mode = mode
+        self.changed = changed
+        self.devices = tuple(rows.values())
+        self.by_serial = {}
+        self.by_ip = {}
+        self.by_site = {}
+        for device in self.devices:
+            self.by_serial[device.get('serial')] = device
+            self.by_ip[device.get('ip')] = device
+            self.by_site.setdefault(device.get('site'), []).append(device)
+
+    def renewed(self, refreshed_at):
+        """Same devices, confirmed current at refreshed_at."""
+        snapshot = object.__new__(InventorySnapshot)
+        snapshot.__dict__.update(self.__dict__, refreshed_at=refreshed_at, mode=INCREMENTAL, changed=0)
+        return snapshot
+
+    def get(self, name):
+        return self.rows.get(name)
+
+    def by_serial_number(self, serial):
+        return self.by_serial.get(serial)
+
+    def by_address(self, ip):
+        return self.by_ip.get(ip)
+
+    def in_site(self, site):
+        return list(self.by_site.get(site, ()))
+
+    def raw_rows(self):
+        """Copies of the /dvmdb rows, in device order."""
+        return [dict(self.raw[name]) for name in self.rows if name in self.raw]
+
+
+class DeviceInventoryStore:
+    """
+    Keeps one FortiManager ADOM's device inventory current.
+    """
+
+    def __init__(self, connect, adom=None, name='default', refresh_interval=REFRESH_INTERVAL,
+                 full_refresh_interval=FULL_REFRESH_INTERVAL):
+        """
+        Initialize an empty store.
+
+        Args:
+            connect (callable): Returns a context manager yielding a logged-in
+                fortimanager_api.FortiManagerAPI, or None on failed login
+            adom (str, optional): ADOM to read (default: all devices)
+            name (str): Label for logs
+            refresh_interval (float): Seconds between incremental refreshes
+            full_refresh_interval (float): Seconds between full refreshes
+        """
+        self.connect = connect
+        self.adom = adom
+        self.name = name
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self.last_error = None
+        self.rejected = False
+        self._snapshot = None
+        self._interfaces = {}  # device name -> (CHANGE_FIELDS values, interface entries)
+        self._interfaces_lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def snapshot(self):
+        """
+        Current snapshot, refreshed synchronously only on first use.
+
+        Returns:
+            InventorySnapshot or None: None when the first refresh failed
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh(missing_only=True)
+        if time.time() - snapshot.refreshed_at > self.refresh_interval:
+            self.refresh_async()
+        return snapshot
+
+    def status(self):
+        """
+        Freshness of the inventory for API responses.
+
+        Returns:
+            dict: refreshed_at (ISO), age_seconds, stale, mode, devices, error
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {'refreshed_at': None, 'age_seconds': None, 'stale': True, 'mode': None,
+                    'devices': 0, 'error': self.last_error}
+        age = time.time() - snapshot.refreshed_at
+        return {
+            'refreshed_at': datetime.fromtimestamp(snapshot.refreshed_at).isoformat(),
+            'age_seconds': round(age, 1),
+            'stale': age > self.refresh_interval,
+            'mode': snapshot.mode,
+            'devices': len(snapshot.devices),
+            'error': self.last_error
+        }
+
+    def interfaces(self, names, snapshot=None):
+        """
+        Interface tables of devices; only devices whose row changed since their
+        table was cached are read from FortiManager (in batched calls).
+
+        Args:
+            names (list): Device names
+            snapshot (InventorySnapshot, optional): Snapshot the names come from
+
+        Returns:
+            dict: {device name: raw interface entries}; [] where the read failed
+        """
+        snapshot = snapshot or self._snapshot
+        versions = snapshot.versions if snapshot is not None else {}
+        with self._interfaces_lock:
+            stale = [name for name in names
+                     if name in versions and self._interfaces.get(name, (None,))[0] != versions[name]]
+        if stale:
+            urls = {name: interface_url(name) for name in stale}
+            with self.connect() as fm:
+                results = collect_batched(fm._post_read, fm.session_id, list(urls.values())) if fm is not None else {}
+            with self._interfaces_lock:
+                for name, url in urls.items():
+                    if results.get(url) is not None:
+                        self._interfaces[name] = (versions[name], results[url])
+                for name in self._interfaces.keys() - versions.keys():
+                    del self._interfaces[name]
+        with self._interfaces_lock:
+            return {name: list(self._interfaces.get(name, (None, []))[1]) for name in names}
+
+    def due(self, now=None):
+        # A rejected login is not retried on a timer (that could lock the account)
+        if self.rejected:
+            return False
+        snapshot = self._snapshot
+        return snapshot is None or (now or time.time()) - snapshot.refreshed_at >= self.refresh_interval
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running."""
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, name=f"fm-inventory-{self.name}", daemon=True).start()
+
+    def _refresh_worker(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"FortiManager inventory refresh failed for {self.name}: {str(e)}")
+        finally:
+            self._refreshing = False
+
+    def refresh(self, full=False, missing_only=False):
+        """
+        Bring the inventory up to date; a failed refresh keeps the previous snapshot.
+
+        Args:
+            full (bool): Re-read every row instead of only changed ones
+            missing_only (bool): Skip the refresh if another caller loaded the
+                inventory while this one waited
+
+        Returns:
+            InventorySnapshot or None: The current snapshot
+        """
+        with self._update_lock:
+            if missing_only and self._snapshot is not None:
+                return self._snapshot
+            return self._refresh(full)
+
+    def _refresh(self, full):
+        current = self._snapshot
+        now = time.time()
+        full = full or current is None or now - current.full_refreshed_at >= self.full_refresh_interval
+        with self.connect() as fm:
+            if fm is None:
+                self.rejected = True
+                self.last_error = 'FortiManager authentication failed'
+                logger.error(f"FortiManager inventory refresh for {self.name}: {self.last_error}")
+                return self._snapshot
+            snapshot = None if full else self._incremental(fm, current, now)
+            if snapshot is None:
+                snapshot = self._full(fm, now)
+        self.rejected = False
+        if snapshot is None:
+            self.last_error = 'Device list could not be read'
+            return self._snapshot
+        self.last_error = None
+        self._snapshot = snapshot
+        return snapshot
+
+    def _full(self, fm, now):
+        rows = fm.get_device_rows(self.adom)
+        if rows is None:
+            return None
+        raw = {row.get('name'): row for row in rows if row.get('name')}
+        devices = {name: fm.process_device(row) for name, row in raw.items()}
+        versions = {name: _version(row) for name, row in raw.items()}
+        logger.info(f"FortiManager inventory {self.name}: full refresh, {len(devices)} devices "
+                    f"in {time.time() - now:.2f}s")
+        return InventorySnapshot(devices, versions, now, now, FULL, changed=len(devices), raw=raw)
+
+    def _incremental(self, fm, current, now):
+        listing = fm.get_device_rows(self.adom, fields=('name',) + CHANGE_FIELDS)
+        if listing is None:
+            return None
+        versions = {row.get('name'): _version(row) for row in listing if row.get('name')}
+        changed = [name for name, version in versions.items() if current.versions.get(name) != version]
+        removed = current.versions.keys() - versions.keys()
+        if not changed and not removed:
+            return current.renewed(now)
+
+        rows = dict(current.rows)
+        raw = dict(current.raw)
+        for name in removed:
+            rows.pop(name, None)
+            raw.pop(name, None)
+        for batch in chunks(changed, BATCH_SIZE):
+            fetched = fm.get_device_rows(self.adom, filter=['name', 'in'] + batch)
+            if fetched is None:
+                logger.warning(f"FortiManager inventory {self.name}: changed rows unavailable, falling back to full refresh")
+                return None
+            for row in fetched:
+                if row.get('name') in versions:
+                    rows[row['name']] = fm.process_device(row)
+                    raw[row['name']] = row
+                    # Keep the fetched row's own change fields in case it moved on since the listing
+                    versions[row['name']] = _version(row)
+        logger.info(f"FortiManager inventory {self.name}: incremental refresh, {len(changed)} changed, "
+                    f"{len(removed)} removed in {time.time() - now:.2f}s")
+        return InventorySnapshot(rows, versions, now, current.full_refreshed_at, INCREMENTAL, changed=len(changed),
+                                 raw=raw)
+
+
+def _pool_connect(host, username, password, port, site):
+    from fortimanager_api import FortiManagerAPI
+    from fortimanager_pool import get_fortimanager_pool
+
+    def connect():
+        return get_fortimanager_pool().client(FortiManagerAPI, host, username, password, site=site, port=port)
+    return connect
+
+
+class FortiManagerInventory:
+    """
+    Registry of inventory stores with a refresh scheduler.
+    """
+
+    def __init__(self, tick=None, connect_factory=None):
+        """
+        Initialize an empty registry.
+
+        Args:
+            tick (float, optional): Seconds between scheduler checks
+            connect_factory (callable, optional): Called as (host, username, password,
+                port, site) and returns a store's connect callable (default: the session pool)
+        """
+        self.tick = tick or max(5.0, min(60.0, REFRESH_INTERVAL / 5))
+        self.connect_factory = connect_factory or _pool_connect
+        self._stores = {}
+        self._lock = threading.Lock()
+        self._scheduler = None
+
+    def store(self, host, username, password, port=443, adom=None, site=None):
+        """
+        Get (or register) the store for a FortiManager user and ADOM.
+
+        Args:
+            host (str): FortiManager host
+            username (str): FortiManager username
+            password (str): FortiManager password; stores are keyed by its hash
+            port (int): HTTPS port
+            adom (str, optional): ADOM to read
+            site (str, optional): Site the FortiManager belongs to
+
+        Returns:
+            DeviceInventoryStore: Store connecting through the session pool
+        """
+        connect = self.connect_factory(host, username, password, port, site)
+        # Callers with other credentials get their own store and must log in themselves
+        credential_hash = hashlib.sha256(str(password or '').encode()).hexdigest()[:16]
+        key = (host, port, username, credential_hash, adom)
+        with self._lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = self._stores[key] = DeviceInventoryStore(connect, adom=adom, name=f"{site or host}/{adom or 'all'}")
+            self._start_scheduler()
+        return store
+
+    def _start_scheduler(self):
+        if self._scheduler is None:
+            self._scheduler = threading.Thread(target=self._schedule, name='fm-inventory-scheduler', daemon=True)
+            self._scheduler.start()
+
+    def _schedule(self):
+        while True:
+            time.sleep(self.tick)
+            self.run_pending()
+
+    def run_pending(self, now=None):
+        """Start background refreshes of due stores; drop stores whose login never worked."""
+        with self._lock:
+            for key, store in list(self._stores.items()):
+                if store.rejected and store._snapshot is None:
+                    del self._stores[key]
+            stores = list(self._stores.values())
+        now = now or time.time()
+        for store in stores:
+            if store.due(now):
+                store.refresh_async()
+
+    def get_stats(self):
+        """Freshness of every registered store."""
+        with self._lock:
+            return {store.name: store.status() for store in self._stores.values()}
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_fortimanager_inventory():
+    """Get the process-wide FortiManager inventory registry (created on first use)"""
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                _inventory = FortiManagerInventory()
+    return _inventory
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+FortiManager Session Pool
+
+Routes used to build a FortiManagerAPI, log in, make one call and log out
+again, so every page load paid for a login (and a fresh TLS handshake) and
+left FortiManager to reap the admin session. The pool keeps authenticated
+clients warm per (client class, site, host, user) and hands them out with
+a context manager:
+
+    with get_fortimanager_pool().client(FortiManagerAPI, host, user, password, site=site) as fm:
+        if fm is None:
+            ...  # authentication failed
+        devices = fm.get_managed_devices()
+
+- Clients are not checked before use. A call whose every result entry comes
+  back with code -11 / "No permission" is treated as an expired session: the
+  client logs in again once and repeats the call (session_rejected()).
+- Pooled clients keep their requests.Session, so keep-alive connections to
+  FortiManager are reused across requests.
+- Live sessions per FortiManager host (idle and in use) are capped at
+  FORTIMANAGER_MAX_SESSIONS, below the appliance's admin-session limit.
+  Callers wait up to FORTIMANAGER_POOL_WAIT seconds for one; idle sessions of
+  other users/sites on the same host are logged out to make room.
+- Sessions idle for more than FORTIMANAGER_POOL_IDLE_TTL seconds are logged out.
+"""
+
+import os
+import time
+import atexit
+import inspect
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSIONS = int(os.getenv('FORTIMANAGER_MAX_SESSIONS', 8))
+POOL_WAIT = float(os.getenv('FORTIMANAGER_POOL_WAIT', 30))
+IDLE_TTL = float(os.getenv('FORTIMANAGER_POOL_IDLE_TTL', 300))
+
+# JSON-RPC status FortiManager answers with for an expired or unknown session
+NO_PERMISSION_CODE = -11
+
+
+class SessionPoolTimeout(Exception):
+    """Raised when no FortiManager session frees up within the pool wait"""
+
+
+def session_rejected(response):
+    """
+    Check whether FortiManager rejected the session of a JSON-RPC call.
+
+    Only a response whose every result entry is -11 / "No permission" counts;
+    a single unauthorized entry in a batch is a real permission error.
+
+    Args:
+        response (requests.Response): Response of a JSON-RPC call
+
+    Returns:
+        bool: True when the call should be repeated after logging in again
+    """
+    if response.status_code != 200:
+        return False
+    try:
+        entries = response.json().get('result') or []
+    except ValueError:
+        return False
+    if not entries:
+        return False
+    for entry in entries:
+        status = entry.get('status', {}) if isinstance(entry, dict) else {}
+        if status.get('code') != NO_PERMISSION_CODE and 'no permission' not in str(status.get('message', '')).lower():
+            return False
+    return True
+
+
+class FortiManagerSessionPool:
+    """
+    Keeps logged-in FortiManager clients for reuse across requests.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS, wait=POOL_WAIT, idle_ttl=IDLE_TTL):
+        """
+        Initialize an empty pool.
+
+        Args:
+            max_sessions (int): Live sessions allowed per FortiManager host
+            wait (float): Seconds to wait for a free session before giving up
+            idle_ttl (float): Seconds an unused session is kept
+        """
+        self.max_sessions = max(1, int(max_sessions))
+        self.wait = wait
+        self.idle_ttl = idle_ttl
+        self._cond = threading.Condition()
+        self._idle = {}   # key -> [(client, returned_at)], most recent last
+        self._live = {}   # host -> sessions logged in (idle + in use)
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0, 'login_failures': 0}
+
+    @staticmethod
+    def _key(client_class, site, host, username):
+        return (f"{client_class.__module__}.{client_class.__name__}", site or 'default', host, username)
+
+    def _take_idle(self, key, password, now, closing):
+        """Pop a reusable idle client for key; stale ones are moved to closing."""
+        idle = self._idle.get(key, [])
+        while idle:
+            client, returned_at = idle.pop()
+            if client.password == password and now - returned_at <= self.idle_ttl:
+                return client
+            closing.append((key[2], client))
+        return None
+
+    def _evict_idle(self, host, now, closing, expired_only=False):
+        """Move idle clients of host to closing: every expired one, or else the least recently used one."""
+        if expired_only:
+            for key, idle in self._idle.items():
+                if key[2] == host:
+                    closing.extend((host, client) for client, at in idle if now - at > self.idle_ttl)
+                    idle[:] = [(client, at) for client, at in idle if now - at <= self.idle_ttl]
+            return
+        candidates = [(idle[0][1], key) for key, idle in self._idle.items() if key[2] == host and idle]
+        if candidates:
+            _, key = min(candidates)
+            closing.append((host, self._idle[key].pop(0)[0]))
+
+    def _close(self, closing):
+        """Log out clients that left the pool and free their session slots."""
+        for host, client in closing:
+            try:
+                client.logout()
+            except Exception as e:
+                logger.warning(f"FortiManager pool logout failed for {host}: {str(e)}")
+        if closing:
+            with self._cond:
+                for host, _ in closing:
+                    self._live[host] = self._live.get(host, 1) - 1
+                    self.stats['evicted'] += 1
+                self._cond.notify_all()
+
+    def acquire(self, client_class, host, username, password, site=None, **kwargs):
+        """
+        Check out a logged-in client, creating and logging one in if needed.
+
+        Args:
+            client_class (type): FortiManagerAPI implementation to build
+            host (str): FortiManager host
+            username (str): FortiManager username
+            password (str): FortiManager password
+            site (str, optional): Site name the session belongs to
+            **kwargs: Extra constructor arguments (port, timeout, ...)
+
+        Returns:
+            object or None: Logged-in client, or None when login failed
+
+        Raises:
+            SessionPoolTimeout: When the host's session limit stays reached
+        """
+        key = self._key(client_class, site, host, username)
+        deadline = time.monotonic() + self.wait
+        closing = []
+        try:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    client = self._take_idle(key, password, now, closing)
+                    if client is not None:
+                        self.stats['reused'] += 1
+                        return client
+                    # Expired sessions of the host and stale clients of this key free slots first
+                    self._evict_idle(host, now, closing, expired_only=True)
+                    live = self._live.get(host, 0) - len(closing)
+                    if live < self.max_sessions:
+                        self._live[host] = self._live.get(host, 0) + 1
+                        break
+                    before = len(closing)
+                    self._evict_idle(host, now, closing)
+                    if len(closing) > before:
+                        continue
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise SessionPoolTimeout(
+                            f"All {self.max_sessions} FortiManager sessions for {host} are in use")
+                    self._cond.wait(remaining)
+        finally:
+            self._close(closing)
+
+        try:
+            # fortimanager_api.FortiManagerAPI keys its Redis token cache by site
+            if site is not None and 'site' in inspect.signature(client_class).parameters:
+                kwargs['site'] = site
+            client = client_class(host, username, password, **kwargs)
+            client._pool_key = key
+            if client.login():
+                self.stats['created'] += 1
+                logger.info(f"FortiManager pool opened a session for {username}@{host} ({site or 'default'})")
+                return client
+            self.stats['login_failures'] += 1
+        except Exception as e:
+            logger.error(f"FortiManager pool could not create a client for {host}: {str(e)}")
+            self._release_slot(host)
+            raise
+        self._release_slot(host)
+        return None
+
+    def _release_slot(self, host):
+        with self._cond:
+            self._live[host] = self._live.get(host, 1) - 1
+            self._cond.notify_all()
+
+    def release(self, client):
+        """
+        Return a client to the pool; clients that lost their session are dropped.
+
+        Args:
+            client: Client returned by acquire()
+        """
+        key = client._pool_key
+        if not client.session_id:
+            self._release_slot(key[2])
+            return
+        with self._cond:
+            self._idle.setdefault(key, []).append((client, time.monotonic()))
+            self._cond.notify_all()
+
+    @contextmanager
+    def client(self, client_class, host, username, password, site=None, **kwargs):
+        """
+        Context manager around acquire()/release().
+
+        Yields:
+            object or None: Logged-in client, or None when login failed
+        """
+        client = self.acquire(client_class, host, username, password, site=site, **kwargs)
+        try:
+            yield client
+        finally:
+            if client is not None:
+                self.release(client)
+
+    def close(self):
+        """Log out every idle session (in-use clients are logged out when returned)."""
+        with self._cond:
+            closing = [(key[2], client) for key, idle in self._idle.items() for client, _ in idle]
+            self._idle.clear()
+        self._close(closing)
+
+    def get_stats(self):
+        """Pool statistics for monitoring."""
+        with self._cond:
+            return dict(self.stats, live=dict(self._live),
+                        idle=sum(len(idle) for idle in self._idle.values()))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_fortimanager_pool():
+    """Get the process-wide FortiManager session pool (created on first use)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FortiManagerSessionPool()
+                atexit.register(_pool.close)
+    return _pool
@@ -12,6 +12,8 @@ from typing import Dict, List, Optional, Any
 import urllib3
 from urllib.parse import urljoin
 
+from fortigate_poller import AP_STATUS, MANAGED_APS, MONITOR_INTERFACES, STATUS, WIFI_CLIENTS, get_fortigate_poller
+
 # Disable SSL warnings for corporate environments
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -111,113 +113,120 @@ class FortinetAPIManager:
             'connections': []
         }
         
-        for fortigate_config in self.fortigate_hosts:
+        # Devices are polled concurrently and added as each one completes
+        endpoints = [STATUS, MONITOR_INTERFACES, MANAGED_APS, AP_STATUS, WIFI_CLIENTS]
+        for polled in get_fortigate_poller().poll(self.fortigate_hosts, endpoints):
             try:
-                # Get Fortigate system info
-                system_status = self.get_fortigate_system_status(fortigate_config)
-                if system_status:
-                    fortigate_info = {
-                        'id': fortigate_config['host'],
-                        'name': fortigate_config['name'],
-                        'host': fortigate_config['host'],
-                        'type': 'fortigate',
-                        'vendor': 'fortinet',
-                        'model': system_status.get('model', 'Unknown'),
-                        'version': system_status.get('version', 'Unknown'),
-                        'serial': system_status.get('serial', 'Unknown'),
-                        'hostname': system_status.get('hostname', fortigate_config['name']),
-                        'status': 'online' if system_status else 'offline',
-                        'uptime': system_status.get('uptime', 0),
-                        'cpu_usage': system_status.get('cpu', 0),
-                        'memory_usage': system_status.get('mem', 0)
-                    }
-                    topology_data['fortigates'].append(fortigate_info)
-                
-                # Get interfaces
-                interfaces = self.get_fortigate_interfaces(fortigate_config)
-                for interface in interfaces:
-                    interface_info = {
-                        'fortigate_id': fortigate_config['host'],
-                        'name': interface.get('name'),
-                        'ip': interface.get('ip'),
-                        'status': interface.get('status'),
-                        'type': interface.get('type'),
-                        'speed': interface.get('speed'),
-                        'duplex': interface.get('duplex')
-                    }
-                    topology_data['interfaces'].append(interface_info)
-                
-                # Get FortiAPs
-                fortiaps = self.get_fortiaps(fortigate_config)
-                ap_status = self.get_fortiap_status(fortigate_config)
-                
-                # Create status lookup for APs
-                ap_status_map = {ap.get('name', ap.get('serial', '')): ap for ap in ap_status}
-                
-                for ap in fortiaps:
-                    ap_name = ap.get('name', ap.get('serial', ''))
-                    status_info = ap_status_map.get(ap_name, {})
-                    
-                    fortiap_info = {
-                        'id': ap.get('serial', ap_name),
-                        'name': ap_name,
-                        'serial': ap.get('serial'),
-                        'type': 'fortiap',
-                        'vendor': 'fortinet',
-                        'model': ap.get('model', 'FortiAP'),
-                        'ip': ap.get('ip', status_info.get('ip')),
-                        'mac': ap.get('mac'),
-                        'status': status_info.get('status', 'unknown'),
-                        'fortigate_id': fortigate_config['host'],
-                        'location': ap.get('location'),
-                        'clients': status_info.get('client_count', 0),
-                        'uptime': status_info.get('uptime', 0),
-                        'channel_2g': status_info.get('radio_2g', {}).get('channel'),
-                        'channel_5g': status_info.get('radio_5g', {}).get('channel')
-                    }
-                    topology_data['fortiaps'].append(fortiap_info)
-                    
-                    # Create connection between Fortigate and FortiAP
-                    connection = {
-                        'source': fortigate_config['host'],
-                        'target': fortiap_info['id'],
-                        'type': 'management',
-                        'vendor': 'fortinet'
-                    }
-                    topology_data['connections'].append(connection)
-                
-                # Get WiFi clients
-                wifi_clients = self.get_wifi_clients(fortigate_config)
-                for client in wifi_clients:
-                    client_info = {
-                        'id': client.get('mac'),
-                        'mac': client.get('mac'),
-                        'ip': client.get('ip'),
-                        'hostname': client.get('hostname'),
-                        'ap_serial': client.get('ap'),
-                        'ssid': client.get('ssid'),
-                        'signal': client.get('signal'),
-                        'type': 'wifi_client',
-                        'vendor': 'fortinet_managed'
-                    }
-                    topology_data['wifi_clients'].append(client_info)
-                    
-                    # Create connection between client and FortiAP
-                    if client.get('ap'):
-                        connection = {
-                            'source': client.get('mac'),
-                            'target': client.get('ap'),
-                            'type': 'wifi',
-                            'vendor': 'fortinet'
-                        }
-                        topology_data['connections'].append(connection)
-                        
+                self._add_device_topology(polled['config'], polled['results'], topology_data)
             except Exception as e:
-                logger.error(f"Error getting topology data from {fortigate_config['name']}: {e}")
-                continue
+                logger.error(f"Error getting topology data from {polled['name']}: {e}")
         
         return topology_data
     
+    def _add_device_topology(self, fortigate_config: Dict, results: Dict, topology_data: Dict):
+        """Add one polled Fortigate, its interfaces, FortiAPs and WiFi clients to topology_data"""
+        # Get Fortigate system info
+        system_status = (results[STATUS] or {}).get('results')
+        if system_status:
+            fortigate_info = {
+                'id': fortigate_config['host'],
+                'name': fortigate_config['name'],
+                'host': fortigate_config['host'],
+                'type': 'fortigate',
+                'vendor': 'fortinet',
+                'model': system_status.get('model', 'Unknown'),
+                'version': system_status.get('version', 'Unknown'),
+                'serial': system_status.get('serial', 'Unknown'),
+                'hostname': system_status.get('hostname', fortigate_config['name']),
+                'status': 'online' if system_status else 'offline',
+                'uptime': system_status.get('uptime', 0),
+                'cpu_usage': system_status.get('cpu', 0),
+                'memory_usage': system_status.get('mem', 0)
+            }
+            topology_data['fortigates'].append(fortigate_info)
+        
+        # Get interfaces (monitor/system/interface keys them by name and reports ip and mask separately)
+        interfaces = (results[MONITOR_INTERFACES] or {}).get('results', [])
+        if isinstance(interfaces, dict):
+            interfaces = list(interfaces.values())
+        for interface in interfaces:
+            interface_info = {
+                'fortigate_id': fortigate_config['host'],
+                'name': interface.get('name'),
+                'ip': interface.get('ip'),
+                'mask': interface.get('mask'),
+                'status': interface.get('status'),
+                'type': interface.get('type'),
+                'speed': interface.get('speed'),
+                'duplex': interface.get('duplex')
+            }
+            topology_data['interfaces'].append(interface_info)
+        
+        # Get FortiAPs
+        fortiaps = (results[MANAGED_APS] or {}).get('results', [])
+        ap_status = (results[AP_STATUS] or {}).get('results', [])
+        
+        # Create status lookup for APs
+        ap_status_map = {ap.get('name', ap.get('serial', '')): ap for ap in ap_status}
+        
+        for ap in fortiaps:
+            ap_name = ap.get('name', ap.get('serial', ''))
+            status_info = ap_status_map.get(ap_name, {})
+            
+            fortiap_info = {
+                'id': ap.get('serial', ap_name),
+                'name': ap_name,
+                'serial': ap.get('serial'),
+                'type': 'fortiap',
+                'vendor': 'fortinet',
+                'model': ap.get('model', 'FortiAP'),
+                'ip': ap.get('ip', status_info.get('ip')),
+                'mac': ap.get('mac'),
+                'status': status_info.get('status', 'unknown'),
+                'fortigate_id': fortigate_config['host'],
+                'location': ap.get('location'),
+                'clients': status_info.get('client_count', 0),
+                'uptime': status_info.get('uptime', 0),
+                'channel_2g': status_info.get('radio_2g', {}).get('channel'),
+                'channel_5g': status_info.get('radio_5g', {}).get('channel')
+            }
+            topology_data['fortiaps'].append(fortiap_info)
+            
+            # Create connection between Fortigate and FortiAP
+            connection = {
+                'source': fortigate_config['host'],
+                'target': fortiap_info['id'],
+                'type': 'management',
+                'vendor': 'fortinet'
+            }
+            topology_data['connections'].append(connection)
+        
+        # Get WiFi clients
+        wifi_clients = (results[WIFI_CLIENTS] or {}).get('results', [])
+        for client in wifi_clients:
+            client_info = {
+                'id': client.get('mac'),
+                'mac': client.get('mac'),
+                'ip': client.get('ip'),
+                'hostname': client.get('hostname'),
+                'ap_serial': client.get('ap'),
+                'ssid': client.get('ssid'),
+                'signal': client.get('signal'),
+                'type': 'wifi_client',
+                'vendor': 'fortinet_managed'
+            }
+            topology_data['wifi_clients'].append(client_info)
+            
+            # Create connection between client and FortiAP
+            if client.get('ap'):
+                connection = {
+                    'source': client.get('mac'),
+                    'target': client.get('ap'),
+                    'type': 'wifi',
+                    'vendor': 'fortinet'
+                }
+                topology_data['connections'].append(connection)
+    
     def test_connection(self, fortigate_config: Dict) -> bool:
         """Test connection to a Fortigate device"""
         try:
@@ -203,7 +203,8 @@ def create_enhanced_network_visualization(api_key, api_mode):
         # Get organizations and networks
         if api_mode == 'sdk':
             import meraki
-            dashboard = meraki.DashboardAPI(api_key, suppress_logging=True)
+            dashboard = meraki.DashboardAPI(api_key, suppress_logging=True,
+                                            base_url=os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1'))
         else:
             # Use custom API implementation
             dashboard = create_custom_dashboard_object(api_key)
@@ -488,9 +489,13 @@ def show_visualization_help():
 
 def create_custom_dashboard_object(api_key):
     """Create a CustomDashboard object for custom API mode, emulating the Meraki SDK interface"""
+    from modules.meraki.meraki_transport import get_transport
+
     class CustomDashboard:
         def __init__(self, api_key):
             self.api_key = api_key
+            # All calls go through meraki_api, which shares this pooled transport
+            self.transport = get_transport()
             self.organizations = self.Organizations(api_key)
             self.networks = self.Networks(api_key)
 
@@ -501,6 +506,14 @@ def create_custom_dashboard_object(api_key):
                 return meraki_api.get_organizations(self.api_key)
             def getOrganizationNetworks(self, org_id):
                 return meraki_api.get_organization_networks(self.api_key, org_id)
+            # Org-level bulk endpoints (all pages) - one call set per org
+            # instead of one getNetworkDevices call per network
+            def getOrganizationDevices(self, org_id):
+                return meraki_api.get_meraki_organization_devices(self.api_key, org_id)
+            def getOrganizationDevicesStatuses(self, org_id):
+                return meraki_api.get_organization_devices_statuses(self.api_key, org_id)
+            def getOrganizationInventoryDevices(self, org_id):
+                return meraki_api.get_organization_inventory(self.api_key, org_id)
 
         class Networks:
             def __init__(self, api_key):
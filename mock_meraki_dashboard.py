@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Mock Meraki Dashboard API Server
+
+Local stand-in for api.meraki.com so the web app, CLI and benchmarks can be
+load-tested without a production org or its rate limits. Implements the
+endpoints this project calls - organizations, networks, devices, clients,
+topology links, device statuses, inventory, switch ports and live tools -
+on top of modules.meraki.synthetic_data, with:
+
+- Link header pagination (perPage / startingAfter, rel=first/next/last)
+- Per-organization 429s with Retry-After, plus optional random 429s
+- Latency injection (fixed + jitter)
+- Record / replay of JSON fixtures: --record proxies to the real API and
+  saves every response, --fixtures serves saved responses before synthetic data
+
+Point any client at it with MERAKI_BASE_URL, which make_meraki_request,
+MerakiClient, the async client and the SDK wrapper all honour:
+
+    python mock_meraki_dashboard.py --networks 1500 --clients 100000
+    MERAKI_BASE_URL=http://127.0.0.1:8765/api/v1 python comprehensive_web_app.py
+
+Only the standard library is needed, so the server also runs inside tests
+and benchmarks via start_mock_server().
+"""
+
+import os
+import re
+import ssl
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.synthetic_data import SyntheticMerakiData
+from modules.meraki.rate_limiter import TokenBucket
+
+API_PREFIX = '/api/v1'
+DEFAULT_PORT = 8765
+
+# (default perPage, maximum perPage) per paginated collection, as documented by Meraki
+PAGE_LIMITS = {
+    'organizations': (9000, 9000),
+    'networks': (1000, 100000),
+    'devices': (1000, 1000),
+    'statuses': (1000, 1000),
+    'inventory': (1000, 1000),
+    'clients': (10, 5000),
+}
+
+_SCOPE_RE = re.compile(r'^/(organizations|networks|devices)/([^/]+)')
+
+logger = logging.getLogger(__name__)
+
+
+class Paginated:
+    """A collection the server slices into Link-paginated pages."""
+
+    def __init__(self, kind, total, fetch):
+        self.kind = kind
+        self.total = total
+        self.fetch = fetch
+
+
+class FixtureStore:
+    """
+    JSON fixtures keyed by method, path and query string.
+
+    Each file holds ``{"status", "headers", "body"}``. Link headers are stored
+    with a ``{base_url}`` placeholder so fixtures replay on any host/port.
+    """
+
+    PLACEHOLDER = '{base_url}'
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _filename(self, method, path, query):
+        name = f"{method.lower()}__{path.strip('/').replace('/', '__') or 'root'}"
+        if query:
+            digest = hashlib.sha1(urlencode(sorted(query.items())).encode()).hexdigest()[:10]
+            name = f"{name}__{digest}"
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, method, path, query, base_url):
+        """Return (status, headers, body) for a recorded request, or None."""
+        filename = self._filename(method, path, query)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        headers = {k: v.replace(self.PLACEHOLDER, base_url) for k, v in fixture.get('headers', {}).items()}
+        return fixture.get('status', 200), headers, fixture.get('body')
+
+    def save(self, method, path, query, status, headers, body, base_url):
+        """Record one response."""
+        stored_headers = {k: v.replace(base_url, self.PLACEHOLDER) for k, v in headers.items()}
+        with open(self._filename(method, path, query), 'w', encoding='utf-8') as f:
+            json.dump({'status': status, 'headers': stored_headers, 'body': body}, f, indent=2)
+
+
+class MockMerakiDashboard:
+    """
+    Request handling for the mock server, independent of the HTTP layer.
+
+    ``handle`` takes a request and returns (status, headers, JSON body), so
+    tests can drive it directly without sockets.
+    """
+
+    def __init__(self, data=None, rate_limit=10, burst=10, error_rate=0.0, latency_ms=0, jitter_ms=0,
+                 fixtures_dir=None, record_dir=None, upstream=None, live_tools_delay=2.0, seed=0):
+        """
+        Initialize the mock dashboard.
+
+        Args:
+            data (SyntheticMerakiData, optional): Synthetic dataset (default: 1 org, 10 networks)
+            rate_limit (float): Requests per second per organization before 429s (0 = unlimited)
+            burst (int): Requests per organization allowed back to back
+            error_rate (float): Probability of a random 429 on any request
+            latency_ms (float): Added latency per request
+            jitter_ms (float): Random extra latency, uniform in [0, jitter_ms]
+            fixtures_dir (str, optional): Replay recorded fixtures from this directory first
+            record_dir (str, optional): Save upstream responses here (requires upstream)
+            upstream (str, optional): Real API base URL to proxy to while recording
+            live_tools_delay (float): Seconds until a live tools job reports complete
+            seed (int): Seed for latency jitter and random 429s
+        """
+        self.data = data or SyntheticMerakiData()
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.error_rate = error_rate
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fixtures = FixtureStore(fixtures_dir) if fixtures_dir else None
+        self.recorder = FixtureStore(record_dir) if record_dir else None
+        self.upstream = upstream.rstrip('/') if upstream else None
+        self.live_tools_delay = live_tools_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._jobs = {}
+        self._job_counter = 0
+        self._stats = {'requests': 0, 'by_status': {}, 'by_source': {}}
+        self._routes = [
+            ('GET', re.compile(r'^/organizations$'), self._organizations),
+            ('GET', re.compile(r'^/organizations/([^/]+)$'), self._organization),
+            ('GET', re.compile(r'^/organizations/([^/]+)/networks$'), self._org_networks),
+            ('GET', re.compile(r'^/organizations/([^/]+)/devices$'), self._org_devices),
+            ('GET', re.compile(r'^/organizations/([^/]+)/devices/statuses$'), self._org_device_statuses),
+            ('GET', re.compile(r'^/organizations/([^/]+)/inventory/devices$'), self._org_inventory),
+            ('GET', re.compile(r'^/networks/([^/]+)$'), self._network),
+            ('GET', re.compile(r'^/networks/([^/]+)/devices$'), self._network_devices),
+            ('GET', re.compile(r'^/networks/([^/]+)/clients$'), self._network_clients),
+            ('GET', re.compile(r'^/networks/([^/]+)/topology/links$'), self._topology_links),
+            ('GET', re.compile(r'^/networks/([^/]+)/topology/linkLayer$'), self._link_layer),
+            ('GET', re.compile(r'^/devices/([^/]+)$'), self._device),
+            ('GET', re.compile(r'^/devices/([^/]+)/switch/ports$'), self._switch_ports),
+            ('GET', re.compile(r'^/devices/([^/]+)/switch/ports/statuses$'), self._switch_port_statuses),
+            ('POST', re.compile(r'^/devices/([^/]+)/liveTools/([^/]+)$'), self._create_live_tool),
+            ('GET', re.compile(r'^/devices/([^/]+)/liveTools/([^/]+)/([^/]+)$'), self._get_live_tool),
+        ]
+
+    # --- Request pipeline ---
+
+    def handle(self, method, path, query=None, headers=None, body=None, base_url=None):
+        """
+        Handle one API request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path, with or without the /api/v1 prefix
+            query (dict, optional): Query parameters
+            headers (dict, optional): Request headers
+            body (dict, optional): Parsed JSON body
+            base_url (str, optional): Public base URL of this server (for Link headers)
+
+        Returns:
+            tuple: (status, headers, body)
+        """
+        query = dict(query or {})
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        base_url = base_url or f"http://127.0.0.1:{DEFAULT_PORT}{API_PREFIX}"
+        if path.startswith(API_PREFIX):
+            path = path[len(API_PREFIX):] or '/'
+
+        self._inject_latency()
+        if not headers.get('x-cisco-meraki-api-key') and not headers.get('authorization'):
+            return self._respond(401, {}, {'errors': ['Invalid API key']}, 'auth')
+
+        retry_after = self._check_rate_limit(path)
+        if retry_after is not None:
+            return self._respond(429, {'Retry-After': str(retry_after)},
+                                 {'errors': ['API rate limit exceeded for organization']}, 'rate_limit')
+
+        if self.fixtures:
+            recorded = self.fixtures.load(method, path, query, base_url)
+            if recorded:
+                return self._respond(*recorded, 'fixture')
+
+        if self.recorder and self.upstream:
+            return self._respond(*self._record(method, path, query, headers, body, base_url), 'upstream')
+
+        return self._respond(*self._synthetic(method, path, query, body, base_url), 'synthetic')
+
+    def _respond(self, status, headers, body, source):
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['by_status'][status] = self._stats['by_status'].get(status, 0) + 1
+            self._stats['by_source'][source] = self._stats['by_source'].get(source, 0) + 1
+        return status, headers, body
+
+    def _inject_latency(self):
+        if self.latency_ms or self.jitter_ms:
+            with self._lock:
+                jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+            time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def _check_rate_limit(self, path):
+        """Return Retry-After seconds if the request is throttled, else None."""
+        with self._lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 1
+            if not self.rate_limit:
+                return None
+            match = _SCOPE_RE.match(path)
+            org = self.data.org_for_scope(*match.groups()) if match else None
+            bucket = self._buckets.get(org)
+            if bucket is None:
+                bucket = self._buckets[org] = TokenBucket(self.rate_limit, self.burst)
+            now = time.monotonic()
+            wait = bucket.time_until_token(now)
+            if wait > 0:
+                return max(1, math.ceil(wait))
+            bucket.take(now)
+            return None
+
+    def _synthetic(self, method, path, query, body, base_url):
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                result = handler(*match.groups(), query=query, body=body)
+                if result is None:
+                    return 404, {}, {'errors': ['Not found']}
+                if isinstance(result, Paginated):
+                    return self._paginate(result, path, query, base_url)
+                if isinstance(result, tuple):
+                    return result[0], {}, result[1]
+                return 200, {}, result
+        return 404, {}, {'errors': [f"No mock for {method} {path}"]}
+
+    def _paginate(self, collection, path, query, base_url):
+        default, maximum = PAGE_LIMITS[collection.kind]
+        try:
+            per_page = min(max(int(query.get('perPage', default)), 3), maximum)
+            start = int(query['startingAfter']) + 1 if 'startingAfter' in query else 0
+        except ValueError:
+            return 400, {}, {'errors': ['Invalid perPage or startingAfter']}
+        stop = min(start + per_page, collection.total)
+        items = collection.fetch(start, stop) if start < collection.total else []
+
+        params = {k: v for k, v in query.items() if k not in ('startingAfter', 'endingBefore')}
+        params['perPage'] = per_page
+
+        def link(rel, starting_after=None):
+            page_params = dict(params)
+            if starting_after is not None:
+                page_params['startingAfter'] = starting_after
+            return f"<{base_url}{path}?{urlencode(page_params)}>; rel={rel}"
+
+        links = [link('first')]
+        if stop < collection.total:
+            links.append(link('next', stop - 1))
+        if collection.total > per_page:
+            links.append(link('last', collection.total - per_page - 1))
+        return 200, {'Link': ', '.join(links)}, items
+
+    def _record(self, method, path, query, headers, body, base_url):
+        """Proxy one request to the real API and save the response as a fixture."""
+        url = f"{self.upstream}{path}"
+        if query:
+            url = f"{url}?{urlencode(query)}"
+        upstream_headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        for name in ('x-cisco-meraki-api-key', 'authorization', 'user-agent'):
+            if headers.get(name):
+                upstream_headers[name] = headers[name]
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(url, data=data, headers=upstream_headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=60, context=_upstream_ssl_context()) as response:
+                status, raw, link = response.status, response.read(), response.headers.get('Link')
+        except urllib.error.HTTPError as e:
+            status, raw, link = e.code, e.read(), e.headers.get('Link')
+
+        payload = json.loads(raw) if raw else None
+        response_headers = {}
+        if link:
+            # Follow-up pages must come back through the recorder
+            response_headers['Link'] = link.replace(self.upstream, base_url)
+        if status == 200:
+            self.recorder.save(method, path, query, status, response_headers, payload, base_url)
+        return status, response_headers, payload
+
+    def get_stats(self):
+        """
+        Get request counters.
+
+        Returns:
+            dict: Totals by status code and by source (synthetic, fixture, upstream, ...)
+        """
+        with self._lock:
+            return json.loads(json.dumps(self._stats))
+
+    # --- Synthetic endpoints ---
+
+    def _organizations(self, query, body):
+        orgs = self.data.organizations()
+        return Paginated('organizations', len(orgs), lambda start, stop: orgs[start:stop])
+
+    def _organization(self, org_id, query, body):
+        return self.data.organization(org_id)
+
+    def _org_collection(self, kind, items):
+        if items is None:
+            return None
+        return Paginated(kind, len(items), lambda start, stop: items[start:stop])
+
+    def _org_networks(self, org_id, query, body):
+        return self._org_collection('networks', self.data.networks(org_id))
+
+    def _org_devices(self, org_id, query, body):
+        return self._org_collection('devices', self.data.org_devices(org_id))
+
+    def _org_device_statuses(self, org_id, query, body):
+        return self._org_collection('statuses', self.data.device_statuses(org_id))
+
+    def _org_inventory(self, org_id, query, body):
+        return self._org_collection('inventory', self.data.inventory(org_id))
+
+    def _network(self, network_id, query, body):
+        return self.data.network(network_id)
+
+    def _network_devices(self, network_id, query, body):
+        return self.data.network_devices(network_id)
+
+    def _network_clients(self, network_id, query, body):
+        total = self.data.client_count(network_id)
+        if total is None:
+            return None
+        return Paginated('clients', total, lambda start, stop: self.data.clients(network_id, start, stop))
+
+    def _topology_links(self, network_id, query, body):
+        return self.data.topology_links(network_id)
+
+    def _link_layer(self, network_id, query, body):
+        return self.data.link_layer(network_id)
+
+    def _device(self, serial, query, body):
+        return self.data.device(serial)
+
+    def _switch_ports(self, serial, query, body):
+        return self.data.switch_ports(serial)
+
+    def _switch_port_statuses(self, serial, query, body):
+        return self.data.switch_port_statuses(serial)
+
+    def _create_live_tool(self, serial, tool, query, body):
+        if self.data.device(serial) is None:
+            return None
+        with self._lock:
+            self._job_counter += 1
+            job_id = str(self._job_counter)
+            self._jobs[(serial, tool, job_id)] = {'created': time.monotonic(), 'request': body or {}}
+        return 201, {
+            f"{tool}Id": job_id,
+            'url': f"/devices/{serial}/liveTools/{tool}/{job_id}",
+            'request': dict(body or {}, serial=serial),
+            'status': 'new'
+        }
+
+    def _get_live_tool(self, serial, tool, job_id, query, body):
+        with self._lock:
+            job = self._jobs.get((serial, tool, job_id))
+        if job is None:
+            return None
+        complete = time.monotonic() - job['created'] >= self.live_tools_delay
+        result = {
+            f"{tool}Id": job_id,
+            'url': f"/devices/{serial}/liveTools/{tool}/{job_id}",
+            'request': dict(job['request'], serial=serial),
+            'status': 'complete' if complete else 'running',
+        }
+        if complete:
+            result['results'] = self.data.live_tool_result(serial, tool)
+        return result
+
+
+def _upstream_ssl_context():
+    """SSL context for recording, using certifi's CA bundle when available."""
+    try:
+        import certifi
+        return ssl.create_default_context(cafile=certifi.where())
+    except ImportError:
+        return ssl.create_default_context()
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    """Adapts http.server requests to MockMerakiDashboard.handle."""
+
+    # Keep-alive, so pooled clients reuse connections like against the real API
+    protocol_version = 'HTTP/1.1'
+
+    def _dispatch(self):
+        parts = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = None
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+            except ValueError:
+                body = None
+        host = self.headers.get('Host') or f"{self.server.server_address[0]}:{self.server.server_address[1]}"
+        base_url = f"http://{host}{API_PREFIX}"
+
+        if parts.path == '/_mock/stats':
+            status, headers, payload = 200, {}, self.server.dashboard.get_stats()
+        else:
+            status, headers, payload = self.server.dashboard.handle(
+                self.command, parts.path, dict(parse_qsl(parts.query)), dict(self.headers), body, base_url
+            )
+
+        raw = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def start_mock_server(dashboard=None, host='127.0.0.1', port=0):
+    """
+    Start the mock server on a background thread.
+
+    Args:
+        dashboard (MockMerakiDashboard, optional): Request handler (default settings if omitted)
+        host (str): Interface to bind
+        port (int): Port to bind (0 picks a free port)
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _MockRequestHandler)
+    server.daemon_threads = True
+    server.dashboard = dashboard or MockMerakiDashboard()
+    threading.Thread(target=server.serve_forever, name="mock-meraki", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}{API_PREFIX}"
+    logger.info(f"Mock Meraki Dashboard listening on {base_url}")
+    return server, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Meraki Dashboard API server for load testing')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--organizations', type=int, default=1, help='Synthetic organizations (1-10)')
+    parser.add_argument('--networks', type=int, default=10, help='Networks per organization (10-10000)')
+    parser.add_argument('--clients', type=int, default=1000, help='Clients per organization (up to 100000)')
+    parser.add_argument('--devices-per-network', type=int, default=5, help='MX + switches + APs per network')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for synthetic data, jitter and random 429s')
+    parser.add_argument('--rate-limit', type=float, default=10, help='Requests/second per organization (0 = unlimited)')
+    parser.add_argument('--burst', type=int, default=10, help='Back-to-back requests per organization')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Probability of a random 429')
+    parser.add_argument('--latency-ms', type=float, default=0, help='Added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='Random extra latency per request')
+    parser.add_argument('--live-tools-delay', type=float, default=2.0, help='Seconds until live tools jobs complete')
+    parser.add_argument('--fixtures', help='Replay recorded JSON fixtures from this directory')
+    parser.add_argument('--record', help='Record upstream responses into this directory')
+    parser.add_argument('--upstream', default='https://api.meraki.com/api/v1', help='Upstream API for --record')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    data = SyntheticMerakiData(organizations=args.organizations, networks=args.networks, clients=args.clients,
+                               devices_per_network=args.devices_per_network, seed=args.seed)
+    dashboard = MockMerakiDashboard(
+        data, rate_limit=args.rate_limit, burst=args.burst, error_rate=args.error_rate,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fixtures_dir=args.fixtures,
+        record_dir=args.record, upstream=args.upstream if args.record else None,
+        live_tools_delay=args.live_tools_delay, seed=args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _MockRequestHandler)
+    server.daemon_threads = True
+    server.dashboard = dashboard
+
+    base_url = f"http://{args.host}:{args.port}{API_PREFIX}"
+    print(f"Mock Meraki Dashboard: {base_url}")
+    print(f"  {args.organizations} org(s) x {args.networks} networks, {args.clients} clients per org")
+    print(f"  export MERAKI_BASE_URL={base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,11 @@ import logging
 from typing import Dict, List, Optional, Any
 import urllib3
 
+from single_flight import get_single_flight, flight_key
+from fortimanager_batch import collect_batched, interface_url
+from fortimanager_pool import session_rejected
+from fortigate_poller import ARP, INTERFACES, STATUS, get_fortigate_poller
+
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -24,6 +29,9 @@ class FortiManagerAPI:
         self.verify_ssl = verify_ssl
         self.session_id = None
         self.base_url = f"https://{self.host}/jsonrpc"
+        # Kept across calls so pooled clients reuse keep-alive connections
+        self.session = requests.Session()
+        self.session.verify = verify_ssl
         
     def login(self) -> bool:
         """Authenticate with FortiManager"""
@@ -40,10 +48,9 @@ class FortiManagerAPI:
                 }]
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.base_url,
                 json=payload,
-                verify=self.verify_ssl,
                 timeout=30
             )
             
@@ -76,10 +83,9 @@ class FortiManagerAPI:
                 "session": self.session_id
             }
             
-            requests.post(
+            self.session.post(
                 self.base_url,
                 json=payload,
-                verify=self.verify_ssl,
                 timeout=10
             )
             
@@ -89,6 +95,33 @@ class FortiManagerAPI:
         except Exception as e:
             logger.error(f"Error during FortiManager logout: {str(e)}")
     
+    def _post_read(self, payload: Dict) -> requests.Response:
+        """POST a read-only JSON-RPC call, sharing it with identical concurrent calls; re-login once if the session was rejected"""
+        key = flight_key(f"{self.host}/{self.username}", payload.get('method', 'get'),
+                         self.base_url, payload.get('params'))
+        
+        def post():
+            response = self.session.post(
+                self.base_url,
+                json=payload,
+                timeout=30
+            )
+            # Read the body once so every waiter can call .json() safely
+            response.content
+            return response
+        
+        def send():
+            response = post()
+            if session_rejected(response):
+                logger.info(f"FortiManager session was rejected, logging in again: {self.host}")
+                self.session_id = None
+                if self.login():
+                    payload['session'] = self.session_id
+                    response = post()
+            return response
+        
+        return get_single_flight('fortimanager').do(key, send)
+    
     def get_managed_devices(self) -> List[Dict]:
         """Get list of managed FortiGate devices"""
         if not self.session_id:
@@ -105,12 +138,7 @@ class FortiManagerAPI:
                 "session": self.session_id
             }
             
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                verify=self.verify_ssl,
-                timeout=30
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -137,17 +165,12 @@ class FortiManagerAPI:
                 "id": 1,
                 "method": "get",
                 "params": [{
-                    "url": f"/pm/config/device/{device_name}/global/system/interface"
+                    "url": interface_url(device_name)
                 }],
                 "session": self.session_id
             }
             
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                verify=self.verify_ssl,
-                timeout=30
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -163,6 +186,17 @@ class FortiManagerAPI:
             logger.error(f"Error getting interfaces for {device_name}: {str(e)}")
             return []
     
+    def get_devices_interfaces(self, device_names: List[str], batch_size: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Get interfaces for many FortiGate devices, batching device urls into shared JSON-RPC calls"""
+        names = [name for name in device_names if name]
+        if not self.session_id:
+            if not self.login():
+                return {name: [] for name in names}
+        
+        results = collect_batched(self._post_read, self.session_id,
+                                  [interface_url(name) for name in names], batch_size)
+        return {name: results.get(interface_url(name)) or [] for name in names}
+    
     def get_device_inventory(self) -> List[Dict]:
         """Get comprehensive device inventory from FortiManager including all managed devices"""
         if not self.session_id:
@@ -174,6 +208,7 @@ class FortiManagerAPI:
         try:
             # Get all managed devices first
             managed_devices = self.get_managed_devices()
+            device_interfaces = self.get_devices_interfaces([device.get('name') for device in managed_devices])
             
             for device in managed_devices:
                 device_name = device.get('name')
@@ -203,7 +238,7 @@ class FortiManagerAPI:
                     'group': 'fortigate',
                     'managed_by': 'FortiManager',
                     'last_seen': device_info.get('last_checkin', 'Unknown') if device_info else 'Unknown',
-                    'interfaces': self.get_device_interfaces(device_name),
+                    'interfaces': device_interfaces.get(device_name, []),
                     'vlans': self.get_device_vlans(device_name)
                 }
                 
@@ -241,12 +276,7 @@ class FortiManagerAPI:
                 "session": self.session_id
             }
             
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                verify=self.verify_ssl,
-                timeout=30
-            )
+            response = self._post_read(payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -276,12 +306,7 @@ class FortiManagerAPI:
                 "session": self.session_id
             }
             
-            response = requests.post(
-                self.base_url,
-                json=payload,
-                verify=self.verify_ssl,
-                timeout=30
-            )
+            response = self._post_read(payload)
             
             vlans = []
             if response.status_code == 200:
@@ -330,12 +355,7 @@ class FortiManagerAPI:
                 "session": self.session_id
             }
             
-            response = requests.post(
-                self.base_url,
-                json=arp_payload,
-                verify=self.verify_ssl,
-                timeout=30
-            )
+            response = self._post_read(arp_payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -392,27 +412,15 @@ class FortiGateDirectAPI:
         self.verify_ssl = verify_ssl
         self.base_url = f"https://{self.host}/api/v2"
         
+    def _get(self, endpoint: str) -> Dict:
+        """GET an endpoint over the host's pooled keep-alive session"""
+        config = {'host': self.host, 'api_key': self.api_key, 'verify_ssl': self.verify_ssl}
+        return get_fortigate_poller().get(config, endpoint)
+        
     def get_system_status(self) -> Dict:
         """Get FortiGate system status"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/monitor/system/status",
-                headers=headers,
-                verify=self.verify_ssl,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get FortiGate status: {response.status_code}")
-                return {}
-                
+            return self._get(STATUS)
         except Exception as e:
             logger.error(f"Error getting FortiGate status: {str(e)}")
             return {}
@@ -420,25 +428,7 @@ class FortiGateDirectAPI:
     def get_interfaces(self) -> List[Dict]:
         """Get FortiGate interfaces"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/cmdb/system/interface",
-                headers=headers,
-                verify=self.verify_ssl,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('results', [])
-            else:
-                logger.error(f"Failed to get FortiGate interfaces: {response.status_code}")
-                return []
-                
+            return self._get(INTERFACES).get('results', [])
         except Exception as e:
             logger.error(f"Error getting FortiGate interfaces: {str(e)}")
             return []
@@ -446,25 +436,7 @@ class FortiGateDirectAPI:
     def get_arp_table(self) -> List[Dict]:
         """Get FortiGate ARP table"""
         try:
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
-                f"{self.base_url}/monitor/system/arp",
-                headers=headers,
-                verify=self.verify_ssl,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('results', [])
-            else:
-                logger.error(f"Failed to get FortiGate ARP table: {response.status_code}")
-                return []
-                
+            return self._get(ARP).get('results', [])
         except Exception as e:
             logger.error(f"Error getting FortiGate ARP table: {str(e)}")
             return []
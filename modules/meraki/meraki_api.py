@@ -57,6 +57,7 @@ warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 import logging
 logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
 import csv
+import tempfile
 import os
 try:
     from tabulate import tabulate
@@ -83,6 +84,13 @@ import base64
 
 # Import our new device types module
 from modules.meraki.device_types import get_device_type, supports_uplink, get_device_type_from_serial
+from modules.meraki.meraki_transport import get_transport
+from modules.meraki.ssl_strategy import get_ssl_strategy_cache, host_for_url, verify_for_mode
+from modules.meraki.meraki_pagination import DEFAULT_MAX_PAGES, iter_pages
+from modules.meraki.rate_limiter import get_rate_scheduler
+from modules.meraki.response_cache import get_response_cache, make_cache_key, is_cacheable, estimate_size
+from single_flight import get_single_flight, flight_key
+from topology_engine import build_topology, to_indexed_dict
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -91,8 +99,8 @@ logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# Base URL for Meraki API
-BASE_URL = "https://api.meraki.com/api/v1"
+# Base URL for Meraki API - MERAKI_BASE_URL points it at a mock dashboard for load testing
+BASE_URL = os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1').rstrip('/')
 
 def get_organizations(api_key):
     """Get a list of organizations accessible by the user"""
@@ -103,13 +111,14 @@ def get_organizations(api_key):
     return make_meraki_request(api_key, "/organizations", headers)
 
 def get_organization_networks(api_key, org_id):
-    """Get list of networks for an organization"""
-    params = {"perPage": 5000}  # Get all networks in one request
-    headers = {
-        "X-Cisco-Meraki-API-Key": api_key,
-        "Content-Type": "application/json"
-    }
-    return make_meraki_request(api_key, f"/organizations/{org_id}/networks", headers, params)
+    """Get list of networks for an organization (all pages)"""
+    params = {"perPage": 5000}
+    return get_all_meraki_pages(api_key, f"/organizations/{org_id}/networks", params)
+
+def iter_organization_networks(api_key, org_id, per_page=5000, prefetch=0):
+    """Yield the networks of an organization one at a time, page by page"""
+    params = {"perPage": per_page}
+    return iter_meraki_items(api_key, f"/organizations/{org_id}/networks", params, prefetch=prefetch)
 
 def get_organization_summary(api_key, organization_id):
     """Get summary information about an organization"""
@@ -117,7 +126,12 @@ def get_organization_summary(api_key, organization_id):
 
 def get_organization_inventory(api_key, organization_id):
     """Get inventory information for an organization"""
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/inventory/devices")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/inventory/devices", {"perPage": 1000})
+
+def iter_organization_inventory(api_key, organization_id, per_page=1000, prefetch=0):
+    """Yield the inventory devices of an organization one at a time, page by page"""
+    params = {"perPage": per_page}
+    return iter_meraki_items(api_key, f"/organizations/{organization_id}/inventory/devices", params, prefetch=prefetch)
 
 def get_organization_licenses(api_key, organization_id):
     """Get license information for an organization"""
@@ -125,39 +139,70 @@ def get_organization_licenses(api_key, organization_id):
 
 def get_organization_devices_statuses(api_key, organization_id):
     """Get device status information for an organization"""
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/devices/statuses")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/devices/statuses", {"perPage": 1000})
 
 # ==================================================
 # EXPORT device list in a beautiful table format
 # ==================================================
 def export_devices_to_csv(devices, network_name, device_type, base_folder_path):
+    """
+    Export devices (or clients) to a CSV file
+    
+    ``devices`` may be a list or any iterable, e.g. iter_network_clients().
+    Iterables are consumed once and spooled to a temporary file while the
+    column set is collected, so the export never holds the whole collection.
+    
+    Args:
+        devices (list or iterable): Device dicts to export
+        network_name (str): Network name used in the file name
+        device_type (str): Device type used in the file name
+        base_folder_path (str): Folder to write the CSV to
+    """
     current_date = datetime.now().strftime("%Y-%m-%d")
     filename = f"{network_name}_{current_date}_{device_type}.csv"
     file_path = os.path.join(base_folder_path, filename)
 
-    if devices:
-        # Priority columns
-        priority_columns = ['name', 'mac', 'lanIp', 'serial', 'model', 'firwmare', 'tags']
+    # Priority columns
+    priority_columns = ['name', 'mac', 'lanIp', 'serial', 'model', 'firwmare', 'tags']
 
+    if isinstance(devices, (list, tuple)):
+        rows = devices
         # Gather all columns from the devices
         all_columns = set(key for device in devices for key in device.keys())
-        
-        # Reorder columns so that priority columns come first
-        ordered_columns = priority_columns + [col for col in all_columns if col not in priority_columns]
-
-        with open(file_path, 'w', newline='', encoding='utf-8') as file:
-            # Convert fieldnames to uppercase
-            fieldnames = [col.upper() for col in ordered_columns]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for device in devices:
-                # Convert keys to uppercase to match fieldnames
-                row = {col.upper(): device.get(col, '') for col in ordered_columns}
-                writer.writerow(row)
-            
-        print(f"Data exported to {file_path}")
+        spool = None
     else:
-        print("No data to export.")
+        # Streaming input - spool rows as JSON lines and collect columns as we go
+        all_columns = set()
+        spool = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+        count = 0
+        for device in devices:
+            all_columns.update(device.keys())
+            spool.write(json.dumps(device) + "\n")
+            count += 1
+        spool.seek(0)
+        rows = (json.loads(line) for line in spool) if count else []
+
+    try:
+        if rows:
+            # Reorder columns so that priority columns come first
+            ordered_columns = priority_columns + [col for col in all_columns if col not in priority_columns]
+
+            with open(file_path, 'w', newline='', encoding='utf-8') as file:
+                # Convert fieldnames to uppercase
+                fieldnames = [col.upper() for col in ordered_columns]
+                writer = csv.DictWriter(file, fieldnames=fieldnames)
+                writer.writeheader()
+                for device in rows:
+                    # Convert keys to uppercase to match fieldnames
+                    row = {col.upper(): device.get(col, '') for col in ordered_columns}
+                    writer.writerow(row)
+                
+            print(f"Data exported to {file_path}")
+        else:
+            print("No data to export.")
+    finally:
+        if spool is not None:
+            spool.close()
 
 # ==================================================
 # EXPORT firewall rules in a beautiful table format
@@ -223,8 +268,8 @@ def select_organization(api_key):
 # GET a list of Networks in an Organization
 # ==================================================
 def get_meraki_networks(api_key, organization_id, per_page=5000):
-    params = {"perPage": per_page}  # Get all networks in one request
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/networks", params=params)
+    params = {"perPage": per_page}  # Follows Link rel=next for orgs beyond one page
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/networks", params)
 
 # ==================================================
 # SELECT a Network in an Organization
@@ -435,7 +480,7 @@ def get_organization_policy_objects_groups(api_key, organization_id):
 # FETCH Organization Devices Statuses
 # ==============================================================
 def get_organization_devices_statuses(api_key, organization_id):
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/devices/statuses")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/devices/statuses", {"perPage": 1000})
 
 # ==================================================
 # GET Environmental Sensor Data
@@ -458,15 +503,15 @@ def get_meraki_organization_details(api_key, organization_id):
 
 def get_meraki_organization_inventory(api_key, organization_id):
     """Get inventory for a specific organization"""
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/inventory/devices")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/inventory/devices", {"perPage": 1000})
 
 def get_meraki_organization_devices(api_key, organization_id):
     """Get all devices in an organization"""
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/devices")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/devices", {"perPage": 1000})
 
 def get_meraki_organization_networks(api_key, organization_id):
     """Get all networks in an organization"""
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/networks")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/networks", {"perPage": 5000})
 
 def get_meraki_organization_admins(api_key, organization_id):
     """Get all admins in an organization"""
@@ -477,7 +522,7 @@ def get_meraki_organization_licenses(api_key, organization_id):
     return make_meraki_request(api_key, f"/organizations/{organization_id}/licenses")
 
 def get_organization_inventory(api_key, organization_id):
-    return make_meraki_request(api_key, f"/organizations/{organization_id}/inventory/devices")
+    return get_all_meraki_pages(api_key, f"/organizations/{organization_id}/inventory/devices", {"perPage": 1000})
 
 def get_organization_licenses(api_key, organization_id):
     return make_meraki_request(api_key, f"/organizations/{organization_id}/licenses")
@@ -501,10 +546,27 @@ def get_network_clients(api_key, network_id, timespan=3600):
         timespan (int): Timespan in seconds for which clients are fetched (default: 3600 = 1 hour)
         
     Returns:
-        list: List of client devices
+        list: List of client devices (all pages)
     """
     params = {"perPage": 1000, "timespan": timespan}
-    return make_meraki_request(api_key, f"/networks/{network_id}/clients", params=params)
+    return get_all_meraki_pages(api_key, f"/networks/{network_id}/clients", params)
+
+def iter_network_clients(api_key, network_id, timespan=3600, per_page=1000, prefetch=1):
+    """
+    Yield the clients of a network one at a time while later pages load
+    
+    Args:
+        api_key (str): Meraki API key
+        network_id (str): Network ID
+        timespan (int): Timespan in seconds for which clients are fetched
+        per_page (int): Clients per page (Meraki allows up to 5000)
+        prefetch (int): Pages fetched ahead in the background
+        
+    Returns:
+        generator: Yields one client (dict) at a time
+    """
+    params = {"perPage": per_page, "timespan": timespan}
+    return iter_meraki_items(api_key, f"/networks/{network_id}/clients", params, prefetch=prefetch)
 
 # ==================================================
 # GET Network Topology
@@ -560,157 +622,8 @@ def get_network_topology(api_key, network_id):
         logging.warning(f"Could not get topology links from API, building manually: {str(e)}")
         topology_links = []
     
-    # Initialize topology data
-    topology_data = {
-        'network_name': get_network_name(api_key, network_id),
-        'nodes': [],
-        'links': []
-    }
-    
-    # Add devices as nodes
-    device_map = {}  # Map serial numbers to node indices
-    for i, device in enumerate(devices):
-        device_type = 'unknown'
-        if 'model' in device and device['model'] is not None:
-            model = device['model'].lower()
-            if 'mx' in model:
-                device_type = 'security_appliance'
-            elif 'ms' in model:
-                device_type = 'switch'
-            elif 'mr' in model:
-                device_type = 'wireless'
-            elif 'mv' in model:
-                device_type = 'camera'
-        
-        node = {
-            'id': device.get('serial', f"device_{i}"),
-            'label': device.get('name', 'Unknown Device'),
-            'type': device_type,
-            'model': device.get('model', 'Unknown'),
-            'ip': device.get('lanIp', 'No IP'),
-            'mac': device.get('mac', 'No MAC'),
-            'serial': device.get('serial', 'No Serial'),
-            'firmware': device.get('firmware', 'Unknown'),
-            'status': device.get('status', 'unknown')
-        }
-        
-        topology_data['nodes'].append(node)
-        device_map[device.get('serial')] = len(topology_data['nodes']) - 1
-    
-    # Add clients as nodes
-    for i, node in enumerate(topology_data['nodes']):
-        if node['type'] == 'client':
-            # Determine client type based on available information
-            client_type = 'unknown'
-            if 'deviceTypePrediction' in node and node['deviceTypePrediction'] is not None:
-                client_type = node['deviceTypePrediction'].lower()
-            elif 'manufacturer' in node and node['manufacturer'] is not None:
-                manufacturer = node['manufacturer'].lower()
-                if any(mobile in manufacturer for mobile in ['apple', 'samsung', 'lg', 'motorola', 'xiaomi']):
-                    client_type = 'mobile'
-                elif any(pc in manufacturer for pc in ['dell', 'hp', 'lenovo', 'microsoft', 'asus']):
-                    client_type = 'desktop'
-        
-            # Get the connection details
-            connection_details = {
-                'type': node.get('recentDeviceConnection', 'Unknown'),
-                'vlan': node.get('vlan', 'Unknown'),
-                'port': node.get('switchport', 'Unknown'),
-                'last_seen': node.get('lastSeen', 'Unknown')
-            }
-        
-            node = {
-                'id': node.get('id', f"client_{i}"),
-                'label': node.get('description', node.get('mac', 'Unknown Client')),
-                'type': 'client',
-                'client_type': client_type,
-                'ip': node.get('ip', 'No IP'),
-                'mac': node.get('mac', 'No MAC'),
-                'vlan': node.get('vlan', 'Unknown'),
-                'connection': connection_details,
-                'usage': node.get('usage', {})
-            }
-        
-            topology_data['nodes'].append(node)
-    
-    # Add links from the topology endpoint if available
-    if topology_links:
-        for link in topology_links:
-            source_serial = link.get('source', {}).get('serial')
-            dest_serial = link.get('destination', {}).get('serial')
-            
-            if source_serial in device_map and dest_serial in device_map:
-                topology_data['links'].append({
-                    'source': device_map[source_serial],
-                    'target': device_map[dest_serial],
-                    'type': link.get('linkType', 'unknown'),
-                    'status': link.get('status', 'unknown')
-                })
-    else:
-        # Fallback: build links based on device relationships
-        # Connect switches to security appliances
-        security_appliances = [i for i, node in enumerate(topology_data['nodes']) 
-                            if node['type'] == 'security_appliance']
-        switches = [i for i, node in enumerate(topology_data['nodes']) 
-                    if node['type'] == 'switch']
-        
-        # Connect all switches to the first security appliance if available
-        if security_appliances and switches:
-            for switch in switches:
-                topology_data['links'].append({
-                    'source': security_appliances[0],
-                    'target': switch,
-                    'type': 'wired',
-                    'status': 'active'
-                })
-        
-        # Connect switches to each other in a chain
-        for i in range(len(switches) - 1):
-            topology_data['links'].append({
-                'source': switches[i],
-                'target': switches[i + 1],
-                'type': 'wired',
-                'status': 'active'
-            })
-    
-    # Connect clients to their parent devices
-    for i, node in enumerate(topology_data['nodes']):
-        if node['type'] == 'client':
-            # Find the device this client is connected to
-            connected_to = None
-            
-            # For wireless clients
-            if node.get('connection', {}).get('type') == 'wireless':
-                # Find wireless APs
-                wireless_aps = [j for j, d in enumerate(topology_data['nodes']) 
-                                if d['type'] == 'wireless']
-                if wireless_aps:
-                    # Connect to the first AP (could be improved with actual connection data)
-                    connected_to = wireless_aps[0]
-            
-            # For wired clients
-            elif node.get('connection', {}).get('type') == 'wired':
-                # Try to find the switch with matching port
-                client_port = node.get('connection', {}).get('port')
-                client_vlan = node.get('connection', {}).get('vlan')
-                
-                for j, device in enumerate(topology_data['nodes']):
-                    if device['type'] == 'switch':
-                        # In a real implementation, you would check if this switch has the port
-                        # the client is connected to. For now, connect to any switch.
-                        connected_to = j
-                        break
-            
-            # If we found a device to connect to
-            if connected_to is not None:
-                topology_data['links'].append({
-                    'source': connected_to,
-                    'target': i,
-                    'type': node.get('connection', {}).get('type', 'unknown'),
-                    'status': 'active'
-                })
-    
-    return topology_data
+    topology = build_topology(devices, clients, topology_links, get_network_name(api_key, network_id))
+    return to_indexed_dict(topology)
 
 def get_detailed_network_topology(api_key, network_id):
     """
@@ -785,21 +698,23 @@ def get_network_topology_links(api_key, network_id):
 # Helper function for making Meraki API requests
 # ==================================================
 
-def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retries=3, retry_delay=1, timeout=30):
+def send_meraki_request(api_key, endpoint, headers=None, params=None, timeout=30):
     """
-    ENHANCED: Make a request to the Meraki API with improved SSL handling for corporate environments
+    Send a GET to the Meraki API and return the raw response.
+    
+    This is the core behind make_meraki_request. Callers that need response
+    headers - e.g. the Link header used for pagination - use it directly.
     
     Args:
         api_key (str): Meraki API key
-        endpoint (str): The API endpoint URL
+        endpoint (str): API endpoint path, or an absolute URL (pagination links)
         headers (dict): Request headers including API key
         params (dict): Query parameters
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
         timeout (int): Request timeout in seconds
         
     Returns:
-        dict: JSON response from the API
+        requests.Response or None: The response, or None for endpoints whose
+        404 means "not supported" (uplink, topology links)
     """
     import time
     import ssl
@@ -807,14 +722,15 @@ def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retrie
     import logging
     import urllib3
     import requests
-    from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
 
     # Disable SSL warnings for corporate environments
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+    # Pagination links are absolute URLs; everything else is a path
+    is_absolute = endpoint.startswith('http://') or endpoint.startswith('https://')
+    
     # Ensure endpoint starts with a slash
-    if not endpoint.startswith('/'):
+    if not is_absolute and not endpoint.startswith('/'):
         endpoint = '/' + endpoint
     
     # Create default headers if not provided
@@ -829,66 +745,51 @@ def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retrie
     is_uplink_endpoint = '/uplink' in endpoint
     is_topology_endpoint = '/topology/links' in endpoint
     
-    # Create session with enhanced SSL configuration
-    session = requests.Session()
-    
-    # Set up retry strategy
-    retry_strategy = Retry(
-        total=1,  # Reduced retries to minimize SSL error noise
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    url = f"{BASE_URL}{endpoint}"
-    
-    # SSL Configuration Priority (try in order)
-    ssl_configs = [
-        # 1. Try with certifi bundle (most compatible)
-        {'verify': certifi.where(), 'name': 'certifi bundle'},
-        # 2. Try with system default
-        {'verify': True, 'name': 'system default'},
-        # 3. Fallback to no verification
-        {'verify': False, 'name': 'no verification (corporate fallback)'}
-    ]
+    # Shared keep-alive transport - connections are reused across calls
+    transport = get_transport()
+    
+    url = endpoint if is_absolute else f"{BASE_URL}{endpoint}"
+    
+    # SSL modes to try - the mode remembered for this host comes first, so
+    # the certifi -> system -> no-verification cascade only runs on a miss
+    ssl_cache = get_ssl_strategy_cache()
+    host = host_for_url(url)
+    
+    # Every call waits for its organization's rate-limit token; 429s pause
+    # the whole organization for Retry-After and are retried here
+    scheduler = get_rate_scheduler()
+    org_key = scheduler.org_for_path(url)
     
     last_error = None
     
-    for config in ssl_configs:
+    for mode in ssl_cache.modes_for(host):
         try:
-            session.verify = config['verify']
-            
             # Suppress logging for SSL attempts to reduce noise
-            if config['verify'] is False:
+            if mode == 'insecure':
                 logging.getLogger("urllib3").setLevel(logging.ERROR)
             
-            response = session.get(
+            # verify is passed per request so concurrent callers never
+            # mutate the shared session
+            verify = verify_for_mode(mode)
+            response = scheduler.call(org_key, lambda: transport.get(
                 url, 
                 headers=headers, 
                 params=params, 
-                timeout=timeout
-            )
+                timeout=timeout,
+                verify=verify
+            ))
             
-            # If we get here, the request succeeded
-            response.raise_for_status()
+            # The TLS handshake worked - remember the mode for this host
+            ssl_cache.record_success(host, mode)
             
-            # Log success only on first successful attempt per session
-            if not hasattr(make_meraki_request, '_ssl_success_logged'):
-                if config['verify']:
-                    logging.info(f"✅ SSL verification successful using {config['name']}")
-                else:
-                    logging.info(f"⚠️ Using SSL bypass mode for corporate environment")
-                make_meraki_request._ssl_success_logged = True
+            response.raise_for_status()
             
-            return response.json()
+            return response
             
         except requests.exceptions.SSLError as e:
             last_error = e
-            # Don't log SSL errors, just continue to next config
+            ssl_cache.record_failure(host, mode)
+            # Don't log SSL errors, just continue to next mode
             continue
             
         except requests.exceptions.HTTPError as e:
@@ -897,10 +798,10 @@ def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retrie
                 if is_uplink_endpoint:
                     device_serial = endpoint.split('/')[-2] if '/' in endpoint else 'unknown'
                     logging.warning(f"Device {device_serial} does not support uplink information")
-                    return []
+                    return None
                 elif is_topology_endpoint:
                     logging.warning(f"Topology links not available for this network")
-                    return []
+                    return None
                 else:
                     logging.error(f"API endpoint not found: {endpoint}")
                     raise
@@ -920,6 +821,172 @@ def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retrie
     else:
         raise Exception("Unknown SSL configuration error")
 
+def make_meraki_request(api_key, endpoint, headers=None, params=None, max_retries=3, retry_delay=1, timeout=30, use_cache=True):
+    """
+    ENHANCED: Make a request to the Meraki API with improved SSL handling for corporate environments
+    
+    Args:
+        api_key (str): Meraki API key
+        endpoint (str): The API endpoint URL
+        headers (dict): Request headers including API key
+        params (dict): Query parameters
+        max_retries (int): Maximum number of retry attempts
+        retry_delay (int): Delay between retries in seconds
+        timeout (int): Request timeout in seconds
+        use_cache (bool): Serve from / store in the shared response cache
+        
+    Returns:
+        dict: JSON response from the API
+    """
+    def fetch():
+        data, _ = get_meraki_page(api_key, endpoint, params=params, headers=headers, timeout=timeout)
+        return data, None
+    
+    if not use_cache or not is_cacheable(endpoint):
+        return fetch()[0]
+    key = make_cache_key(api_key, endpoint, params)
+    return get_response_cache().get_or_fetch(key, endpoint, fetch)
+
+def get_meraki_page(api_key, endpoint, params=None, headers=None, timeout=30):
+    """
+    GET one Meraki page, sharing the upstream call with identical concurrent requests.
+    
+    Requests are coalesced on (API key hash, GET, absolute URL, params) across
+    threads and the asyncio client, so only one of them reaches Meraki.
+    
+    Args:
+        api_key (str): Meraki API key
+        endpoint (str): API endpoint path or absolute URL
+        params (dict): Query parameters
+        headers (dict): Request headers including API key
+        timeout (int): Request timeout in seconds
+        
+    Returns:
+        tuple: (parsed JSON, Link header or None)
+    """
+    url = endpoint if endpoint.startswith('http') else f"{BASE_URL}/{endpoint.lstrip('/')}"
+    
+    def fetch():
+        response = send_meraki_request(api_key, url, headers=headers, params=params, timeout=timeout)
+        if response is None:
+            return [], None
+        data = response.json()
+        # Learn network/device -> org mappings for rate-limit attribution
+        get_rate_scheduler().learn_from_path(url, data)
+        return data, response.headers.get('Link')
+    
+    return get_single_flight('meraki').do(flight_key(api_key, 'GET', url, params), fetch)
+
+# ==================================================
+# Pagination helpers (Link: rel=next)
+# ==================================================
+
+def iter_meraki_pages(api_key, endpoint, params=None, max_pages=DEFAULT_MAX_PAGES, prefetch=0, timeout=30):
+    """
+    Yield pages of a paginated Meraki collection as they arrive.
+    
+    Follows the Link rel=next header, so collections larger than one perPage
+    are returned in full instead of being cut off after the first page.
+    
+    Args:
+        api_key (str): Meraki API key
+        endpoint (str): The API endpoint path
+        params (dict): Query parameters for the first page (perPage, timespan, ...)
+        max_pages (int): Upper bound on pages fetched
+        prefetch (int): Pages to fetch ahead in the background (0 = lazy)
+        timeout (int): Request timeout in seconds
+        
+    Returns:
+        generator: Yields one list of items per page
+    """
+    def fetch_page(url, page_params):
+        return get_meraki_page(api_key, url, params=page_params, timeout=timeout)
+    
+    if not endpoint.startswith('/'):
+        endpoint = '/' + endpoint
+    return iter_pages(fetch_page, f"{BASE_URL}{endpoint}", params, max_pages=max_pages, prefetch=prefetch)
+
+def _all_pages_cache_key(api_key, endpoint, params):
+    """Cache key for a complete paginated collection (distinct from its first page)."""
+    return make_cache_key(api_key, endpoint, dict(params or {}, _pages='all'))
+
+def iter_meraki_items(api_key, endpoint, params=None, max_pages=DEFAULT_MAX_PAGES, prefetch=0, timeout=30, use_cache=True):
+    """
+    Yield the items of a paginated Meraki collection one at a time.
+    
+    Bounded-memory mode: only the current page is held, never the whole list.
+    A cached copy of the collection is replayed when present; otherwise a
+    collection that streams to the end while staying under the cache's
+    per-entry cap is stored for the next caller.
+    
+    Args:
+        api_key (str): Meraki API key
+        endpoint (str): The API endpoint path
+        params (dict): Query parameters for the first page
+        max_pages (int): Upper bound on pages fetched
+        prefetch (int): Pages to fetch ahead in the background (0 = lazy)
+        timeout (int): Request timeout in seconds
+        use_cache (bool): Serve from / store in the shared response cache
+        
+    Returns:
+        generator: Yields one item (dict) at a time
+    """
+    cache = get_response_cache()
+    if not use_cache or not cache.enabled or not is_cacheable(endpoint):
+        for page in iter_meraki_pages(api_key, endpoint, params, max_pages=max_pages, prefetch=prefetch, timeout=timeout):
+            yield from page
+        return
+    
+    key = _all_pages_cache_key(api_key, endpoint, params)
+    cached, state = cache.get(key, refresh=lambda: (
+        get_all_meraki_pages(api_key, endpoint, params, max_pages=max_pages, timeout=timeout, use_cache=False), None))
+    if state != 'miss':
+        yield from cached
+        return
+    
+    collected, collected_bytes = [], 0
+    for page in iter_meraki_pages(api_key, endpoint, params, max_pages=max_pages, prefetch=prefetch, timeout=timeout):
+        if collected is not None:
+            collected_bytes += estimate_size(page)
+            if collected_bytes <= cache.max_entry_bytes:
+                collected.extend(page)
+            else:
+                collected = None
+        yield from page
+    if collected is not None:
+        cache.put(key, endpoint, collected, collected_bytes)
+
+def get_all_meraki_pages(api_key, endpoint, params=None, max_pages=DEFAULT_MAX_PAGES, timeout=30, use_cache=True):
+    """
+    Fetch every page of a paginated Meraki collection into one list.
+    
+    Args:
+        api_key (str): Meraki API key
+        endpoint (str): The API endpoint path
+        params (dict): Query parameters for the first page
+        max_pages (int): Upper bound on pages fetched
+        timeout (int): Request timeout in seconds
+        use_cache (bool): Serve from / store in the shared response cache
+        
+    Returns:
+        list: All items across all pages
+    """
+    def collect():
+        items, size = [], 0
+        for page in iter_meraki_pages(api_key, endpoint, params, max_pages=max_pages, timeout=timeout):
+            items.extend(page)
+            size += estimate_size(page)
+        return items, size
+    
+    def fetch():
+        # Callers that arrive mid-collection share it instead of walking the pages again
+        return get_single_flight('meraki').do(flight_key(api_key, 'GET-ALL', endpoint, params), collect)
+    
+    if not use_cache or not is_cacheable(endpoint):
+        return fetch()[0]
+    key = _all_pages_cache_key(api_key, endpoint, params)
+    return get_response_cache().get_or_fetch(key, endpoint, fetch)
+
 def store_api_key(api_key):
     """
     Securely store the Meraki API key
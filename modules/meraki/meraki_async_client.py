@@ -0,0 +1,446 @@
+"""
+Meraki Asyncio Client Module
+
+Org-wide operations (org -> networks -> devices for ~1,500 stores) used to run
+one request at a time. AsyncMerakiClient exposes the same method surface as
+the CustomDashboard shim in main.py - ``organizations.getOrganizations``,
+``organizations.getOrganizationNetworks``, ``networks.getNetworkDevices``,
+``networks.getNetworkClients`` and ``networks.getNetworkTopology`` - as
+coroutines, so thousands of networks can be fanned out concurrently.
+
+Concurrency is bounded twice: a global semaphore caps in-flight requests and a
+per-organization semaphore sized to the org burst keeps each org inside its
+rate limit. Tokens still come from the shared MerakiRateScheduler, so async,
+custom and SDK callers draw from one per-org budget.
+
+aiohttp is used when installed. Without it the client falls back to running
+make_meraki_request in a thread pool, which keeps the same interface.
+
+SyncMerakiDashboard is a blocking facade over the async client, backed by a
+background event loop, so Flask routes and the CLI can use it as a drop-in
+dashboard object without becoming async themselves.
+"""
+
+import os
+import ssl
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from modules.meraki.meraki_pagination import DEFAULT_MAX_PAGES, next_page_url
+from modules.meraki.rate_limiter import (
+    DEFAULT_MAX_429_RETRIES, get_rate_scheduler, get_request_priority,
+    reset_request_priority, retry_after_from, set_request_priority
+)
+from modules.meraki.ssl_strategy import get_ssl_strategy_cache, host_for_url, verify_for_mode
+from single_flight import get_single_flight, flight_key
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+DEFAULT_BASE_URL = os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1').rstrip('/')
+DEFAULT_MAX_CONCURRENCY = int(os.getenv('MERAKI_ASYNC_CONCURRENCY', 50))
+DEFAULT_TIMEOUT = 30
+USER_AGENT = "MerakiCLI-Enhanced/2.6"
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMerakiClient:
+    """
+    Asyncio Meraki client with the CustomDashboard method surface.
+
+    Example:
+        client = AsyncMerakiClient(api_key)
+        networks = await client.organizations.getOrganizationNetworks(org_id)
+        devices = await client.map_networks('getNetworkDevices', [n['id'] for n in networks])
+        await client.close()
+    """
+
+    def __init__(self, api_key, base_url=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT):
+        """
+        Initialize the client.
+
+        Args:
+            api_key (str): Meraki API key
+            base_url (str, optional): API base URL
+            max_concurrency (int): Maximum requests in flight across all orgs
+            timeout (int): Per-request timeout in seconds
+        """
+        self.api_key = api_key
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.scheduler = get_rate_scheduler()
+        self._session = None
+        self._global_semaphore = None
+        self._org_semaphores = {}
+        # Threads used to wait for rate-limit tokens (and for requests when
+        # aiohttp is unavailable) without blocking the event loop
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="meraki-async")
+        self.organizations = _AsyncOrganizations(self)
+        self.networks = _AsyncNetworks(self)
+
+    @property
+    def headers(self):
+        return {
+            "X-Cisco-Meraki-API-Key": self.api_key,
+            "Content-Type": "application/json",
+            "User-Agent": USER_AGENT
+        }
+
+    def _url(self, endpoint):
+        if endpoint.startswith('http://') or endpoint.startswith('https://'):
+            return endpoint
+        if not endpoint.startswith('/'):
+            endpoint = '/' + endpoint
+        return f"{self.base_url}{endpoint}"
+
+    def _org_semaphore(self, org):
+        # Created lazily so they bind to the loop the client runs on
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        if org not in self._org_semaphores:
+            self._org_semaphores[org] = asyncio.Semaphore(max(int(self.scheduler.burst), 1))
+        return self._org_semaphores[org]
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            )
+        return self._session
+
+    @staticmethod
+    def _ssl_for_mode(mode):
+        verify = verify_for_mode(mode)
+        if verify is False:
+            return False
+        if verify is True:
+            return ssl.create_default_context()
+        return ssl.create_default_context(cafile=verify)
+
+    async def _send_aiohttp(self, url, params):
+        """Send one GET with the remembered SSL mode; returns (data, link, retry_after)."""
+        session = await self._get_session()
+        ssl_cache = get_ssl_strategy_cache()
+        host = host_for_url(url)
+        path = urlparse(url).path
+        last_error = None
+
+        for mode in ssl_cache.modes_for(host):
+            try:
+                async with session.get(url, params=params, ssl=self._ssl_for_mode(mode)) as response:
+                    ssl_cache.record_success(host, mode)
+                    retry_after = retry_after_from(response)
+                    if retry_after is not None:
+                        return None, None, retry_after
+                    if response.status == 404 and ('/uplink' in path or '/topology/links' in path):
+                        return [], None, None
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+                    return data, response.headers.get('Link'), None
+            except aiohttp.ClientSSLError as e:
+                last_error = e
+                ssl_cache.record_failure(host, mode)
+                continue
+
+        raise last_error
+
+    async def _fetch_page(self, url, params):
+        """
+        Fetch one page; returns (data, link_header).
+
+        Identical concurrent requests - from this loop or from Flask threads
+        going through meraki_api - share a single upstream call.
+        """
+        key = flight_key(self.api_key, 'GET', url, params)
+        return await get_single_flight('meraki').do_async(key, lambda: self._request_page(url, params))
+
+    async def _request_page(self, url, params):
+        """Fetch one page under the org rate limit; returns (data, link_header)."""
+        loop = asyncio.get_running_loop()
+        org = self.scheduler.org_for_path(url)
+        priority = get_request_priority()
+
+        async with self._org_semaphore(org), self._global_semaphore:
+            if not AIOHTTP_AVAILABLE:
+                # make_meraki_request's path already waits for tokens and retries 429s
+                from modules.meraki.meraki_api import send_meraki_request
+                response = await loop.run_in_executor(
+                    self._executor, _call_with_priority, priority,
+                    send_meraki_request, self.api_key, url, None, params, self.timeout
+                )
+                if response is None:
+                    return [], None
+                data = response.json()
+                self.scheduler.learn_from_path(url, data)
+                return data, response.headers.get('Link')
+
+            for attempt in range(DEFAULT_MAX_429_RETRIES + 1):
+                await loop.run_in_executor(self._executor, self.scheduler.acquire, org, priority)
+                data, link, retry_after = await self._send_aiohttp(url, params)
+                if retry_after is None:
+                    self.scheduler.learn_from_path(url, data)
+                    return data, link
+                if attempt == DEFAULT_MAX_429_RETRIES:
+                    raise RuntimeError(f"Meraki rate limit still exceeded after {attempt} retries: {url}")
+                self.scheduler.penalize(org, retry_after)
+
+    async def get(self, endpoint, params=None):
+        """
+        GET a single (non-paginated) endpoint.
+
+        Args:
+            endpoint (str): API path
+            params (dict, optional): Query parameters
+
+        Returns:
+            dict or list: Parsed JSON response
+        """
+        data, _ = await self._fetch_page(self._url(endpoint), params)
+        return data
+
+    async def iter_pages(self, endpoint, params=None, max_pages=DEFAULT_MAX_PAGES):
+        """
+        Yield pages of a collection as they arrive, following Link rel=next.
+
+        Args:
+            endpoint (str): API path
+            params (dict, optional): Query parameters for the first page
+            max_pages (int): Upper bound on pages fetched
+
+        Yields:
+            list: Items of one page
+        """
+        url = self._url(endpoint)
+        pages = 0
+        while url:
+            data, link = await self._fetch_page(url, params)
+            pages += 1
+            if isinstance(data, dict):
+                yield [data]
+                return
+            yield data or []
+            url = next_page_url(link)
+            params = None
+            if max_pages and pages >= max_pages:
+                return
+
+    async def get_all(self, endpoint, params=None):
+        """
+        GET every page of a collection into one list.
+
+        Args:
+            endpoint (str): API path
+            params (dict, optional): Query parameters for the first page
+
+        Returns:
+            list: All items
+        """
+        items = []
+        async for page in self.iter_pages(endpoint, params):
+            items.extend(page)
+        return items
+
+    async def map_networks(self, method_name, network_ids, **kwargs):
+        """
+        Run a ``networks`` method for many networks concurrently.
+
+        Args:
+            method_name (str): e.g. 'getNetworkDevices'
+            network_ids (list): Network ids
+            **kwargs: Extra keyword arguments for the method
+
+        Returns:
+            dict: network_id -> result, or the exception raised for that network
+        """
+        method = getattr(self.networks, method_name)
+        results = await asyncio.gather(
+            *(method(network_id, **kwargs) for network_id in network_ids),
+            return_exceptions=True
+        )
+        return dict(zip(network_ids, results))
+
+    async def close(self):
+        """Close the HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class _AsyncOrganizations:
+    def __init__(self, client):
+        self._client = client
+
+    async def getOrganizations(self):
+        return await self._client.get_all("/organizations")
+
+    async def getOrganizationNetworks(self, org_id):
+        return await self._client.get_all(f"/organizations/{org_id}/networks", {"perPage": 5000})
+
+    async def getOrganizationDevices(self, org_id):
+        return await self._client.get_all(f"/organizations/{org_id}/devices", {"perPage": 1000})
+
+    async def getOrganizationDevicesStatuses(self, org_id):
+        return await self._client.get_all(f"/organizations/{org_id}/devices/statuses", {"perPage": 1000})
+
+    async def getOrganizationInventoryDevices(self, org_id):
+        return await self._client.get_all(f"/organizations/{org_id}/inventory/devices", {"perPage": 1000})
+
+
+class _AsyncNetworks:
+    def __init__(self, client):
+        self._client = client
+
+    async def getNetworkDevices(self, network_id):
+        return await self._client.get(f"/networks/{network_id}/devices")
+
+    async def getNetworkClients(self, network_id, timespan=86400):
+        return await self._client.get_all(f"/networks/{network_id}/clients",
+                                          {"perPage": 1000, "timespan": timespan})
+
+    async def getNetworkTopology(self, network_id):
+        # The topology builder is a multi-call composite in meraki_api; run it
+        # in the pool so it still goes through the shared rate scheduler
+        from modules.meraki import meraki_api
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._client._executor, _call_with_priority, get_request_priority(),
+            meraki_api.get_network_topology, self._client.api_key, network_id
+        )
+
+
+def _call_with_priority(priority, func, *args):
+    """Run ``func`` in a worker thread with the caller's request priority."""
+    token = set_request_priority(priority)
+    try:
+        return func(*args)
+    finally:
+        # Pool threads are reused - never leak a priority into the next job
+        reset_request_priority(token)
+
+
+# ==================================================
+# Sync facade
+# ==================================================
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_background_loop():
+    """Get (starting on first use) the event loop that runs facade calls."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="meraki-async-loop", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+async def _with_priority(coro, priority):
+    # Tasks get a copy of the loop thread's context; apply the caller's priority
+    set_request_priority(priority)
+    return await coro
+
+
+class _SyncSection:
+    def __init__(self, facade, section):
+        self._facade = facade
+        self._section = section
+
+    def __getattr__(self, name):
+        method = getattr(self._section, name)
+        if not callable(method):
+            return method
+
+        def _call(*args, **kwargs):
+            return self._facade.run(method(*args, **kwargs))
+
+        _call.__name__ = name
+        return _call
+
+
+class SyncMerakiDashboard:
+    """
+    Blocking dashboard object backed by AsyncMerakiClient.
+
+    Drop-in for the CustomDashboard shim: ``dashboard.networks.getNetworkDevices(id)``
+    blocks the calling thread while the request runs on the shared background
+    loop. ``map_networks`` exposes the concurrent fan-out to sync callers.
+    """
+
+    def __init__(self, api_key, max_concurrency=DEFAULT_MAX_CONCURRENCY, base_url=None, client=None):
+        """
+        Initialize the facade.
+
+        Args:
+            api_key (str): Meraki API key
+            max_concurrency (int): Maximum requests in flight
+            base_url (str, optional): API base URL
+            client (AsyncMerakiClient, optional): Existing client to wrap
+        """
+        self.api_key = api_key
+        self.client = client or AsyncMerakiClient(api_key, base_url=base_url, max_concurrency=max_concurrency)
+        self.organizations = _SyncSection(self, self.client.organizations)
+        self.networks = _SyncSection(self, self.client.networks)
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout (float, optional): Seconds to wait for the result
+
+        Returns:
+            The coroutine's result
+        """
+        loop = _get_background_loop()
+        future = asyncio.run_coroutine_threadsafe(_with_priority(coro, get_request_priority()), loop)
+        return future.result(timeout)
+
+    def map_networks(self, method_name, network_ids, **kwargs):
+        """
+        Run a ``networks`` method for many networks concurrently.
+
+        Args:
+            method_name (str): e.g. 'getNetworkDevices'
+            network_ids (list): Network ids
+            **kwargs: Extra keyword arguments for the method
+
+        Returns:
+            dict: network_id -> result, or the exception raised for that network
+        """
+        return self.run(self.client.map_networks(method_name, network_ids, **kwargs))
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.run(self.client.close())
+
+
+def create_async_dashboard_object(api_key):
+    """
+    Create a blocking dashboard object backed by the asyncio client.
+
+    Args:
+        api_key (str): Meraki API key
+
+    Returns:
+        SyncMerakiDashboard: Dashboard with the CustomDashboard method surface
+    """
+    return SyncMerakiDashboard(api_key)
@@ -0,0 +1,102 @@
+"""
+Meraki Organization Inventory Module
+
+Builds a per-organization device inventory from the org-level bulk endpoints
+instead of calling getNetworkDevices once per network:
+
+- /organizations/{id}/devices          - device records (name, model, networkId, ...)
+- /organizations/{id}/devices/statuses - online/offline/alerting per serial
+- /organizations/{id}/inventory/devices - claimed hardware, incl. devices the
+                                          other two endpoints do not list yet
+
+The three lists are joined in memory by serial and networkId, so an org with
+1,500 networks costs a handful of (paginated) calls instead of 1,500.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Inventory fields copied onto device records when the device list lacks them
+INVENTORY_FIELDS = ['name', 'model', 'mac', 'networkId', 'productType', 'claimedAt', 'licenseExpirationDate']
+
+# Status fields copied onto device records
+STATUS_FIELDS = ['status', 'lanIp', 'publicIp', 'gateway', 'lastReportedAt', 'usingCellularFailover', 'wan1Ip', 'wan2Ip']
+
+
+def join_organization_inventory(devices, statuses, inventory, networks=None):
+    """
+    Join org-level device, status and inventory lists by serial and networkId.
+
+    Args:
+        devices (list): /organizations/{id}/devices records
+        statuses (list): /organizations/{id}/devices/statuses records
+        inventory (list): /organizations/{id}/inventory/devices records
+        networks (list, optional): Org networks; when given, each device gets
+                                   ``networkName`` and devices outside these
+                                   networks (unassigned inventory) are dropped
+
+    Returns:
+        list: One merged record per device serial, in device-list order
+    """
+    status_by_serial = {s['serial']: s for s in statuses or [] if isinstance(s, dict) and s.get('serial')}
+    inventory_by_serial = {i['serial']: i for i in inventory or [] if isinstance(i, dict) and i.get('serial')}
+    network_names = None
+    if networks is not None:
+        network_names = {n['id']: n.get('name', 'Unknown') for n in networks if isinstance(n, dict) and n.get('id')}
+
+    merged = []
+    seen = set()
+
+    def _add(record):
+        serial = record.get('serial')
+        status = status_by_serial.get(serial)
+        if status:
+            for field in STATUS_FIELDS:
+                if field in status and record.get(field) in (None, ''):
+                    record[field] = status[field]
+            if not record.get('networkId') and status.get('networkId'):
+                record['networkId'] = status['networkId']
+
+        item = inventory_by_serial.get(serial)
+        if item:
+            for field in INVENTORY_FIELDS:
+                if field in item and record.get(field) in (None, ''):
+                    record[field] = item[field]
+
+        network_id = record.get('networkId')
+        if network_names is not None:
+            if network_id not in network_names:
+                return
+            record['networkName'] = network_names[network_id]
+        merged.append(record)
+        seen.add(serial)
+
+    for device in devices or []:
+        if isinstance(device, dict) and device.get('serial'):
+            _add(dict(device))
+
+    # Claimed devices that the device list does not report yet
+    for serial, item in inventory_by_serial.items():
+        if serial not in seen and item.get('networkId'):
+            _add(dict(item))
+
+    logger.debug(f"Joined {len(merged)} devices from {len(devices or [])} device, "
+                 f"{len(status_by_serial)} status and {len(inventory_by_serial)} inventory records")
+    return merged
+
+
+def group_by_network(devices):
+    """
+    Group joined device records by networkId.
+
+    Args:
+        devices (list): Records from join_organization_inventory
+
+    Returns:
+        dict: networkId -> list of devices
+    """
+    grouped = {}
+    for device in devices:
+        grouped.setdefault(device.get('networkId'), []).append(device)
+    return grouped
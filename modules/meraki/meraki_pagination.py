@@ -0,0 +1,190 @@
+"""
+Meraki Pagination Module
+
+The Meraki Dashboard API pages large collections (clients, networks, inventory)
+and advertises the next page in an RFC 5988 ``Link`` header::
+
+    Link: <https://api.meraki.com/api/v1/networks/N_1/clients?perPage=1000&startingAfter=k>; rel=next
+
+This module follows those ``rel=next`` links and hands pages to the caller as
+they arrive, so processing can start before the last page has been fetched.
+It is transport-agnostic: callers supply a ``fetch_page(url, params)`` function
+returning ``(items, link_header)``, which keeps the same paginator usable from
+make_meraki_request, the SDK wrapper and the tests.
+"""
+
+import contextvars
+import logging
+import queue
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Safety net against servers that keep returning the same next link
+DEFAULT_MAX_PAGES = 10000
+
+
+def parse_link_header(value):
+    """
+    Parse an RFC 5988 Link header into a rel -> url mapping.
+
+    Args:
+        value (str): Raw Link header value
+
+    Returns:
+        dict: e.g. {'first': url, 'next': url, 'last': url}
+    """
+    links = {}
+    if not value:
+        return links
+
+    for part in value.split(','):
+        segments = part.strip().split(';')
+        url = segments[0].strip()
+        if not (url.startswith('<') and url.endswith('>')):
+            continue
+        url = url[1:-1]
+        for param in segments[1:]:
+            key, _, rel_value = param.strip().partition('=')
+            if key.strip().lower() != 'rel':
+                continue
+            # rel may hold several space separated values
+            for rel in rel_value.strip().strip('"').split():
+                links[rel.lower()] = url
+    return links
+
+
+def next_page_url(link_header):
+    """
+    Get the ``rel=next`` URL from a Link header.
+
+    Args:
+        link_header (str): Raw Link header value
+
+    Returns:
+        str or None: URL of the next page, or None on the last page
+    """
+    return parse_link_header(link_header).get('next')
+
+
+def _page_sequence(fetch_page, url, params, max_pages):
+    """Fetch pages one after another, yielding each page's item list."""
+    seen_urls = set()
+    page_params = params
+    pages = 0
+
+    while url:
+        items, link_header = fetch_page(url, page_params)
+        pages += 1
+
+        if isinstance(items, dict):
+            # Non-collection endpoint - nothing to paginate
+            yield [items]
+            return
+        yield items or []
+
+        next_url = next_page_url(link_header)
+        if not next_url:
+            return
+        if next_url in seen_urls:
+            logger.warning(f"Pagination loop detected at {urlparse(next_url).path}, stopping")
+            return
+        if max_pages and pages >= max_pages:
+            logger.warning(f"Stopped after {pages} pages of {urlparse(url).path}; more data is available")
+            return
+
+        seen_urls.add(next_url)
+        url = next_url
+        # The next link already carries perPage, startingAfter and the filters
+        page_params = None
+
+
+def _prefetched_pages(fetch_page, url, params, max_pages, prefetch):
+    """
+    Yield pages while a background thread fetches the following ones.
+
+    At most ``prefetch`` pages are buffered, so memory stays bounded even when
+    the consumer is slower than the API.
+    """
+    buffer = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
+
+    def _offer(item):
+        # Block until there is room, unless the consumer has gone away
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _producer():
+        try:
+            for page in _page_sequence(fetch_page, url, params, max_pages):
+                if not _offer(page):
+                    return
+            _offer(done)
+        except Exception as e:
+            _offer(e)
+
+    # Run the producer in a copy of the caller's context so prefetched pages keep
+    # its request priority (threads otherwise start at the default, interactive)
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(_producer,),
+                              name="meraki-page-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            page = buffer.get()
+            if page is done:
+                return
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        # Consumer stopped early (break, exception, close) - release the producer
+        stop.set()
+
+
+def iter_pages(fetch_page, url, params=None, max_pages=DEFAULT_MAX_PAGES, prefetch=0):
+    """
+    Iterate over the pages of a paginated Meraki collection.
+
+    Args:
+        fetch_page (callable): ``fetch_page(url, params) -> (items, link_header)``
+        url (str): Absolute URL of the first page
+        params (dict, optional): Query parameters for the first page only
+        max_pages (int, optional): Upper bound on pages fetched
+        prefetch (int): Pages to fetch ahead in a background thread; 0 fetches
+                        lazily, only when the caller asks for the next page
+
+    Yields:
+        list: Items of one page, in API order
+    """
+    if prefetch and prefetch > 0:
+        return _prefetched_pages(fetch_page, url, params, max_pages, prefetch)
+    return _page_sequence(fetch_page, url, params, max_pages)
+
+
+def iter_items(fetch_page, url, params=None, max_pages=DEFAULT_MAX_PAGES, prefetch=0):
+    """
+    Iterate over individual items across all pages.
+
+    This is the bounded-memory mode: only the page being consumed (plus any
+    prefetched pages) is held in memory, never the whole collection.
+
+    Args:
+        fetch_page (callable): ``fetch_page(url, params) -> (items, link_header)``
+        url (str): Absolute URL of the first page
+        params (dict, optional): Query parameters for the first page only
+        max_pages (int, optional): Upper bound on pages fetched
+        prefetch (int): Pages to fetch ahead in a background thread
+
+    Yields:
+        dict: One item at a time
+    """
+    for page in iter_pages(fetch_page, url, params, max_pages=max_pages, prefetch=prefetch):
+        for item in page:
+            yield item
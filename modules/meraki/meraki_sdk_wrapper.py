@@ -16,6 +16,9 @@ import platform
 from datetime import datetime
 from termcolor import colored
 
+from modules.meraki.rate_limiter import RateLimitedDashboard, get_rate_scheduler
+from topology_engine import build_topology, to_indexed_dict
+
 # --- Zscaler SSL CA bundle logic ---
 ZSCALER_CA_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools', 'meraki.pem'))
 if os.path.exists(ZSCALER_CA_PATH):
@@ -50,6 +53,15 @@ logging.basicConfig(
 DEFAULT_TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
+# Point at a mock dashboard (mock_meraki_dashboard.py) for load testing
+BASE_URL = os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1').rstrip('/')
+
+
+def _rate_limited_get(url, **kwargs):
+    """Direct API fallback request, scheduled like every other Meraki call."""
+    import requests
+    scheduler = get_rate_scheduler()
+    return scheduler.call(scheduler.org_for_path(url), lambda: requests.get(url, **kwargs))
 
 class MerakiSDKWrapper:
     """
@@ -65,7 +77,8 @@ class MerakiSDKWrapper:
             api_key (str): Meraki API key
         """
         self.api_key = api_key
-        self.dashboard = self._initialize_dashboard()
+        # Every SDK call goes through the shared per-org rate scheduler
+        self.dashboard = RateLimitedDashboard(self._initialize_dashboard())
         self.check_api_version()
         
     def _initialize_dashboard(self):
@@ -92,12 +105,12 @@ class MerakiSDKWrapper:
                 # First try with verification enabled
                 dashboard = meraki.DashboardAPI(
                     api_key=self.api_key,
-                    base_url='https://api.meraki.com/api/v1',
+                    base_url=BASE_URL,
                     output_log=False,
                     print_console=False,
                     suppress_logging=False,
                     maximum_retries=MAX_RETRIES,
-                    wait_on_rate_limit=True,
+                    wait_on_rate_limit=False,  # 429s are handled by the org rate scheduler
                     retry_4xx_error=True,
                     retry_4xx_error_wait_time=RETRY_DELAY,
                     use_iterator_for_get_pages=False
@@ -111,12 +124,12 @@ class MerakiSDKWrapper:
                 # If that fails, try with verification disabled
                 dashboard = meraki.DashboardAPI(
                     api_key=self.api_key,
-                    base_url='https://api.meraki.com/api/v1',
+                    base_url=BASE_URL,
                     output_log=False,
                     print_console=False,
                     suppress_logging=False,
                     maximum_retries=MAX_RETRIES,
-                    wait_on_rate_limit=True,
+                    wait_on_rate_limit=False,  # 429s are handled by the org rate scheduler
                     retry_4xx_error=True,
                     retry_4xx_error_wait_time=RETRY_DELAY,
                     use_iterator_for_get_pages=False,
@@ -127,12 +140,12 @@ class MerakiSDKWrapper:
             # For non-Windows platforms, use system certificates
             return meraki.DashboardAPI(
                 api_key=self.api_key,
-                base_url='https://api.meraki.com/api/v1',
+                base_url=BASE_URL,
                 output_log=False,
                 print_console=False,
                 suppress_logging=False,
                 maximum_retries=MAX_RETRIES,
-                wait_on_rate_limit=True,
+                wait_on_rate_limit=False,  # 429s are handled by the org rate scheduler
                 retry_4xx_error=True,
                 retry_4xx_error_wait_time=RETRY_DELAY,
                 use_iterator_for_get_pages=False,
@@ -198,8 +211,8 @@ class MerakiSDKWrapper:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.get(
-                    "https://api.meraki.com/api/v1/organizations",
+                response = _rate_limited_get(
+                    f"{BASE_URL}/organizations",
                     headers=headers,
                     verify=verify
                 )
@@ -249,8 +262,8 @@ class MerakiSDKWrapper:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.get(
-                    f"https://api.meraki.com/api/v1/organizations/{org_id}/networks",
+                response = _rate_limited_get(
+                    f"{BASE_URL}/organizations/{org_id}/networks",
                     headers=headers,
                     verify=verify
                 )
@@ -300,8 +313,8 @@ class MerakiSDKWrapper:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.get(
-                    f"https://api.meraki.com/api/v1/organizations/{org_id}/devices",
+                response = _rate_limited_get(
+                    f"{BASE_URL}/organizations/{org_id}/devices",
                     headers=headers,
                     verify=verify
                 )
@@ -351,8 +364,8 @@ class MerakiSDKWrapper:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.get(
-                    f"https://api.meraki.com/api/v1/organizations/{org_id}/admins",
+                response = _rate_limited_get(
+                    f"{BASE_URL}/organizations/{org_id}/admins",
                     headers=headers,
                     verify=verify
                 )
@@ -402,8 +415,8 @@ class MerakiSDKWrapper:
                     "Content-Type": "application/json"
                 }
                 
-                response = requests.get(
-                    f"https://api.meraki.com/api/v1/organizations/{org_id}/licenses",
+                response = _rate_limited_get(
+                    f"{BASE_URL}/organizations/{org_id}/licenses",
                     headers=headers,
                     verify=verify
                 )
@@ -549,156 +562,8 @@ class MerakiSDKWrapper:
                 logging.warning(f"Could not get topology links from API, building manually: {str(e)}")
                 topology_links = []
             
-            # Initialize topology data
-            topology_data = {
-                'network_name': self.get_network_name(network_id),
-                'nodes': [],
-                'links': []
-            }
-            
-            # Add devices as nodes
-            device_map = {}  # Map serial numbers to node indices
-            for i, device in enumerate(devices):
-                device_type = 'unknown'
-                if 'model' in device and device['model'] is not None:
-                    model = device['model'].lower()
-                    if 'mx' in model:
-                        device_type = 'security_appliance'
-                    elif 'ms' in model:
-                        device_type = 'switch'
-                    elif 'mr' in model:
-                        device_type = 'wireless'
-                    elif 'mv' in model:
-                        device_type = 'camera'
-                
-                node = {
-                    'id': device.get('serial', f"device_{i}"),
-                    'label': device.get('name', 'Unknown Device'),
-                    'type': device_type,
-                    'model': device.get('model', 'Unknown'),
-                    'ip': device.get('lanIp', 'No IP'),
-                    'mac': device.get('mac', 'No MAC'),
-                    'serial': device.get('serial', 'No Serial'),
-                    'firmware': device.get('firmware', 'Unknown'),
-                    'status': device.get('status', 'unknown')
-                }
-                
-                topology_data['nodes'].append(node)
-                device_map[device.get('serial')] = len(topology_data['nodes']) - 1
-            
-            # Add clients as nodes
-            for i, client in enumerate(clients):
-                # Determine client type based on available information
-                client_type = 'unknown'
-                if 'deviceTypePrediction' in client and client['deviceTypePrediction'] is not None:
-                    client_type = client['deviceTypePrediction'].lower()
-                elif 'manufacturer' in client and client['manufacturer'] is not None:
-                    manufacturer = client['manufacturer'].lower()
-                    if any(mobile in manufacturer for mobile in ['apple', 'samsung', 'lg', 'motorola', 'xiaomi']):
-                        client_type = 'mobile'
-                    elif any(pc in manufacturer for pc in ['dell', 'hp', 'lenovo', 'microsoft', 'asus']):
-                        client_type = 'desktop'
-                
-                # Get the connection details
-                connection_details = {
-                    'type': client.get('recentDeviceConnection', 'Unknown'),
-                    'vlan': client.get('vlan', 'Unknown'),
-                    'port': client.get('switchport', 'Unknown'),
-                    'last_seen': client.get('lastSeen', 'Unknown')
-                }
-                
-                node = {
-                    'id': client.get('id', f"client_{i}"),
-                    'label': client.get('description', client.get('mac', 'Unknown Client')),
-                    'type': 'client',
-                    'client_type': client_type,
-                    'ip': client.get('ip', 'No IP'),
-                    'mac': client.get('mac', 'No MAC'),
-                    'vlan': client.get('vlan', 'Unknown'),
-                    'connection': connection_details,
-                    'usage': client.get('usage', {})
-                }
-                
-                topology_data['nodes'].append(node)
-            
-            # Add links from the topology endpoint if available
-            if topology_links:
-                for link in topology_links:
-                    source_serial = link.get('source', {}).get('serial')
-                    dest_serial = link.get('destination', {}).get('serial')
-                    
-                    if source_serial in device_map and dest_serial in device_map:
-                        topology_data['links'].append({
-                            'source': device_map[source_serial],
-                            'target': device_map[dest_serial],
-                            'type': link.get('linkType', 'unknown'),
-                            'status': link.get('status', 'unknown')
-                        })
-            else:
-                # Fallback: build links based on device relationships
-                # Connect switches to security appliances
-                security_appliances = [i for i, node in enumerate(topology_data['nodes']) 
-                                    if node['type'] == 'security_appliance']
-                switches = [i for i, node in enumerate(topology_data['nodes']) 
-                            if node['type'] == 'switch']
-                
-                # Connect all switches to the first security appliance if available
-                if security_appliances and switches:
-                    for switch in switches:
-                        topology_data['links'].append({
-                            'source': security_appliances[0],
-                            'target': switch,
-                            'type': 'wired',
-                            'status': 'active'
-                        })
-                
-                # Connect switches to each other in a chain
-                for i in range(len(switches) - 1):
-                    topology_data['links'].append({
-                        'source': switches[i],
-                        'target': switches[i + 1],
-                        'type': 'wired',
-                        'status': 'active'
-                    })
-            
-            # Connect clients to their parent devices
-            for i, node in enumerate(topology_data['nodes']):
-                if node['type'] == 'client':
-                    # Find the device this client is connected to
-                    connected_to = None
-                    
-                    # For wireless clients
-                    if node.get('connection', {}).get('type') == 'wireless':
-                        # Find wireless APs
-                        wireless_aps = [j for j, d in enumerate(topology_data['nodes']) 
-                                        if d['type'] == 'wireless']
-                        if wireless_aps:
-                            # Connect to the first AP (could be improved with actual connection data)
-                            connected_to = wireless_aps[0]
-                    
-                    # For wired clients
-                    elif node.get('connection', {}).get('type') == 'wired':
-                        # Try to find the switch with matching port
-                        client_port = node.get('connection', {}).get('port')
-                        client_vlan = node.get('connection', {}).get('vlan')
-                        
-                        for j, device in enumerate(topology_data['nodes']):
-                            if device['type'] == 'switch':
-                                # In a real implementation, you would check if this switch has the port
-                                # the client is connected to. For now, connect to any switch.
-                                connected_to = j
-                                break
-                    
-                    # If we found a device to connect to
-                    if connected_to is not None:
-                        topology_data['links'].append({
-                            'source': connected_to,
-                            'target': i,
-                            'type': node.get('connection', {}).get('type', 'unknown'),
-                            'status': 'active'
-                        })
-            
-            return topology_data
+            topology = build_topology(devices, clients, topology_links, self.get_network_name(network_id))
+            return to_indexed_dict(topology)
             
         except Exception as e:
             logging.error(f"Error getting topology for network {network_id}: {str(e)}")
@@ -0,0 +1,225 @@
+"""
+Meraki HTTP Transport Module
+
+This module provides a process-wide, thread-safe HTTP transport for the Meraki
+Dashboard API. One keep-alive requests.Session is kept per upstream host, so
+repeated API calls reuse pooled TCP/TLS connections instead of paying a full
+handshake on every request. The Flask worker threads, the CLI and the
+CustomDashboard shim all share the same transport through get_transport().
+"""
+
+import os
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Default sizing - can be tuned through the environment
+DEFAULT_POOL_SIZE = int(os.getenv('MERAKI_POOL_SIZE', 20))
+DEFAULT_POOL_BLOCK = os.getenv('MERAKI_POOL_BLOCK', 'False').lower() == 'true'
+DEFAULT_USER_AGENT = "MerakiCLI-Enhanced/2.6"
+
+logger = logging.getLogger(__name__)
+
+
+class MerakiTransport:
+    """
+    Pooled HTTP transport shared by every Meraki API call.
+
+    Sessions are created lazily, one per scheme://host, and are never torn down
+    between calls. Each session mounts an HTTPAdapter whose urllib3 pool keeps
+    up to ``pool_size`` idle keep-alive connections to that host.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, pool_block=DEFAULT_POOL_BLOCK,
+                 user_agent=DEFAULT_USER_AGENT):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size (int): Maximum number of keep-alive connections per host
+            pool_block (bool): Block when the pool is exhausted instead of opening
+                               throw-away connections
+            user_agent (str): User-Agent header sent with every request
+        """
+        self.pool_size = pool_size
+        self.pool_block = pool_block
+        self.user_agent = user_agent
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._session_hits = 0
+        self._session_misses = 0
+
+    def _create_session(self):
+        """
+        Create a keep-alive session with a pooled adapter.
+
+        Returns:
+            requests.Session: Configured session
+        """
+        session = requests.Session()
+        session.headers.update({"User-Agent": self.user_agent})
+
+        # Retry only on transient server errors; the SSL cascade in
+        # make_meraki_request handles certificate problems itself and 429s
+        # are left to the org rate scheduler so it can honour Retry-After
+        retry_strategy = Retry(
+            total=1,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["HEAD", "GET", "OPTIONS"]
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+            max_retries=retry_strategy
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _host_key(url):
+        """Return the scheme://host[:port] key used to pick a session."""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def session_for(self, url):
+        """
+        Get the shared session for the host of ``url``, creating it on first use.
+
+        Args:
+            url (str): Full request URL
+
+        Returns:
+            requests.Session: Shared keep-alive session for that host
+        """
+        host_key = self._host_key(url)
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is not None:
+                self._session_hits += 1
+                return session
+
+            self._session_misses += 1
+            session = self._create_session()
+            self._sessions[host_key] = session
+            logger.debug(f"Created pooled session for {host_key} (pool size {self.pool_size})")
+            return session
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request over the pooled session for the target host.
+
+        Args:
+            method (str): HTTP method
+            url (str): Full request URL
+            **kwargs: Passed through to requests.Session.request (verify, timeout, ...)
+
+        Returns:
+            requests.Response: The response
+        """
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request over the pooled session."""
+        return self.request("GET", url, **kwargs)
+
+    def get_stats(self):
+        """
+        Get pool statistics.
+
+        Session hits/misses count how often a caller found an existing host
+        session. Per-host connection counters come straight from the urllib3
+        pools: every request that did not open a new connection was served
+        from a kept-alive one.
+
+        Returns:
+            dict: Pool statistics
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+            stats = {
+                'pool_size': self.pool_size,
+                'session_hits': self._session_hits,
+                'session_misses': self._session_misses,
+                'hosts': {}
+            }
+
+        for host_key, session in sessions.items():
+            adapter = session.get_adapter(host_key + "/")
+            requests_sent = 0
+            connections_opened = 0
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+            stats['hosts'][host_key] = {
+                'requests': requests_sent,
+                'connections_opened': connections_opened,
+                'pool_hits': max(requests_sent - connections_opened, 0),
+                'pool_misses': connections_opened
+            }
+
+        stats['pool_hits'] = sum(h['pool_hits'] for h in stats['hosts'].values())
+        stats['pool_misses'] = sum(h['pool_misses'] for h in stats['hosts'].values())
+        return stats
+
+    def close(self):
+        """Close every pooled session and drop the idle connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# Global transport instance (created lazily)
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """
+    Get the process-wide Meraki transport.
+
+    Returns:
+        MerakiTransport: Shared transport instance
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = MerakiTransport()
+    return _transport
+
+
+def configure_transport(pool_size=None, pool_block=None):
+    """
+    Replace the global transport with one using different pool settings.
+
+    Args:
+        pool_size (int, optional): Keep-alive connections per host
+        pool_block (bool, optional): Block when the pool is exhausted
+
+    Returns:
+        MerakiTransport: The new transport instance
+    """
+    global _transport
+    with _transport_lock:
+        old_transport = _transport
+        _transport = MerakiTransport(
+            pool_size=pool_size if pool_size is not None else DEFAULT_POOL_SIZE,
+            pool_block=pool_block if pool_block is not None else DEFAULT_POOL_BLOCK
+        )
+    if old_transport is not None:
+        old_transport.close()
+    return _transport
@@ -0,0 +1,559 @@
+"""
+Meraki Rate Limit Scheduler Module
+
+The Meraki Dashboard API allows each organization roughly 10 requests per
+second and answers anything above that with ``429 Too Many Requests`` and a
+``Retry-After`` header. Parallel web users, the CLI and the AI maintenance loop
+all share that budget, so every Meraki call - custom mode through
+make_meraki_request and SDK mode through RateLimitedDashboard - is scheduled
+here:
+
+- one token bucket per organization, refilled at the org rate limit
+- a priority queue per organization, so interactive UI requests are served
+  before background refreshes, FIFO within the same priority
+- Retry-After handling that pauses the whole organization's bucket, not just
+  the request that was throttled
+- queue depth and wait-time metrics for /health
+
+Requests are attributed to an organization from their path. Network ids and
+device serials are learned from API responses so /networks/... and
+/devices/... calls land in the right bucket.
+"""
+
+import os
+import re
+import time
+import heapq
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+# Priorities - lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BACKGROUND: 'background'
+}
+
+# Default limits - can be tuned through the environment
+DEFAULT_ORG_RATE = float(os.getenv('MERAKI_ORG_RATE_LIMIT', 10))
+DEFAULT_ORG_BURST = int(os.getenv('MERAKI_ORG_BURST', 10))
+DEFAULT_MAX_429_RETRIES = 5
+DEFAULT_RETRY_AFTER = 1.0
+
+# Bucket used when a request cannot be attributed to an organization yet
+UNKNOWN_ORG = 'unknown'
+
+# Request priority for the current thread / asyncio task
+_request_priority = contextvars.ContextVar('meraki_request_priority', default=PRIORITY_INTERACTIVE)
+
+_PATH_SCOPE_RE = re.compile(r'/(organizations|networks|devices)/([^/?#]+)')
+_SDK_SCOPE_RE = re.compile(r'^[a-z]+(Organization|Network|Device)')
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request waited longer than its timeout for a token."""
+
+
+def get_request_priority():
+    """Get the Meraki request priority of the current context."""
+    return _request_priority.get()
+
+
+def set_request_priority(priority):
+    """
+    Set the Meraki request priority of the current context.
+
+    Args:
+        priority (int): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        contextvars.Token: Token for reset_request_priority
+    """
+    return _request_priority.set(priority)
+
+
+def reset_request_priority(token):
+    """Restore the priority that was active before set_request_priority."""
+    _request_priority.reset(token)
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    Run a block of Meraki calls at the given priority.
+
+    Example:
+        with request_priority(PRIORITY_BACKGROUND):
+            refresh_all_networks()
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def retry_after_from(result):
+    """
+    Get the Retry-After delay from a 429 response or exception.
+
+    Works with requests responses, requests.HTTPError and meraki.APIError.
+
+    Args:
+        result: Response object or exception
+
+    Returns:
+        float or None: Seconds to wait, or None if ``result`` is not a 429
+    """
+    response = getattr(result, 'response', None)
+    status = getattr(result, 'status_code', None)
+    if status is None:
+        status = getattr(result, 'status', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None)
+    try:
+        if int(status) != 429:
+            return None
+    except (TypeError, ValueError):
+        return None
+
+    headers = getattr(result, 'headers', None)
+    if headers is None and response is not None:
+        headers = getattr(response, 'headers', None)
+    value = (headers or {}).get('Retry-After')
+    if not value:
+        return DEFAULT_RETRY_AFTER
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        # HTTP-date form
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate, capacity):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def time_until_token(self, now):
+        """Seconds until a token can be taken (0 if one is available now)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        """Take one token; callers check time_until_token first."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def block(self, seconds, now):
+        """Stop handing out tokens for ``seconds`` (Retry-After)."""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = max(self.updated, self.blocked_until)
+
+
+class MerakiRateScheduler:
+    """
+    Per-organization token-bucket scheduler shared by every Meraki call.
+
+    ``acquire`` blocks the calling thread until its organization has a token
+    and no higher-priority (or earlier, same-priority) request is waiting.
+    ``call`` wraps a request function with acquire and Retry-After handling.
+    """
+
+    def __init__(self, rate=DEFAULT_ORG_RATE, burst=DEFAULT_ORG_BURST):
+        """
+        Initialize the scheduler.
+
+        Args:
+            rate (float): Requests per second allowed per organization
+            burst (int): Requests that may be sent back to back after idling
+        """
+        self.rate = rate
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._buckets = {}
+        self._queues = {}
+        self._metrics = {}
+        self._network_orgs = {}
+        self._device_orgs = {}
+
+    # --- Organization attribution ---
+
+    def org_for_path(self, path):
+        """
+        Get the organization a request path counts against.
+
+        Args:
+            path (str): API path or full URL
+
+        Returns:
+            str: Organization id, or UNKNOWN_ORG
+        """
+        match = _PATH_SCOPE_RE.search(path or '')
+        if not match:
+            return UNKNOWN_ORG
+        scope, value = match.groups()
+        if scope == 'organizations':
+            return value
+        if scope == 'networks':
+            return self._network_orgs.get(value, UNKNOWN_ORG)
+        return self._device_orgs.get(value, UNKNOWN_ORG)
+
+    def org_for_sdk_call(self, method_name, args, kwargs):
+        """
+        Get the organization an SDK method call counts against.
+
+        Args:
+            method_name (str): SDK method, e.g. 'getNetworkDevices'
+            args (tuple): Positional arguments
+            kwargs (dict): Keyword arguments
+
+        Returns:
+            str: Organization id, or UNKNOWN_ORG
+        """
+        if kwargs.get('organizationId'):
+            return str(kwargs['organizationId'])
+        if kwargs.get('networkId'):
+            return self._network_orgs.get(kwargs['networkId'], UNKNOWN_ORG)
+        if kwargs.get('serial'):
+            return self._device_orgs.get(kwargs['serial'], UNKNOWN_ORG)
+
+        match = _SDK_SCOPE_RE.match(method_name)
+        if not match or not args:
+            return UNKNOWN_ORG
+        scope = match.group(1)
+        if scope == 'Organization':
+            return str(args[0])
+        if scope == 'Network':
+            return self._network_orgs.get(args[0], UNKNOWN_ORG)
+        return self._device_orgs.get(args[0], UNKNOWN_ORG)
+
+    def learn(self, data, org_id=None, network_id=None):
+        """
+        Record network -> org and serial -> org mappings from API data.
+
+        Args:
+            data (list or dict): API response body
+            org_id (str, optional): Organization the request was scoped to
+            network_id (str, optional): Network the request was scoped to
+        """
+        if isinstance(data, dict):
+            items = [data]
+        elif isinstance(data, list):
+            items = data
+        else:
+            return
+
+        if org_id == UNKNOWN_ORG:
+            org_id = None
+        if network_id and not org_id:
+            org_id = self._network_orgs.get(network_id)
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_org = item.get('organizationId') or org_id
+            if not item_org:
+                item_org = self._network_orgs.get(item.get('networkId'))
+            if not item_org:
+                continue
+            if 'productTypes' in item and item.get('id'):
+                self._network_orgs[item['id']] = item_org
+            if item.get('networkId'):
+                self._network_orgs.setdefault(item['networkId'], item_org)
+            if item.get('serial'):
+                self._device_orgs[item['serial']] = item_org
+
+    def learn_from_path(self, path, data):
+        """
+        Record org mappings from the response to a request path.
+
+        Args:
+            path (str): API path or full URL the data came from
+            data (list or dict): API response body
+        """
+        match = _PATH_SCOPE_RE.search(path or '')
+        if not match:
+            return
+        scope, value = match.groups()
+        if scope == 'organizations':
+            self.learn(data, org_id=value)
+        elif scope == 'networks':
+            self.learn(data, network_id=value)
+
+    # --- Scheduling ---
+
+    def _org_state(self, org):
+        if org not in self._buckets:
+            self._buckets[org] = TokenBucket(self.rate, self.burst)
+            self._queues[org] = []
+            self._metrics[org] = {
+                'granted': 0,
+                'throttled': 0,
+                'max_queue_depth': 0,
+                'total_wait': 0.0,
+                'max_wait': 0.0,
+                'by_priority': {}
+            }
+        return self._buckets[org], self._queues[org], self._metrics[org]
+
+    def acquire(self, org_key=None, priority=None, timeout=None):
+        """
+        Block until a request for ``org_key`` may be sent.
+
+        Args:
+            org_key (str, optional): Organization id (UNKNOWN_ORG if omitted)
+            priority (int, optional): Defaults to the current context priority
+            timeout (float, optional): Give up after this many seconds
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If no token was granted within ``timeout``
+        """
+        org = org_key or UNKNOWN_ORG
+        if priority is None:
+            priority = get_request_priority()
+
+        with self._cond:
+            bucket, queue, metrics = self._org_state(org)
+            entry = (priority, next(self._seq))
+            heapq.heappush(queue, entry)
+            metrics['max_queue_depth'] = max(metrics['max_queue_depth'], len(queue))
+            start = time.monotonic()
+            granted = False
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if queue[0] == entry:
+                        wait = bucket.time_until_token(now)
+                        if wait <= 0:
+                            bucket.take(now)
+                            heapq.heappop(queue)
+                            granted = True
+                            break
+                    if timeout is not None:
+                        remaining = start + timeout - now
+                        if remaining <= 0:
+                            raise RateLimitTimeout(f"No Meraki rate-limit token for org {org} within {timeout}s")
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                if not granted:
+                    queue.remove(entry)
+                    heapq.heapify(queue)
+                # Let the next request in line re-check the bucket
+                self._cond.notify_all()
+
+            waited = time.monotonic() - start
+            metrics['granted'] += 1
+            metrics['total_wait'] += waited
+            metrics['max_wait'] = max(metrics['max_wait'], waited)
+            name = PRIORITY_NAMES.get(priority, str(priority))
+            prio = metrics['by_priority'].setdefault(name, {'granted': 0, 'total_wait': 0.0})
+            prio['granted'] += 1
+            prio['total_wait'] += waited
+
+        if waited > 1:
+            logger.debug(f"Meraki request for org {org} waited {waited:.2f}s for a rate-limit token")
+        return waited
+
+    def penalize(self, org_key, retry_after):
+        """
+        Pause an organization's bucket after a 429.
+
+        Args:
+            org_key (str): Organization id
+            retry_after (float): Seconds from the Retry-After header
+        """
+        org = org_key or UNKNOWN_ORG
+        with self._cond:
+            bucket, _, metrics = self._org_state(org)
+            bucket.block(retry_after, time.monotonic())
+            metrics['throttled'] += 1
+            self._cond.notify_all()
+        logger.warning(f"Meraki rate limit hit for org {org}, pausing {retry_after:.1f}s")
+
+    def call(self, org_key, func, priority=None, max_retries=DEFAULT_MAX_429_RETRIES):
+        """
+        Run ``func`` under the rate limit, retrying 429s after Retry-After.
+
+        ``func`` may either return a response with status 429 or raise an
+        exception carrying one (requests.HTTPError, meraki.APIError).
+
+        Args:
+            org_key (str): Organization id
+            func (callable): Sends one request
+            priority (int, optional): Defaults to the current context priority
+            max_retries (int): 429 retries before the last result is returned
+
+        Returns:
+            The return value of ``func``
+        """
+        for attempt in range(max_retries + 1):
+            self.acquire(org_key, priority)
+            try:
+                result = func()
+            except Exception as e:
+                retry_after = retry_after_from(e)
+                if retry_after is None or attempt == max_retries:
+                    raise
+                self.penalize(org_key, retry_after)
+                continue
+
+            retry_after = retry_after_from(result)
+            if retry_after is None or attempt == max_retries:
+                return result
+            self.penalize(org_key, retry_after)
+        return result
+
+    # --- Metrics ---
+
+    def get_metrics(self):
+        """
+        Get per-organization queue and wait-time metrics.
+
+        Returns:
+            dict: Scheduler settings and per-org queue depth, waits and 429s
+        """
+        now = time.monotonic()
+        with self._cond:
+            orgs = {}
+            for org, metrics in self._metrics.items():
+                bucket = self._buckets[org]
+                granted = metrics['granted']
+                orgs[org] = {
+                    'queue_depth': len(self._queues[org]),
+                    'max_queue_depth': metrics['max_queue_depth'],
+                    'granted': granted,
+                    'throttled_429': metrics['throttled'],
+                    'avg_wait_ms': round(metrics['total_wait'] / granted * 1000, 1) if granted else 0.0,
+                    'max_wait_ms': round(metrics['max_wait'] * 1000, 1),
+                    'paused_for_seconds': round(max(bucket.blocked_until - now, 0), 2),
+                    'by_priority': {
+                        name: {
+                            'granted': p['granted'],
+                            'avg_wait_ms': round(p['total_wait'] / p['granted'] * 1000, 1) if p['granted'] else 0.0
+                        }
+                        for name, p in metrics['by_priority'].items()
+                    }
+                }
+            return {
+                'rate_per_org': self.rate,
+                'burst': self.burst,
+                'known_networks': len(self._network_orgs),
+                'known_devices': len(self._device_orgs),
+                'organizations': orgs
+            }
+
+
+class _RateLimitedSection:
+    """One SDK API section (organizations, networks, ...) behind the scheduler."""
+
+    def __init__(self, section, scheduler):
+        self._section = section
+        self._scheduler = scheduler
+
+    def __getattr__(self, name):
+        attr = getattr(self._section, name)
+        if not callable(attr) or name.startswith('_'):
+            return attr
+
+        scheduler = self._scheduler
+
+        def _call(*args, **kwargs):
+            org = scheduler.org_for_sdk_call(name, args, kwargs)
+            result = scheduler.call(org, lambda: attr(*args, **kwargs))
+            if name.startswith('get'):
+                network_id = kwargs.get('networkId')
+                match = _SDK_SCOPE_RE.match(name)
+                if not network_id and args and match and match.group(1) == 'Network':
+                    network_id = args[0]
+                scheduler.learn(result, org_id=org, network_id=network_id)
+            return result
+
+        _call.__name__ = name
+        _call.__doc__ = getattr(attr, '__doc__', None)
+        return _call
+
+
+class RateLimitedDashboard:
+    """
+    Proxy around meraki.DashboardAPI that sends every call through the scheduler.
+
+    The SDK should be created with ``wait_on_rate_limit=False`` so 429s reach
+    the scheduler, which pauses the whole organization instead of sleeping in
+    one thread.
+    """
+
+    def __init__(self, dashboard, scheduler=None):
+        self._dashboard = dashboard
+        self._scheduler = scheduler or get_rate_scheduler()
+        self._sections = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._dashboard, name)
+        if name.startswith('_') or callable(attr) or isinstance(attr, (str, int, float, bool, type(None))):
+            return attr
+        if name not in self._sections:
+            self._sections[name] = _RateLimitedSection(attr, self._scheduler)
+        return self._sections[name]
+
+
+# Global scheduler instance (created lazily)
+_rate_scheduler = None
+_rate_scheduler_lock = threading.Lock()
+
+
+def get_rate_scheduler():
+    """
+    Get the process-wide Meraki rate scheduler.
+
+    Returns:
+        MerakiRateScheduler: Shared scheduler instance
+    """
+    global _rate_scheduler
+    if _rate_scheduler is None:
+        with _rate_scheduler_lock:
+            if _rate_scheduler is None:
+                _rate_scheduler = MerakiRateScheduler()
+    return _rate_scheduler
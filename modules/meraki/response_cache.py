@@ -0,0 +1,471 @@
+"""
+Meraki Response Cache Module
+
+Read-through cache in front of the Meraki API. Every page load of the topology,
+visualization and network status views used to re-fetch devices and 24h of
+clients even when the same network was loaded a second ago.
+
+- Per-endpoint TTLs: long for organizations and networks, short for statuses
+  and clients (see DEFAULT_TTLS)
+- Stale-while-revalidate: an expired entry is still served for another TTL
+  while a background refresh fetches the new copy at background priority
+- LRU eviction bounded by an approximate memory cap
+- Explicit invalidation by path fragment, network or organization, plus
+  listener hooks so other caches can follow along
+- Hit, stale-hit and miss counters for /health
+
+Keys include a hash of the API key, so users with different keys never see
+each other's data. Cached values are shared between callers and must be
+treated as read-only (copy before annotating records).
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import contextvars
+import logging
+import threading
+from collections import OrderedDict
+
+from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, request_priority
+
+# TTLs in seconds per endpoint kind - override per instance with ResponseCache(ttls=...)
+DEFAULT_TTLS = {
+    'organizations': 3600,
+    'networks': 900,
+    'devices': 300,
+    'topology': 300,
+    'clients': 60,
+    'statuses': 30,
+    'default': 60
+}
+
+DEFAULT_MAX_BYTES = int(float(os.getenv('MERAKI_CACHE_MAX_MB', 128)) * 1024 * 1024)
+CACHE_ENABLED = os.getenv('MERAKI_CACHE_ENABLED', 'True').lower() == 'true'
+
+# Resource words -> endpoint kind; the last known word in a path wins
+_KIND_WORDS = {
+    'statuses': 'statuses', 'status': 'statuses', 'health': 'statuses',
+    'uplink': 'statuses', 'uplinks': 'statuses', 'latest': 'statuses',
+    'clients': 'clients', 'client': 'clients',
+    'topology': 'topology', 'links': 'topology', 'link': 'topology',
+    'devices': 'devices', 'device': 'devices', 'inventory': 'devices', 'ports': 'devices',
+    'networks': 'networks', 'network': 'networks',
+    'organizations': 'organizations', 'organization': 'organizations'
+}
+
+_TOKEN_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])')
+
+# Never cached: live tools are polled until their result changes
+UNCACHED_WORDS = ('livetools',)
+
+# SDK method prefixes that change state and invalidate their scope
+WRITE_PREFIXES = ('create', 'update', 'delete', 'claim', 'remove', 'reboot', 'provision', 'bind', 'unbind', 'split', 'combine')
+
+logger = logging.getLogger(__name__)
+
+
+def endpoint_kind(path_or_method):
+    """
+    Classify an API path or SDK method name for TTL selection.
+
+    Args:
+        path_or_method (str): e.g. '/networks/N_1/clients' or 'getNetworkClients'
+
+    Returns:
+        str: One of the DEFAULT_TTLS keys
+    """
+    if '/' in path_or_method:
+        tokens = [seg.lower() for seg in path_or_method.split('?')[0].strip('/').split('/')]
+    else:
+        tokens = [tok.lower() for tok in _TOKEN_RE.findall(path_or_method)]
+    for token in reversed(tokens):
+        if token in _KIND_WORDS:
+            return _KIND_WORDS[token]
+    return 'default'
+
+
+def make_cache_key(api_key, path, params=None):
+    """
+    Build a cache key from the caller's API key, path and query parameters.
+
+    Args:
+        api_key (str): Meraki API key (only a hash is kept)
+        path (str): API path or SDK method name
+        params (dict, optional): Query parameters / call arguments
+
+    Returns:
+        tuple: Hashable cache key
+    """
+    key_hash = hashlib.sha256((api_key or '').encode()).hexdigest()[:16]
+    param_items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (key_hash, path, param_items)
+
+
+def is_cacheable(path_or_method):
+    """Check whether an API path or SDK method may be served from the cache."""
+    lowered = path_or_method.lower()
+    return not any(word in lowered for word in UNCACHED_WORDS)
+
+
+def estimate_size(value):
+    """Approximate in-memory size of a JSON-like value in bytes."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU response cache with per-endpoint TTLs and stale-while-revalidate.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttls=None, enabled=CACHE_ENABLED):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Approximate memory cap for all cached values
+            ttls (dict, optional): Overrides for DEFAULT_TTLS
+            enabled (bool): When False, every lookup is a miss and nothing is stored
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._refreshing = set()
+        self._listeners = []
+        self._stats = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'oversize_skips': 0
+        }
+
+    def ttl_for(self, path):
+        """Get the TTL in seconds for an API path or SDK method name."""
+        return self.ttls.get(endpoint_kind(path), self.ttls['default'])
+
+    # --- Lookups ---
+
+    def get(self, key, refresh=None):
+        """
+        Look up a cached value.
+
+        Args:
+            key (tuple): Key from make_cache_key
+            refresh (callable, optional): ``refresh() -> (value, size)`` run in
+                the background when a stale entry is served
+
+        Returns:
+            tuple: (value, state) where state is 'fresh', 'stale' or 'miss'
+        """
+        if not self.enabled:
+            return None, 'miss'
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, 'miss'
+
+            age = now - entry['stored_at']
+            if age < entry['ttl']:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry['value'], 'fresh'
+
+            if age < entry['ttl'] * 2:
+                # Stale-while-revalidate window: serve now, refresh behind
+                self._entries.move_to_end(key)
+                self._stats['stale_hits'] += 1
+                value = entry['value']
+            else:
+                self._stats['misses'] += 1
+                return None, 'miss'
+
+        if refresh is not None:
+            self.refresh_async(key, entry['path'], refresh)
+        return value, 'stale'
+
+    def put(self, key, path, value, size=None):
+        """
+        Store a value, evicting least recently used entries past the memory cap.
+
+        Args:
+            key (tuple): Key from make_cache_key
+            path (str): API path or SDK method name (selects the TTL)
+            value: JSON-like value to cache
+            size (int, optional): Size in bytes if already known
+        """
+        if not self.enabled:
+            return
+        if size is None:
+            size = estimate_size(value)
+        if size > self.max_entry_bytes:
+            with self._lock:
+                self._stats['oversize_skips'] += 1
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old['size']
+            self._entries[key] = {
+                'value': value,
+                'size': size,
+                'path': path,
+                'ttl': self.ttl_for(path),
+                'stored_at': time.time()
+            }
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted['size']
+                self._stats['evictions'] += 1
+
+    def get_or_fetch(self, key, path, fetch):
+        """
+        Read-through lookup.
+
+        Args:
+            key (tuple): Key from make_cache_key
+            path (str): API path or SDK method name
+            fetch (callable): ``fetch() -> (value, size)``; size may be None
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value, state = self.get(key, refresh=fetch)
+        if state != 'miss':
+            return value
+        value, size = fetch()
+        self.put(key, path, value, size)
+        return value
+
+    def refresh_async(self, key, path, fetch):
+        """
+        Refresh one entry in a background thread unless a refresh is running.
+
+        Args:
+            key (tuple): Key from make_cache_key
+            path (str): API path or SDK method name
+            fetch (callable): ``fetch() -> (value, size)``
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _worker():
+            try:
+                # Revalidation must not compete with interactive requests
+                with request_priority(PRIORITY_BACKGROUND):
+                    value, size = fetch()
+                self.put(key, path, value, size)
+                with self._lock:
+                    self._stats['refreshes'] += 1
+            except Exception as e:
+                with self._lock:
+                    self._stats['refresh_errors'] += 1
+                logger.warning(f"Background refresh of {path} failed, keeping stale copy: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        # Carry the caller's context into the thread; _worker then drops to background
+        # priority, since nobody is waiting on a revalidation
+        threading.Thread(target=contextvars.copy_context().run, args=(_worker,),
+                         name="meraki-cache-refresh", daemon=True).start()
+
+    # --- Invalidation ---
+
+    def add_invalidation_listener(self, callback):
+        """
+        Register ``callback(fragment)`` to be called after every invalidation.
+
+        Args:
+            callback (callable): Receives the path fragment that was invalidated
+                                 (None for a full clear)
+        """
+        self._listeners.append(callback)
+
+    def invalidate(self, fragment=None):
+        """
+        Drop cached entries whose path contains ``fragment`` (all if omitted).
+
+        Args:
+            fragment (str, optional): Path fragment, e.g. '/networks/N_1/'
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            if fragment is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+            else:
+                keys = [k for k, e in self._entries.items() if fragment in e['path']]
+                for k in keys:
+                    self._bytes -= self._entries.pop(k)['size']
+                removed = len(keys)
+            self._stats['invalidations'] += removed
+
+        for callback in list(self._listeners):
+            try:
+                callback(fragment)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}")
+        if removed:
+            logger.info(f"Invalidated {removed} cached Meraki responses ({fragment or 'all'})")
+        return removed
+
+    def invalidate_scope(self, scope_id):
+        """
+        Drop cached entries for one network, organization or device.
+
+        Matches whole path segments and exact parameter values, so 'N_1'
+        does not also drop 'N_10'.
+
+        Args:
+            scope_id (str): Network ID, organization ID or device serial
+
+        Returns:
+            int: Number of entries removed
+        """
+        scope_id = str(scope_id)
+        with self._lock:
+            keys = [k for k, e in self._entries.items()
+                    if scope_id in e['path'].split('/') or any(v == scope_id for _, v in k[2])]
+            for k in keys:
+                self._bytes -= self._entries.pop(k)['size']
+            self._stats['invalidations'] += len(keys)
+
+        for callback in list(self._listeners):
+            try:
+                callback(scope_id)
+            except Exception as e:
+                logger.error(f"Cache invalidation listener failed: {e}")
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached Meraki responses for {scope_id}")
+        return len(keys)
+
+    def invalidate_network(self, network_id):
+        """Drop every cached response scoped to one network."""
+        return self.invalidate_scope(network_id)
+
+    def invalidate_organization(self, org_id):
+        """Drop every cached response scoped to one organization."""
+        return self.invalidate_scope(org_id)
+
+    # --- Metrics ---
+
+    def get_stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Entry count, bytes, hit ratio and raw counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            stats['max_bytes'] = self.max_bytes
+            stats['enabled'] = self.enabled
+            stats['refreshing'] = len(self._refreshing)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['stale_hits']) / lookups, 3) if lookups else 0.0
+        stats['ttls'] = dict(self.ttls)
+        return stats
+
+
+class _CachedSection:
+    """One SDK section (organizations, networks, ...) behind the response cache."""
+
+    def __init__(self, section, name, api_key, cache):
+        self._section = section
+        self._name = name
+        self._api_key = api_key
+        self._cache = cache
+
+    def __getattr__(self, method_name):
+        attr = getattr(self._section, method_name)
+        if not callable(attr) or method_name.startswith('_'):
+            return attr
+
+        if method_name.startswith('get') and is_cacheable(method_name):
+            def cached_call(*args, **kwargs):
+                params = {str(i): arg for i, arg in enumerate(args)}
+                params.update(kwargs)
+                key = make_cache_key(self._api_key, f"sdk:{self._name}.{method_name}", params)
+                return self._cache.get_or_fetch(key, method_name, lambda: (attr(*args, **kwargs), None))
+            return cached_call
+
+        if method_name.startswith(WRITE_PREFIXES):
+            def invalidating_call(*args, **kwargs):
+                try:
+                    return attr(*args, **kwargs)
+                finally:
+                    # The first positional argument is the network, org or serial being changed
+                    if args:
+                        self._cache.invalidate_scope(args[0])
+            return invalidating_call
+
+        return attr
+
+
+class CachedDashboard:
+    """
+    Proxy around a dashboard object (SDK, async facade) that serves get* calls
+    from the response cache and invalidates the affected scope on writes.
+
+    The custom dashboard does not need it: meraki_api caches its reads itself.
+    """
+
+    def __init__(self, dashboard, api_key, cache=None):
+        self._dashboard = dashboard
+        self._api_key = api_key
+        self._cache = cache or get_response_cache()
+        self._sections = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._dashboard, name)
+        if name.startswith('_') or callable(attr) or isinstance(attr, (str, int, float, bool, type(None))):
+            return attr
+        if name not in self._sections:
+            self._sections[name] = _CachedSection(attr, name, self._api_key, self._cache)
+        return self._sections[name]
+
+
+# Global cache instance (created lazily)
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get the process-wide Meraki response cache.
+
+    Returns:
+        ResponseCache: Shared cache instance
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
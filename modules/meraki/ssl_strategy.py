@@ -0,0 +1,324 @@
+"""
+Meraki SSL Strategy Module
+
+This module remembers which SSL verification mode works for each upstream
+host. Corporate proxies that re-sign TLS traffic used to force every Meraki
+call through the full certifi -> system -> no-verification cascade, paying one
+or two failed handshakes per request. The cascade now runs once per host; the
+mode that worked is cached with a TTL and re-probed in a background thread when
+the entry expires or the cached mode starts failing.
+"""
+
+import os
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+# Modes in order of preference - most secure first
+SSL_MODES = ['certifi', 'system', 'insecure']
+
+SSL_MODE_NAMES = {
+    'certifi': 'certifi bundle',
+    'system': 'system default',
+    'insecure': 'no verification (corporate fallback)'
+}
+
+# Default lifetime of a remembered mode - can be tuned through the environment
+DEFAULT_SSL_STRATEGY_TTL = int(os.getenv('MERAKI_SSL_STRATEGY_TTL', 3600))
+DEFAULT_PROBE_TIMEOUT = 10
+
+logger = logging.getLogger(__name__)
+
+
+def verify_for_mode(mode):
+    """
+    Translate an SSL mode into the value passed as requests' ``verify``.
+
+    Args:
+        mode (str): One of SSL_MODES
+
+    Returns:
+        str or bool: CA bundle path, True or False
+    """
+    if mode == 'certifi':
+        import certifi
+        return certifi.where()
+    if mode == 'system':
+        return True
+    if mode == 'insecure':
+        return False
+    raise ValueError(f"Unknown SSL mode: {mode}")
+
+
+def host_for_url(url):
+    """Return the host[:port] the strategy for ``url`` is keyed on."""
+    return urlparse(url).netloc or url
+
+
+def default_probe(host, mode, timeout=DEFAULT_PROBE_TIMEOUT):
+    """
+    Check whether a TLS handshake to ``host`` succeeds with ``mode``.
+
+    Any HTTP response - even a 404 - proves the handshake worked, so the probe
+    sends an unauthenticated HEAD to the host root.
+
+    Args:
+        host (str): Host[:port] to probe
+        mode (str): SSL mode to try
+        timeout (int): Probe timeout in seconds
+
+    Returns:
+        bool: True if the handshake succeeded
+    """
+    import requests
+    import urllib3
+
+    if mode == 'insecure':
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    try:
+        requests.head(f"https://{host}/", timeout=timeout, verify=verify_for_mode(mode),
+                      allow_redirects=False)
+        return True
+    except requests.exceptions.SSLError:
+        return False
+    except requests.exceptions.RequestException as e:
+        # Not an SSL problem - treat as inconclusive and keep the old mode
+        logger.debug(f"SSL probe of {host} with {mode} inconclusive: {e}")
+        return None
+
+
+class SSLStrategyCache:
+    """
+    Per-host cache of the SSL verification mode that last worked.
+
+    Callers ask ``modes_for(host)`` for the order in which to try modes; the
+    remembered mode comes first so a healthy host costs exactly one request.
+    ``record_success`` and ``record_failure`` keep the cache current, and an
+    expired entry keeps being used while a background thread re-probes it.
+    """
+
+    def __init__(self, ttl=DEFAULT_SSL_STRATEGY_TTL, probe=default_probe):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (int): Seconds a remembered mode is trusted before re-probing
+            probe (callable): ``probe(host, mode) -> bool or None`` used by
+                              background re-probes
+        """
+        self.ttl = ttl
+        self.probe = probe
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_mode(self, host):
+        """
+        Get the remembered mode for a host.
+
+        Args:
+            host (str): Host[:port]
+
+        Returns:
+            str or None: Cached mode, or None if the host has not been probed
+        """
+        with self._lock:
+            entry = self._entries.get(host)
+            return entry['mode'] if entry else None
+
+    def modes_for(self, host, allow_insecure=True):
+        """
+        Get the order in which SSL modes should be tried for a host.
+
+        Args:
+            host (str): Host[:port]
+            allow_insecure (bool): Whether the no-verification fallback may be used
+
+        Returns:
+            list: Modes to try, remembered mode first
+        """
+        candidates = [m for m in SSL_MODES if allow_insecure or m != 'insecure']
+        expired = False
+
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry['mode'] in candidates:
+                expired = time.time() >= entry['expires_at']
+                candidates.remove(entry['mode'])
+                candidates.insert(0, entry['mode'])
+
+        if expired:
+            self.refresh_async(host)
+        return candidates
+
+    def record_success(self, host, mode):
+        """
+        Remember that ``mode`` worked for ``host``.
+
+        A success with the already-cached mode does not extend its TTL, so
+        hosts stuck on a fallback mode are still re-probed periodically.
+
+        Args:
+            host (str): Host[:port]
+            mode (str): Mode that succeeded
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry['mode'] == mode:
+                entry['successes'] += 1
+                entry['last_success'] = now
+                return
+
+            previous = entry['mode'] if entry else None
+            self._entries[host] = {
+                'mode': mode,
+                'probed_at': now,
+                'expires_at': now + self.ttl,
+                'last_success': now,
+                'successes': 1,
+                'failures': entry['failures'] if entry else 0,
+                'reprobes': entry['reprobes'] if entry else 0
+            }
+
+        if previous is None:
+            logger.info(f"SSL mode for {host}: {SSL_MODE_NAMES[mode]}")
+        else:
+            logger.warning(f"SSL mode for {host} changed: {SSL_MODE_NAMES[previous]} -> {SSL_MODE_NAMES[mode]}")
+
+    def record_failure(self, host, mode):
+        """
+        Note an SSL failure for ``host`` with ``mode``.
+
+        If the failing mode is the cached one, the entry is expired so the
+        next caller (and a background probe) look for a working mode again.
+
+        Args:
+            host (str): Host[:port]
+            mode (str): Mode that failed
+        """
+        with self._lock:
+            entry = self._entries.get(host)
+            if not entry or entry['mode'] != mode:
+                return
+            entry['failures'] += 1
+            entry['expires_at'] = 0
+        logger.warning(f"Cached SSL mode {SSL_MODE_NAMES[mode]} failed for {host}, re-probing")
+        self.refresh_async(host)
+
+    def refresh(self, host):
+        """
+        Re-probe a host synchronously, most secure mode first.
+
+        Args:
+            host (str): Host[:port]
+
+        Returns:
+            str or None: Mode that worked, or None if the probe was inconclusive
+        """
+        for mode in SSL_MODES:
+            result = self.probe(host, mode)
+            if result is None:
+                # Network trouble - keep what we have and retry after another TTL
+                with self._lock:
+                    entry = self._entries.get(host)
+                    if entry:
+                        entry['expires_at'] = time.time() + self.ttl
+                        entry['reprobes'] += 1
+                return None
+            if result:
+                with self._lock:
+                    entry = self._entries.get(host)
+                    if entry:
+                        entry['reprobes'] += 1
+                        if entry['mode'] == mode:
+                            entry['probed_at'] = time.time()
+                            entry['expires_at'] = entry['probed_at'] + self.ttl
+                            return mode
+                self.record_success(host, mode)
+                return mode
+        return None
+
+    def refresh_async(self, host):
+        """
+        Re-probe a host in a background thread unless one is already running.
+
+        Args:
+            host (str): Host[:port]
+        """
+        with self._lock:
+            if host in self._refreshing:
+                return
+            self._refreshing.add(host)
+
+        def _worker():
+            try:
+                self.refresh(host)
+            except Exception as e:
+                logger.error(f"SSL re-probe of {host} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(host)
+
+        threading.Thread(target=_worker, name=f"ssl-probe-{host}", daemon=True).start()
+
+    def invalidate(self, host=None):
+        """
+        Forget the remembered mode for one host, or for every host.
+
+        Args:
+            host (str, optional): Host[:port]; all hosts when omitted
+        """
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(host, None)
+
+    def get_report(self):
+        """
+        Get the per-host SSL modes for health reporting.
+
+        Returns:
+            dict: host -> mode, verification flag, age and expiry information
+        """
+        now = time.time()
+        with self._lock:
+            entries = {host: dict(entry) for host, entry in self._entries.items()}
+            refreshing = set(self._refreshing)
+
+        report = {}
+        for host, entry in entries.items():
+            report[host] = {
+                'mode': entry['mode'],
+                'description': SSL_MODE_NAMES[entry['mode']],
+                'verified': entry['mode'] != 'insecure',
+                'age_seconds': round(now - entry['probed_at'], 1),
+                'expires_in_seconds': round(max(entry['expires_at'] - now, 0), 1),
+                'successes': entry['successes'],
+                'failures': entry['failures'],
+                'reprobes': entry['reprobes'],
+                'reprobing': host in refreshing
+            }
+        return report
+
+
+# Global strategy cache (created lazily)
+_ssl_strategy_cache = None
+_ssl_strategy_lock = threading.Lock()
+
+
+def get_ssl_strategy_cache():
+    """
+    Get the process-wide SSL strategy cache.
+
+    Returns:
+        SSLStrategyCache: Shared cache instance
+    """
+    global _ssl_strategy_cache
+    if _ssl_strategy_cache is None:
+        with _ssl_strategy_lock:
+            if _ssl_strategy_cache is None:
+                _ssl_strategy_cache = SSLStrategyCache()
+    return _ssl_strategy_cache
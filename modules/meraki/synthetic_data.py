@@ -0,0 +1,425 @@
+"""
+Synthetic Meraki Organization Module
+
+Deterministic, lazily generated Dashboard API data for load testing and
+benchmarks: organizations of 10 to 10,000 store networks, each with an MX,
+switches and access points, and up to 100k clients per organization.
+
+Nothing is stored per client - records are derived from (network, index) on
+demand, so a page of clients costs the same whether the org has 100 or 100k.
+Network IDs and serials encode their position, so lookups are O(1) without
+index dictionaries:
+
+- organization ID: '100000' + org index
+- network ID:      'L_' + organization ID + 6-digit network index
+- serial:          'Q' + org index + family ('MX'/'MS'/'MR') + '-NNNN-DDDD' (hex)
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+ORG_ID_BASE = 100000
+MAX_ORGANIZATIONS = 10
+
+# Client VLANs seen in QSR stores: POS (wired), corporate wireless, guest wireless
+CLIENT_VLANS = [10, 20, 30]
+CLIENT_SSIDS = {20: 'Corp', 30: 'Guest'}
+CLIENT_MANUFACTURERS = ['Apple', 'Samsung', 'Dell', 'HP', 'Lenovo', 'Zebra', 'Verifone', 'Microsoft']
+CLIENT_OS = ['iOS', 'Android', 'Windows 10', 'Windows 11', 'Linux', None]
+
+# Live tools results once a job completes
+LIVE_TOOL_RESULTS = {
+    'ping': lambda: {'sent': 5, 'received': 5, 'loss': {'percentage': 0},
+                     'latencies': {'minimum': 1.2, 'average': 2.4, 'maximum': 4.1},
+                     'replies': [{'sequenceId': i, 'size': 64, 'latency': 2.4} for i in range(5)]},
+    'throughputTest': lambda: {'speeds': {'downstream': 482.6}},
+    'speedTest': lambda: {'speeds': {'downstream': 482.6, 'upstream': 97.3}},
+    'routingTable': lambda: {'entries': [{'subnet': '0.0.0.0/0', 'nextHop': '10.0.0.1', 'interface': 'wan1'}]},
+    'ospfNeighbors': lambda: {'neighbors': []},
+    'cyclePort': lambda: {'ports': ['1']},
+}
+
+
+def _mix(a, b):
+    """Cheap deterministic hash of two ints (Knuth multiplicative)."""
+    return ((a * 2654435761) ^ (b * 40503) ^ (a * b * 97)) & 0xffffffff
+
+
+def _timestamp(offset_seconds):
+    """ISO8601 UTC timestamp offset_seconds before a fixed reference time."""
+    reference = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return (reference - timedelta(seconds=offset_seconds)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class SyntheticMerakiData:
+    """
+    Deterministic synthetic Dashboard data for one or more organizations.
+
+    Example:
+        data = SyntheticMerakiData(networks=1500, clients=100000)
+        org_id = data.organizations()[0]['id']
+        first_page = data.clients(data.networks(org_id)[0]['id'], 0, 1000)
+    """
+
+    def __init__(self, organizations=1, networks=10, clients=1000, devices_per_network=5, seed=0):
+        """
+        Initialize the dataset.
+
+        Args:
+            organizations (int): Number of organizations (1-10)
+            networks (int): Networks per organization
+            clients (int): Clients per organization, spread evenly over its networks
+            devices_per_network (int): MX + switches + APs per network (>= 2)
+            seed (int): Varies names, statuses and client attributes
+        """
+        if not 1 <= organizations <= MAX_ORGANIZATIONS:
+            raise ValueError(f"organizations must be between 1 and {MAX_ORGANIZATIONS}")
+        self.organization_count = organizations
+        self.network_count = networks
+        self.client_count_per_org = clients
+        self.devices_per_network = max(2, devices_per_network)
+        self.seed = seed
+        self.switch_count = max(1, (self.devices_per_network - 1) // 3)
+        self.ap_count = self.devices_per_network - 1 - self.switch_count
+        self.switch_model = 'MS120-8LP' if self.ap_count <= 6 else 'MS225-48LP'
+        # Org-wide lists are built once and reused for every page request
+        self._org_lists = {}
+
+    # --- Identifiers ---
+
+    def org_id(self, org_index):
+        return str(ORG_ID_BASE + org_index)
+
+    def network_id(self, org_index, net_index):
+        return f"L_{self.org_id(org_index)}{net_index:06d}"
+
+    def serial(self, org_index, net_index, dev_index):
+        return f"Q{org_index}{self._family(dev_index)}-{net_index:04X}-{dev_index:04X}"
+
+    def parse_org_id(self, org_id):
+        """Return the org index for an organization ID, or None if unknown."""
+        try:
+            index = int(org_id) - ORG_ID_BASE
+        except (TypeError, ValueError):
+            return None
+        return index if 0 <= index < self.organization_count else None
+
+    def parse_network_id(self, network_id):
+        """Return (org index, network index) for a network ID, or None if unknown."""
+        if not isinstance(network_id, str) or not network_id.startswith('L_') or len(network_id) != 14:
+            return None
+        org_index = self.parse_org_id(network_id[2:8])
+        try:
+            net_index = int(network_id[8:])
+        except ValueError:
+            return None
+        if org_index is None or not 0 <= net_index < self.network_count:
+            return None
+        return org_index, net_index
+
+    def parse_serial(self, serial):
+        """Return (org index, network index, device index) for a serial, or None if unknown."""
+        try:
+            org_index = int(serial[1])
+            net_index = int(serial[5:9], 16)
+            dev_index = int(serial[10:14], 16)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if (len(serial) != 14 or org_index >= self.organization_count or net_index >= self.network_count
+                or dev_index >= self.devices_per_network or serial[2:4] != self._family(dev_index)):
+            return None
+        return org_index, net_index, dev_index
+
+    def org_for_scope(self, kind, scope_id):
+        """Organization ID owning a network ID or serial (for rate limiting)."""
+        if kind == 'organizations':
+            return scope_id if self.parse_org_id(scope_id) is not None else None
+        parsed = self.parse_network_id(scope_id) if kind == 'networks' else self.parse_serial(scope_id)
+        return self.org_id(parsed[0]) if parsed else None
+
+    # --- Organizations and networks ---
+
+    def organizations(self):
+        return [self.organization(self.org_id(o)) for o in range(self.organization_count)]
+
+    def organization(self, org_id):
+        org_index = self.parse_org_id(org_id)
+        if org_index is None:
+            return None
+        return {
+            'id': org_id,
+            'name': f"Synthetic QSR Brand {org_index + 1}",
+            'url': f"https://n1.meraki.com/o/{org_id}/manage/organization/overview",
+            'api': {'enabled': True},
+            'licensing': {'model': 'co-term'},
+            'cloud': {'region': {'name': 'North America'}}
+        }
+
+    def networks(self, org_id):
+        org_index = self.parse_org_id(org_id)
+        if org_index is None:
+            return None
+        return [self._network(org_index, i) for i in range(self.network_count)]
+
+    def network(self, network_id):
+        parsed = self.parse_network_id(network_id)
+        return self._network(*parsed) if parsed else None
+
+    def _network(self, org_index, net_index):
+        store = 1000 + net_index
+        return {
+            'id': self.network_id(org_index, net_index),
+            'organizationId': self.org_id(org_index),
+            'name': f"Store {store}",
+            'productTypes': ['appliance', 'switch', 'wireless'],
+            'timeZone': 'America/New_York',
+            'tags': [f"region-{net_index % 12 + 1}"],
+            'enrollmentString': None,
+            'url': f"https://n1.meraki.com/store{store}/n/{net_index}/manage/nodes/list",
+            'notes': '',
+            'isBoundToConfigTemplate': False
+        }
+
+    # --- Devices ---
+
+    def _family(self, dev_index):
+        if dev_index == 0:
+            return 'MX'
+        return 'MS' if dev_index <= self.switch_count else 'MR'
+
+    def network_devices(self, network_id):
+        parsed = self.parse_network_id(network_id)
+        if parsed is None:
+            return None
+        return [self._device(*parsed, d) for d in range(self.devices_per_network)]
+
+    def device(self, serial):
+        parsed = self.parse_serial(serial)
+        return self._device(*parsed) if parsed else None
+
+    def _device(self, org_index, net_index, dev_index):
+        family = self._family(dev_index)
+        store = 1000 + net_index
+        if family == 'MX':
+            model, name, product, lan_ip = 'MX68', f"MX-{store}", 'appliance', '10.0.0.1'
+        elif family == 'MS':
+            model, name, product, lan_ip = self.switch_model, f"SW{dev_index}-{store}", 'switch', f"10.0.0.{10 + dev_index}"
+        else:
+            ap = dev_index - self.switch_count
+            model, name, product, lan_ip = 'MR36', f"AP{ap}-{store}", 'wireless', f"10.0.0.{100 + ap}"
+        return {
+            'serial': self.serial(org_index, net_index, dev_index),
+            'name': name,
+            'model': model,
+            'mac': self._mac(0x0c8ddb, net_index, dev_index),
+            'lanIp': lan_ip,
+            'networkId': self.network_id(org_index, net_index),
+            'productType': product,
+            'firmware': {'appliance': 'MX 18.211', 'switch': 'MS 16.8', 'wireless': 'MR 30.7'}[product],
+            'address': f"{store} Main St",
+            'lat': 33.0 + (net_index % 1000) / 100.0,
+            'lng': -84.0 - (net_index // 1000) / 10.0,
+            'tags': []
+        }
+
+    def _org_list(self, kind, org_id, build):
+        key = (kind, org_id)
+        if key not in self._org_lists:
+            self._org_lists[key] = build()
+        return self._org_lists[key]
+
+    def org_devices(self, org_id):
+        org_index = self.parse_org_id(org_id)
+        if org_index is None:
+            return None
+        return self._org_list('devices', org_id, lambda: [
+            self._device(org_index, n, d)
+            for n in range(self.network_count) for d in range(self.devices_per_network)
+        ])
+
+    def device_status(self, device):
+        """Status record for a device; about 95% online, 3% alerting, 2% offline."""
+        parsed = self.parse_serial(device['serial'])
+        roll = _mix(parsed[1] + self.seed, parsed[2]) % 100
+        status = 'online' if roll < 95 else 'alerting' if roll < 98 else 'offline'
+        record = {
+            'serial': device['serial'],
+            'name': device['name'],
+            'model': device['model'],
+            'mac': device['mac'],
+            'networkId': device['networkId'],
+            'productType': device['productType'],
+            'status': status,
+            'lanIp': device['lanIp'],
+            'gateway': '10.0.0.1',
+            'lastReportedAt': _timestamp(roll * 7)
+        }
+        if device['productType'] == 'appliance':
+            record['publicIp'] = f"203.0.{parsed[1] // 256 % 256}.{parsed[1] % 256}"
+            record['wan1Ip'] = record['publicIp']
+        return record
+
+    def device_statuses(self, org_id):
+        devices = self.org_devices(org_id)
+        if devices is None:
+            return None
+        return self._org_list('statuses', org_id, lambda: [self.device_status(d) for d in devices])
+
+    def inventory(self, org_id):
+        """Claimed hardware: every device plus a few unassigned spares."""
+        devices = self.org_devices(org_id)
+        if devices is None:
+            return None
+        return self._org_list('inventory', org_id, lambda: self._build_inventory(org_id, devices))
+
+    def _build_inventory(self, org_id, devices):
+        org_index = self.parse_org_id(org_id)
+        inventory = [{
+            'serial': d['serial'], 'mac': d['mac'], 'name': d['name'], 'model': d['model'],
+            'networkId': d['networkId'], 'productType': d['productType'],
+            'claimedAt': _timestamp(86400 * 30), 'licenseExpirationDate': None
+        } for d in devices]
+        for spare in range(max(1, self.network_count // 100)):
+            inventory.append({
+                'serial': f"Q{org_index}MR-FFFF-{spare:04X}", 'mac': self._mac(0x0c8ddb, 0xffff, spare),
+                'name': None, 'model': 'MR36', 'networkId': None, 'productType': 'wireless',
+                'claimedAt': _timestamp(86400 * 60), 'licenseExpirationDate': None
+            })
+        return inventory
+
+    # --- Clients ---
+
+    def client_count(self, network_id):
+        parsed = self.parse_network_id(network_id)
+        if parsed is None:
+            return None
+        base, extra = divmod(self.client_count_per_org, self.network_count)
+        return base + (1 if parsed[1] < extra else 0)
+
+    def clients(self, network_id, start, stop):
+        """Clients [start, stop) of a network, generated on demand."""
+        parsed = self.parse_network_id(network_id)
+        if parsed is None:
+            return None
+        stop = min(stop, self.client_count(network_id))
+        return [self._client(parsed[0], parsed[1], j) for j in range(max(0, start), stop)]
+
+    def _client(self, org_index, net_index, client_index):
+        h = _mix(net_index + self.seed, client_index)
+        vlan = CLIENT_VLANS[h % len(CLIENT_VLANS)]
+        wired = vlan == 10
+        if wired:
+            dev_index = 1 + h % self.switch_count
+            port = str(3 + (client_index % 40))
+        else:
+            dev_index = 1 + self.switch_count + (h >> 4) % max(1, self.ap_count)
+            port = None
+        device = self._device(org_index, net_index, min(dev_index, self.devices_per_network - 1))
+        manufacturer = CLIENT_MANUFACTURERS[(h >> 8) % len(CLIENT_MANUFACTURERS)]
+        return {
+            'id': f"k{net_index:05x}{client_index:05x}",
+            'mac': self._mac(0x001a2b, net_index, client_index),
+            'description': f"{manufacturer}-{client_index}",
+            'ip': f"10.{vlan}.{(client_index // 250) % 256}.{client_index % 250 + 2}",
+            'vlan': vlan,
+            'ssid': CLIENT_SSIDS.get(vlan),
+            'switchport': port,
+            'recentDeviceSerial': device['serial'],
+            'recentDeviceName': device['name'],
+            'recentDeviceMac': device['mac'],
+            'recentDeviceConnection': 'Wired' if wired else 'Wireless',
+            'status': 'Online' if h % 10 else 'Offline',
+            'manufacturer': manufacturer,
+            'os': CLIENT_OS[(h >> 12) % len(CLIENT_OS)],
+            'usage': {'sent': h % 50000, 'recv': (h >> 3) % 250000},
+            'firstSeen': _timestamp(86400 + h % 86400),
+            'lastSeen': _timestamp(h % 3600),
+            'user': None,
+            'deviceTypePrediction': None
+        }
+
+    # --- Topology and switch ports ---
+
+    def topology_links(self, network_id):
+        """Links in the /topology/links shape meraki_api.get_network_topology reads."""
+        devices = self.network_devices(network_id)
+        if devices is None:
+            return None
+        mx, switches, aps = devices[0], devices[1:1 + self.switch_count], devices[1 + self.switch_count:]
+        links = []
+        for i, switch in enumerate(switches):
+            links.append({'source': {'serial': mx['serial'], 'port': str(3 + i)},
+                          'destination': {'serial': switch['serial'], 'port': '1'},
+                          'linkType': 'wired', 'status': 'active'})
+        for i, ap in enumerate(aps):
+            switch = switches[i % len(switches)]
+            links.append({'source': {'serial': switch['serial'], 'port': str(2 + i // len(switches))},
+                          'destination': {'serial': ap['serial'], 'port': 'wired0'},
+                          'linkType': 'wired', 'status': 'active'})
+        return links
+
+    def link_layer(self, network_id):
+        """Topology in the /topology/linkLayer shape (nodes plus LLDP link ends)."""
+        links = self.topology_links(network_id)
+        if links is None:
+            return None
+        devices = {d['serial']: d for d in self.network_devices(network_id)}
+        return {
+            'nodes': [{'derivedId': serial, 'type': 'device', 'root': d['productType'] == 'appliance',
+                       'device': {'serial': serial, 'name': d['name'], 'model': d['model'],
+                                  'productType': d['productType']}}
+                      for serial, d in devices.items()],
+            'links': [{'ends': [
+                {'device': {'serial': link['source']['serial'], 'name': devices[link['source']['serial']]['name']},
+                 'discovered': {'lldp': {'portId': link['source']['port']}}},
+                {'device': {'serial': link['destination']['serial'], 'name': devices[link['destination']['serial']]['name']},
+                 'discovered': {'lldp': {'portId': link['destination']['port']}}}
+            ], 'lastReportedAt': _timestamp(60)} for link in links],
+            'errors': []
+        }
+
+    def switch_ports(self, serial):
+        device = self.device(serial)
+        if device is None or device['productType'] != 'switch':
+            return None
+        count = 48 if device['model'].startswith('MS225') else 8
+        return [{
+            'portId': str(p), 'name': 'Uplink' if p == 1 else None, 'enabled': True,
+            'poeEnabled': p > 1, 'type': 'trunk' if p <= 2 else 'access',
+            'vlan': 1 if p <= 2 else 10, 'allowedVlans': 'all' if p <= 2 else '10',
+            'linkNegotiation': 'Auto negotiate', 'tags': []
+        } for p in range(1, count + 1)]
+
+    def switch_port_statuses(self, serial):
+        ports = self.switch_ports(serial)
+        if ports is None:
+            return None
+        parsed = self.parse_serial(serial)
+        statuses = []
+        for port in ports:
+            p = int(port['portId'])
+            connected = p <= 2 or _mix(parsed[1], p) % 3 != 0
+            statuses.append({
+                'portId': port['portId'], 'enabled': True,
+                'status': 'Connected' if connected else 'Disconnected',
+                'speed': '1 Gbps' if connected else '', 'duplex': 'full' if connected else '',
+                'usageInKb': {'total': _mix(p, parsed[1]) % 100000} if connected else {'total': 0},
+                'clientCount': 1 if connected else 0, 'errors': [], 'warnings': []
+            })
+        return statuses
+
+    def live_tool_result(self, serial, tool):
+        """Result payload of a completed live tools job."""
+        if tool in ('arpTable', 'macTable', 'dhcpLeases'):
+            parsed = self.parse_serial(serial)
+            entries = self.clients(self.network_id(*parsed[:2]), 0, 20) if parsed else []
+            return {'entries': [{'ip': c['ip'], 'mac': c['mac'], 'vlanId': c['vlan']} for c in entries]}
+        return LIVE_TOOL_RESULTS.get(tool, lambda: {})()
+
+    @staticmethod
+    def _mac(oui, major, minor):
+        # 17 bits keep up to 131k addresses unique within one network
+        value = (oui << 24) | ((major & 0x7f) << 17) | (minor & 0x1ffff)
+        return ':'.join(f"{(value >> shift) & 0xff:02x}" for shift in range(40, -8, -8))
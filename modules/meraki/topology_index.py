@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Indexed client-to-parent linking for Meraki topology builds.
+
+Lookup tables (serial, MAC, name and switch port) are built once from the
+device nodes, so attaching N clients costs O(N) instead of rescanning every
+node per client. Clients are attached to the device they report in
+recentDeviceSerial / recentDeviceMac / recentDeviceName; wired clients seen on
+a switch port that the topology links show leading to another Meraki device
+are attached to that device instead.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_mac(mac):
+    return mac.lower().replace('-', ':') if isinstance(mac, str) else None
+
+
+def _normalize_port(port):
+    return str(port).strip() if port not in (None, '', 'Unknown') else None
+
+
+def connection_type(client):
+    """
+    Normalize a client's recentDeviceConnection ('Wired', 'Wireless', ...).
+
+    Args:
+        client (dict): Client as returned by the Dashboard API
+
+    Returns:
+        str: 'wired', 'wireless' or 'unknown'
+    """
+    value = client.get('recentDeviceConnection')
+    if isinstance(value, str) and value.lower() in ('wired', 'wireless'):
+        return value.lower()
+    if client.get('ssid'):
+        return 'wireless'
+    if client.get('switchport'):
+        return 'wired'
+    return 'unknown'
+
+
+class DeviceIndex:
+    """
+    Lookup tables over the device nodes of one topology.
+
+    Node positions are the integer indices used as link endpoints by
+    get_network_topology.
+    """
+
+    def __init__(self, nodes, topology_links=None):
+        """
+        Args:
+            nodes (list): Device nodes (dicts with serial, mac, label, type)
+            topology_links (list, optional): /topology/links entries with
+                source/destination serial and port
+        """
+        self.by_serial = {}
+        self.by_mac = {}
+        self.by_name = {}
+        self.by_switch_port = {}
+        self.first_of_type = {}
+
+        for position, node in enumerate(nodes):
+            if node.get('type') == 'client':
+                continue
+            serial = node.get('serial')
+            if serial:
+                self.by_serial[serial] = position
+            mac = _normalize_mac(node.get('mac'))
+            if mac:
+                self.by_mac[mac] = position
+            name = node.get('label')
+            if name:
+                self.by_name.setdefault(name, position)
+            self.first_of_type.setdefault(node.get('type'), position)
+
+        for link in topology_links or []:
+            self._add_port_link(link.get('source') or {}, link.get('destination') or {})
+            self._add_port_link(link.get('destination') or {}, link.get('source') or {})
+
+    def _add_port_link(self, near, far):
+        port = _normalize_port(near.get('port'))
+        near_position = self.by_serial.get(near.get('serial'))
+        far_position = self.by_serial.get(far.get('serial'))
+        if port and near_position is not None and far_position is not None:
+            self.by_switch_port[(near_position, port)] = far_position
+
+    def reported_device(self, client):
+        """
+        Node position of the device a client reports it was last seen on.
+
+        Args:
+            client (dict): Client as returned by the Dashboard API
+
+        Returns:
+            int or None: Node position
+        """
+        position = self.by_serial.get(client.get('recentDeviceSerial'))
+        if position is None:
+            position = self.by_mac.get(_normalize_mac(client.get('recentDeviceMac')))
+        if position is None:
+            position = self.by_name.get(client.get('recentDeviceName'))
+        return position
+
+    def parent_of(self, client):
+        """
+        Resolve the node a client should hang from.
+
+        Args:
+            client (dict): Client as returned by the Dashboard API
+
+        Returns:
+            tuple: (node position or None, how) where how is 'reported',
+                'switch_port' or 'inferred'
+        """
+        kind = connection_type(client)
+        position = self.reported_device(client)
+        if position is not None:
+            port = _normalize_port(client.get('switchport')) if kind == 'wired' else None
+            downstream = self.by_switch_port.get((position, port)) if port else None
+            if downstream is not None:
+                return downstream, 'switch_port'
+            return position, 'reported'
+
+        # No device reference at all: fall back to the first AP / switch
+        if kind == 'wireless':
+            position = self.first_of_type.get('wireless')
+        elif kind == 'wired':
+            position = self.first_of_type.get('switch')
+        return position, 'inferred'
+
+    def client_link(self, client, client_position):
+        """
+        Link dict from a client's parent device to the client node.
+
+        Args:
+            client (dict): Client as returned by the Dashboard API
+            client_position (int): Position of the client node
+
+        Returns:
+            dict or None: Link in the get_network_topology shape, or None when
+                no parent could be found
+        """
+        parent, how = self.parent_of(client)
+        if parent is None:
+            return None
+        link = {
+            'source': parent,
+            'target': client_position,
+            'type': connection_type(client),
+            'status': 'active'
+        }
+        port = _normalize_port(client.get('switchport'))
+        if port:
+            link['port'] = port
+        if how == 'inferred':
+            link['inferred'] = True
+        return link
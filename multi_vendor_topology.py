@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import os
 
+from subnet_index import SubnetIndex, parse_ip, parse_subnet
+
 logger = logging.getLogger(__name__)
 
 class MultiVendorTopologyEngine:
@@ -31,6 +33,7 @@ class MultiVendorTopologyEngine:
                 'devices': [],
                 'clients': [],
                 'connections': [],
+                'subnets': [],
                 'vendor_stats': {
                     'meraki': {'devices': 0, 'clients': 0},
                     'fortinet': {'devices': 0, 'clients': 0}
@@ -83,10 +86,18 @@ class MultiVendorTopologyEngine:
             except:
                 logger.info("Meraki topology links not available, will use device-client associations")
             
+            # VLAN subnets give cross-vendor linking the real prefix lengths
+            vlans = None
+            try:
+                vlans = self.meraki_manager.dashboard.appliance.getNetworkApplianceVlans(network_id)
+            except Exception:
+                logger.info("Meraki appliance VLANs not available, subnets will come from Fortinet interfaces only")
+            
             return {
                 'devices': devices or [],
                 'clients': clients or [],
-                'links': links or []
+                'links': links or [],
+                'vlans': vlans or []
             }
             
         except Exception as e:
@@ -182,6 +193,20 @@ class MultiVendorTopologyEngine:
                             'vendor': 'meraki'
                         }
                         unified_topology['connections'].append(connection)
+            
+            # VLAN subnets belong to their network's security appliance; without one the
+            # subnet still resolves device addresses but links no device of its own
+            appliances = {d['network_id']: d['id'] for d in unified_topology['devices']
+                          if d['vendor'] == 'meraki' and d['type'] == 'security_appliance'}
+            for vlan in meraki_data.get('vlans', []):
+                if vlan.get('subnet'):
+                    unified_topology['subnets'].append({
+                        'subnet': vlan['subnet'],
+                        'vendor': 'meraki',
+                        'device_id': appliances.get(vlan.get('networkId')),
+                        'name': vlan.get('name'),
+                        'vlan': vlan.get('id')
+                    })
                         
         except Exception as e:
             logger.error(f"Error merging Meraki data: {e}")
@@ -253,38 +278,92 @@ class MultiVendorTopologyEngine:
             # Add Fortinet connections
             for connection in fortinet_data.get('connections', []):
                 unified_topology['connections'].append(connection)
+            
+            # Interface addresses carry the FortiGate's real subnet masks: cmdb reports
+            # 'address mask' in ip, the monitor API a bare ip plus a separate mask
+            for interface in fortinet_data.get('interfaces', []):
+                address, mask = interface.get('ip'), interface.get('mask')
+                if isinstance(address, str) and len(address.split()) == 1 and '/' not in address:
+                    if mask in (None, ''):
+                        continue  # a bare address would index as a /32
+                    address = (address.strip(), mask)
+                network = parse_subnet(address)
+                if network is not None:
+                    unified_topology['subnets'].append({
+                        'subnet': str(network),
+                        'vendor': 'fortinet',
+                        'device_id': interface.get('fortigate_id'),
+                        'name': interface.get('name')
+                    })
                 
         except Exception as e:
             logger.error(f"Error merging Fortinet data: {e}")
     
     def _build_cross_vendor_connections(self, unified_topology: Dict):
-        """Build connections between different vendor devices"""
+        """
+        Link Meraki and Fortinet devices that share a subnet.
+        
+        Every device address is resolved to its most specific known subnet
+        (FortiGate interfaces, Meraki VLANs) through a prefix trie; devices that
+        own a subnet join it too. Addresses outside every known subnet fall back
+        to their /24, marked as inferred. Links are emitted subnet by subnet and
+        summarized in unified_topology['subnet_groups'].
+        """
         try:
-            # Find potential connections based on IP subnets, VLANs, etc.
-            meraki_devices = [d for d in unified_topology['devices'] if d['vendor'] == 'meraki']
-            fortinet_devices = [d for d in unified_topology['devices'] if d['vendor'] == 'fortinet']
-            
-            # Look for devices on same subnet (simplified logic)
-            for meraki_device in meraki_devices:
-                meraki_ip = meraki_device.get('lan_ip') or meraki_device.get('wan1_ip')
-                if not meraki_ip:
+            index = SubnetIndex()
+            groups = {}
+            
+            def join(subnet, vendor, device_id, inferred=False):
+                group = groups.get(subnet)
+                if group is None:
+                    group = groups[subnet] = {'subnet': subnet, 'meraki': {}, 'fortinet': {}, 'inferred': inferred}
+                group[vendor][device_id] = None
+            
+            for entry in unified_topology.get('subnets', []):
+                network = index.add(entry['subnet'], entry)
+                if network is not None and entry.get('device_id') and entry['vendor'] in ('meraki', 'fortinet'):
+                    join(str(network), entry['vendor'], entry['device_id'])
+            
+            for device in unified_topology['devices']:
+                vendor = device['vendor']
+                if vendor == 'meraki':
+                    ip = parse_ip(device.get('lan_ip')) or parse_ip(device.get('wan1_ip'))
+                elif vendor == 'fortinet':
+                    ip = parse_ip(device.get('ip')) or parse_ip(device.get('host'))
+                else:
+                    continue
+                if ip is None:
+                    continue
+                
+                match = index.lookup(ip)
+                if match is not None:
+                    join(str(match[0]), vendor, device['id'])
+                elif ip.version == 4:
+                    join(self._get_subnet(str(ip)), vendor, device['id'], inferred=True)
+            
+            subnet_groups = []
+            for subnet, group in groups.items():
+                if not group['meraki'] or not group['fortinet']:
                     continue
-                    
-                for fortinet_device in fortinet_devices:
-                    fortinet_ip = fortinet_device.get('ip')
-                    if not fortinet_ip:
-                        continue
-                    
-                    # Simple same-subnet check (first 3 octets)
-                    if self._same_subnet(meraki_ip, fortinet_ip):
+                for meraki_id in group['meraki']:
+                    for fortinet_id in group['fortinet']:
                         connection = {
-                            'source': meraki_device['id'],
-                            'target': fortinet_device['id'],
+                            'source': meraki_id,
+                            'target': fortinet_id,
                             'type': 'cross_vendor',
                             'vendor': 'multi_vendor',
-                            'subnet': self._get_subnet(meraki_ip)
+                            'subnet': subnet
                         }
+                        if group['inferred']:
+                            connection['inferred'] = True
                         unified_topology['connections'].append(connection)
+                subnet_groups.append({
+                    'subnet': subnet,
+                    'meraki': list(group['meraki']),
+                    'fortinet': list(group['fortinet']),
+                    'inferred': group['inferred']
+                })
+            unified_topology['subnet_groups'] = subnet_groups
                         
         except Exception as e:
             logger.error(f"Error building cross-vendor connections: {e}")
@@ -305,17 +384,8 @@ class MultiVendorTopologyEngine:
         else:
             return 'unknown'
     
-    def _same_subnet(self, ip1: str, ip2: str) -> bool:
-        """Check if two IPs are in the same /24 subnet"""
-        try:
-            octets1 = ip1.split('.')[:3]
-            octets2 = ip2.split('.')[:3]
-            return octets1 == octets2
-        except:
-            return False
-    
     def _get_subnet(self, ip: str) -> str:
-        """Get subnet from IP address"""
+        """Get the /24 containing an IPv4 address (used when no real subnet is known)"""
         try:
             octets = ip.split('.')[:3]
             return '.'.join(octets) + '.0/24'
@@ -355,6 +425,8 @@ class MultiVendorTopologyEngine:
             'devices': [],
             'clients': [],
             'connections': [],
+            'subnets': [],
+            'subnet_groups': [],
             'vendor_stats': {
                 'meraki': {'devices': 0, 'clients': 0},
                 'fortinet': {'devices': 0, 'clients': 0}
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Organization-Wide Topology Builds
+
+A whole organization (or a region of it, selected by network tag) used to mean
+one build_topology_from_api_data call per network, serially, in the request
+thread. OrgTopologyJobs runs that as a background job instead:
+
+1. Networks are sharded across a process pool; each worker fetches one
+   network's devices, clients and links and builds its Topology.
+2. The parent merges the per-network topologies into one graph and adds the
+   inter-site edges from the org-level endpoints: site-to-site VPN peers
+   between MX appliances and WAN uplinks to a shared Internet node.
+3. The merged graph is kept as a snapshot per organization and selection
+   (network ids and/or tags, see selection_key) that the UI pages through site
+   by site. A region build never joins or replaces the whole-org build.
+
+Jobs report progress (networks done / failed) and can be cancelled; pending
+networks are dropped and running ones finish in the background. Workers share
+a fraction of the organization's API rate limit so interactive requests from
+the web UI keep their headroom.
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from topology_engine import (DEFAULT_NODE_BUDGET, Topology, TopologyNode, build_topology, level_of_detail,
+                             to_d3)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv('ORG_TOPOLOGY_WORKERS', min(8, os.cpu_count() or 2)))
+# Share of the per-org API rate limit the workers may use together
+RATE_SHARE = float(os.getenv('ORG_TOPOLOGY_RATE_SHARE', 0.5))
+SNAPSHOT_TTL = int(os.getenv('ORG_TOPOLOGY_SNAPSHOT_TTL', 3600))
+MAX_JOBS = 32
+SITES_PER_PAGE = 25
+INTERNET_NODE_ID = 'internet'
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+
+def selection_key(network_ids=None, tags=None):
+    """
+    Canonical key of a network selection within an organization.
+
+    Args:
+        network_ids (list, optional): Networks asked for
+        tags (list, optional): Network tags asked for (a region)
+
+    Returns:
+        tuple: (sorted network ids or None, sorted tags or None); (None, None)
+            is the whole organization
+    """
+    return (tuple(sorted(set(network_ids))) if network_ids else None,
+            tuple(sorted(set(tags))) if tags else None)
+
+
+def _selection_dict(selection):
+    network_ids, tags = selection
+    return {'network_ids': list(network_ids) if network_ids else None, 'tags': list(tags) if tags else None}
+
+
+# --- Worker side ---
+
+def fetch_network_data(api_key, network_id):
+    """
+    Fetch what build_topology needs for one network (runs in a worker process).
+
+    Returns:
+        tuple: (devices, clients, links)
+    """
+    from modules.meraki import meraki_api
+    devices = meraki_api.get_network_devices(api_key, network_id)
+    clients = meraki_api.iter_network_clients(api_key, network_id, timespan=10800)
+    try:
+        links = meraki_api.get_network_topology_links(api_key, network_id)
+    except Exception as e:
+        logger.warning(f"No topology links for {network_id}, inferring device links: {e}")
+        links = []
+    return devices, clients, links
+
+
+def fetch_org_links(api_key, org_id):
+    """
+    Fetch the org-level data inter-site edges come from (runs in the job thread).
+
+    Returns:
+        tuple: (appliance VPN statuses, appliance uplink statuses)
+    """
+    from modules.meraki import meraki_api
+    results = []
+    for endpoint in (f"/organizations/{org_id}/appliance/vpn/statuses",
+                     f"/organizations/{org_id}/appliance/uplink/statuses"):
+        try:
+            results.append(meraki_api.get_all_meraki_pages(api_key, endpoint))
+        except Exception as e:
+            logger.warning(f"Could not fetch {endpoint}: {e}")
+            results.append([])
+    return tuple(results)
+
+
+def _init_worker(rate, burst):
+    """Give each worker its share of the org rate limit and run it at background priority."""
+    from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, get_rate_scheduler, set_request_priority
+    scheduler = get_rate_scheduler()
+    scheduler.rate = rate
+    scheduler.burst = burst
+    set_request_priority(PRIORITY_BACKGROUND)
+
+
+def build_network(api_key, network, fetch=fetch_network_data):
+    """
+    Fetch and build one network's topology (the worker task).
+
+    Args:
+        api_key (str): Meraki API key
+        network (dict): Network with id and name
+        fetch (callable): (api_key, network_id) -> (devices, clients, links);
+            must be a module-level function so it can be pickled
+
+    Returns:
+        Topology: The network's topology
+    """
+    devices, clients, links = fetch(api_key, network['id'])
+    return build_topology(devices or [], clients or [], links or None, network.get('name'))
+
+
+# --- Merging ---
+
+def merge_topologies(parts, vpn_statuses=None, uplink_statuses=None, name=None):
+    """
+    Merge per-network topologies into one graph with inter-site edges.
+
+    Args:
+        parts (list): (network dict, Topology) pairs
+        vpn_statuses (list, optional): /organizations/{id}/appliance/vpn/statuses
+        uplink_statuses (list, optional): /organizations/{id}/appliance/uplink/statuses
+        name (str, optional): Name of the merged topology
+
+    Returns:
+        tuple: (Topology, sites) where sites lists each network's id, name and
+            node position range in the merged graph
+    """
+    merged = Topology(network_name=name)
+    sites = []
+    for network, part in parts:
+        start = len(merged.nodes)
+        positions = []
+        for node in part.nodes:
+            if node.id in merged.positions:
+                # The same client seen in two networks stays two nodes
+                node.id = f"{network['id']}:{node.id}"
+            if node.network_id is None:
+                node.network_id = network['id']
+            positions.append(merged.add_node(node))
+        links = part.links
+        for i in range(len(links)):
+            merged.add_link(positions[links.sources[i]], positions[links.targets[i]], links.types[i],
+                            links.interfaces[i], links.statuses[i], bool(links.inferred[i]))
+        sites.append({
+            'id': network['id'],
+            'name': network.get('name') or network['id'],
+            'start': start,
+            'stop': len(merged.nodes),
+            'devices': part.device_count,
+            'clients': part.client_count
+        })
+
+    _add_vpn_links(merged, vpn_statuses or [])
+    _add_wan_links(merged, uplink_statuses or [])
+    return merged, sites
+
+
+def _add_vpn_links(topology, vpn_statuses):
+    """Site-to-site VPN tunnels between the MX appliances of two networks, once per pair."""
+    appliance_of = {status.get('networkId'): topology.positions.get(status.get('deviceSerial'))
+                    for status in vpn_statuses}
+    seen = set()
+    for status in vpn_statuses:
+        source = appliance_of.get(status.get('networkId'))
+        if source is None:
+            continue
+        for peer in status.get('merakiVpnPeers') or []:
+            target = appliance_of.get(peer.get('networkId'))
+            pair = (min(source, target), max(source, target)) if target is not None else None
+            if pair is None or source == target or pair in seen:
+                continue
+            seen.add(pair)
+            reachable = (peer.get('reachability') or '').lower() == 'reachable'
+            topology.add_link(source, target, 'vpn', 'Site-to-site VPN', 'active' if reachable else 'down')
+
+
+def _add_wan_links(topology, uplink_statuses):
+    """WAN uplinks of each appliance to one shared Internet node."""
+    internet = None
+    for status in uplink_statuses:
+        appliance = topology.positions.get(status.get('serial'))
+        if appliance is None:
+            continue
+        for uplink in status.get('uplinks') or []:
+            if uplink.get('status') in (None, 'not connected'):
+                continue
+            if internet is None:
+                internet = topology.add_node(TopologyNode(id=INTERNET_NODE_ID, label='Internet', type='internet'))
+            topology.add_link(appliance, internet, 'wan', uplink.get('interface') or 'WAN',
+                              'active' if uplink.get('status') == 'active' else uplink.get('status'))
+
+
+def _subgraph(topology, positions):
+    """Topology of the given node positions and the links between them."""
+    sub = Topology(network_name=topology.network_name)
+    mapping = {}
+    for position in positions:
+        mapping[position] = sub.add_node(topology.nodes[position])
+    links = topology.links
+    for i in range(len(links)):
+        source, target = mapping.get(links.sources[i]), mapping.get(links.targets[i])
+        if source is not None and target is not None:
+            sub.add_link(source, target, links.types[i], links.interfaces[i], links.statuses[i],
+                         bool(links.inferred[i]))
+    return sub
+
+
+class OrgTopologySnapshot:
+    """
+    Merged topology of one organization build, paged site by site.
+    """
+
+    def __init__(self, org_id, topology, sites, failed, selection=(None, None)):
+        self.org_id = org_id
+        self.selection = selection
+        self.topology = topology
+        self.sites = sites
+        self.failed = failed
+        self.created = time.time()
+
+    def summary(self):
+        """
+        Returns:
+            dict: Totals, per-site counts and networks that failed to build
+        """
+        return {
+            'org_id': self.org_id,
+            'selection': _selection_dict(self.selection),
+            'created': self.created,
+            'nodes': len(self.topology.nodes),
+            'links': len(self.topology.links),
+            'sites': [{k: site[k] for k in ('id', 'name', 'devices', 'clients')} for site in self.sites],
+            'failed': self.failed
+        }
+
+    def page(self, offset=0, limit=SITES_PER_PAGE, node_budget=DEFAULT_NODE_BUDGET):
+        """
+        D3 data for a range of sites, with the inter-site edges between them.
+
+        Args:
+            offset (int): First site
+            limit (int): Sites per page
+            node_budget (int, optional): Clients are aggregated to fit (None/0 = all)
+
+        Returns:
+            dict: nodes, edges, the page's sites, total and next_offset (None on the last page)
+        """
+        sites = self.sites[offset:offset + limit]
+        positions = [p for site in sites for p in range(site['start'], site['stop'])]
+        internet = self.topology.positions.get(INTERNET_NODE_ID)
+        if internet is not None and positions:
+            positions.append(internet)
+        data = to_d3(level_of_detail(_subgraph(self.topology, positions), node_budget))
+        next_offset = offset + limit if offset + limit < len(self.sites) else None
+        data.update(sites=[site['id'] for site in sites], offset=offset, total=len(self.sites),
+                    next_offset=next_offset)
+        return data
+
+
+# --- Jobs ---
+
+class OrgTopologyJob:
+    """
+    One organization build: progress, cancellation and the resulting snapshot.
+    """
+
+    def __init__(self, org_id, networks, selection=(None, None)):
+        self.id = uuid.uuid4().hex
+        self.org_id = org_id
+        self.selection = selection
+        self.networks = networks
+        self.status = QUEUED
+        self.completed = 0
+        self.failed = {}
+        self.error = None
+        self.snapshot = None
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Stop the job; networks not started yet are skipped."""
+        self._cancel.set()
+
+    def progress(self):
+        """
+        Returns:
+            dict: Job state for the status endpoint
+        """
+        return {
+            'job_id': self.id,
+            'org_id': self.org_id,
+            'selection': _selection_dict(self.selection),
+            'status': self.status,
+            'total': len(self.networks),
+            'completed': self.completed,
+            'failed': self.failed,
+            'error': self.error,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+
+class OrgTopologyJobs:
+    """
+    Runs organization builds on a process pool and keeps their snapshots.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_jobs=MAX_JOBS, snapshot_ttl=SNAPSHOT_TTL):
+        """
+        Args:
+            workers (int): Worker processes per job
+            max_jobs (int): Finished jobs kept for status queries
+            snapshot_ttl (int): Seconds a snapshot is served before it needs a rebuild
+        """
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self.snapshot_ttl = snapshot_ttl
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._snapshots = {}
+
+    def submit(self, api_key, org_id, networks, fetch=fetch_network_data, fetch_org=fetch_org_links,
+               selection=None):
+        """
+        Start (or join) a build of the given networks.
+
+        Args:
+            api_key (str): Meraki API key
+            org_id (str): Organization ID
+            networks (list): Network dicts (id, name) to build
+            fetch (callable): Per-network fetcher run in the workers
+            fetch_org (callable): (api_key, org_id) -> (vpn statuses, uplink statuses)
+            selection (tuple, optional): selection_key() the networks were picked
+                by (default: the whole organization)
+
+        Returns:
+            OrgTopologyJob: The new job, or the running job of the same selection
+        """
+        selection = selection or selection_key()
+        with self._lock:
+            for job in self._jobs.values():
+                if (job.org_id == org_id and job.selection == selection and job.status in (QUEUED, RUNNING)
+                        and not job.cancelled):
+                    return job
+            job = OrgTopologyJob(org_id, networks, selection)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.status in (QUEUED, RUNNING):
+                    break
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(target=self._run, args=(job, api_key, fetch, fetch_org),
+                                  name=f"org-topology-{org_id}", daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Returns:
+            OrgTopologyJob or None: The job, if known
+        """
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def snapshot(self, org_id, selection=None):
+        """
+        Args:
+            org_id (str): Organization ID
+            selection (tuple, optional): selection_key() (default: the whole organization)
+
+        Returns:
+            OrgTopologySnapshot or None: Latest snapshot of that selection, if still fresh
+        """
+        with self._lock:
+            snapshot = self._snapshots.get((org_id, selection or selection_key()))
+        if snapshot is None or time.time() - snapshot.created > self.snapshot_ttl:
+            return None
+        return snapshot
+
+    def _run(self, job, api_key, fetch, fetch_org):
+        job.status = RUNNING
+        job.started = time.time()
+        workers = min(self.workers, max(1, len(job.networks)))
+        from modules.meraki.rate_limiter import DEFAULT_ORG_BURST, DEFAULT_ORG_RATE
+        rate = DEFAULT_ORG_RATE * RATE_SHARE / workers
+        burst = max(1, int(DEFAULT_ORG_BURST * RATE_SHARE) // workers)
+        parts = {}
+        try:
+            # spawn, not fork: forking a threaded web server can deadlock the child
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker, initargs=(rate, burst))
+            try:
+                pending = {pool.submit(build_network, api_key, network, fetch): network
+                           for network in job.networks}
+                while pending and not job.cancelled:
+                    done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        network = pending.pop(future)
+                        try:
+                            parts[network['id']] = future.result()
+                        except Exception as e:
+                            logger.warning(f"Org topology {job.org_id}: network {network['id']} failed: {e}")
+                            job.failed[network['id']] = str(e)
+                        job.completed += 1
+            finally:
+                pool.shutdown(wait=not job.cancelled, cancel_futures=True)
+
+            if job.cancelled:
+                job.status = CANCELLED
+                logger.info(f"Org topology {job.org_id} cancelled after {job.completed}/{len(job.networks)} networks")
+                return
+
+            vpn_statuses, uplink_statuses = fetch_org(api_key, job.org_id)
+            topology, sites = merge_topologies(
+                [(network, parts[network['id']]) for network in job.networks if network['id'] in parts],
+                vpn_statuses, uplink_statuses, name=job.org_id)
+            job.snapshot = OrgTopologySnapshot(job.org_id, topology, sites, job.failed, job.selection)
+            with self._lock:
+                self._snapshots[(job.org_id, job.selection)] = job.snapshot
+            job.status = DONE
+            logger.info(f"Org topology {job.org_id}: {len(sites)} sites, {len(topology.nodes)} nodes "
+                        f"in {time.time() - job.started:.1f}s with {workers} workers")
+        except Exception as e:
+            logger.error(f"Org topology {job.org_id} failed: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+
+
+_org_topology_jobs = None
+_org_topology_jobs_lock = threading.Lock()
+
+
+def get_org_topology_jobs():
+    """
+    Get the process-wide organization build runner.
+
+    Returns:
+        OrgTopologyJobs: Shared runner
+    """
+    global _org_topology_jobs
+    if _org_topology_jobs is None:
+        with _org_topology_jobs_lock:
+            if _org_topology_jobs is None:
+                _org_topology_jobs = OrgTopologyJobs()
+    return _org_topology_jobs
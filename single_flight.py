@@ -0,0 +1,184 @@
+"""
+Single-Flight Request Coalescing
+
+When several operators open the same store's topology at once, or the AI
+maintenance engine polls while a user is on the dashboard, identical upstream
+calls used to run in parallel and burn rate-limit budget. A SingleFlight lets
+exactly one in-flight call per key reach Meraki or FortiManager and hands its
+result (or exception) to every caller that asked for the same thing meanwhile.
+
+Keys are (credential hash, method, path, params). The registry is a plain
+concurrent.futures.Future per key, so threaded Flask callers (do) and asyncio
+callers (do_async) share the same in-flight call in both directions.
+
+Results are shared between all waiters and must be treated as read-only.
+"""
+
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+def flight_key(credential, method, path, params=None):
+    """
+    Build a single-flight key.
+
+    Args:
+        credential (str): API key, or host/user for session-based upstreams
+                          (only a hash is kept)
+        method (str): HTTP or JSON-RPC method
+        path (str): URL or JSON-RPC url
+        params (dict, optional): Query parameters / request body params
+
+    Returns:
+        tuple: Hashable key
+    """
+    credential_hash = hashlib.sha256(str(credential or '').encode()).hexdigest()[:16]
+    params_repr = json.dumps(params or {}, sort_keys=True, default=str)
+    return (credential_hash, method.upper(), path, params_repr)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+    """
+
+    def __init__(self, name='default'):
+        """
+        Initialize an empty in-flight registry.
+
+        Args:
+            name (str): Upstream name used in logs and stats
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'calls': 0, 'coalesced': 0, 'errors': 0}
+
+    def _join(self, key):
+        """Return (future, is_leader) for a key, registering a new call if none is in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats['coalesced'] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._stats['calls'] += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, error=None):
+        """Publish the leader's outcome and drop the key so later calls go upstream again."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            if error is not None:
+                self._stats['errors'] += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, func):
+        """
+        Run ``func()`` unless an identical call is in flight, then share its result.
+
+        Args:
+            key (tuple): Key from flight_key
+            func (callable): Performs the upstream call
+
+        Returns:
+            The result of the single in-flight call
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key, coro_func):
+        """
+        Await ``coro_func()`` unless an identical call is in flight, then share its result.
+
+        Waits on calls started by threads without blocking the event loop, and
+        threads waiting on a call started here are woken when it completes.
+
+        Args:
+            key (tuple): Key from flight_key
+            coro_func (callable): Returns an awaitable performing the upstream call
+
+        Returns:
+            The result of the single in-flight call
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # shield: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await coro_func()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def get_stats(self):
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: Upstream calls made, callers that shared one, errors and calls in flight
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+
+# Named registries, one per upstream (created lazily)
+_single_flights = {}
+_single_flights_lock = threading.Lock()
+
+
+def get_single_flight(name):
+    """
+    Get the process-wide SingleFlight for an upstream.
+
+    Args:
+        name (str): Upstream name, e.g. 'meraki' or 'fortimanager'
+
+    Returns:
+        SingleFlight: Shared registry for that upstream
+    """
+    flight = _single_flights.get(name)
+    if flight is None:
+        with _single_flights_lock:
+            flight = _single_flights.get(name)
+            if flight is None:
+                flight = SingleFlight(name)
+                _single_flights[name] = flight
+    return flight
+
+
+def get_single_flight_stats():
+    """
+    Get coalescing counters for every upstream.
+
+    Returns:
+        dict: Upstream name -> stats
+    """
+    with _single_flights_lock:
+        flights = dict(_single_flights)
+    return {name: flight.get_stats() for name, flight in flights.items()}
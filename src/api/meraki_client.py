@@ -2,6 +2,8 @@
 Improved Meraki API client with SSL handling and error recovery.
 Addresses SSL certificate verification errors and API request failures.
 """
+import os
+import sys
 import ssl
 import certifi
 import requests
@@ -11,14 +13,23 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 import urllib3
 
+try:
+    from modules.meraki.ssl_strategy import get_ssl_strategy_cache, host_for_url, verify_for_mode
+except ImportError:
+    # src/ runs as its own root - make the repository modules importable
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from modules.meraki.ssl_strategy import get_ssl_strategy_cache, host_for_url, verify_for_mode
+from topology_engine import build_topology
+
 
 class MerakiClient:
     """Enhanced Meraki API client with proper SSL handling and error recovery."""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.meraki.com/api/v1", 
+    def __init__(self, api_key: str, base_url: Optional[str] = None, 
                  timeout: int = 30, ssl_verify: bool = True):
         self.api_key = api_key
-        self.base_url = base_url.rstrip('/')
+        # MERAKI_BASE_URL points the client at a mock dashboard for load testing
+        self.base_url = (base_url or os.getenv('MERAKI_BASE_URL', 'https://api.meraki.com/api/v1')).rstrip('/')
         self.timeout = timeout
         self.ssl_verify = ssl_verify
         self.logger = logging.getLogger(__name__)
@@ -66,47 +77,50 @@ class MerakiClient:
         return session
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
-        """Make an API request with proper error handling and SSL fallback."""
+        """Make an API request with proper error handling and SSL fallback.
+
+        The SSL mode that worked for the host is remembered process-wide, so
+        only the first request (or one after the cached mode expires or fails)
+        walks the fallback chain.
+        """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        ssl_cache = get_ssl_strategy_cache()
+        host = host_for_url(url)
         
-        # First attempt with SSL verification
-        try:
-            self.logger.info(f"Making request to {url} with timeout {self.timeout}s")
-            response = self.session.request(
-                method=method,
-                url=url,
-                timeout=self.timeout,
-                verify=self.ssl_verify,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.SSLError as e:
-            self.logger.error(f"SSL error: {e}")
-            
-            # Fallback: retry without SSL verification
-            if self.ssl_verify:
-                self.logger.warning("SSL verification failed, retrying without verification")
-                try:
-                    response = self.session.request(
-                        method=method,
-                        url=url,
-                        timeout=self.timeout,
-                        verify=False,
-                        **kwargs
-                    )
-                    response.raise_for_status()
-                    return response
-                except Exception as fallback_error:
-                    self.logger.error(f"Fallback request also failed: {fallback_error}")
-                    raise
-            else:
-                raise
+        if self.ssl_verify:
+            modes = ssl_cache.modes_for(host)
+        else:
+            modes = ['insecure']
+        
+        last_error = None
+        for mode in modes:
+            try:
+                self.logger.info(f"Making request to {url} with timeout {self.timeout}s")
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    timeout=self.timeout,
+                    verify=verify_for_mode(mode),
+                    **kwargs
+                )
+                if self.ssl_verify:
+                    ssl_cache.record_success(host, mode)
+                response.raise_for_status()
+                return response
                 
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request failed: {e}")
-            raise
+            except requests.exceptions.SSLError as e:
+                last_error = e
+                self.logger.error(f"SSL error: {e}")
+                if self.ssl_verify:
+                    ssl_cache.record_failure(host, mode)
+                    self.logger.warning(f"SSL mode '{mode}' failed for {host}, trying next mode")
+                continue
+                
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"Request failed: {e}")
+                raise
+        
+        raise last_error
     
     def get_organizations(self) -> List[Dict[str, Any]]:
         """Get list of organizations."""
@@ -176,44 +190,51 @@ class MerakiClient:
         """Build topology manually when API doesn't provide it."""
         self.logger.info("Building topology manually from device and client data")
         
+        topology = build_topology(devices, clients)
+        devices_by_id = {device.get('serial', device.get('mac')): device for device in devices}
         nodes = []
         links = []
         
-        # Add devices as nodes
-        for device in devices:
-            nodes.append({
-                'id': device.get('serial', device.get('mac')),
-                'name': device.get('name', 'Unknown Device'),
-                'type': 'device',
-                'model': device.get('model'),
-                'status': device.get('status', 'unknown'),
-                'productType': device.get('productType', 'unknown'),
-                'networkId': device.get('networkId'),
-                'address': device.get('address', ''),
-                'lat': device.get('lat'),
-                'lng': device.get('lng')
-            })
+        # This client's schema: generic 'device' nodes with location details
+        for node in topology.nodes:
+            if node.is_client:
+                nodes.append({
+                    'id': node.mac or node.id,
+                    'name': node.label,
+                    'type': 'client',
+                    'ip': node.ip,
+                    'vlan': node.vlan,
+                    'status': node.status or 'unknown',
+                    'switchport': node.switchport,
+                    'connectedDevice': None
+                })
+            else:
+                device = devices_by_id.get(node.id, {})
+                nodes.append({
+                    'id': node.id,
+                    'name': device.get('name', 'Unknown Device'),
+                    'type': 'device',
+                    'model': node.model,
+                    'status': node.status or 'unknown',
+                    'productType': device.get('productType', 'unknown'),
+                    'networkId': node.network_id,
+                    'address': device.get('address', ''),
+                    'lat': device.get('lat'),
+                    'lng': device.get('lng')
+                })
         
-        # Add clients as nodes
-        for client in clients:
-            nodes.append({
-                'id': client.get('mac', client.get('id')),
-                'name': client.get('description', client.get('dhcpHostname', 'Unknown Client')),
-                'type': 'client',
-                'ip': client.get('ip'),
-                'vlan': client.get('vlan'),
-                'status': client.get('status', 'unknown'),
-                'switchport': client.get('switchport'),
-                'connectedDevice': client.get('recentDeviceSerial')
+        # Link each client to the device it reports, as client -> device
+        for link in topology.links:
+            client = topology.nodes[link.target]
+            if not client.is_client or link.inferred:
+                continue
+            parent_id = topology.nodes[link.source].id
+            nodes[link.target]['connectedDevice'] = parent_id
+            links.append({
+                'source': nodes[link.target]['id'],
+                'target': parent_id,
+                'type': 'client_connection'
             })
-            
-            # Create link between client and connected device
-            if client.get('recentDeviceSerial'):
-                links.append({
-                    'source': client.get('mac', client.get('id')),
-                    'target': client.get('recentDeviceSerial'),
-                    'type': 'client_connection'
-                })
         
         return {
             'nodes': nodes,
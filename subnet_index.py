@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+IP Prefix Index
+
+Longest-prefix matching of device addresses against the subnets the network
+actually uses: FortiGate interface addresses with their real masks and Meraki
+appliance VLAN subnets. Cross-vendor link inference used to compare every
+Meraki device with every Fortinet device on the first three octets, which was
+O(N x M) and wrong for anything that is not a /24.
+
+The index is a path-compressed binary (Patricia) trie per address family over
+ipaddress networks. A lookup walks at most one node per distinct prefix length
+on the path to the address, so resolving N devices against S subnets costs
+O(N log S) rather than O(N x S).
+"""
+
+import ipaddress
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_subnet(value):
+    """
+    Parse a subnet as Meraki or FortiOS report it.
+
+    Accepts CIDR ('10.1.2.0/25'), interface addresses with host bits set
+    ('10.1.2.1/25'), FortiOS 'address mask' pairs ('10.1.2.1 255.255.255.128')
+    and ipaddress network/interface objects.
+
+    Args:
+        value: Subnet in any of the forms above
+
+    Returns:
+        IPv4Network/IPv6Network or None: The network, or None when the value
+            is empty, unparseable or a default route (0.0.0.0/0 - FortiOS
+            reports unnumbered interfaces as '0.0.0.0 0.0.0.0')
+    """
+    if isinstance(value, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+        network = value
+    elif isinstance(value, (ipaddress.IPv4Interface, ipaddress.IPv6Interface)):
+        network = value.network
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        return parse_subnet(f"{value[0]}/{value[1]}")
+    elif isinstance(value, str) and value.strip():
+        parts = value.split()
+        text = '/'.join(parts[:2]) if len(parts) >= 2 else parts[0]
+        try:
+            network = ipaddress.ip_interface(text).network
+        except ValueError:
+            return None
+    else:
+        return None
+    return network if network.prefixlen > 0 else None
+
+
+def parse_ip(value):
+    """
+    Parse a single IP address, ignoring hostnames and empty values.
+
+    Args:
+        value (str): Address such as '10.1.2.10' (a '/len' or mask suffix is dropped)
+
+    Returns:
+        IPv4Address/IPv6Address or None
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return ipaddress.ip_address(value.split('/')[0].split()[0])
+    except ValueError:
+        return None
+
+
+class _TrieNode:
+    """Trie node: a prefix (left-aligned address bits + length) and what is stored at it."""
+
+    __slots__ = ('bits', 'length', 'network', 'values', 'children')
+
+    def __init__(self, bits, length):
+        self.bits = bits
+        self.length = length
+        self.network = None
+        self.values = None
+        self.children = [None, None]
+
+
+class SubnetIndex:
+    """
+    Longest-prefix-match index from subnets to the things attached to them.
+
+    Several values may share a subnet (e.g. a FortiGate interface and the
+    Meraki VLAN behind it); lookups return all of them.
+    """
+
+    def __init__(self):
+        """Initialize empty IPv4 and IPv6 tries."""
+        self._roots = {4: _TrieNode(0, 0), 6: _TrieNode(0, 0)}
+        self._widths = {4: 32, 6: 128}
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, subnet, value):
+        """
+        Attach a value to a subnet.
+
+        Args:
+            subnet: Anything parse_subnet() accepts
+            value: Stored with the subnet and returned by lookup()
+
+        Returns:
+            IPv4Network/IPv6Network or None: The parsed network, or None when
+                the subnet was skipped
+        """
+        network = parse_subnet(subnet)
+        if network is None:
+            logger.debug(f"Skipping unusable subnet {subnet!r}")
+            return None
+
+        width = self._widths[network.version]
+        bits, length = int(network.network_address), network.prefixlen
+        node = self._roots[network.version]
+        while True:
+            if node.length == length:
+                # Only reachable when node.bits == bits (node is always a prefix of the key)
+                break
+            branch = (bits >> (width - node.length - 1)) & 1
+            child = node.children[branch]
+            if child is None:
+                child = node.children[branch] = _TrieNode(bits, length)
+                node = child
+                break
+
+            diff = child.bits ^ bits
+            common = min(width - diff.bit_length(), child.length, length)
+            if common == child.length:
+                node = child
+                continue
+
+            # Split: a new node at the common prefix takes the child's place
+            split = _TrieNode(bits & ~((1 << (width - common)) - 1), common)
+            split.children[(child.bits >> (width - common - 1)) & 1] = child
+            node.children[branch] = split
+            if common != length:
+                leaf = _TrieNode(bits, length)
+                split.children[(bits >> (width - common - 1)) & 1] = leaf
+                split = leaf
+            node = split
+            break
+
+        if node.values is None:
+            node.network = network
+            node.values = []
+            self._count += 1
+        node.values.append(value)
+        return network
+
+    def lookup(self, ip):
+        """
+        Find the most specific subnet containing an address.
+
+        Args:
+            ip (str or ipaddress address): Address to resolve
+
+        Returns:
+            tuple or None: (network, [values]) of the longest matching prefix
+        """
+        address = ip if isinstance(ip, (ipaddress.IPv4Address, ipaddress.IPv6Address)) else parse_ip(ip)
+        if address is None:
+            return None
+
+        width = self._widths[address.version]
+        bits = int(address)
+        node = self._roots[address.version]
+        best = None
+        while node is not None:
+            if node.length and (bits ^ node.bits) >> (width - node.length):
+                break
+            if node.values is not None:
+                best = node
+            if node.length == width:
+                break
+            node = node.children[(bits >> (width - node.length - 1)) & 1]
+        return (best.network, best.values) if best is not None else None
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the concurrent direct-FortiGate poller
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fortigate_poller import INTERFACES, STATUS, FortiGatePoller
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body, self.status_code = body, status_code
+
+    def json(self):
+        return self.body
+
+
+class FakeFleet:
+    """One FakeSession per host; hosts named 'slow-*' answer late, 'dead-*' refuse connections"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.sessions = 0
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def session_factory(self):
+        with self.lock:
+            self.sessions += 1
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, fleet):
+        self.fleet = fleet
+
+    def get(self, url, headers=None, verify=None, timeout=None):
+        host = url.split('/')[2]
+        with self.fleet.lock:
+            self.fleet.calls.append((host, url.split('/api/v2/')[1], timeout))
+        if host.startswith('dead'):
+            raise ConnectionRefusedError(f"{host} refused")
+        time.sleep(self.fleet.delay * (6 if host.startswith('slow') else 1))
+        if url.endswith(INTERFACES) and host.startswith('noint'):
+            return FakeResponse({}, status_code=403)
+        return FakeResponse({'results': {'hostname': host, 'auth': headers['Authorization']}})
+
+    def close(self):
+        pass
+
+
+def devices(*hosts):
+    return [{'host': host, 'api_key': f"key-{host}", 'name': host.upper()} for host in hosts]
+
+
+def test_devices_poll_concurrently_over_one_session_per_host():
+    """Bounded parallel polling; every endpoint of a host reuses its session and gets its own timeout"""
+    fleet = FakeFleet()
+    poller = FortiGatePoller(max_workers=10, jitter=0, session_factory=fleet.session_factory)
+    hosts = [f"fg{i}" for i in range(20)]
+    start = time.monotonic()
+    results = poller.poll_all(devices(*hosts), [STATUS, INTERFACES])
+    elapsed = time.monotonic() - start
+    # 20 devices x 2 calls x 50ms serially would be 2s
+    assert elapsed < 0.6
+    assert [r['host'] for r in results] == hosts
+    assert fleet.sessions == 20 and len(fleet.calls) == 40
+    assert {timeout for _, endpoint, timeout in fleet.calls if endpoint == STATUS} == {(5, 5)}
+    assert results[3]['results'][STATUS]['results']['auth'] == 'Bearer key-fg3'
+
+    poller.poll_all(devices('fg1'), [STATUS])
+    assert fleet.sessions == 20
+    # Counters are shared by all workers
+    assert poller.stats == {'devices': 21, 'requests': 41, 'failures': 0, 'unreachable': 0}
+    poller.close()
+
+
+def test_results_stream_as_devices_complete():
+    """Fast devices arrive first; unreachable devices skip their remaining endpoints; errors stay per endpoint"""
+    fleet = FakeFleet()
+    poller = FortiGatePoller(max_workers=4, jitter=0, session_factory=fleet.session_factory)
+    configs = devices('slow-1', 'fg1', 'dead-1', 'noint-1') + [{'host': 'nokey', 'name': 'NOKEY'}]
+    order = [r['host'] for r in poller.poll(configs, [STATUS, INTERFACES])]
+    assert order[-1] == 'slow-1' and set(order) == {'slow-1', 'fg1', 'dead-1', 'noint-1'}
+
+    by_host = {r['host']: r for r in poller.poll_all(configs, [STATUS, INTERFACES])}
+    dead = by_host['dead-1']
+    assert not dead['reachable'] and dead['errors'][INTERFACES].startswith('skipped')
+    assert [c for c in fleet.calls if c[0] == 'dead-1'] == [('dead-1', STATUS, (5, 5))] * 2
+    noint = by_host['noint-1']
+    assert noint['reachable'] and noint['results'][STATUS] and noint['errors'] == {INTERFACES: 'HTTP 403'}
+    poller.close()
+
+
+def test_jitter_and_early_close():
+    """Starts are spread by the jitter; closing the stream early cancels devices not yet started"""
+    fleet = FakeFleet(delay=0.02)
+    poller = FortiGatePoller(max_workers=1, jitter=0.05, session_factory=fleet.session_factory)
+    stream = poller.poll(devices(*[f"fg{i}" for i in range(10)]), [STATUS])
+    first = next(stream)
+    stream.close()
+    time.sleep(0.2)
+    assert first['latency_ms'] >= 20 and len(fleet.calls) < 5
+    poller.close()
+
+
+def test_recent_results_are_reused_within_max_age():
+    """Delta polls reuse a device's last result until it is max_age old; other endpoints or keys poll again"""
+    fleet = FakeFleet(delay=0.01)
+    poller = FortiGatePoller(max_workers=4, jitter=0, session_factory=fleet.session_factory)
+    configs = devices('fg1', 'fg2')
+    poller.poll_all(configs, [STATUS, INTERFACES])
+    assert len(fleet.calls) == 4
+
+    again = poller.poll_all([dict(config) for config in configs], [STATUS, INTERFACES], max_age=60)
+    assert len(fleet.calls) == 4 and all(result['cached'] for result in again)
+    assert again[1]['results'][STATUS]['results']['hostname'] == 'fg2'
+
+    poller.poll_all(configs, [STATUS], max_age=60)
+    poller.poll_all(devices('fg1') + [dict(configs[1], api_key='rotated')], [STATUS, INTERFACES], max_age=60)
+    assert len(fleet.calls) == 4 + 2 + 2
+    time.sleep(0.05)
+    poller.poll_all(configs, [STATUS, INTERFACES], max_age=0.01)
+    assert len(fleet.calls) == 8 + 4
+    poller.close()
+
+
+if __name__ == "__main__":
+    test_devices_poll_concurrently_over_one_session_per_host()
+    test_results_stream_as_devices_complete()
+    test_jitter_and_early_close()
+    test_recent_results_are_reused_within_max_age()
+    print("✅ FortiGate poller tests passed")
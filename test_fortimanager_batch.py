@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for batched FortiManager JSON-RPC reads
+"""
+
+import os
+import sys
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fortimanager_batch import collect_batched, interface_url, split_batch_result
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def json(self):
+        return self.body
+
+
+class FakeFortiManager:
+    """Answers batched interface reads; 'missing' devices fail per entry, a 'down' device fails its request"""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, payload):
+        urls = [param['url'] for param in payload['params']]
+        self.requests.append(urls)
+        if any('/down/' in url for url in urls):
+            return FakeResponse({}, status_code=503)
+        result = []
+        for url in urls:
+            if '/missing' in url:
+                result.append({'url': url, 'status': {'code': -3, 'message': 'Object does not exist'}})
+            else:
+                result.append({'url': url, 'status': {'code': 0, 'message': 'OK'}, 'data': [{'name': url.split('/')[4]}]})
+        # FortiManager does not promise to keep the request order
+        return FakeResponse({'id': payload['id'], 'result': result[::-1]})
+
+
+def test_batches_and_splits_per_device():
+    """Devices are packed batch_size per request and every device gets its own data back"""
+    fm = FakeFortiManager()
+    names = [f"FG-{i}" for i in range(7)] + ['FG-0']
+    results = collect_batched(fm.post, 'session', [interface_url(name) for name in names], batch_size=3)
+    assert [len(urls) for urls in fm.requests] == [3, 3, 1]
+    assert all(results[interface_url(name)] == [{'name': name}] for name in names)
+
+
+def test_entry_and_batch_errors_stay_local():
+    """A failed entry only loses its device; a failed request only loses its batch"""
+    fm = FakeFortiManager()
+    names = ['FG-1', 'missing', 'FG-2', 'down', 'FG-3']
+    results = collect_batched(fm.post, 'session', [interface_url(name) for name in names], batch_size=3)
+    assert results[interface_url('FG-1')] == [{'name': 'FG-1'}] and results[interface_url('FG-2')] == [{'name': 'FG-2'}]
+    assert results[interface_url('missing')] is None
+    assert results[interface_url('down')] is None and results[interface_url('FG-3')] is None
+
+
+def test_split_falls_back_to_position():
+    """Entries without an echoed url are matched by position; absent entries are reported"""
+    urls = [interface_url('a'), interface_url('b'), interface_url('c')]
+    split = split_batch_result(urls, {'result': [{'status': {'code': 0}, 'data': [1]},
+                                                 {'url': urls[1] + '/', 'status': {'code': 0}, 'data': [2]}]})
+    assert split[urls[0]][2] == [1] and split[urls[1]][2] == [2]
+    assert split[urls[2]][0] is None
+
+
+if __name__ == "__main__":
+    test_batches_and_splits_per_device()
+    test_entry_and_batch_errors_stay_local()
+    test_split_falls_back_to_position()
+    print("✅ FortiManager batch tests passed")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the concurrent multi-site FortiManager fan-out
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fortimanager_fanout import DONE, ERROR, TIMEOUT, fan_out
+
+SITES = {'arbys': {'delay': 0.2}, 'bww': {'delay': 0.2}, 'sonic': {'delay': 0.2}}
+
+
+def fake_site(site, config):
+    time.sleep(config['delay'])
+    if config.get('fail'):
+        raise ConnectionError(f"{site} refused")
+    return [f"{site}-fg1", f"{site}-fg2"]
+
+
+def test_sites_run_concurrently():
+    """All sites are queried at once and report their own latency"""
+    start = time.monotonic()
+    results = fan_out(SITES, fake_site, site_timeout=5, budget=5)
+    assert time.monotonic() - start < 0.5
+    assert list(results) == list(SITES)
+    assert all(r['status'] == DONE and r['result'] == [f"{s}-fg1", f"{s}-fg2"] for s, r in results.items())
+    assert all(150 <= r['latency_ms'] < 500 for r in results.values())
+
+
+def test_slow_site_returns_partial_results():
+    """A dead site times out at its deadline while the others come back; errors stay per site"""
+    sites = dict(SITES, arbys={'delay': 3}, bww={'delay': 0.1, 'fail': True})
+    start = time.monotonic()
+    results = fan_out(sites, fake_site, site_timeout=0.6, budget=5)
+    assert time.monotonic() - start < 1.5
+    assert results['arbys']['status'] == TIMEOUT and results['arbys']['latency_ms'] >= 600
+    assert results['bww']['status'] == ERROR and 'refused' in results['bww']['error']
+    assert results['sonic']['status'] == DONE
+
+
+def test_request_budget_caps_queued_sites():
+    """Sites queued behind a small pool still finish within the overall budget"""
+    sites = {f"site{i}": {'delay': 0.4} for i in range(4)}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.monotonic()
+        results = fan_out(sites, fake_site, site_timeout=5, budget=0.6, executor=executor)
+        elapsed = time.monotonic() - start
+    assert elapsed < 1.5
+    statuses = [r['status'] for r in results.values()]
+    assert statuses.count(DONE) == 2 and statuses.count(TIMEOUT) == 2
+
+
+if __name__ == "__main__":
+    test_sites_run_concurrently()
+    test_slow_site_returns_partial_results()
+    test_request_budget_caps_queued_sites()
+    print("✅ FortiManager fan-out tests passed")
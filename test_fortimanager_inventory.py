@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for the FortiManager device inventory store
+"""
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fortimanager_inventory import FULL, INCREMENTAL, DeviceInventoryStore, FortiManagerInventory
+
+
+class FakeFortiManager:
+    """Serves /dvmdb device rows and records every get_device_rows call"""
+
+    def __init__(self, count=6):
+        self.rows = {f"FG-{i}": {'name': f"FG-{i}", 'sn': f"FGT{i:04d}", 'ip': f"10.0.{i}.1", 'conn_status': 1,
+                                 'last_resync': 1000, 'os_ver': '7.2', 'platform_str': 'FortiGate-60F',
+                                 'meta fields': {'Company/Organization': 'arbys' if i % 2 else 'sonic'}}
+                     for i in range(count)}
+        self.calls = []
+        self.fail = set()
+
+    def get_device_rows(self, adom=None, fields=None, filter=None):
+        kind = 'filter' if filter else 'listing' if fields else 'full'
+        self.calls.append((kind, tuple(filter[2:]) if filter else None))
+        if kind in self.fail:
+            return None
+        rows = [row for name, row in self.rows.items() if not filter or name in filter[2:]]
+        if fields:
+            rows = [{field: row.get(field) for field in fields} for row in rows]
+        return rows
+
+    @staticmethod
+    def process_device(device):
+        return {'name': device['name'], 'serial': device['sn'], 'ip': device['ip'], 'os_ver': device['os_ver'],
+                'status': 'online' if device.get('conn_status') == 1 else 'offline',
+                'site': device['meta fields']['Company/Organization']}
+
+
+def store_for(fm, **kwargs):
+    @contextmanager
+    def connect():
+        yield fm
+    return DeviceInventoryStore(connect, name='test', **kwargs)
+
+
+def test_incremental_refresh_fetches_only_changed_rows():
+    """After a full load only devices whose change fields moved are re-read; deleted devices drop out"""
+    fm = FakeFortiManager()
+    store = store_for(fm)
+    first = store.refresh()
+    assert first.mode == FULL and len(first.devices) == 6
+
+    fm.rows['FG-2']['last_resync'] = 2000
+    fm.rows['FG-2']['os_ver'] = '7.4'
+    fm.rows['FG-4']['conn_status'] = 0
+    del fm.rows['FG-5']
+    fm.rows['FG-9'] = dict(fm.rows['FG-0'], name='FG-9', sn='FGT0009', ip='10.0.9.1')
+    fm.calls.clear()
+    second = store.refresh()
+    assert fm.calls == [('listing', None), ('filter', ('FG-2', 'FG-4', 'FG-9'))]
+    assert second.mode == INCREMENTAL and second.changed == 3
+    assert second.get('FG-2')['os_ver'] == '7.4' and second.get('FG-4')['status'] == 'offline'
+    assert second.get('FG-5') is None and second.get('FG-9') is not None
+    # The earlier snapshot is untouched
+    assert first.get('FG-2')['os_ver'] == '7.2' and first.get('FG-5') is not None
+
+    fm.calls.clear()
+    third = store.refresh()
+    assert fm.calls == [('listing', None)] and third.devices == second.devices and third.changed == 0
+
+
+def test_indexes_and_staleness():
+    """Lookups by serial, IP and site come from the snapshot; status reports its age"""
+    fm = FakeFortiManager()
+    store = store_for(fm, refresh_interval=0.2)
+    inventory = store.snapshot()
+    assert inventory.by_serial_number('FGT0003')['name'] == 'FG-3'
+    assert inventory.by_address('10.0.4.1')['name'] == 'FG-4'
+    assert [d['name'] for d in inventory.in_site('arbys')] == ['FG-1', 'FG-3', 'FG-5']
+    status = store.status()
+    assert status['mode'] == FULL and status['devices'] == 6 and not status['stale']
+
+    time.sleep(0.25)
+    assert store.status()['stale']
+    fm.calls.clear()
+    assert store.snapshot() is inventory  # served immediately, refreshed in the background
+    deadline = time.time() + 2
+    while store.status()['stale'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert not store.status()['stale'] and fm.calls == [('listing', None)]
+
+
+def test_failures_keep_previous_snapshot():
+    """A failed incremental pass falls back to a full read; a failed full read keeps serving the last snapshot"""
+    fm = FakeFortiManager()
+    store = store_for(fm)
+    threads = [threading.Thread(target=store.snapshot) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fm.calls == [('full', None)]
+
+    fm.rows['FG-1']['ip'] = '10.9.9.9'
+    fm.fail = {'filter'}
+    fm.calls.clear()
+    assert store.refresh().by_address('10.9.9.9')['name'] == 'FG-1'
+    assert [kind for kind, _ in fm.calls] == ['listing', 'filter', 'full']
+
+    before = store.snapshot()
+    fm.fail = {'listing', 'full'}
+    assert store.refresh() is before and store.status()['error']
+
+
+def test_stores_are_keyed_by_credentials():
+    """A wrong password never reads another caller's snapshot or changes how the store logs in"""
+    fm = FakeFortiManager()
+    logins = []
+
+    def connect_factory(host, username, password, port, site):
+        @contextmanager
+        def connect():
+            logins.append(password)
+            yield fm if password == 'right' else None
+        return connect
+
+    registry = FortiManagerInventory(tick=3600, connect_factory=connect_factory)
+    good = registry.store('fmg.example.com', 'admin', 'right')
+    assert len(good.snapshot().devices) == 6
+
+    bad = registry.store('fmg.example.com', 'admin', 'wrong')
+    assert bad is not good and bad.snapshot() is None and bad.rejected
+    assert registry.store('fmg.example.com', 'admin', 'right') is good
+
+    logins.clear()
+    good.refresh()
+    assert logins == ['right'] and good.last_error is None
+
+    # Rejected stores are not retried on a timer and are dropped if they never loaded
+    assert not bad.due()
+    registry.run_pending(now=time.time())
+    assert registry.store('fmg.example.com', 'admin', 'wrong') is not bad
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+def test_interfaces_reread_only_for_changed_devices():
+    """Interface tables are cached per device row; raw rows are kept for the topology routes"""
+    fm = FakeFortiManager(count=3)
+    fm.session_id = 'session'
+    reads = []
+
+    def post_read(payload):
+        urls = [entry['url'] for entry in payload['params']]
+        reads.append([url.split('/')[4] for url in urls])
+        return FakeResponse({'result': [{'url': url, 'status': {'code': 0},
+                                         'data': [{'name': 'lan', 'ip': ['10.0.0.1', '255.255.255.0']}]}
+                                        for url in urls]})
+    fm._post_read = post_read
+    store = store_for(fm)
+    inventory = store.snapshot()
+    rows = inventory.raw_rows()
+    assert [row['sn'] for row in rows] == ['FGT0000', 'FGT0001', 'FGT0002']
+    rows[0]['interfaces'] = []
+    assert 'interfaces' not in inventory.raw['FG-0']
+
+    names = [row['name'] for row in rows]
+    assert store.interfaces(names)['FG-1'][0]['name'] == 'lan'
+    assert store.interfaces(names, inventory) and reads == [['FG-0', 'FG-1', 'FG-2']]
+
+    fm.rows['FG-2']['last_resync'] = 2000
+    store.refresh()
+    store.interfaces(names)
+    assert reads[1:] == [['FG-2']]
+
+
+if __name__ == "__main__":
+    test_incremental_refresh_fetches_only_changed_rows()
+    test_indexes_and_staleness()
+    test_failures_keep_previous_snapshot()
+    test_stores_are_keyed_by_credentials()
+    test_interfaces_reread_only_for_changed_devices()
+    print("✅ FortiManager inventory tests passed")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the FortiManager session pool
+"""
+
+import os
+import sys
+import threading
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fortimanager_pool import FortiManagerSessionPool, SessionPoolTimeout, session_rejected
+
+
+class FakeClient:
+    """Stands in for FortiManagerAPI; counts logins and logouts per class"""
+    logins = 0
+    logouts = 0
+
+    def __init__(self, host, username, password, port=443, site=None):
+        self.host, self.username, self.password, self.site = host, username, password, site
+        self.session_id = None
+
+    def login(self):
+        FakeClient.logins += 1
+        if self.password == 'wrong':
+            return False
+        self.session_id = f"session-{FakeClient.logins}"
+        return True
+
+    def logout(self):
+        FakeClient.logouts += 1
+        self.session_id = None
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body, self.status_code = body, status_code
+
+    def json(self):
+        return self.body
+
+
+def reset():
+    FakeClient.logins = FakeClient.logouts = 0
+
+
+def test_clients_are_reused_per_site_and_user():
+    """A returned client is handed out again; other sites, users and passwords get their own"""
+    reset()
+    pool = FortiManagerSessionPool(max_sessions=4, wait=1)
+    with pool.client(FakeClient, 'fm1', 'admin', 'pw', site='arbys') as fm:
+        first = fm
+        assert fm.site == 'arbys'
+    with pool.client(FakeClient, 'fm1', 'admin', 'pw', site='arbys') as fm:
+        assert fm is first
+    with pool.client(FakeClient, 'fm1', 'admin', 'pw', site='bww') as fm:
+        assert fm is not first
+    with pool.client(FakeClient, 'fm1', 'admin', 'new-pw', site='arbys') as fm:
+        assert fm is not first
+    assert FakeClient.logins == 3 and FakeClient.logouts == 1
+    with pool.client(FakeClient, 'fm1', 'admin', 'wrong') as fm:
+        assert fm is None
+    assert pool.get_stats()['live'] == {'fm1': 2}
+    pool.close()
+    assert FakeClient.logouts == 3 and pool.get_stats()['live'] == {'fm1': 0}
+
+
+def test_sessions_are_bounded_per_host():
+    """The host limit evicts idle sessions of other keys and otherwise makes callers wait"""
+    reset()
+    pool = FortiManagerSessionPool(max_sessions=2, wait=0.2)
+    with pool.client(FakeClient, 'fm1', 'reader', 'pw'):
+        pass
+    a = pool.acquire(FakeClient, 'fm1', 'admin', 'pw')
+    b = pool.acquire(FakeClient, 'fm1', 'admin', 'pw')
+    assert FakeClient.logouts == 1 and pool.get_stats()['live'] == {'fm1': 2}
+    try:
+        pool.acquire(FakeClient, 'fm1', 'admin', 'pw')
+        assert False, 'expected SessionPoolTimeout'
+    except SessionPoolTimeout:
+        pass
+    # Another host is not affected
+    with pool.client(FakeClient, 'fm2', 'admin', 'pw') as other:
+        assert other is not None
+
+    pool.wait = 5
+    waiter = {}
+    thread = threading.Thread(target=lambda: waiter.update(client=pool.acquire(FakeClient, 'fm1', 'admin', 'pw')))
+    thread.start()
+    pool.release(a)
+    thread.join(2)
+    assert waiter['client'] is a
+    pool.release(b)
+    pool.release(a)
+
+
+def test_rejected_session_detection():
+    """Only responses rejected in every entry count as an expired session"""
+    rejected = {'code': -11, 'message': 'No permission for the resource'}
+    assert session_rejected(FakeResponse({'result': [{'status': rejected}, {'status': rejected}]}))
+    assert not session_rejected(FakeResponse({'result': [{'status': rejected}, {'status': {'code': 0}}]}))
+    assert not session_rejected(FakeResponse({'result': [{'status': {'code': 0}}]}))
+    assert not session_rejected(FakeResponse({}, status_code=503))
+
+
+if __name__ == "__main__":
+    test_clients_are_reused_per_site_and_user()
+    test_sessions_are_bounded_per_host()
+    test_rejected_session_detection()
+    print("✅ FortiManager session pool tests passed")
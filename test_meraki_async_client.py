@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio Meraki client and its sync facade
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.meraki_async_client import AsyncMerakiClient, SyncMerakiDashboard
+from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, get_request_priority, request_priority
+
+
+class FakeAsyncClient(AsyncMerakiClient):
+    """Serves canned pages instead of calling the Dashboard API"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.priorities = []
+
+    async def _fetch_page(self, url, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.priorities.append(get_request_priority())
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+
+        if url.endswith('/organizations/1/networks'):
+            return [{'id': f'N_{i}', 'name': f'Store {i}'} for i in range(3)], \
+                f'<{self.base_url}/organizations/1/networks?page=2>; rel=next'
+        if url.endswith('networks?page=2'):
+            return [{'id': 'N_3', 'name': 'Store 3'}], None
+        if '/devices' in url:
+            network_id = url.split('/networks/')[1].split('/')[0]
+            if network_id == 'N_bad':
+                raise RuntimeError("boom")
+            return [{'serial': f'{network_id}-MX', 'networkId': network_id}], None
+        return [], None
+
+
+def make_dashboard():
+    return SyncMerakiDashboard('test-key', client=FakeAsyncClient('test-key'))
+
+
+def test_facade_follows_pagination():
+    """The blocking facade returns every page like CustomDashboard"""
+    dashboard = make_dashboard()
+    networks = dashboard.organizations.getOrganizationNetworks('1')
+    assert [n['id'] for n in networks] == ['N_0', 'N_1', 'N_2', 'N_3']
+
+
+def test_map_networks_runs_concurrently():
+    """Fan-out overlaps requests and reports per-network failures"""
+    dashboard = make_dashboard()
+    network_ids = [f'N_{i}' for i in range(20)] + ['N_bad']
+
+    start = time.monotonic()
+    results = dashboard.map_networks('getNetworkDevices', network_ids)
+    elapsed = time.monotonic() - start
+
+    assert results['N_7'][0]['serial'] == 'N_7-MX'
+    assert isinstance(results['N_bad'], RuntimeError)
+    # 21 sequential requests would take >= 0.42s
+    assert elapsed < 0.3
+    assert dashboard.client.max_in_flight > 1
+
+
+def test_facade_propagates_priority():
+    """Background callers stay background on the event loop thread"""
+    dashboard = make_dashboard()
+    with request_priority(PRIORITY_BACKGROUND):
+        dashboard.networks.getNetworkDevices('N_1')
+    assert dashboard.client.priorities[-1] == PRIORITY_BACKGROUND
+
+
+if __name__ == "__main__":
+    test_facade_follows_pagination()
+    test_map_networks_runs_concurrently()
+    test_facade_propagates_priority()
+    print("✅ Async client tests passed")
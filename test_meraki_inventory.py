@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the org-level bulk device inventory join
+"""
+
+import os
+import sys
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.meraki_inventory import join_organization_inventory, group_by_network
+
+
+NETWORKS = [
+    {'id': 'N_1', 'name': 'Store 1001'},
+    {'id': 'N_2', 'name': 'Store 1002'},
+]
+
+DEVICES = [
+    {'serial': 'Q2MX-0001', 'name': 'MX-1001', 'model': 'MX68', 'networkId': 'N_1'},
+    {'serial': 'Q2MS-0001', 'name': None, 'model': 'MS120-8', 'networkId': 'N_1'},
+    {'serial': 'Q2MR-0002', 'name': 'AP-1002', 'model': 'MR36', 'networkId': 'N_2'},
+]
+
+STATUSES = [
+    {'serial': 'Q2MX-0001', 'status': 'online', 'lanIp': '10.1.0.1', 'networkId': 'N_1'},
+    {'serial': 'Q2MS-0001', 'status': 'alerting', 'networkId': 'N_1'},
+    {'serial': 'Q2MR-0002', 'status': 'offline', 'networkId': 'N_2'},
+]
+
+INVENTORY = [
+    {'serial': 'Q2MS-0001', 'name': 'SW-1001', 'networkId': 'N_1', 'claimedAt': '2024-01-01'},
+    {'serial': 'Q2MR-0003', 'name': 'AP-1002-B', 'model': 'MR36', 'networkId': 'N_2'},
+    {'serial': 'Q2MR-9999', 'name': 'Spare', 'model': 'MR36', 'networkId': None},
+]
+
+
+def test_join_by_serial_and_network():
+    """Status and inventory fields are merged onto device records"""
+    devices = join_organization_inventory(DEVICES, STATUSES, INVENTORY, NETWORKS)
+    by_serial = {d['serial']: d for d in devices}
+
+    assert by_serial['Q2MX-0001']['status'] == 'online'
+    assert by_serial['Q2MX-0001']['lanIp'] == '10.1.0.1'
+    assert by_serial['Q2MX-0001']['networkName'] == 'Store 1001'
+    # Missing name filled from inventory, status from statuses
+    assert by_serial['Q2MS-0001']['name'] == 'SW-1001'
+    assert by_serial['Q2MS-0001']['status'] == 'alerting'
+    assert by_serial['Q2MR-0002']['status'] == 'offline'
+
+
+def test_inventory_only_devices():
+    """Claimed devices in a network are included, unassigned spares are not"""
+    devices = join_organization_inventory(DEVICES, STATUSES, INVENTORY, NETWORKS)
+    serials = [d['serial'] for d in devices]
+
+    assert 'Q2MR-0003' in serials
+    assert 'Q2MR-9999' not in serials
+    assert len(group_by_network(devices)['N_2']) == 2
+
+
+def test_inputs_are_not_mutated():
+    """Joining copies records so cached API responses stay untouched"""
+    join_organization_inventory(DEVICES, STATUSES, INVENTORY, NETWORKS)
+    assert 'status' not in DEVICES[0]
+    assert DEVICES[1]['name'] is None
+
+
+if __name__ == "__main__":
+    test_join_by_serial_and_network()
+    test_inventory_only_devices()
+    test_inputs_are_not_mutated()
+    print("✅ Inventory join tests passed")
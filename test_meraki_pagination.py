@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for Meraki Link-header pagination
+"""
+
+import os
+import sys
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.meraki_pagination import parse_link_header, iter_pages, iter_items
+from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, get_request_priority, request_priority
+
+BASE = "https://api.meraki.com/api/v1/networks/N_1/clients"
+
+
+def make_fake_api(total, per_page):
+    """Build a fetch_page function serving ``total`` clients in pages"""
+    calls = []
+
+    def fetch_page(url, params):
+        calls.append((url, params))
+        start = int(url.split('startingAfter=')[1]) if 'startingAfter=' in url else 0
+        items = [{'id': f'k{i}', 'mac': f'00:00:00:00:{i // 256:02x}:{i % 256:02x}'}
+                 for i in range(start, min(start + per_page, total))]
+        link = f'<{BASE}?perPage={per_page}>; rel=first'
+        if start + per_page < total:
+            link += f', <{BASE}?perPage={per_page}&startingAfter={start + per_page}>; rel=next'
+        return items, link
+
+    return fetch_page, calls
+
+
+def test_parse_link_header():
+    """Meraki style Link headers are parsed into rel -> url"""
+    header = (f'<{BASE}?perPage=10>; rel=first, '
+              f'<{BASE}?perPage=10&startingAfter=k9>; rel=next, '
+              f'<{BASE}?perPage=10&endingBefore=z>; rel="last"')
+    links = parse_link_header(header)
+    assert links['first'] == f'{BASE}?perPage=10'
+    assert links['next'] == f'{BASE}?perPage=10&startingAfter=k9'
+    assert links['last'] == f'{BASE}?perPage=10&endingBefore=z'
+    assert parse_link_header(None) == {}
+
+
+def test_follows_next_links():
+    """Every page is fetched and first-page params are not re-sent"""
+    fetch_page, calls = make_fake_api(total=2500, per_page=1000)
+    pages = list(iter_pages(fetch_page, BASE, {'perPage': 1000, 'timespan': 86400}))
+
+    assert [len(p) for p in pages] == [1000, 1000, 500]
+    assert calls[0][1] == {'perPage': 1000, 'timespan': 86400}
+    assert all(params is None for _, params in calls[1:])
+
+
+def test_items_are_lazy():
+    """The item iterator only fetches pages the caller actually reaches"""
+    fetch_page, calls = make_fake_api(total=5000, per_page=100)
+    items = iter_items(fetch_page, BASE)
+
+    first = [next(items) for _ in range(150)]
+    assert first[-1]['id'] == 'k149'
+    assert len(calls) == 2
+
+
+def test_prefetch_preserves_order():
+    """Background prefetching yields the same items in the same order"""
+    fetch_page, _ = make_fake_api(total=1234, per_page=100)
+    ids = [item['id'] for item in iter_items(fetch_page, BASE, prefetch=2)]
+    assert ids == [f'k{i}' for i in range(1234)]
+
+
+def test_prefetch_stops_when_consumer_leaves():
+    """Closing a prefetching iterator early does not fetch the whole collection"""
+    fetch_page, calls = make_fake_api(total=100000, per_page=100)
+    pages = iter_pages(fetch_page, BASE, prefetch=1)
+    next(pages)
+    pages.close()
+    assert len(calls) < 10
+
+
+def test_prefetch_keeps_caller_priority():
+    """Pages fetched by the prefetch thread run at the caller's request priority"""
+    fetch_page, _ = make_fake_api(total=500, per_page=100)
+    priorities = []
+
+    def recording_fetch(url, params):
+        priorities.append(get_request_priority())
+        return fetch_page(url, params)
+
+    with request_priority(PRIORITY_BACKGROUND):
+        assert len(list(iter_pages(recording_fetch, BASE, prefetch=1))) == 5
+    assert priorities == [PRIORITY_BACKGROUND] * 5
+
+
+def test_max_pages_and_loops():
+    """max_pages bounds the walk and repeated next links stop it"""
+    fetch_page, calls = make_fake_api(total=10000, per_page=10)
+    assert len(list(iter_pages(fetch_page, BASE, max_pages=3))) == 3
+
+    def looping_fetch(url, params):
+        return [{'id': 'x'}], f'<{BASE}?startingAfter=x>; rel=next'
+
+    assert len(list(iter_pages(looping_fetch, BASE))) == 2
+
+
+if __name__ == "__main__":
+    test_parse_link_header()
+    test_follows_next_links()
+    test_items_are_lazy()
+    test_prefetch_preserves_order()
+    test_prefetch_stops_when_consumer_leaves()
+    test_prefetch_keeps_caller_priority()
+    test_max_pages_and_loops()
+    print("✅ Pagination tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled Meraki HTTP transport
+"""
+
+import os
+import sys
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki import meraki_transport
+from modules.meraki.meraki_transport import MerakiTransport, configure_transport, get_transport
+
+API = "https://api.meraki.com/api/v1"
+
+
+def test_sessions_are_shared_per_host():
+    """The same scheme://host reuses one session; another host gets its own"""
+    transport = MerakiTransport(pool_size=4)
+    try:
+        first = transport.session_for(f"{API}/organizations")
+        second = transport.session_for(f"{API}/networks/N_1/devices?perPage=100")
+        other_host = transport.session_for("https://n123.meraki.com/api/v1/organizations")
+        other_scheme = transport.session_for("http://api.meraki.com/api/v1/organizations")
+
+        assert first is second
+        assert other_host is not first
+        assert other_scheme is not first
+        assert other_scheme is not other_host
+    finally:
+        transport.close()
+
+
+def test_stats_count_session_hits_and_misses():
+    """get_stats reports how often callers found an existing host session"""
+    transport = MerakiTransport(pool_size=4)
+    try:
+        for _ in range(3):
+            transport.session_for(f"{API}/organizations")
+        transport.session_for("https://n123.meraki.com/api/v1/organizations")
+
+        stats = transport.get_stats()
+        assert stats['pool_size'] == 4
+        assert stats['session_hits'] == 2
+        assert stats['session_misses'] == 2
+        assert set(stats['hosts']) == {"https://api.meraki.com", "https://n123.meraki.com"}
+        # Nothing has been sent yet, so no connections were opened or reused
+        assert stats['pool_hits'] == 0
+        assert stats['pool_misses'] == 0
+    finally:
+        transport.close()
+
+
+def test_configure_transport_replaces_shared_instance():
+    """configure_transport swaps the process-wide transport and closes the old one"""
+    previous = meraki_transport._transport
+    try:
+        old = get_transport()
+        old.session_for(f"{API}/organizations")
+        assert get_transport() is old
+
+        new = configure_transport(pool_size=7, pool_block=True)
+        assert new is not old
+        assert get_transport() is new
+        assert (new.pool_size, new.pool_block) == (7, True)
+        assert old.get_stats()['hosts'] == {}
+    finally:
+        meraki_transport._transport.close()
+        meraki_transport._transport = previous
+
+
+def test_429_is_left_to_the_rate_scheduler():
+    """The adapter retries transient 5xx errors but never 429s"""
+    transport = MerakiTransport()
+    try:
+        session = transport.session_for(f"{API}/organizations")
+        retries = session.get_adapter(f"{API}/organizations").max_retries
+        assert 429 not in retries.status_forcelist
+        assert {500, 502, 503, 504} <= set(retries.status_forcelist)
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    test_sessions_are_shared_per_host()
+    test_stats_count_session_hits_and_misses()
+    test_configure_transport_replaces_shared_instance()
+    test_429_is_left_to_the_rate_scheduler()
+    print("✅ Meraki transport tests passed")
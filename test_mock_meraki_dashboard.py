@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the mock Meraki Dashboard server and its synthetic data
+"""
+
+import os
+import sys
+import json
+import tempfile
+import urllib.error
+import urllib.request
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_meraki_dashboard import MockMerakiDashboard, start_mock_server
+from modules.meraki.synthetic_data import SyntheticMerakiData
+from modules.meraki.meraki_pagination import iter_pages
+
+HEADERS = {'X-Cisco-Meraki-API-Key': 'test-key'}
+
+
+def http_get(url, params=None):
+    """GET a mock URL with urllib; returns (status, body, Link header)."""
+    if params:
+        url = f"{url}?{'&'.join(f'{k}={v}' for k, v in params.items())}"
+    request = urllib.request.Request(url, headers=HEADERS)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read()), response.headers.get('Link')
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read()), e.headers.get('Retry-After')
+
+
+def test_synthetic_data_is_deterministic_and_sized():
+    """Same parameters give the same org; clients spread over networks"""
+    a = SyntheticMerakiData(networks=1000, clients=100000)
+    b = SyntheticMerakiData(networks=1000, clients=100000)
+    org_id = a.organizations()[0]['id']
+    network_id = a.networks(org_id)[42]['id']
+
+    assert len(a.networks(org_id)) == 1000
+    assert a.client_count(network_id) == 100
+    assert a.clients(network_id, 0, 5) == b.clients(network_id, 0, 5)
+    serial = a.network_devices(network_id)[1]['serial']
+    assert a.device(serial)['networkId'] == network_id
+    assert a.parse_serial('Q9MX-0000-0000') is None
+
+
+def test_pagination_follows_link_headers():
+    """iter_pages walks every page of a network's clients through the server"""
+    data = SyntheticMerakiData(networks=2, clients=2500)
+    server, base_url = start_mock_server(MockMerakiDashboard(data, rate_limit=0))
+    try:
+        network_id = data.networks('100000')[0]['id']
+
+        def fetch_page(url, params):
+            status, body, link = http_get(url, params)
+            assert status == 200
+            return body, link
+
+        pages = list(iter_pages(fetch_page, f"{base_url}/networks/{network_id}/clients", {'perPage': 500}))
+        clients = [c for page in pages for c in page]
+        assert len(pages) == 3
+        assert len({c['id'] for c in clients}) == 1250
+    finally:
+        server.shutdown()
+
+
+def test_rate_limit_returns_429_with_retry_after():
+    """Bursting past the per-org budget yields 429 + Retry-After"""
+    dashboard = MockMerakiDashboard(rate_limit=1, burst=2)
+    statuses = [dashboard.handle('GET', '/api/v1/organizations/100000/networks', headers=HEADERS)[0]
+                for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    status, headers, _ = dashboard.handle('GET', '/organizations/100000/devices', headers=HEADERS)
+    assert status == 429 and int(headers['Retry-After']) >= 1
+    # Unauthenticated requests are rejected before anything else
+    assert dashboard.handle('GET', '/organizations')[0] == 401
+
+
+def test_live_tools_job_completes():
+    """Live tools jobs are created, then report complete with results"""
+    dashboard = MockMerakiDashboard(rate_limit=0, live_tools_delay=0)
+    serial = dashboard.data.network_devices('L_100000000000')[0]['serial']
+    status, _, job = dashboard.handle('POST', f'/devices/{serial}/liveTools/ping', headers=HEADERS,
+                                      body={'target': '8.8.8.8'})
+    assert status == 201 and job['status'] == 'new'
+
+    status, _, result = dashboard.handle('GET', f"/devices/{serial}/liveTools/ping/{job['pingId']}",
+                                         headers=HEADERS)
+    assert status == 200 and result['status'] == 'complete'
+    assert result['results']['loss']['percentage'] == 0
+
+
+def test_record_then_replay_fixtures():
+    """Responses recorded through one server replay from fixtures on another"""
+    upstream_server, upstream_url = start_mock_server(MockMerakiDashboard(rate_limit=0))
+    fixtures = tempfile.mkdtemp()
+    recorder_server, recorder_url = start_mock_server(
+        MockMerakiDashboard(rate_limit=0, record_dir=fixtures, upstream=upstream_url))
+    try:
+        status, recorded, link = http_get(f"{recorder_url}/organizations/100000/networks", {'perPage': 3})
+        assert status == 200 and len(recorded) == 3
+        assert link.startswith(f"<{recorder_url}")
+    finally:
+        upstream_server.shutdown()
+        recorder_server.shutdown()
+
+    # Replay ignores synthetic data entirely: use a dataset with different names
+    replay = MockMerakiDashboard(SyntheticMerakiData(seed=5, networks=1), rate_limit=0, fixtures_dir=fixtures)
+    status, headers, body = replay.handle('GET', '/organizations/100000/networks', {'perPage': '3'},
+                                          HEADERS, base_url='http://mock/api/v1')
+    assert status == 200 and body == recorded
+    assert headers['Link'].startswith('<http://mock/api/v1/organizations/100000/networks')
+    assert replay.get_stats()['by_source'] == {'fixture': 1}
+
+
+if __name__ == "__main__":
+    test_synthetic_data_is_deterministic_and_sized()
+    test_pagination_follows_link_headers()
+    test_rate_limit_returns_429_with_retry_after()
+    test_live_tools_job_completes()
+    test_record_then_replay_fixtures()
+    print("✅ Mock Meraki Dashboard tests passed")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for organization-wide topology jobs
+"""
+
+import os
+import sys
+import time
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from org_topology import (CANCELLED, DONE, INTERNET_NODE_ID, OrgTopologyJobs, build_network,
+                          merge_topologies, selection_key)
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+NETWORKS = 6
+
+
+def synthetic_org():
+    return SyntheticMerakiData(networks=NETWORKS, clients=NETWORKS * 40, devices_per_network=5)
+
+
+def synthetic_fetch(api_key, network_id):
+    """Per-network fetcher for the worker processes"""
+    data = synthetic_org()
+    if network_id.endswith('000005'):
+        raise RuntimeError('network unreachable')
+    return (data.network_devices(network_id), data.clients(network_id, 0, data.client_count(network_id)),
+            data.topology_links(network_id))
+
+
+def slow_fetch(api_key, network_id):
+    time.sleep(2)
+    return synthetic_fetch(api_key, network_id)
+
+
+def synthetic_org_links(api_key, org_id):
+    """Hub-and-spoke VPN from the first store, every MX with an active WAN1"""
+    data = synthetic_org()
+    networks = data.networks(org_id)
+    mx = {n['id']: data.network_devices(n['id'])[0]['serial'] for n in networks}
+    hub = networks[0]['id']
+    vpn = [{'networkId': n['id'], 'deviceSerial': mx[n['id']],
+            'merakiVpnPeers': [{'networkId': hub if n['id'] != hub else networks[1]['id'], 'reachability': 'reachable'}]}
+           for n in networks]
+    uplinks = [{'networkId': n['id'], 'serial': mx[n['id']],
+                'uplinks': [{'interface': 'wan1', 'status': 'active'}, {'interface': 'wan2', 'status': 'not connected'}]}
+               for n in networks]
+    return vpn, uplinks
+
+
+def org_networks():
+    data = synthetic_org()
+    return data.networks(data.organizations()[0]['id'])
+
+
+def test_merge_adds_inter_site_edges():
+    """Sites keep their own links; MX appliances gain VPN tunnels and WAN links to one Internet node"""
+    networks = org_networks()[:4]
+    parts = [(n, build_network('key', n, synthetic_fetch)) for n in networks]
+    vpn, uplinks = synthetic_org_links('key', networks[0]['organizationId'])
+    # A client reported by two networks stays one node per network
+    parts[1][1].nodes[-1].id = parts[0][1].nodes[-1].id
+    per_site = sum(len(p.nodes) for _, p in parts)
+
+    topology, sites = merge_topologies(parts, vpn, uplinks)
+    assert len(topology.nodes) == per_site + 1 and len(sites) == 4
+    assert topology.nodes[topology.positions[INTERNET_NODE_ID]].type == 'internet'
+    types = [link.type for link in topology.links]
+    # Spokes 1-3 tunnel to the hub; stores 4 and 5 are not part of this merge
+    assert types.count('vpn') == 3 and types.count('wan') == 4
+    assert sum(1 for node in topology.nodes if ':' in node.id) == 1
+    assert [s['stop'] - s['start'] for s in sites] == [len(p.nodes) for _, p in parts]
+
+
+def test_job_builds_and_pages_snapshot():
+    """Networks build across worker processes; failures are reported and the snapshot pages by site"""
+    jobs = OrgTopologyJobs(workers=2)
+    networks = org_networks()
+    job = jobs.submit('key', networks[0]['organizationId'], networks, synthetic_fetch, synthetic_org_links)
+    assert jobs.submit('key', job.org_id, networks, synthetic_fetch, synthetic_org_links) is job
+
+    deadline = time.time() + 60
+    while job.status not in (DONE, CANCELLED) and time.time() < deadline:
+        time.sleep(0.1)
+    progress = job.progress()
+    assert progress['status'] == DONE and progress['completed'] == NETWORKS
+    assert list(progress['failed']) == [networks[5]['id']]
+
+    snapshot = jobs.snapshot(job.org_id)
+    assert [s['id'] for s in snapshot.summary()['sites']] == [n['id'] for n in networks[:5]]
+    first = snapshot.page(0, 2)
+    assert first['next_offset'] == 2 and first['total'] == 5
+    assert any(node['id'] == INTERNET_NODE_ID for node in first['nodes'])
+    assert {e['type'] for e in first['edges']} >= {'vpn', 'wan'}
+    last = snapshot.page(4, 2, node_budget=10)
+    assert last['next_offset'] is None and len(last['nodes']) <= 10
+
+
+def test_job_cancellation():
+    """A cancelled job stops without merging and leaves no snapshot"""
+    jobs = OrgTopologyJobs(workers=1)
+    networks = org_networks()
+    job = jobs.submit('key', networks[0]['organizationId'], networks, slow_fetch, synthetic_org_links)
+    jobs.cancel(job.id)
+    deadline = time.time() + 30
+    while job.status != CANCELLED and time.time() < deadline:
+        time.sleep(0.1)
+    assert job.status == CANCELLED and job.completed < NETWORKS
+    assert jobs.snapshot(job.org_id) is None
+
+
+def test_region_jobs_are_kept_per_selection():
+    """Overlapping regions get their own jobs and snapshots; neither stands in for the whole organization"""
+    jobs = OrgTopologyJobs(workers=2)
+    networks = org_networks()
+    org_id = networks[0]['organizationId']
+    east, west = selection_key(tags=['east']), selection_key(tags=['west', 'east-west'])
+    east_job = jobs.submit('key', org_id, networks[:4], synthetic_fetch, synthetic_org_links, selection=east)
+    west_job = jobs.submit('key', org_id, networks[2:], synthetic_fetch, synthetic_org_links, selection=west)
+    assert west_job is not east_job
+    assert jobs.submit('key', org_id, networks[:4], synthetic_fetch, synthetic_org_links,
+                       selection=selection_key(tags=['east', 'east'])) is east_job
+    assert west_job.progress()['selection'] == {'network_ids': None, 'tags': ['east-west', 'west']}
+
+    deadline = time.time() + 60
+    while {east_job.status, west_job.status} != {DONE} and time.time() < deadline:
+        time.sleep(0.1)
+    assert [s['id'] for s in jobs.snapshot(org_id, east).summary()['sites']] == [n['id'] for n in networks[:4]]
+    assert [s['id'] for s in jobs.snapshot(org_id, west).summary()['sites']] == [n['id'] for n in networks[2:5]]
+    assert jobs.snapshot(org_id) is None
+
+
+if __name__ == "__main__":
+    test_merge_adds_inter_site_edges()
+    test_job_builds_and_pages_snapshot()
+    test_job_cancellation()
+    test_region_jobs_are_kept_per_selection()
+    print("✅ Org topology tests passed")
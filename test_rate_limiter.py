@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for the Meraki org-wide rate-limit scheduler
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.rate_limiter import (
+    MerakiRateScheduler, RateLimitedDashboard, RateLimitTimeout, UNKNOWN_ORG,
+    PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, request_priority, retry_after_from
+)
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_bucket_limits_rate_per_org():
+    """Burst is served immediately, the rest at the configured rate"""
+    scheduler = MerakiRateScheduler(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(15):
+        scheduler.acquire('org1')
+    elapsed = time.monotonic() - start
+    # 10 requests beyond the burst at 50 rps take ~0.2s
+    assert 0.15 <= elapsed < 1.0
+
+    # A different org has its own bucket
+    start = time.monotonic()
+    for _ in range(5):
+        scheduler.acquire('org2')
+    assert time.monotonic() - start < 0.05
+
+    metrics = scheduler.get_metrics()['organizations']
+    assert metrics['org1']['granted'] == 15
+    assert metrics['org2']['granted'] == 5
+
+
+def test_interactive_requests_jump_the_queue():
+    """Queued background requests are served after interactive ones"""
+    scheduler = MerakiRateScheduler(rate=20, burst=1)
+    scheduler.acquire('org1')  # drain the burst
+    order = []
+
+    def worker(priority, label):
+        scheduler.acquire('org1', priority=priority)
+        order.append(label)
+
+    threads = [threading.Thread(target=worker, args=(PRIORITY_BACKGROUND, f'bg{i}')) for i in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=worker, args=(PRIORITY_INTERACTIVE, 'ui'))
+    interactive.start()
+    for t in threads + [interactive]:
+        t.join(5)
+
+    # The first background request may already hold the head of the queue;
+    # the interactive one must beat the remaining background requests
+    assert order.index('ui') <= 1
+    by_priority = scheduler.get_metrics()['organizations']['org1']['by_priority']
+    assert by_priority['background']['granted'] == 3
+
+
+def test_retry_after_pauses_org_and_retries():
+    """A 429 pauses the org bucket for Retry-After and the call is retried"""
+    scheduler = MerakiRateScheduler(rate=100, burst=10)
+    responses = [FakeResponse(429, {'Retry-After': '0.2'}), FakeResponse(200)]
+
+    start = time.monotonic()
+    result = scheduler.call('org1', lambda: responses.pop(0))
+    assert result.status_code == 200
+    assert time.monotonic() - start >= 0.2
+    assert scheduler.get_metrics()['organizations']['org1']['throttled_429'] == 1
+
+
+def test_retry_after_parsing():
+    """Retry-After is read from responses and exceptions"""
+    assert retry_after_from(FakeResponse(200)) is None
+    assert retry_after_from(FakeResponse(429, {'Retry-After': '3'})) == 3.0
+    assert retry_after_from(FakeResponse(429)) == 1.0
+
+    class FakeAPIError(Exception):
+        status = 429
+        response = FakeResponse(429, {'Retry-After': '2'})
+
+    assert retry_after_from(FakeAPIError()) == 2.0
+
+
+def test_org_attribution_is_learned():
+    """Network and device paths map to the org learned from responses"""
+    scheduler = MerakiRateScheduler()
+    assert scheduler.org_for_path('/networks/N_1/clients') == UNKNOWN_ORG
+
+    scheduler.learn_from_path('/organizations/123/networks',
+                              [{'id': 'N_1', 'organizationId': '123', 'productTypes': ['switch']}])
+    scheduler.learn_from_path('/networks/N_1/devices', [{'serial': 'Q2XX-1', 'networkId': 'N_1'}])
+
+    assert scheduler.org_for_path('https://api.meraki.com/api/v1/organizations/123/devices') == '123'
+    assert scheduler.org_for_path('/networks/N_1/clients') == '123'
+    assert scheduler.org_for_path('/devices/Q2XX-1/switch/ports') == '123'
+    assert scheduler.org_for_sdk_call('getNetworkDevices', ('N_1',), {}) == '123'
+
+
+def test_sdk_proxy_and_priority_context():
+    """SDK sections are scheduled and the context priority is applied"""
+    scheduler = MerakiRateScheduler()
+
+    class Networks:
+        def getNetworkDevices(self, networkId):
+            return [{'serial': 'Q2XX-2', 'networkId': networkId}]
+
+    class Dashboard:
+        networks = Networks()
+
+    dashboard = RateLimitedDashboard(Dashboard(), scheduler)
+    scheduler.learn([{'id': 'N_2', 'organizationId': '456', 'productTypes': []}])
+
+    with request_priority(PRIORITY_BACKGROUND):
+        assert dashboard.networks.getNetworkDevices('N_2')[0]['serial'] == 'Q2XX-2'
+
+    org = scheduler.get_metrics()['organizations']['456']
+    assert org['by_priority']['background']['granted'] == 1
+    assert scheduler.org_for_path('/devices/Q2XX-2') == '456'
+
+
+def test_acquire_timeout():
+    """acquire gives up after its timeout and leaves the queue clean"""
+    scheduler = MerakiRateScheduler(rate=1, burst=1)
+    scheduler.acquire('org1')
+    try:
+        scheduler.acquire('org1', timeout=0.05)
+        assert False, "expected RateLimitTimeout"
+    except RateLimitTimeout:
+        pass
+    assert scheduler.get_metrics()['organizations']['org1']['queue_depth'] == 0
+
+
+if __name__ == "__main__":
+    test_bucket_limits_rate_per_org()
+    test_interactive_requests_jump_the_queue()
+    test_retry_after_pauses_org_and_retries()
+    test_retry_after_parsing()
+    test_org_attribution_is_learned()
+    test_sdk_proxy_and_priority_context()
+    test_acquire_timeout()
+    print("✅ Rate limiter tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the Meraki TTL / stale-while-revalidate response cache
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.response_cache import ResponseCache, CachedDashboard, endpoint_kind, make_cache_key
+from modules.meraki.rate_limiter import PRIORITY_BACKGROUND, get_request_priority
+
+
+def test_endpoint_ttls():
+    """Organizations and networks live long, statuses and clients short"""
+    assert endpoint_kind('/organizations') == 'organizations'
+    assert endpoint_kind('/organizations/123/networks') == 'networks'
+    assert endpoint_kind('/networks/N_1/clients') == 'clients'
+    assert endpoint_kind('/organizations/123/devices/statuses') == 'statuses'
+    assert endpoint_kind('getNetworkTopologyLinkLayer') == 'topology'
+    assert endpoint_kind('getOrganizationDevicesStatuses') == 'statuses'
+
+    cache = ResponseCache()
+    assert cache.ttl_for('/organizations') > cache.ttl_for('/networks/N_1/clients')
+    assert cache.ttl_for('getOrganizationNetworks') > cache.ttl_for('getOrganizationDevicesStatuses')
+
+
+def test_read_through_and_hit_ratio():
+    """Second read is served from the cache and counted as a hit"""
+    cache = ResponseCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return [{'serial': 'Q2MX-0001'}], None
+
+    key = make_cache_key('key-a', '/networks/N_1/devices')
+    cache.get_or_fetch(key, '/networks/N_1/devices', fetch)
+    cache.get_or_fetch(key, '/networks/N_1/devices', fetch)
+    # A different API key never shares entries
+    cache.get_or_fetch(make_cache_key('key-b', '/networks/N_1/devices'), '/networks/N_1/devices', fetch)
+
+    stats = cache.get_stats()
+    assert len(calls) == 2
+    assert stats['hits'] == 1 and stats['misses'] == 2
+    assert stats['hit_ratio'] == round(1 / 3, 3)
+
+
+def test_stale_while_revalidate():
+    """Expired entries are served immediately while a background refresh runs"""
+    cache = ResponseCache(ttls={'clients': 0.05})
+    key = make_cache_key('key', '/networks/N_1/clients')
+    cache.put(key, '/networks/N_1/clients', ['old'])
+    time.sleep(0.06)
+
+    refreshed = threading.Event()
+    priorities = []
+
+    def refresh():
+        priorities.append(get_request_priority())
+        refreshed.set()
+        return ['new'], None
+
+    value, state = cache.get(key, refresh=refresh)
+    assert (value, state) == (['old'], 'stale')
+    assert refreshed.wait(2)
+    time.sleep(0.02)
+    assert cache.get(key) == (['new'], 'fresh')
+    assert priorities == [PRIORITY_BACKGROUND]
+
+
+def test_lru_memory_cap():
+    """Least recently used entries are evicted past the byte cap"""
+    cache = ResponseCache(max_bytes=400)
+    cache.max_entry_bytes = 400
+    keys = [make_cache_key('key', f'/networks/N_{i}/devices') for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, f'/networks/N_{i}/devices', 'x', size=100)
+    cache.get(keys[0])
+    cache.put(keys[3], '/networks/N_3/devices', 'x', size=150)
+
+    assert cache.get(keys[1])[1] == 'miss'
+    assert cache.get(keys[0])[1] == 'fresh'
+    assert cache.get_stats()['bytes'] <= 400
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_invalidation_hooks():
+    """Scoped invalidation matches whole IDs and notifies listeners"""
+    cache = ResponseCache()
+    seen = []
+    cache.add_invalidation_listener(seen.append)
+    cache.put(make_cache_key('key', '/networks/N_1/clients'), '/networks/N_1/clients', [1])
+    cache.put(make_cache_key('key', '/networks/N_10/clients'), '/networks/N_10/clients', [2])
+
+    assert cache.invalidate_network('N_1') == 1
+    assert seen == ['N_1']
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_cached_dashboard():
+    """SDK reads are cached, live tools are not, and writes invalidate"""
+    class Devices:
+        def __init__(self):
+            self.calls = 0
+
+        def getNetworkDevices(self, network_id):
+            self.calls += 1
+            return [{'serial': 'Q2MX-0001', 'networkId': network_id}]
+
+        def getDeviceLiveToolsPing(self, serial, ping_id):
+            self.calls += 1
+            return {'status': 'running'}
+
+        def updateNetworkDevice(self, network_id, **kwargs):
+            return kwargs
+
+    class Dashboard:
+        networks = Devices()
+
+    sdk = Dashboard()
+    dashboard = CachedDashboard(sdk, 'key', cache=ResponseCache())
+    dashboard.networks.getNetworkDevices('N_1')
+    dashboard.networks.getNetworkDevices('N_1')
+    assert sdk.networks.calls == 1
+
+    dashboard.networks.getDeviceLiveToolsPing('Q2MX-0001', '1')
+    dashboard.networks.getDeviceLiveToolsPing('Q2MX-0001', '1')
+    assert sdk.networks.calls == 3
+
+    dashboard.networks.updateNetworkDevice('N_1', name='MX')
+    dashboard.networks.getNetworkDevices('N_1')
+    assert sdk.networks.calls == 4
+
+
+if __name__ == "__main__":
+    test_endpoint_ttls()
+    test_read_through_and_hit_ratio()
+    test_stale_while_revalidate()
+    test_lru_memory_cap()
+    test_invalidation_hooks()
+    test_cached_dashboard()
+    print("✅ Response cache tests passed")
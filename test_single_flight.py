@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight coalescing of identical upstream calls
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from single_flight import SingleFlight, flight_key
+
+
+def test_key_ignores_param_order_and_hides_credential():
+    """Keys are stable across dict ordering and never hold the raw API key"""
+    a = flight_key('secret-key', 'get', '/networks/N_1/clients', {'perPage': 1000, 'timespan': 86400})
+    b = flight_key('secret-key', 'GET', '/networks/N_1/clients', {'timespan': 86400, 'perPage': 1000})
+    assert a == b
+    assert 'secret-key' not in repr(a)
+    assert a != flight_key('other-key', 'GET', '/networks/N_1/clients', {'perPage': 1000, 'timespan': 86400})
+
+
+def test_threads_share_one_call():
+    """Concurrent threads with the same key cause a single upstream call"""
+    flight = SingleFlight('test')
+    calls = []
+    results = []
+
+    def upstream():
+        calls.append(1)
+        time.sleep(0.1)
+        return [{'serial': 'Q2MX-0001'}]
+
+    def worker():
+        results.append(flight.do(('k',), upstream))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.get_stats()['coalesced'] == 7
+    # Once finished, the next call goes upstream again
+    flight.do(('k',), upstream)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    """The leader's exception is raised in every coalesced caller"""
+    flight = SingleFlight('test')
+    errors = []
+
+    def upstream():
+        time.sleep(0.05)
+        raise RuntimeError("429")
+
+    def worker():
+        try:
+            flight.do(('k',), upstream)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == ['429'] * 4
+
+
+def test_asyncio_and_threads_share_one_call():
+    """An asyncio caller joins a call started by a thread, and vice versa"""
+    flight = SingleFlight('test')
+    calls = []
+
+    def thread_upstream():
+        calls.append('thread')
+        time.sleep(0.1)
+        return 'from-thread'
+
+    async def async_upstream():
+        calls.append('async')
+        await asyncio.sleep(0.1)
+        return 'from-async'
+
+    async def main():
+        # Thread leads, coroutines follow
+        leader = threading.Thread(target=flight.do, args=(('a',), thread_upstream))
+        leader.start()
+        await asyncio.sleep(0.02)
+        shared = await asyncio.gather(*[flight.do_async(('a',), async_upstream) for _ in range(3)])
+        leader.join()
+
+        # Coroutine leads, a thread follows
+        thread_result = []
+        task = asyncio.ensure_future(flight.do_async(('b',), async_upstream))
+        await asyncio.sleep(0.02)
+        follower = threading.Thread(target=lambda: thread_result.append(flight.do(('b',), thread_upstream)))
+        follower.start()
+        await task
+        await asyncio.get_running_loop().run_in_executor(None, follower.join)
+        return shared, thread_result
+
+    shared, thread_result = asyncio.run(main())
+    assert shared == ['from-thread'] * 3
+    assert thread_result == ['from-async']
+    assert calls == ['thread', 'async']
+
+
+if __name__ == "__main__":
+    test_key_ignores_param_order_and_hides_credential()
+    test_threads_share_one_call()
+    test_errors_reach_every_waiter()
+    test_asyncio_and_threads_share_one_call()
+    print("✅ Single-flight tests passed")
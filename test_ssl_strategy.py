@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-host SSL strategy cache
+"""
+
+import os
+import sys
+import time
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.meraki.ssl_strategy import SSLStrategyCache, SSL_MODES
+
+
+def test_cascade_order_and_memory():
+    """Unknown hosts get the full cascade; known hosts get their mode first"""
+    cache = SSLStrategyCache(ttl=60, probe=lambda host, mode: True)
+
+    assert cache.modes_for('api.meraki.com') == SSL_MODES
+
+    cache.record_success('api.meraki.com', 'insecure')
+    assert cache.get_mode('api.meraki.com') == 'insecure'
+    assert cache.modes_for('api.meraki.com')[0] == 'insecure'
+    assert cache.modes_for('api.meraki.com', allow_insecure=False) == ['certifi', 'system']
+
+    # Other hosts are unaffected
+    assert cache.modes_for('n123.meraki.com') == SSL_MODES
+
+
+def test_failure_triggers_reprobe():
+    """A failing cached mode is expired and re-probed most secure first"""
+    probed = []
+
+    def probe(host, mode):
+        probed.append(mode)
+        return mode == 'system'
+
+    cache = SSLStrategyCache(ttl=60, probe=probe)
+    cache.record_success('api.meraki.com', 'certifi')
+    cache.record_failure('api.meraki.com', 'certifi')
+
+    deadline = time.time() + 2
+    while cache.get_mode('api.meraki.com') != 'system' and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get_mode('api.meraki.com') == 'system'
+    assert probed[:2] == ['certifi', 'system']
+
+    report = cache.get_report()['api.meraki.com']
+    assert report['mode'] == 'system'
+    assert report['failures'] == 1
+    assert report['verified'] is True
+
+
+def test_expired_entry_upgrades_in_background():
+    """An expired fallback mode keeps serving while a re-probe upgrades it"""
+    cache = SSLStrategyCache(ttl=0, probe=lambda host, mode: True)
+    cache.record_success('api.meraki.com', 'insecure')
+
+    # The stale mode is still offered first for this call
+    assert cache.modes_for('api.meraki.com')[0] == 'insecure'
+
+    deadline = time.time() + 2
+    while cache.get_mode('api.meraki.com') != 'certifi' and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get_mode('api.meraki.com') == 'certifi'
+
+
+def test_inconclusive_probe_keeps_mode():
+    """Network errors during a probe do not drop the remembered mode"""
+    cache = SSLStrategyCache(ttl=60, probe=lambda host, mode: None)
+    cache.record_success('api.meraki.com', 'system')
+
+    assert cache.refresh('api.meraki.com') is None
+    assert cache.get_mode('api.meraki.com') == 'system'
+    assert cache.get_report()['api.meraki.com']['reprobes'] == 1
+
+
+if __name__ == "__main__":
+    test_cascade_order_and_memory()
+    test_failure_triggers_reprobe()
+    test_expired_entry_upgrades_in_background()
+    test_inconclusive_probe_keeps_mode()
+    print("✅ SSL strategy cache tests passed")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the IP prefix index and subnet-based cross-vendor linking
+"""
+
+import os
+import sys
+import ipaddress
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from subnet_index import SubnetIndex, parse_ip, parse_subnet
+from multi_vendor_topology import MultiVendorTopologyEngine
+
+
+def test_parse_meraki_and_fortios_subnets():
+    """CIDR, interface addresses and FortiOS 'address mask' pairs; unnumbered interfaces are skipped"""
+    assert parse_subnet('10.1.2.0/25') == ipaddress.ip_network('10.1.2.0/25')
+    assert parse_subnet('10.1.2.129/25') == ipaddress.ip_network('10.1.2.128/25')
+    assert parse_subnet('10.1.2.1 255.255.255.128') == ipaddress.ip_network('10.1.2.0/25')
+    assert parse_subnet(['172.16.0.1', '255.255.0.0']) == ipaddress.ip_network('172.16.0.0/16')
+    assert parse_subnet('2001:db8::1/64') == ipaddress.ip_network('2001:db8::/64')
+    for unusable in ('0.0.0.0 0.0.0.0', '', None, 'fgt.example.com'):
+        assert parse_subnet(unusable) is None
+    assert parse_ip('fgt.example.com') is None and str(parse_ip('10.0.0.1/24')) == '10.0.0.1'
+
+
+def test_longest_prefix_match():
+    """The most specific subnet wins, and shared subnets return every owner"""
+    index = SubnetIndex()
+    index.add('10.0.0.0/8', 'corp')
+    index.add('10.1.2.0/24', 'store')
+    index.add('10.1.2.128/25', 'pos')
+    index.add('10.1.2.130 255.255.255.128', 'fortigate')
+    index.add('2001:db8::/32', 'v6')
+
+    assert len(index) == 4
+    assert index.lookup('10.1.2.200') == (ipaddress.ip_network('10.1.2.128/25'), ['pos', 'fortigate'])
+    assert index.lookup('10.1.2.20')[1] == ['store']
+    assert index.lookup('10.9.9.9')[1] == ['corp']
+    assert index.lookup('2001:db8:1::5')[1] == ['v6']
+    assert index.lookup('192.168.1.1') is None and index.lookup('not-an-ip') is None
+
+
+def test_matches_brute_force():
+    """Random prefixes resolve exactly like a linear scan"""
+    networks = [ipaddress.ip_network(f"10.{(i * 37) % 4}.{(i * 11) % 4}.{(i * 53) % 256}/{8 + i % 25}", strict=False)
+                for i in range(300)]
+    index = SubnetIndex()
+    for network in networks:
+        index.add(network, str(network))
+    for i in range(2000):
+        address = ipaddress.ip_address(f"10.{i % 4}.{(i // 4) % 4}.{(i * 7) % 256}")
+        containing = [n for n in networks if address in n]
+        match = index.lookup(address)
+        assert (match[0] if match else None) == (max(containing, key=lambda n: n.prefixlen) if containing else None)
+
+
+def test_cross_vendor_links_use_real_masks():
+    """Devices link only within the FortiGate's /25; unknown subnets fall back to an inferred /24"""
+    engine = MultiVendorTopologyEngine()
+    topology = {'devices': [], 'clients': [], 'connections': [], 'subnets': [],
+                'vendor_stats': {'meraki': {'devices': 0, 'clients': 0}, 'fortinet': {'devices': 0, 'clients': 0}}}
+    engine._merge_meraki_data(topology, {
+        'devices': [
+            {'serial': 'Q2MX-0001', 'model': 'MX68', 'lanIp': '10.1.2.2', 'networkId': 'N_1'},
+            {'serial': 'Q2MS-0001', 'model': 'MS120-8', 'lanIp': '10.1.2.10', 'networkId': 'N_1'},
+            {'serial': 'Q2MR-0001', 'model': 'MR36', 'lanIp': '10.1.2.200', 'networkId': 'N_1'},
+            {'serial': 'Q2MR-0002', 'model': 'MR36', 'lanIp': '10.9.9.20', 'networkId': 'N_1'},
+        ],
+        'vlans': [{'id': 20, 'name': 'Corp', 'networkId': 'N_1', 'subnet': '10.1.3.0/24'}]
+    })
+    engine._merge_fortinet_data(topology, {
+        'fortigates': [{'id': '192.168.0.1', 'name': 'FGT-1', 'host': '192.168.0.1'}],
+        'fortiaps': [{'id': 'FP-1', 'name': 'FAP-1', 'ip': '10.9.9.30'}],
+        'interfaces': [
+            {'fortigate_id': '192.168.0.1', 'name': 'lan', 'ip': '10.1.2.1 255.255.255.128'},
+            {'fortigate_id': '192.168.0.1', 'name': 'corp', 'ip': '10.1.3.1 255.255.255.0'},
+            {'fortigate_id': '192.168.0.1', 'name': 'wan2', 'ip': '0.0.0.0 0.0.0.0'},
+        ]
+    })
+    engine._build_cross_vendor_connections(topology)
+
+    links = {(c['source'], c['target'], c['subnet'], c.get('inferred', False))
+             for c in topology['connections'] if c['type'] == 'cross_vendor'}
+    assert links == {
+        ('Q2MX-0001', '192.168.0.1', '10.1.2.0/25', False),
+        ('Q2MS-0001', '192.168.0.1', '10.1.2.0/25', False),
+        # The MX owns the Corp VLAN the FortiGate also has an interface on
+        ('Q2MX-0001', '192.168.0.1', '10.1.3.0/24', False),
+        ('Q2MR-0002', 'FP-1', '10.9.9.0/24', True),
+    }
+    assert [g['subnet'] for g in topology['subnet_groups']] == ['10.1.3.0/24', '10.1.2.0/25', '10.9.9.0/24']
+
+
+def test_monitor_api_interfaces_and_networks_without_appliance():
+    """Monitor-API interfaces (ip and mask apart) index their real subnet; VLANs of a network without an MX link nothing"""
+    engine = MultiVendorTopologyEngine()
+    topology = {'devices': [], 'clients': [], 'connections': [], 'subnets': [],
+                'vendor_stats': {'meraki': {'devices': 0, 'clients': 0}, 'fortinet': {'devices': 0, 'clients': 0}}}
+    engine._merge_meraki_data(topology, {
+        'devices': [
+            {'serial': 'Q2MX-0001', 'model': 'MX68', 'lanIp': '10.1.2.2', 'networkId': 'N_1'},
+            {'serial': 'Q2MS-0002', 'model': 'MS120-8', 'lanIp': '172.16.5.10', 'networkId': 'N_2'},
+        ],
+        'vlans': [{'id': 1, 'name': 'Store', 'networkId': 'N_1', 'subnet': '10.1.2.0/24'},
+                  {'id': 30, 'name': 'Office', 'networkId': 'N_2', 'subnet': '172.16.5.0/24'}]
+    })
+    engine._merge_fortinet_data(topology, {
+        # FortiGates polled on their LAN address: host equals an interface IP
+        'fortigates': [{'id': '10.1.2.1', 'name': 'FGT-1', 'host': '10.1.2.1'},
+                       {'id': '192.168.0.9', 'name': 'FGT-9', 'host': '192.168.0.9'}],
+        'interfaces': [
+            {'fortigate_id': '10.1.2.1', 'name': 'lan', 'ip': '10.1.2.1', 'mask': 24},
+            {'fortigate_id': '10.1.2.1', 'name': 'dmz', 'ip': '10.1.7.1', 'mask': '255.255.255.192'},
+            {'fortigate_id': '10.1.2.1', 'name': 'wan2', 'ip': '0.0.0.0', 'mask': 0},
+            {'fortigate_id': '192.168.0.9', 'name': 'lan', 'ip': '192.168.0.9'},
+        ]
+    })
+    assert {s['subnet'] for s in topology['subnets'] if s['vendor'] == 'fortinet'} == {'10.1.2.0/24', '10.1.7.0/26'}
+    assert [s['device_id'] for s in topology['subnets'] if s['vendor'] == 'meraki'] == ['Q2MX-0001', None]
+    engine._build_cross_vendor_connections(topology)
+
+    links = {(c['source'], c['target'], c['subnet']) for c in topology['connections'] if c['type'] == 'cross_vendor'}
+    assert links == {('Q2MX-0001', '10.1.2.1', '10.1.2.0/24')}
+
+
+if __name__ == "__main__":
+    test_parse_meraki_and_fortios_subnets()
+    test_longest_prefix_match()
+    test_matches_brute_force()
+    test_cross_vendor_links_use_real_masks()
+    test_monitor_api_interfaces_and_networks_without_appliance()
+    print("✅ Subnet index tests passed")
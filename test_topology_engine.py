@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for the unified topology engine and its output adapters
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import topology_engine
+from topology_engine import (ClientGroupNode, TopologyNode, VENDOR_FORTINET, build_topology, classify_device,
+                             client_group_members, level_of_detail, to_d3, to_dict, to_indexed_dict,
+                             stream_d3, to_multi_vendor_d3, to_vis)
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+
+def synthetic_network(clients=200, devices=12):
+    data = SyntheticMerakiData(networks=1, clients=clients, devices_per_network=devices)
+    network_id = data.networks('100000')[0]['id']
+    return data.network_devices(network_id), data.clients(network_id, 0, clients), data.topology_links(network_id)
+
+
+def test_classification_is_shared():
+    """productType wins, then the model prefix, then the name"""
+    assert classify_device({'productType': 'appliance', 'model': 'MS120'}) == 'appliance'
+    assert classify_device({'model': 'MR46'}) == 'wireless'
+    assert classify_device({'model': 'MS225-48'}) == 'switch'
+    assert classify_device({'model': 'MV12'}) == 'camera'
+    assert classify_device({'name': 'Back Office Switch'}) == 'switch'
+    assert classify_device({}) == 'unknown'
+
+
+def test_build_links_clients_and_devices():
+    """Clients hang from their reported device; API links connect devices"""
+    devices, clients, links = synthetic_network()
+    by_id = {c['id']: c for c in clients}
+    topology = build_topology(devices, clients, None, network_name='Store 1')
+
+    assert topology.device_count == 12 and topology.client_count == 200
+    client_links = [l for l in topology.links if topology.nodes[l.target].is_client]
+    assert len(client_links) == 200
+    for link in client_links:
+        client = by_id[topology.nodes[link.target].id]
+        assert topology.nodes[link.source].serial == client['recentDeviceSerial']
+
+    topology = build_topology(devices, clients, links)
+    device_links = [l for l in topology.links if not topology.nodes[l.target].is_client]
+    assert len(device_links) == len(links)
+
+
+def test_inferred_device_links_without_api_links():
+    """Without API links: MX uplinks every switch, each AP uplinks to one switch"""
+    devices, clients, _ = synthetic_network(clients=0)
+    topology = build_topology(devices, [], None)
+    kinds = [topology.nodes[l.source].type + '>' + topology.nodes[l.target].type for l in topology.links]
+    switches = sum(1 for n in topology.nodes if n.type == 'switch')
+    aps = sum(1 for n in topology.nodes if n.type == 'wireless')
+    assert kinds.count('appliance>switch') == switches
+    assert kinds.count('switch>wireless') == aps
+
+
+def test_adapters_keep_their_shapes():
+    """Legacy, indexed, vis.js and D3 outputs keep the shapes their callers expect"""
+    devices, clients, links = synthetic_network(clients=20)
+    topology = build_topology(devices, clients, links, network_name='Store 1')
+
+    legacy = to_dict(topology)
+    client_ids = {c['id'] for c in clients}
+    # Client links keep pointing client -> device
+    assert sum(1 for l in legacy['links'] if l['source'] in client_ids) == len(clients)
+    assert legacy['nodes'][0]['type'] == 'appliance'
+
+    indexed = to_indexed_dict(topology)
+    assert indexed['nodes'][0]['type'] == 'security_appliance'
+    assert all(isinstance(l['source'], int) for l in indexed['links'])
+    assert indexed['nodes'][-1]['connection']['type'] in ('wired', 'wireless')
+
+    vis = to_vis(topology)
+    assert len(vis['edges']) == len(legacy['links'])
+    assert '<b>Serial:</b>' in vis['nodes'][0]['title']
+
+    d3 = to_d3(topology)
+    assert {n['group'] for n in d3['nodes']} == {'appliance', 'switch', 'wireless', 'client'}
+    # Legacy dicts render the same way as the typed topology
+    assert to_d3(legacy) == d3
+    assert to_vis(indexed)['edges'][0]['from'] == vis['edges'][0]['from']
+
+
+def test_compact_store():
+    """Nodes are slotted, links array-backed, and repeated values share one string"""
+    devices, clients, links = synthetic_network(clients=50)
+    topology = build_topology(devices, [dict(c, status=''.join(['Onl', 'ine'])) for c in clients], links)
+    client_nodes = [n for n in topology.nodes if n.is_client]
+
+    assert not hasattr(client_nodes[0], '__dict__')
+    assert client_nodes[0].status is client_nodes[1].status
+    assert topology.links.sources.typecode == 'l'
+    assert topology.links[0].source == next(iter(topology.links)).source
+    assert to_indexed_dict(topology)['nodes'][-1]['usage'] == clients[-1]['usage']
+
+
+def test_multi_vendor_adapter():
+    """FortiGate nodes get their own id prefix and uplink the Meraki appliance"""
+    devices, clients, _ = synthetic_network(clients=3)
+    topology = build_topology(devices, clients)
+    fortigate = topology.add_node(TopologyNode(id='FGT60F0001', label='FGT-Store', type='appliance',
+                                               vendor=VENDOR_FORTINET, ip='10.0.0.254'))
+    topology.add_link(fortigate, 0, 'uplink', 'Uplink')
+
+    d3 = to_multi_vendor_d3(topology)
+    ids = [n['id'] for n in d3['nodes']]
+    assert ids[0] == f"meraki_{devices[0]['serial']}"
+    assert ids[-1] == 'fortigate_FGT60F0001' and d3['nodes'][-1]['size'] == 14
+    assert sum(1 for i in ids if i.startswith('client_')) == 3
+    assert {'source': 'fortigate_FGT60F0001', 'target': ids[0], 'type': 'uplink', 'width': 3,
+            'dashes': False} in d3['edges']
+
+
+def test_level_of_detail_fits_the_budget():
+    """Clients collapse per parent/VLAN/category with counts; small networks are untouched"""
+    devices, clients, links = synthetic_network(clients=5000, devices=40)
+    topology = build_topology(devices, clients, links)
+    assert level_of_detail(topology, 10000) is topology
+
+    lod = level_of_detail(topology, 300)
+    groups = [n for n in lod.nodes if isinstance(n, ClientGroupNode)]
+    assert len(lod.nodes) <= 300 and groups
+    assert lod.device_count == 40 and lod.client_count == 5000
+    assert sum(sum(g.statuses.values()) for g in groups) == sum(g.count for g in groups)
+    parents = {topology.nodes[l.source].id for l in lod.links if lod.nodes[l.target] in groups}
+    assert parents == {g.parent for g in groups}
+
+    d3 = to_d3(lod)
+    group = next(n for n in d3['nodes'] if n.get('group_id'))
+    assert group['group'] == 'client_group' and group['count'] > 1
+    assert any(e['source'] == group['id'] for e in d3['edges'])
+    # Fewer nodes than groups: VLAN and category are dropped from the grouping
+    coarse = level_of_detail(topology, 60)
+    assert all(n.id.endswith('|*|*') for n in coarse.nodes if isinstance(n, ClientGroupNode))
+
+
+def test_client_group_drill_down():
+    """A group's members come back page by page with their parent device"""
+    devices, clients, links = synthetic_network(clients=2000, devices=20)
+    topology = build_topology(devices, clients, links)
+    group = max((n for n in level_of_detail(topology, 200).nodes if isinstance(n, ClientGroupNode)),
+                key=lambda n: n.count)
+
+    members, total = client_group_members(topology, group.id, offset=0, limit=25)
+    assert total == group.count and members.client_count == 25
+    assert members.nodes[0].id == group.parent and len(members.links) == 25
+    rest, _ = client_group_members(topology, group.id, offset=25)
+    assert rest.client_count == total - 25
+    assert level_of_detail(topology, 200, expand=[group.id]).client_count == 2000
+
+
+def test_stream_d3_matches_to_d3():
+    """Devices go out before any client is read; the chunks add up to the to_d3 payload"""
+    devices, clients, links = synthetic_network(clients=1200, devices=20)
+    consumed = []
+
+    def paginated():
+        for client in clients:
+            consumed.append(client)
+            yield client
+
+    chunks = stream_d3(devices, paginated(), links, batch_size=500)
+    first = next(chunks)
+    assert first['type'] == 'devices' and len(first['nodes']) == len(devices) and not consumed
+    rest = list(chunks)
+    assert [c['type'] for c in rest] == ['clients', 'clients', 'clients', 'end']
+    assert [len(c['nodes']) for c in rest[:-1]] == [500, 500, 200]
+
+    expected = to_d3(build_topology(devices, clients, links))
+    nodes = [n for c in [first] + rest[:-1] for n in c['nodes']]
+    edges = [e for c in [first] + rest[:-1] for e in c['edges']]
+    assert nodes == expected['nodes']
+    assert sorted(edges, key=str) == sorted(expected['edges'], key=str)
+    assert rest[-1]['stats'] == {'devices': len(devices), 'clients': 1200, 'edges': len(expected['edges'])}
+
+
+def test_write_html():
+    """The HTML adapter writes a vis.js page with the graph embedded"""
+    devices, clients, links = synthetic_network(clients=5)
+    path = os.path.join(tempfile.mkdtemp(), 'topology.html')
+    topology_engine.write_html(build_topology(devices, clients, links), 'Store 1', path)
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    assert 'Network Topology: Store 1' in html
+    assert devices[0]['serial'] in html
+
+
+if __name__ == "__main__":
+    test_classification_is_shared()
+    test_build_links_clients_and_devices()
+    test_inferred_device_links_without_api_links()
+    test_adapters_keep_their_shapes()
+    test_compact_store()
+    test_multi_vendor_adapter()
+    test_level_of_detail_fits_the_budget()
+    test_client_group_drill_down()
+    test_stream_d3_matches_to_d3()
+    test_write_html()
+    print("✅ Topology engine tests passed")
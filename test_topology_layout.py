@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for server-side topology layout and the per-version layout cache
+"""
+
+import os
+import sys
+import tempfile
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from topology_engine import build_topology, to_d3, write_html
+from topology_layout import LayoutCache, layout_payload, layout_topology
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+
+def synthetic_d3(clients=200, devices=12):
+    data = SyntheticMerakiData(networks=1, clients=clients, devices_per_network=devices)
+    network_id = data.networks('100000')[0]['id']
+    devices = data.network_devices(network_id)
+    return devices, to_d3(build_topology(devices, data.clients(network_id, 0, clients)))
+
+
+def test_hierarchical_tiers_follow_device_roles():
+    """Every node gets a position; MX sits above switches, switches above APs, APs above clients"""
+    _, d3_data = synthetic_d3()
+    positions = layout_payload(d3_data)
+    assert set(positions) == {node['id'] for node in d3_data['nodes']}
+
+    depth = {}
+    for node in d3_data['nodes']:
+        depth.setdefault(node['group'], []).append(positions[node['id']][1])
+    mean = {group: sum(ys) / len(ys) for group, ys in depth.items()}
+    assert mean['appliance'] < mean['switch'] < mean['wireless'] < mean['client']
+
+
+def test_cache_reuses_versions_and_seeds_the_next_one():
+    """A version is laid out once; the next version keeps the coordinates of unchanged nodes"""
+    _, d3_data = synthetic_d3()
+    cache = LayoutCache(max_entries=4)
+    first = cache.get_or_compute(('N_1', 'd3'), 1, d3_data)
+    assert cache.get_or_compute(('N_1', 'd3'), 1, {'nodes': [], 'edges': []}) is first
+
+    kept = d3_data['nodes'][:-10]
+    kept_ids = {node['id'] for node in kept}
+    second = cache.get_or_compute(('N_1', 'd3'), 2, {
+        'nodes': kept + [{'id': 'new-client', 'group': 'client'}],
+        'edges': [e for e in d3_data['edges'] if e['source'] in kept_ids and e['target'] in kept_ids]
+    })
+    assert 'new-client' in second and len(second) == len(kept) + 1
+    moved = [node_id for node_id in kept_ids
+             if abs(second[node_id][0] - first[node_id][0]) + abs(second[node_id][1] - first[node_id][1]) > 150]
+    assert len(moved) < len(kept_ids) / 10
+
+    for version in range(3, 8):
+        cache.get_or_compute(('N_1', 'd3'), version, d3_data)
+    assert cache.get_or_compute(('N_1', 'd3'), 1, {'nodes': [], 'edges': []}) == {}
+
+
+def test_write_html_embeds_coordinates():
+    """The vis.js export carries x/y so the page only stabilises briefly"""
+    data = SyntheticMerakiData(networks=1, clients=30, devices_per_network=6)
+    network_id = data.networks('100000')[0]['id']
+    topology = build_topology(data.network_devices(network_id), data.clients(network_id, 0, 30))
+    assert len(layout_topology(topology)) == len(topology.nodes)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_html(topology, 'Store 1', os.path.join(directory, 'topology.html'))
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+    assert '"x":' in html and '"y":' in html
+    assert 'iterations: 100' in html
+
+
+if __name__ == "__main__":
+    test_hierarchical_tiers_follow_device_roles()
+    test_cache_reuses_versions_and_seeds_the_next_one()
+    test_write_html_embeds_coordinates()
+    print("✅ Topology layout tests passed")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for versioned topology snapshots and deltas
+"""
+
+import os
+import sys
+import json
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from topology_engine import build_topology, to_d3
+from topology_versions import TopologyVersionStore, edge_key, input_fingerprint
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+KEY = ('N_1', 'd3')
+
+
+def synthetic_network(clients=300, devices=12):
+    data = SyntheticMerakiData(networks=1, clients=clients, devices_per_network=devices)
+    network_id = data.networks('100000')[0]['id']
+    return data.network_devices(network_id), data.clients(network_id, 0, clients)
+
+
+def roam(devices, clients, moves, offset=0):
+    """Move a few clients to another AP and rename one of them"""
+    aps = [d['serial'] for d in devices if d['model'].startswith('MR')]
+    clients = [dict(c) for c in clients]
+    for i in range(offset, offset + moves):
+        current = clients[i].get('recentDeviceSerial')
+        clients[i]['recentDeviceSerial'] = next(ap for ap in aps if ap != current)
+        clients[i]['recentDeviceConnection'] = 'Wireless'
+    clients[offset]['description'] = f"Roamed {offset}"
+    return clients
+
+
+def apply_delta(payload, delta):
+    """What the D3 page does with a delta"""
+    nodes = {n['id']: dict(n) for n in payload['nodes']}
+    edges = {edge_key(e): dict(e) for e in payload['edges']}
+    for node_id in delta['nodes']['removed']:
+        del nodes[node_id]
+    for change in delta['nodes']['changed']:
+        nodes[change['id']].update(change)
+    for node in delta['nodes']['added']:
+        nodes[node['id']] = node
+    for edge in delta['edges']['removed']:
+        del edges[edge_key(edge)]
+    for change in delta['edges']['changed']:
+        edges[edge_key(change)].update(change)
+    for edge in delta['edges']['added']:
+        edges[edge_key(edge)] = edge
+    return nodes, edges
+
+
+def as_maps(payload):
+    return {n['id']: n for n in payload['nodes']}, {edge_key(e): e for e in payload['edges']}
+
+
+def test_unchanged_rebuild_keeps_version():
+    """Recording an identical build keeps the version and the delta is empty"""
+    devices, clients = synthetic_network()
+    store = TopologyVersionStore()
+    version = store.record(KEY, to_d3(build_topology(devices, clients)))
+    assert store.record(KEY, to_d3(build_topology(devices, clients))) == version
+
+    delta = store.delta_since(KEY, version)
+    assert delta['full'] is False and delta['version'] == version
+    assert not any(delta['nodes'].values()) and not any(delta['edges'].values())
+    assert store.delta_since(('other', 'd3'), version) is None
+
+
+def test_delta_patches_to_the_new_topology():
+    """Deltas across several versions reproduce the latest payload and stay small"""
+    devices, clients = synthetic_network()
+    store = TopologyVersionStore()
+    first = to_d3(build_topology(devices, clients))
+    v1 = store.record(KEY, first)
+
+    second_clients = roam(devices, clients, 5)
+    v2 = store.record(KEY, to_d3(build_topology(devices, second_clients)))
+    third_clients = roam(devices, second_clients[:-2], 3, offset=50)
+    third = to_d3(build_topology(devices, third_clients))
+    v3 = store.record(KEY, third)
+    assert v1 < v2 < v3
+
+    delta = store.delta_since(KEY, v1)
+    assert delta['since'] == v1 and delta['version'] == v3
+    assert len(delta['nodes']['removed']) == 2
+    assert {c['id'] for c in delta['nodes']['changed']} == {clients[0]['id'], clients[50]['id']}
+    assert apply_delta(first, delta) == as_maps(third)
+    assert len(json.dumps(delta)) < len(json.dumps(third)) / 10
+
+
+def test_unknown_or_expired_version_gets_full_payload():
+    """Versions the store no longer holds diffs for get the whole graph"""
+    devices, clients = synthetic_network(clients=20)
+    store = TopologyVersionStore(history_size=2)
+    first = store.record(KEY, dict(to_d3(build_topology(devices, clients)), stats={'clients': 20}))
+    for moves in range(1, 4):
+        latest = store.record(KEY, to_d3(build_topology(devices, roam(devices, clients, moves))))
+
+    for since in (first, None, 12345):
+        delta = store.delta_since(KEY, since)
+        assert delta['full'] is True and delta['version'] == latest
+        assert len(delta['nodes']) == 32
+    assert store.delta_since(KEY, latest - 2)['full'] is False
+    assert store.stats()['full'] == 3
+
+
+def test_fingerprint_skips_volatile_fields():
+    """Traffic counters and last-seen times do not change the fingerprint; roaming does"""
+    devices, clients = synthetic_network(clients=20)
+    busy = [dict(reversed(list(c.items())), usage={'sent': 1, 'recv': 2}, lastSeen=1) for c in clients]
+    fingerprint = input_fingerprint(devices, clients)
+    assert input_fingerprint(devices, iter(busy)) == fingerprint
+    assert input_fingerprint(devices, roam(devices, clients, 1)) != fingerprint
+
+    store = TopologyVersionStore()
+    store.record(KEY, to_d3(build_topology(devices, clients)), fingerprint)
+    assert store.is_current(KEY, fingerprint)
+    assert not store.is_current(KEY, input_fingerprint(devices, roam(devices, clients, 1)))
+
+
+if __name__ == "__main__":
+    test_unchanged_rebuild_keeps_version()
+    test_delta_patches_to_the_new_topology()
+    test_unknown_or_expired_version_gets_full_payload()
+    test_fingerprint_skips_volatile_fields()
+    print("✅ Topology version tests passed")
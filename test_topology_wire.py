@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact columnar topology wire format
+"""
+
+import os
+import sys
+import json
+
+# Add the CLI directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from topology_engine import build_topology, level_of_detail, to_d3, to_multi_vendor_d3
+from topology_layout import layout_payload
+from topology_wire import (BROTLI_AVAILABLE, COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_MSGPACK_MEDIA_TYPE,
+                           JSON_MEDIA_TYPE, MSGPACK_AVAILABLE, decode_topology, encode_topology,
+                           from_columnar, negotiate_encoding, negotiate_media_type, to_columnar)
+from modules.meraki.synthetic_data import SyntheticMerakiData
+
+
+def synthetic_topology(clients=500, devices=20):
+    data = SyntheticMerakiData(networks=1, clients=clients, devices_per_network=devices)
+    network_id = data.networks('100000')[0]['id']
+    return build_topology(data.network_devices(network_id), data.clients(network_id, 0, clients))
+
+
+def without_titles(data):
+    return dict(data, nodes=[{k: v for k, v in n.items() if k != 'title'} for n in data['nodes']])
+
+
+def test_columnar_round_trip():
+    """D3, multi-vendor and aggregated payloads decode back to the same nodes, edges and extras"""
+    topology = synthetic_topology()
+    for data in (to_d3(topology), to_multi_vendor_d3(topology), to_d3(level_of_detail(topology, 100))):
+        data.update(version=7, stats={'total_nodes': len(data['nodes'])})
+        assert from_columnar(json.loads(json.dumps(to_columnar(data)))) == without_titles(data)
+
+    data = to_d3(topology)
+    data['layout'] = {'positions': layout_payload(data), 'relaxed': False}
+    decoded = from_columnar(to_columnar(data))
+    assert decoded['layout'] == data['layout']
+
+
+def test_columnar_is_smaller_and_titles_become_fields():
+    """Titles are dropped in favour of the fields they were built from"""
+    data = to_d3(synthetic_topology(clients=2000))
+    columnar = to_columnar(data)
+    assert 'title' not in columnar['nodes']['columns']
+    assert {'ip', 'status'} <= set(columnar['nodes']['columns'])
+    assert columnar['strings'].count('client') == 1
+
+    body, headers = encode_topology(data, COLUMNAR_JSON_MEDIA_TYPE)
+    assert headers['Content-Type'] == COLUMNAR_JSON_MEDIA_TYPE and 'Content-Encoding' not in headers
+    assert len(body) < len(json.dumps(data)) / 2
+
+    gzipped, headers = encode_topology(data, COLUMNAR_JSON_MEDIA_TYPE, 'gzip')
+    assert headers['Content-Encoding'] == 'gzip' and len(gzipped) < len(body) / 3
+    assert decode_topology(gzipped, COLUMNAR_JSON_MEDIA_TYPE, 'gzip') == without_titles(data)
+
+    if MSGPACK_AVAILABLE:
+        packed, headers = encode_topology(data, COLUMNAR_MSGPACK_MEDIA_TYPE)
+        assert len(packed) < len(body)
+        assert decode_topology(packed, COLUMNAR_MSGPACK_MEDIA_TYPE) == without_titles(data)
+
+
+def test_negotiation_keeps_json_default():
+    """Only an explicit compact media type switches format; encodings honour q=0"""
+    for accept in (None, '', '*/*', 'application/json', 'text/html,application/xhtml+xml,*/*;q=0.8',
+                   'application/vnd.topology.columnar+json;q=0.5, application/json'):
+        assert negotiate_media_type(accept) == JSON_MEDIA_TYPE
+    assert negotiate_media_type('application/vnd.topology.columnar+json, application/json;q=0.9') == \
+        COLUMNAR_JSON_MEDIA_TYPE
+    msgpack_choice = negotiate_media_type('application/vnd.topology.columnar+msgpack')
+    assert msgpack_choice == (COLUMNAR_MSGPACK_MEDIA_TYPE if MSGPACK_AVAILABLE else JSON_MEDIA_TYPE)
+
+    assert negotiate_encoding(None) is None and negotiate_encoding('identity') is None
+    assert negotiate_encoding('gzip, deflate') == 'gzip'
+    assert negotiate_encoding('gzip;q=0, deflate') is None
+    assert negotiate_encoding('gzip, deflate, br') == ('br' if BROTLI_AVAILABLE else 'gzip')
+
+
+if __name__ == "__main__":
+    test_columnar_round_trip()
+    test_columnar_is_smaller_and_titles_become_fields()
+    test_negotiation_keeps_json_default()
+    print("✅ Topology wire format tests passed")
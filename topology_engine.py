@@ -0,0 +1,1563 @@
+#!/usr/bin/env python3
+"""
+Unified Topology Engine
+
+The single place where Meraki devices, clients and links are turned into a
+network topology. Builders used to live in utilities/topology_visualizer,
+enhanced_visualizer, meraki_api, MerakiSDKWrapper and src/api/meraki_client,
+each with its own device-type heuristics; they now all call build_topology()
+and pick an output adapter:
+
+- to_dict          legacy node/link dicts (build_topology_from_api_data)
+- to_indexed_dict  integer link endpoints (get_network_topology)
+- to_vis           vis.js nodes/edges (create_vis_network_data)
+- to_d3            D3 nodes/edges (/api/visualization/<network_id>/data)
+- stream_d3        the same in chunks while clients are still paginating (.../stream)
+- to_multi_vendor_d3  QSR-classified Meraki + FortiGate D3 data (.../multi-vendor/data)
+- write_html       standalone vis.js HTML page (generate_topology_html)
+
+level_of_detail() sits between the builder and the D3 adapters: it collapses
+clients into ClientGroupNodes per (parent device, VLAN, category) so a
+response never carries more than a node budget, and client_group_members()
+serves the drill-down into one group.
+
+Adapters also accept the legacy dicts, so older callers that still hold a
+dict (e.g. from get_network_topology) can render it.
+
+Nodes are slotted objects with interned low-cardinality values and links
+live in typed arrays; JSON-shaped dicts are only produced by the adapters at
+the response boundary.
+"""
+
+import os
+import sys
+import json
+import logging
+from array import array
+from pathlib import Path
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from modules.meraki.topology_index import DeviceIndex, connection_type
+
+logger = logging.getLogger(__name__)
+
+# Device type to icon mapping
+DEVICE_ICONS = {
+    'switch': 'settings_ethernet',       # Switch icon
+    'wireless': 'wifi',                  # Access point icon
+    'appliance': 'security',             # MX security appliance icon
+    'camera': 'videocam',
+    'phone': 'phone_iphone',
+    'desktop': 'desktop_windows',
+    'mobile': 'smartphone',
+    'printer': 'print',
+    'server': 'dns',
+    'voip': 'call',
+    'tablet': 'tablet_mac',
+    'gateway': 'router',
+    'internet': 'public',
+    'client': 'devices_other',
+    'unknown': 'device_unknown'
+}
+
+# Connection type to style mapping
+CONNECTION_STYLES = {
+    'uplink': {'color': '#00C853', 'width': 3, 'dashes': False, 'label': 'Uplink', 'highlight': '#00C853', 'arrow': True},
+    'switch': {'color': '#2196F3', 'width': 2, 'dashes': False, 'label': 'Switch Connection', 'highlight': '#2196F3', 'arrow': True},
+    'wireless': {'color': '#FF9800', 'width': 2, 'dashes': True, 'label': 'Wireless Connection', 'highlight': '#FF9800', 'arrow': False},
+    'wired': {'color': '#607D8B', 'width': 1, 'dashes': False, 'label': 'Wired Client', 'highlight': '#607D8B', 'arrow': True},
+    'vpn': {'color': '#7B1FA2', 'width': 2, 'dashes': True, 'label': 'Site-to-site VPN', 'highlight': '#7B1FA2', 'arrow': False},
+    'wan': {'color': '#37474F', 'width': 3, 'dashes': False, 'label': 'WAN Uplink', 'highlight': '#37474F', 'arrow': True},
+    'unknown': {'color': '#9E9E9E', 'width': 1, 'dashes': True, 'label': 'Unknown Connection', 'highlight': '#9E9E9E', 'arrow': False}
+}
+
+# D3 node sizes by group and edge widths by connection type
+D3_NODE_SIZES = {'internet': 14, 'appliance': 12, 'switch': 10, 'wireless': 10, 'client': 6, 'client_group': 9,
+                 'unknown': 8}
+D3_EDGE_WIDTHS = {'uplink': 3, 'wan': 3, 'switch': 2, 'wireless': 2, 'vpn': 2, 'wired': 1, 'unknown': 1}
+# Clients per chunk of stream_d3()
+STREAM_BATCH_SIZE = int(os.getenv('TOPOLOGY_STREAM_BATCH', 500))
+
+# get_network_topology has always called MX appliances 'security_appliance'
+INDEXED_TYPE_NAMES = {'appliance': 'security_appliance'}
+
+MOBILE_MANUFACTURERS = ('apple', 'samsung', 'lg', 'motorola', 'xiaomi')
+DESKTOP_MANUFACTURERS = ('dell', 'hp', 'lenovo', 'microsoft', 'asus')
+
+
+# Low-cardinality values (status, connection, switchport, device names) are
+# interned so 100k clients share a handful of string objects
+VENDOR_MERAKI = 'meraki'
+VENDOR_FORTINET = 'fortinet'
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class TopologyNode:
+    """A device or client in a topology."""
+    id: str
+    label: str
+    type: str
+    vendor: str = VENDOR_MERAKI
+    model: Optional[str] = None
+    ip: Optional[str] = None
+    mac: Optional[str] = None
+    status: Optional[str] = None
+    serial: Optional[str] = None
+    network_id: Optional[str] = None
+    firmware: Optional[str] = None
+    ports: Optional[Dict[str, Any]] = None
+    # Client-only fields
+    client_type: Optional[str] = None
+    vlan: Any = None
+    connection: Optional[str] = None
+    connected_device: Optional[str] = None
+    switchport: Optional[str] = None
+    switchport_desc: Optional[str] = None
+    last_seen: Any = None
+    usage: Optional[tuple] = None  # (sent, recv) - rebuilt as a dict at the response boundary
+    manufacturer: Optional[str] = None
+    # Display classification (e.g. QSR device type), shared between nodes
+    group: Optional[str] = None
+    category: Optional[str] = None
+
+    @property
+    def is_client(self) -> bool:
+        return self.type == 'client'
+
+
+@dataclass(slots=True)
+class TopologyLink:
+    """A connection between two nodes, by node position (source is upstream)."""
+    source: int
+    target: int
+    type: str = 'unknown'
+    interface: str = 'Unknown'
+    status: str = 'active'
+    inferred: bool = False
+
+
+class LinkStore:
+    """
+    Array-backed link list: endpoints and flags live in typed arrays and
+    TopologyLink views are only created while iterating.
+    """
+
+    __slots__ = ('sources', 'targets', 'types', 'interfaces', 'statuses', 'inferred')
+
+    def __init__(self):
+        self.sources = array('l')
+        self.targets = array('l')
+        self.types = []
+        self.interfaces = []
+        self.statuses = []
+        self.inferred = array('b')
+
+    def append(self, source, target, link_type='unknown', interface='Unknown', status='active', inferred=False):
+        self.sources.append(source)
+        self.targets.append(target)
+        self.types.append(_intern(link_type))
+        self.interfaces.append(_intern(interface))
+        self.statuses.append(_intern(status))
+        self.inferred.append(1 if inferred else 0)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __getitem__(self, i):
+        return TopologyLink(self.sources[i], self.targets[i], self.types[i], self.interfaces[i],
+                            self.statuses[i], bool(self.inferred[i]))
+
+    def __iter__(self):
+        for i in range(len(self.sources)):
+            yield self[i]
+
+
+@dataclass
+class Topology:
+    """Nodes and links of one network, with an id -> position index."""
+    network_name: Optional[str] = None
+    nodes: List[TopologyNode] = field(default_factory=list)
+    links: LinkStore = field(default_factory=LinkStore)
+    positions: Dict[str, int] = field(default_factory=dict)
+
+    def add_node(self, node: TopologyNode) -> int:
+        """Add a node and return its position (an existing node with the same id is reused)."""
+        position = self.positions.get(node.id)
+        if position is None:
+            position = len(self.nodes)
+            self.positions[node.id] = position
+            self.nodes.append(node)
+        return position
+
+    def add_link(self, source: int, target: int, link_type: str = 'unknown', interface: str = 'Unknown',
+                 status: str = 'active', inferred: bool = False) -> None:
+        self.links.append(source, target, link_type, interface, status, inferred)
+
+    @property
+    def device_count(self) -> int:
+        return sum(1 for node in self.nodes if not node.is_client)
+
+    @property
+    def client_count(self) -> int:
+        return sum(node.count if isinstance(node, ClientGroupNode) else 1 for node in self.nodes if node.is_client)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Topology':
+        """
+        Rebuild a Topology from a legacy topology dict.
+
+        Args:
+            data (dict): Output of to_dict or to_indexed_dict (string or integer link ends)
+
+        Returns:
+            Topology: Equivalent topology
+        """
+        topology = cls(network_name=data.get('network_name'))
+        for raw in data.get('nodes', []):
+            node_type = raw.get('type', 'unknown')
+            if node_type == 'security_appliance':
+                node_type = 'appliance'
+            connection = raw.get('connection')
+            topology.add_node(TopologyNode(
+                id=raw.get('id'),
+                label=raw.get('label', raw.get('name', raw.get('id'))),
+                type=node_type,
+                vendor=_intern(raw.get('vendor', VENDOR_MERAKI)),
+                model=raw.get('model'),
+                ip=raw.get('ip'),
+                mac=raw.get('mac'),
+                status=_intern(raw.get('status')),
+                serial=raw.get('serial'),
+                network_id=raw.get('network_id'),
+                firmware=raw.get('firmware'),
+                ports=raw.get('ports'),
+                client_type=_intern(raw.get('client_type')),
+                vlan=raw.get('vlan'),
+                connection=_intern(connection.get('type') if isinstance(connection, dict) else connection),
+                connected_device=_intern(raw.get('connected_device')),
+                switchport=_intern(raw.get('switchport')),
+                switchport_desc=raw.get('switchportDesc'),
+                last_seen=raw.get('last_seen'),
+                usage=_usage_tuple(raw.get('usage')),
+                manufacturer=_intern(raw.get('manufacturer')),
+                group=_intern(raw.get('group')),
+                category=_intern(raw.get('category')),
+            ))
+        for raw in data.get('links', []):
+            source = _resolve_end(topology, raw.get('source'))
+            target = _resolve_end(topology, raw.get('target'))
+            if source is None or target is None:
+                continue
+            topology.add_link(source, target, raw.get('type', 'unknown'), raw.get('interface', 'Unknown'),
+                              raw.get('status', 'active'), raw.get('inferred', False))
+        return topology
+
+
+def _resolve_end(topology, end):
+    if isinstance(end, int):
+        return end if 0 <= end < len(topology.nodes) else None
+    return topology.positions.get(end)
+
+
+def _usage_tuple(usage):
+    if isinstance(usage, dict):
+        return (usage.get('sent'), usage.get('recv'))
+    return usage
+
+
+def _usage_dict(usage):
+    return {'sent': usage[0], 'recv': usage[1]} if usage else {}
+
+
+def as_topology(data) -> Topology:
+    """Accept either a Topology or a legacy topology dict."""
+    return data if isinstance(data, Topology) else Topology.from_dict(data)
+
+
+# --- Classification ---
+
+def classify_device(device: Dict[str, Any]) -> str:
+    """
+    Determine a device's topology type from productType, model or name.
+
+    Args:
+        device (dict): Device as returned by the Dashboard API
+
+    Returns:
+        str: 'appliance', 'switch', 'wireless', 'camera' or 'unknown'
+    """
+    product_type = (device.get('productType') or '').lower()
+    model = (device.get('model') or '').lower()
+    name = (device.get('name') or '').lower()
+
+    if 'appliance' in product_type or model.startswith(('mx', 'z')) or 'security appliance' in name:
+        return 'appliance'
+    if 'wireless' in product_type or model.startswith('mr') or 'access point' in name:
+        return 'wireless'
+    if 'switch' in product_type or model.startswith('ms') or 'switch' in name:
+        return 'switch'
+    if 'camera' in product_type or model.startswith('mv'):
+        return 'camera'
+    return 'unknown'
+
+
+def classify_client(client: Dict[str, Any]) -> str:
+    """
+    Determine a client's device type from the API's prediction or manufacturer.
+
+    Args:
+        client (dict): Client as returned by the Dashboard API
+
+    Returns:
+        str: Client type such as 'mobile', 'desktop' or 'unknown'
+    """
+    prediction = client.get('deviceTypePrediction') or client.get('deviceType')
+    if prediction:
+        return sys.intern(prediction.lower())
+    return _client_type_for_manufacturer(client.get('manufacturer') or '')
+
+
+@lru_cache(maxsize=1024)
+def _client_type_for_manufacturer(manufacturer):
+    # A network has a handful of manufacturers, so the substring scans are cached
+    manufacturer = manufacturer.lower()
+    if any(vendor in manufacturer for vendor in MOBILE_MANUFACTURERS):
+        return 'mobile'
+    if any(vendor in manufacturer for vendor in DESKTOP_MANUFACTURERS):
+        return 'desktop'
+    return 'unknown'
+
+
+def _interface_label(client):
+    if client.get('switchport'):
+        label = f"Port {client['switchport']}"
+        if client.get('switchportDesc'):
+            label += f" ({client['switchportDesc']})"
+        return label
+    if client.get('vlan'):
+        return f"VLAN {client['vlan']}"
+    return 'Unknown'
+
+
+def _link_end(end, flat_serial, flat_mac):
+    """Serial/MAC and port of one end of a flat or /topology/links style link."""
+    if isinstance(end, dict):
+        return end.get('serial') or end.get('mac'), end.get('port')
+    return end or flat_serial or flat_mac, None
+
+
+# --- Building ---
+
+def build_topology(devices: Iterable[Dict[str, Any]], clients: Iterable[Dict[str, Any]],
+                   links: Optional[List[Dict[str, Any]]] = None,
+                   network_name: Optional[str] = None) -> Topology:
+    """
+    Build a topology from Meraki API data.
+
+    Args:
+        devices (iterable): Network devices
+        clients (iterable): Network clients - a list or a paginated generator,
+                            consumed once as pages arrive
+        links (list, optional): Topology links, either flat (source/target) or in
+                                the /topology/links shape (source/destination
+                                dicts). When empty, device links are inferred.
+        network_name (str, optional): Network name
+
+    Returns:
+        Topology: Nodes and links; clients hang from the device they report
+    """
+    topology, device_index = _build_devices(devices, links, network_name)
+    for i, client in enumerate(clients):
+        node, kind = _client_node(i, client)
+        position = topology.add_node(node)
+        parent, how = device_index.parent_of(client)
+        if parent is not None:
+            topology.add_link(parent, position, kind, _interface_label(client), inferred=how == 'inferred')
+
+    return topology
+
+
+def _build_devices(devices, links, network_name=None):
+    """Device nodes and device links, plus the index clients are attached through."""
+    topology = Topology(network_name=network_name)
+
+    for i, device in enumerate(devices):
+        serial = device.get('serial')
+        topology.add_node(TopologyNode(
+            id=serial or device.get('mac') or f"device_{i}",
+            label=device.get('name') or device.get('mac') or 'Unknown Device',
+            type=classify_device(device),
+            model=device.get('model'),
+            ip=device.get('lanIp', device.get('ip')),
+            mac=device.get('mac'),
+            status=_intern(device.get('status')),
+            serial=serial,
+            network_id=device.get('networkId'),
+            firmware=device.get('firmware'),
+            ports=device.get('ports') or None,
+        ))
+
+    device_index = DeviceIndex(
+        [{'serial': n.serial, 'mac': n.mac, 'label': n.label, 'type': n.type} for n in topology.nodes],
+        [link for link in links or [] if isinstance(link.get('source'), dict)])
+
+    if links:
+        _add_explicit_links(topology, links)
+    else:
+        _infer_device_links(topology)
+    return topology, device_index
+
+
+def _client_node(i, client):
+    """Client node for the i-th client record, and its connection type."""
+    kind = connection_type(client)
+    return TopologyNode(
+        id=client.get('id') or client.get('mac') or f"client_{i}",
+        label=(client.get('description') or client.get('dhcpHostname') or client.get('hostname')
+               or client.get('mac') or 'Unknown Client'),
+        type='client',
+        client_type=classify_client(client),
+        ip=client.get('ip'),
+        mac=client.get('mac'),
+        status=_intern(client.get('status')),
+        vlan=client.get('vlan'),
+        connection=kind,
+        connected_device=_intern(client.get('recentDeviceName', client.get('deviceName'))),
+        switchport=_intern(client.get('switchport')),
+        switchport_desc=_intern(client.get('switchportDesc')),
+        last_seen=client.get('lastSeen'),
+        usage=_usage_tuple(client.get('usage')),
+        manufacturer=_intern(client.get('manufacturer')),
+    ), kind
+
+
+def _add_explicit_links(topology, links):
+    for link in links:
+        source_id, source_port = _link_end(link.get('source'), link.get('sourceSerial'), link.get('sourceMac'))
+        target_id, _ = _link_end(link.get('target', link.get('destination')),
+                                 link.get('targetSerial'), link.get('targetMac'))
+        source = topology.positions.get(source_id)
+        target = topology.positions.get(target_id)
+        if source is None or target is None:
+            continue
+        port = link.get('sourcePort', source_port)
+        topology.add_link(source, target, (link.get('linkType') or 'unknown').lower(),
+                          f"Port {port}" if port else 'Unknown', link.get('status', 'active'))
+
+
+def _infer_device_links(topology):
+    """Connect devices when the API gave no links: CDP/LLDP neighbours, then MX -> MS -> MR per network."""
+    by_name = {}
+    by_network = {}
+    for position, node in enumerate(topology.nodes):
+        by_name.setdefault(node.label, position)
+        roles = by_network.setdefault(node.network_id, {'appliance': [], 'switch': [], 'wireless': []})
+        if node.type in roles:
+            roles[node.type].append(position)
+
+    linked = set()
+    for position, node in enumerate(topology.nodes):
+        if node.type != 'switch' or not node.ports:
+            continue
+        for port_number, port_data in node.ports.items():
+            neighbour = (port_data.get('cdp') or port_data.get('lldp') or {}).get('deviceId')
+            target = by_name.get(neighbour)
+            if target is not None and target != position:
+                topology.add_link(position, target, 'switch', f"Port {port_number}")
+                linked.add(target)
+
+    for roles in by_network.values():
+        switches, aps = roles['switch'], roles['wireless']
+        for appliance in roles['appliance']:
+            for downstream in (switches or aps):
+                if downstream not in linked:
+                    topology.add_link(appliance, downstream, 'uplink', 'Uplink', inferred=True)
+        # Each AP uplinks to one switch (round robin), not to every switch
+        if switches:
+            for i, ap in enumerate(aps):
+                if ap not in linked:
+                    topology.add_link(switches[i % len(switches)], ap, 'switch', 'AP Uplink', inferred=True)
+
+
+# --- Level of detail ---
+
+CLIENT_GROUP = 'client_group'
+DEFAULT_NODE_BUDGET = int(os.getenv('TOPOLOGY_NODE_BUDGET', 1500))
+
+
+@dataclass(slots=True)
+class ClientGroupNode(TopologyNode):
+    """Clients of one parent device, VLAN and category collapsed into one node."""
+    count: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    parent: Optional[str] = None
+
+    @property
+    def is_client(self) -> bool:
+        return True
+
+
+def _client_category(node):
+    return node.category or node.client_type or 'Unknown'
+
+
+def _client_group_ids(parent_id, node):
+    """Group ids of a client from the finest to the coarsest grouping."""
+    parent_id = parent_id or '*'
+    return (f"clients|{parent_id}|{_or(node.vlan, '*')}|{_client_category(node)}",
+            f"clients|{parent_id}|{_or(node.vlan, '*')}|*",
+            f"clients|{parent_id}|*|*")
+
+
+def _client_parents(topology):
+    """Map each client position to the index of the link from its parent."""
+    nodes, links = topology.nodes, topology.links
+    parents = {}
+    for i, target in enumerate(links.targets):
+        if nodes[target].is_client:
+            parents[target] = i
+    return parents
+
+
+def level_of_detail(topology, node_budget: Optional[int] = DEFAULT_NODE_BUDGET, expand: Iterable[str] = ()):
+    """
+    Collapse clients into aggregate nodes so the topology fits a node budget.
+
+    Clients are grouped per (parent device, VLAN, category); when even the
+    groups do not fit, VLAN and then category are dropped from the grouping.
+    Devices are always kept. Left-over budget is spent showing the smallest
+    groups (and any group listed in expand) as individual clients, so small
+    networks come back unchanged.
+
+    Args:
+        topology (Topology or dict): Built topology
+        node_budget (int, optional): Maximum nodes; None or 0 disables aggregation
+        expand (iterable): Group ids to show as individual clients when they fit
+
+    Returns:
+        Topology: The same topology when it fits, otherwise a new one whose
+            ClientGroupNodes carry member counts and status breakdowns
+    """
+    topology = as_topology(topology)
+    if not node_budget or len(topology.nodes) <= node_budget:
+        return topology
+
+    nodes, links = topology.nodes, topology.links
+    parents = _client_parents(topology)
+    devices = [position for position, node in enumerate(nodes) if not node.is_client]
+    clients = [position for position, node in enumerate(nodes) if node.is_client]
+
+    for level in range(3):
+        groups = {}
+        for position in clients:
+            link = parents.get(position)
+            parent_id = nodes[links.sources[link]].id if link is not None else None
+            groups.setdefault(_client_group_ids(parent_id, nodes[position])[level], []).append(position)
+        if len(devices) + len(groups) <= node_budget:
+            break
+
+    # Spend what is left of the budget on requested, then the smallest, groups
+    expand = set(expand)
+    remaining = node_budget - len(devices) - len(groups)
+    expanded = set()
+    for group_id in sorted(groups, key=lambda g: (g not in expand, len(groups[g]))):
+        cost = len(groups[group_id]) - 1
+        if cost <= remaining:
+            expanded.add(group_id)
+            remaining -= cost
+
+    result = Topology(network_name=topology.network_name)
+    moved = {position: result.add_node(nodes[position]) for position in devices}
+    for i in range(len(links)):
+        source, target = links.sources[i], links.targets[i]
+        if source in moved and target in moved:
+            result.add_link(moved[source], moved[target], links.types[i], links.interfaces[i],
+                            links.statuses[i], bool(links.inferred[i]))
+
+    for group_id, members in groups.items():
+        first_link = parents.get(members[0])
+        parent = moved[links.sources[first_link]] if first_link is not None else None
+        if group_id in expanded:
+            for position in members:
+                client = result.add_node(nodes[position])
+                link = parents.get(position)
+                if link is not None:
+                    result.add_link(parent, client, links.types[link], links.interfaces[link],
+                                    links.statuses[link], bool(links.inferred[link]))
+            continue
+
+        statuses = {}
+        for position in members:
+            status = nodes[position].status or 'unknown'
+            statuses[status] = statuses.get(status, 0) + 1
+        sample = nodes[members[0]]
+        by_category = level == 0
+        group = result.add_node(ClientGroupNode(
+            id=group_id,
+            label=f"{len(members)} {_client_category(sample) if by_category else 'clients'}",
+            type=CLIENT_GROUP,
+            vlan=sample.vlan if level < 2 else None,
+            category=sample.category if by_category else None,
+            client_type=sample.client_type if by_category else None,
+            group=sample.group if by_category else None,
+            connection=sample.connection,
+            count=len(members),
+            statuses=statuses,
+            parent=result.nodes[parent].id if parent is not None else None,
+        ))
+        if parent is not None:
+            result.add_link(parent, group, links.types[first_link], 'Clients', 'active')
+
+    logger.debug(f"Level of detail: {len(nodes)} nodes -> {len(result.nodes)} "
+                 f"({len(groups) - len(expanded)} client groups)")
+    return result
+
+
+def client_group_members(topology, group_id: str, offset: int = 0, limit: Optional[int] = None):
+    """
+    Drill down into one client group produced by level_of_detail.
+
+    Args:
+        topology (Topology or dict): Full topology the group was built from
+        group_id (str): ClientGroupNode id
+        offset (int): Members to skip
+        limit (int, optional): Maximum members to return
+
+    Returns:
+        tuple: (Topology with the parent device and the requested member
+            clients, total number of members in the group)
+    """
+    topology = as_topology(topology)
+    nodes, links = topology.nodes, topology.links
+    parents = _client_parents(topology)
+    members = []
+    for position, node in enumerate(nodes):
+        if node.is_client:
+            link = parents.get(position)
+            parent_id = nodes[links.sources[link]].id if link is not None else None
+            if group_id in _client_group_ids(parent_id, node):
+                members.append(position)
+
+    result = Topology(network_name=topology.network_name)
+    selected = members[offset:offset + limit if limit else None]
+    parent = None
+    if selected and parents.get(selected[0]) is not None:
+        parent = result.add_node(nodes[links.sources[parents[selected[0]]]])
+    for position in selected:
+        client = result.add_node(nodes[position])
+        link = parents.get(position)
+        if parent is not None and link is not None:
+            result.add_link(parent, client, links.types[link], links.interfaces[link],
+                            links.statuses[link], bool(links.inferred[link]))
+    return result, len(members)
+
+
+# --- Output adapters ---
+
+def _or(value, default='Unknown'):
+    return default if value is None else value
+
+
+def _fields(node, names, default='Unknown'):
+    """Attributes a D3 title is built from, so the page (and compact payloads) can render it from fields."""
+    return {name: _or(getattr(node, name), default) for name in names}
+
+
+def to_dict(topology) -> Dict[str, Any]:
+    """
+    Legacy topology dict: string link ends, client links pointing client -> device.
+
+    Args:
+        topology (Topology): Built topology
+
+    Returns:
+        dict: nodes, links (and network_name when known)
+    """
+    nodes = []
+    for node in topology.nodes:
+        if node.is_client:
+            nodes.append({
+                'id': node.id,
+                'label': node.label,
+                'type': 'client',
+                'client_type': _or(node.client_type, 'unknown'),
+                'ip': _or(node.ip),
+                'mac': _or(node.mac),
+                'vlan': _or(node.vlan),
+                'status': _or(node.status),
+                'last_seen': _or(node.last_seen),
+                'connected_device': _or(node.connected_device),
+                'switchport': _or(node.switchport),
+                'switchportDesc': node.switchport_desc or ''
+            })
+        else:
+            entry = {
+                'id': node.id,
+                'label': node.label,
+                'type': node.type,
+                'model': _or(node.model),
+                'ip': _or(node.ip),
+                'mac': _or(node.mac),
+                'status': _or(node.status),
+                'network_id': _or(node.network_id)
+            }
+            if node.ports:
+                entry['ports'] = node.ports
+            nodes.append(entry)
+
+    links = []
+    for link in topology.links:
+        source, target = topology.nodes[link.source], topology.nodes[link.target]
+        if target.is_client:
+            source, target = target, source
+        links.append({'source': source.id, 'target': target.id, 'type': link.type, 'interface': link.interface})
+
+    result = {'nodes': nodes, 'links': links}
+    if topology.network_name:
+        result['network_name'] = topology.network_name
+    return result
+
+
+def to_indexed_dict(topology) -> Dict[str, Any]:
+    """
+    get_network_topology dict: link ends are node positions, parent -> child.
+
+    Args:
+        topology (Topology): Built topology
+
+    Returns:
+        dict: network_name, nodes, links
+    """
+    nodes = []
+    for i, node in enumerate(topology.nodes):
+        if node.is_client:
+            nodes.append({
+                'id': node.id,
+                'label': node.label,
+                'type': 'client',
+                'client_type': _or(node.client_type, 'unknown'),
+                'ip': _or(node.ip, 'No IP'),
+                'mac': _or(node.mac, 'No MAC'),
+                'vlan': _or(node.vlan),
+                'connection': {
+                    'type': _or(node.connection),
+                    'vlan': _or(node.vlan),
+                    'port': _or(node.switchport),
+                    'last_seen': _or(node.last_seen)
+                },
+                'usage': _usage_dict(node.usage)
+            })
+        else:
+            nodes.append({
+                'id': node.id,
+                'label': node.label,
+                'type': INDEXED_TYPE_NAMES.get(node.type, node.type),
+                'model': _or(node.model),
+                'ip': _or(node.ip, 'No IP'),
+                'mac': _or(node.mac, 'No MAC'),
+                'serial': _or(node.serial, 'No Serial'),
+                'firmware': _or(node.firmware),
+                'status': _or(node.status, 'unknown')
+            })
+
+    links = []
+    for link in topology.links:
+        entry = {'source': link.source, 'target': link.target, 'type': link.type, 'status': link.status}
+        if link.inferred:
+            entry['inferred'] = True
+        links.append(entry)
+    return {'network_name': topology.network_name, 'nodes': nodes, 'links': links}
+
+
+def _vis_title(node):
+    """Hover tooltip HTML for a vis.js node."""
+    if node.is_client:
+        title = f"""<b>{node.label}</b><br>
+<b>Type:</b> {_or(node.client_type)}<br>
+<b>IP:</b> {_or(node.ip)}<br>
+<b>MAC:</b> {_or(node.mac)}<br>
+<b>VLAN:</b> {_or(node.vlan)}<br>
+<b>Status:</b> {_or(node.status)}<br>
+<b>Connected to:</b> {_or(node.connected_device)}"""
+        if node.switchport:
+            port_info = f"{node.switchport}"
+            if node.switchport_desc:
+                port_info += f" ({node.switchport_desc})"
+            title += f"""<br>
+<b>Switchport:</b> {port_info}"""
+        if node.last_seen:
+            title += f"<br><b>Last Seen:</b> {node.last_seen}"
+        return title
+
+    type_names = {'appliance': 'MX Security Appliance', 'switch': 'MS Switch', 'wireless': 'MR Access Point'}
+    title = f"""<b>{node.label}</b><br>
+<b>Model:</b> {_or(node.model)}<br>
+<b>Type:</b> {type_names.get(node.type, node.type)}<br>
+<b>IP:</b> {_or(node.ip)}<br>
+<b>MAC:</b> {_or(node.mac)}<br>
+<b>Status:</b> {_or(node.status)}"""
+    if node.type in type_names:
+        title += f"<br>\n<b>Serial:</b> {node.id}"
+    return title
+
+
+def _vis_edge_label(link):
+    if link.type == 'uplink':
+        return "Internet Connection"
+    if link.type == 'wireless':
+        return "Wireless Connection"
+    if link.type in ('switch', 'wired'):
+        return link.interface
+    return ""
+
+
+def to_vis(topology) -> Dict[str, Any]:
+    """
+    vis.js network data.
+
+    Args:
+        topology (Topology or dict): Built topology
+
+    Returns:
+        dict: nodes, edges and the set of connection_types present
+    """
+    topology = as_topology(topology)
+    vis_nodes = []
+    for node in topology.nodes:
+        icon = DEVICE_ICONS.get(node.type, 'device_unknown')
+        size, font_size = 30, 14
+        if node.is_client:
+            icon = DEVICE_ICONS.get(node.client_type, icon)
+            size, font_size = 20, 12
+        vis_nodes.append({
+            'id': node.id,
+            'label': node.label,
+            'title': _vis_title(node),
+            'shape': 'circularImage',
+            'image': f"https://img.icons8.com/material/48/{icon}.png",
+            'group': node.type,
+            'size': size,
+            'font': {
+                'size': font_size
+            }
+        })
+
+    vis_edges = []
+    connection_types = set()
+    for link in topology.links:
+        connection_types.add(link.type)
+        style = CONNECTION_STYLES.get(link.type, CONNECTION_STYLES['unknown'])
+        source, target = topology.nodes[link.source], topology.nodes[link.target]
+        if target.is_client:
+            source, target = target, source
+        label = _vis_edge_label(link)
+        vis_edges.append({
+            'from': source.id,
+            'to': target.id,
+            'label': label,
+            'title': label,
+            'color': {
+                'color': style['color'],
+                'highlight': style['highlight']
+            },
+            'width': style['width'],
+            'dashes': style['dashes'],
+            'arrows': {
+                'to': {
+                    'enabled': style['arrow']
+                }
+            },
+            'font': {
+                'size': 10,
+                'align': 'middle'
+            }
+        })
+
+    return {
+        'nodes': vis_nodes,
+        'edges': vis_edges,
+        'connection_types': connection_types
+    }
+
+
+def to_d3(topology) -> Dict[str, Any]:
+    """
+    D3 data for /api/visualization/<network_id>/data.
+
+    Args:
+        topology (Topology or dict): Built topology
+
+    Returns:
+        dict: nodes and edges
+    """
+    topology = as_topology(topology)
+    d3_nodes = [_d3_node(node) for node in topology.nodes]
+    d3_edges = []
+    for link in topology.links:
+        source, target = topology.nodes[link.source], topology.nodes[link.target]
+        if target.is_client:
+            source, target = target, source
+        d3_edges.append(_d3_edge(source.id, target.id, link.type))
+    return {'nodes': d3_nodes, 'edges': d3_edges}
+
+
+def _d3_node(node):
+    if isinstance(node, ClientGroupNode):
+        return _client_group_d3(node, node.id, CLIENT_GROUP, D3_NODE_SIZES[CLIENT_GROUP])
+    group = node.type if node.type in D3_NODE_SIZES else 'unknown'
+    d3_node = {
+        'id': node.id,
+        'label': node.label,
+        'group': group,
+        'size': D3_NODE_SIZES[group],
+        'title': f"<b>{node.label}</b><br>" +
+                 f"Type: {node.type}<br>" +
+                 f"IP: {_or(node.ip)}<br>" +
+                 f"Status: {_or(node.status)}"
+    }
+    d3_node.update(_fields(node, ('ip', 'status')))
+    return d3_node
+
+
+def _d3_edge(source_id, target_id, link_type):
+    edge_type = link_type if link_type in D3_EDGE_WIDTHS else 'unknown'
+    return {
+        'source': source_id,
+        'target': target_id,
+        'type': edge_type,
+        'width': D3_EDGE_WIDTHS[edge_type],
+        'dashes': link_type == 'wireless'
+    }
+
+
+def stream_d3(devices: Iterable[Dict[str, Any]], clients: Iterable[Dict[str, Any]],
+              links: Optional[List[Dict[str, Any]]] = None, batch_size: int = STREAM_BATCH_SIZE):
+    """
+    D3 data as a sequence of chunks, for /api/visualization/<network_id>/stream.
+
+    Devices and device links come first; clients and their links follow in
+    batches as the client generator yields them, so the first chunk goes out
+    before client pagination finishes. Only the devices are held in memory -
+    client nodes are turned into D3 dicts and dropped batch by batch, so the
+    stream is not aggregated to a node budget.
+
+    Args:
+        devices (iterable): Network devices
+        clients (iterable): Network clients, typically a paginated generator
+        links (list, optional): Topology links (see build_topology)
+        batch_size (int): Clients per chunk
+
+    Yields:
+        dict: {'type': 'devices' | 'clients', 'nodes': [...], 'edges': [...]},
+            then {'type': 'end', 'stats': {...}}
+    """
+    topology, device_index = _build_devices(devices, links)
+    device_chunk = to_d3(topology)
+    yield {'type': 'devices', 'nodes': device_chunk['nodes'], 'edges': device_chunk['edges']}
+
+    nodes, edges = [], []
+    client_count = link_count = 0
+    for i, client in enumerate(clients):
+        node, kind = _client_node(i, client)
+        nodes.append(_d3_node(node))
+        parent, _ = device_index.parent_of(client)
+        if parent is not None:
+            edges.append(_d3_edge(node.id, topology.nodes[parent].id, kind))
+        if len(nodes) >= batch_size:
+            client_count += len(nodes)
+            link_count += len(edges)
+            yield {'type': 'clients', 'nodes': nodes, 'edges': edges}
+            nodes, edges = [], []
+    if nodes:
+        client_count += len(nodes)
+        link_count += len(edges)
+        yield {'type': 'clients', 'nodes': nodes, 'edges': edges}
+
+    yield {'type': 'end', 'stats': {
+        'devices': len(topology.nodes),
+        'clients': client_count,
+        'edges': len(device_chunk['edges']) + link_count
+    }}
+
+
+def _client_group_d3(node, node_id, group, size):
+    """D3 node for a ClientGroupNode; the page drills down through 'group_id'."""
+    statuses = ', '.join(f"{status}: {count}" for status, count in sorted(node.statuses.items()))
+    d3_node = {
+        'id': node_id,
+        'label': node.label,
+        'group': group,
+        'size': size,
+        'title': (f"<b>{node.label}</b><br>"
+                  f"Category: {_or(node.category, 'All')}<br>"
+                  f"VLAN: {_or(node.vlan, 'All')}<br>"
+                  f"Status: {statuses}"),
+        'count': node.count,
+        'statuses': node.statuses,
+        'group_id': node.id
+    }
+    d3_node.update(_fields(node, ('category', 'vlan'), 'All'))
+    return d3_node
+
+
+# Multi-vendor D3 ids are prefixed by vendor so Meraki and FortiGate serials never collide
+MULTI_VENDOR_PREFIXES = {VENDOR_MERAKI: 'meraki', VENDOR_FORTINET: 'fortigate'}
+LARGE_DEVICE_GROUPS = ('security_appliance', 'digital_menu')
+LARGE_CLIENT_GROUPS = ('pos_register', 'pos_tablet', 'kitchen_display')
+
+
+def _multi_vendor_id(node):
+    if node.is_client:
+        return f"client_{node.id}"
+    return f"{MULTI_VENDOR_PREFIXES.get(node.vendor, node.vendor)}_{node.id}"
+
+
+def _multi_vendor_node(node, node_id):
+    group = node.group or node.type
+    category = node.category or 'Unknown'
+    if isinstance(node, ClientGroupNode):
+        return _client_group_d3(node, node_id, group, 8 if group in LARGE_CLIENT_GROUPS else 9)
+    if node.is_client:
+        size = 8 if group in LARGE_CLIENT_GROUPS else 6
+        title = (f"<b>{node.label}</b><br>"
+                 f"Category: {category}<br>"
+                 f"MAC: {_or(node.mac)}<br>"
+                 f"IP: {_or(node.ip)}<br>"
+                 f"VLAN: {_or(node.vlan)}<br>"
+                 f"Manufacturer: {_or(node.manufacturer)}")
+        fields = _fields(node, ('mac', 'ip', 'vlan', 'manufacturer'))
+    elif node.vendor == VENDOR_FORTINET:
+        # FortiGates are typically central devices
+        size = 14
+        title = (f"<b>{node.label}</b><br>"
+                 f"Category: {category}<br>"
+                 f"Host: {_or(node.ip)}<br>"
+                 f"Serial: {_or(node.serial)}<br>"
+                 f"Platform: {_or(node.model)}")
+        fields = _fields(node, ('ip', 'serial', 'model'))
+    else:
+        size = 12 if group in LARGE_DEVICE_GROUPS else 10
+        title = (f"<b>{node.label}</b><br>"
+                 f"Category: {category}<br>"
+                 f"Model: {_or(node.model)}<br>"
+                 f"Serial: {_or(node.serial)}<br>"
+                 f"Status: {_or(node.status)}<br>"
+                 f"IP: {_or(node.ip)}")
+        fields = _fields(node, ('model', 'serial', 'status', 'ip'))
+    d3_node = {'id': node_id, 'label': node.label, 'group': group, 'size': size, 'title': title,
+               'category': category}
+    d3_node.update(fields)
+    return d3_node
+
+
+def to_multi_vendor_d3(topology) -> Dict[str, Any]:
+    """
+    D3 data for /api/visualization/<network_id>/multi-vendor/data.
+
+    Nodes carry their display classification in group/category (QSR device
+    types); ids are prefixed meraki_/fortigate_/client_.
+
+    Args:
+        topology (Topology or dict): Built topology
+
+    Returns:
+        dict: nodes and edges
+    """
+    topology = as_topology(topology)
+    ids = [_multi_vendor_id(node) for node in topology.nodes]
+    nodes = [_multi_vendor_node(node, node_id) for node, node_id in zip(topology.nodes, ids)]
+    edges = []
+    for link in topology.links:
+        edges.append({
+            'source': ids[link.source],
+            'target': ids[link.target],
+            'type': link.type,
+            'width': D3_EDGE_WIDTHS.get(link.type, 1),
+            'dashes': link.type == 'wireless'
+        })
+    return {'nodes': nodes, 'edges': edges}
+
+
+def write_html(topology, network_name=None, output_path=None, layout=True):
+    """
+    Write a standalone vis.js page for a topology.
+
+    Args:
+        topology (Topology or dict): Built topology
+        network_name (str, optional): Page title; defaults to the topology's network name
+        output_path (str, optional): Target file; defaults to ~/meraki_visualizations/<name>_topology.html
+        layout (bool): Embed server-side node coordinates so the page only
+                       relaxes the layout instead of simulating from scratch
+
+    Returns:
+        str: Path to the generated HTML file
+    """
+    topology = as_topology(topology)
+    network_name = network_name or topology.network_name or "Unknown Network"
+    if not output_path:
+        output_dir = Path(os.path.expanduser("~")) / "meraki_visualizations"
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = output_dir / f"{network_name.replace(' ', '_')}_topology.html"
+
+    vis_data = to_vis(topology)
+    if layout:
+        from topology_layout import layout_topology
+        positions = layout_topology(topology)
+        for node in vis_data['nodes']:
+            node['x'], node['y'] = positions[node['id']]
+    html_content = render_html(vis_data, network_name)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    logger.info(f"Network topology visualization saved to {output_path}")
+    return str(output_path)
+
+
+def render_html(vis_data, network_name):
+    """
+    Render the standalone vis.js topology page.
+
+    Args:
+        vis_data (dict): Output of to_vis
+        network_name (str): Page title
+
+    Returns:
+        str: HTML document
+    """
+    vis_nodes = vis_data['nodes']
+    vis_edges = vis_data['edges']
+    connection_types = vis_data['connection_types']
+    # Nodes placed by topology_layout only need a short relaxation
+    stabilization_iterations = 100 if vis_nodes and all('x' in node for node in vis_nodes) else 1000
+
+    # Build HTML content
+    html_parts = []
+    
+    # Start HTML
+    html_parts.append(f"""<!DOCTYPE html>
+<html>
+<head>
+<title>Network Topology: {network_name}</title>
+<meta charset="utf-8">
+<script src="https://cdnjs.cloudflare.com/ajax/libs/vis/4.21.0/vis.min.js"></script>
+<link href="https://cdnjs.cloudflare.com/ajax/libs/vis/4.21.0/vis.min.css" rel="stylesheet" type="text/css">
+<style type="text/css">
+    body, html {{
+        height: 100%;
+        margin: 0;
+        padding: 0;
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        background-color: #1e1e1e;
+        color: #e0e0e0;
+    }}
+    
+    #topology-container {{
+        width: 100%;
+        height: 100%;
+        display: flex;
+        flex-direction: column;
+    }}
+    
+    #topology-header {{
+        background-color: #2d2d2d;
+        color: #ffffff;
+        padding: 10px 20px;
+        border-bottom: 1px solid #3d3d3d;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+    }}
+    #topology-title {{
+        font-size: 20px;
+        font-weight: bold;
+    }}
+    #topology-stats {{
+        font-size: 14px;
+    }}
+    #topology-content {{
+        display: flex;
+        flex: 1;
+        overflow: hidden;
+    }}
+    #topology-sidebar {{
+        width: 250px;
+        background-color: #252525;
+        padding: 15px;
+        overflow-y: auto;
+        border-right: 1px solid #3d3d3d;
+    }}
+    #topology-network {{
+        flex: 1;
+        position: relative;
+    }}
+    .legend {{
+        margin-bottom: 20px;
+    }}
+    .legend h3 {{
+        font-size: 16px;
+        margin-bottom: 10px;
+        color: #ffffff;
+        border-bottom: 1px solid #3d3d3d;
+        padding-bottom: 5px;
+    }}
+    .legend-item {{
+        display: flex;
+        align-items: center;
+        margin-bottom: 8px;
+    }}
+    .legend-color {{
+        width: 16px;
+        height: 16px;
+        border-radius: 50%;
+        margin-right: 8px;
+    }}
+    .legend-dash {{
+        width: 20px;
+        height: 0;
+        border-top: 2px dashed;
+        margin-right: 8px;
+    }}
+    .device-count {{
+        margin-top: 20px;
+    }}
+    .device-count h3 {{
+        font-size: 16px;
+        margin-bottom: 10px;
+        color: #ffffff;
+        border-bottom: 1px solid #3d3d3d;
+        padding-bottom: 5px;
+    }}
+    .device-type {{
+        display: flex;
+        justify-content: space-between;
+        margin-bottom: 5px;
+        font-size: 14px;
+    }}
+    .controls {{
+        margin-top: 20px;
+    }}
+    .controls h3 {{
+        font-size: 16px;
+        margin-bottom: 10px;
+        color: #ffffff;
+        border-bottom: 1px solid #3d3d3d;
+        padding-bottom: 5px;
+    }}
+    .control-button {{
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        padding: 8px 12px;
+        margin: 5px 0;
+        border-radius: 4px;
+        cursor: pointer;
+        width: 100%;
+        text-align: left;
+    }}
+    .control-button:hover {{
+        background-color: #106ebe;
+    }}
+    .vis-network {{
+        background-color: #121212;
+    }}
+    .vis-tooltip {{
+        background-color: #2d2d2d !important;
+        color: #e0e0e0 !important;
+        border: 1px solid #3d3d3d !important;
+        border-radius: 4px !important;
+        padding: 10px !important;
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif !important;
+        box-shadow: 0 2px 10px rgba(0, 0, 0, 0.5) !important;
+        max-width: 300px !important;
+    }}
+</style>
+</head>
+<body>
+<div id="topology-container">
+    <div id="topology-header">
+        <div id="topology-title">Network Topology: {network_name}</div>
+        <div id="topology-stats">
+            Devices: {len([n for n in vis_nodes if 'group' in n and n['group'] != 'client'])} | 
+            Clients: {len([n for n in vis_nodes if 'group' in n and n['group'] == 'client'])} | 
+            Connections: {len(vis_edges)}
+        </div>
+    </div>
+    <div id="topology-content">
+        <div id="topology-sidebar">
+            <div class="legend">
+                <h3>Connection Types</h3>""")
+
+    # Dynamically generate legend based on connection types present in the data
+    for conn_type in connection_types:
+        style = CONNECTION_STYLES.get(conn_type, CONNECTION_STYLES['unknown'])
+        if style['dashes']:
+            html_parts.append(f"""
+                <div class="legend-item">
+                    <div class="legend-dash" style="border-color: {style['color']};"></div>
+                    <span>{style['label']}</span>
+                </div>""")
+        else:
+            html_parts.append(f"""
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: {style['color']};"></div>
+                    <span>{style['label']}</span>
+                </div>""")
+
+    # Add device type legend
+    device_types = set(node.get('group', 'Unknown') for node in vis_nodes)
+    
+    if device_types:
+        html_parts.append("""
+            </div>
+            <div class="legend">
+                <h3>Device Types</h3>""")
+        for device_type in device_types:
+            if device_type != 'client':
+                html_parts.append(f"""
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: #4CAF50;"></div>
+                    <span>{device_type}</span>
+                </div>""")
+    
+    # Add client type legend if we have client devices
+    if 'client' in device_types:
+        html_parts.append("""
+            </div>
+            <div class="legend">
+                <h3>Client Types</h3>
+                <div class="legend-item">
+                    <div class="legend-color" style="background-color: #2196F3;"></div>
+                    <span>client</span>
+                </div>""")
+
+    # Add device count summary
+    device_count = {}
+    for node in vis_nodes:
+        group = node.get('group', 'Unknown')
+        device_count[group] = device_count.get(group, 0) + 1
+    
+    html_parts.append("""
+            </div>
+            <div class="device-count">
+                <h3>Device Count</h3>""")
+    
+    for device_type, count in device_count.items():
+        html_parts.append(f"""
+                <div class="device-type">
+                    <span>{device_type}</span>
+                    <span>{count}</span>
+                </div>""")
+    
+    # Add controls
+    html_parts.append("""
+            </div>
+            <div class="controls">
+                <h3>Controls</h3>
+                <button class="control-button" onclick="fitNetwork()">Fit All Nodes</button>
+                <button class="control-button" onclick="togglePhysics()">Toggle Physics</button>
+                <button class="control-button" onclick="toggleEdgeLabels()">Toggle Edge Labels</button>
+                <button class="control-button" onclick="toggleNodeLabels()">Toggle Node Labels</button>
+            </div>
+        </div>
+        <div id="topology-network"></div>
+    </div>
+</div>
+
+<script type="text/javascript">
+    // Create a network
+    var container = document.getElementById('topology-network');
+    
+    // Parse the JSON data
+    var nodes = new vis.DataSet(""" + json.dumps(vis_nodes) + """);
+    var edges = new vis.DataSet(""" + json.dumps(vis_edges) + """);
+    
+    // Provide the data in the vis format
+    var data = {
+        nodes: nodes,
+        edges: edges
+    };
+    
+    // Options for the network visualization
+    var options = {
+        nodes: {
+            shape: 'circularImage',
+            font: {
+                color: '#ffffff',
+                strokeWidth: 3,
+                strokeColor: '#121212'
+            },
+            shadow: {
+                enabled: true,
+                color: 'rgba(0,0,0,0.5)',
+                size: 10,
+                x: 5,
+                y: 5
+            }
+        },
+        edges: {
+            font: {
+                color: '#ffffff',
+                strokeWidth: 3,
+                strokeColor: '#121212',
+                size: 12
+            },
+            shadow: {
+                enabled: true,
+                color: 'rgba(0,0,0,0.5)',
+                size: 10,
+                x: 5,
+                y: 5
+            }
+        },
+        physics: {
+            enabled: true,
+            barnesHut: {
+                gravitationalConstant: -3000,
+                centralGravity: 0.3,
+                springLength: 200,
+                springConstant: 0.05,
+                damping: 0.09
+            },
+            stabilization: {
+                enabled: true,
+                iterations: """ + str(stabilization_iterations) + """,
+                updateInterval: 100
+            }
+        },
+        interaction: {
+            navigationButtons: true,
+            keyboard: true,
+            tooltipDelay: 200,
+            hover: true
+        },
+        groups: {
+            switch: {
+                color: {
+                    background: '#4CAF50',
+                    border: '#2E7D32',
+                    highlight: {
+                        background: '#81C784',
+                        border: '#4CAF50'
+                    }
+                }
+            },
+            wireless: {
+                color: {
+                    background: '#FF9800',
+                    border: '#F57C00',
+                    highlight: {
+                        background: '#FFB74D',
+                        border: '#FF9800'
+                    }
+                }
+            },
+            appliance: {
+                color: {
+                    background: '#9C27B0',
+                    border: '#7B1FA2',
+                    highlight: {
+                        background: '#BA68C8',
+                        border: '#9C27B0'
+                    }
+                }
+            },
+            client: {
+                color: {
+                    background: '#2196F3',
+                    border: '#1976D2',
+                    highlight: {
+                        background: '#64B5F6',
+                        border: '#2196F3'
+                    }
+                }
+            },
+            unknown: {
+                color: {
+                    background: '#9E9E9E',
+                    border: '#616161',
+                    highlight: {
+                        background: '#BDBDBD',
+                        border: '#9E9E9E'
+                    }
+                }
+            }
+        }
+    };
+    
+    // Initialize the network
+    var network = new vis.Network(container, data, options);
+    
+    // Add event listeners
+    network.on("stabilizationProgress", function(params) {
+        // Update loading bar
+        console.log("Stabilization progress:", params.iterations, "/", params.total);
+    });
+    
+    network.on("stabilizationIterationsDone", function() {
+        console.log("Stabilization complete");
+    });
+    
+    // Control functions
+    function fitNetwork() {
+        network.fit({
+            animation: {
+                duration: 1000,
+                easingFunction: "easeInOutQuad"
+            }
+        });
+    }
+    
+    var physicsEnabled = true;
+    function togglePhysics() {
+        physicsEnabled = !physicsEnabled;
+        network.setOptions({physics: {enabled: physicsEnabled}});
+    }
+    
+    var edgeLabelsVisible = true;
+    function toggleEdgeLabels() {
+        edgeLabelsVisible = !edgeLabelsVisible;
+        edges.forEach(function(edge) {
+            if (edgeLabelsVisible) {
+                if (edge._originalLabel) {
+                    edges.update({id: edge.id, label: edge._originalLabel});
+                }
+            } else {
+                if (edge.label) {
+                    edge._originalLabel = edge.label;
+                    edges.update({id: edge.id, label: ""});
+                }
+            }
+        });
+    }
+    
+    var nodeLabelsVisible = true;
+    function toggleNodeLabels() {
+        nodeLabelsVisible = !nodeLabelsVisible;
+        nodes.forEach(function(node) {
+            if (nodeLabelsVisible) {
+                if (node._originalLabel) {
+                    nodes.update({id: node.id, label: node._originalLabel});
+                }
+            } else {
+                if (node.label) {
+                    node._originalLabel = node.label;
+                    nodes.update({id: node.id, label: ""});
+                }
+            }
+        });
+    }
+    
+    // Initial fit
+    setTimeout(fitNetwork, 1000);
+</script>
+</body>
+</html>""")
+    
+    # Join all parts
+    html_content = ''.join(html_parts)
+    return html_content
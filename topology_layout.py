@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Server-Side Topology Layout
+
+The D3 and vis.js pages used to run their force simulation from scratch on
+every load, which takes tens of seconds on large graphs. This module computes
+node coordinates once per topology version so the page can draw immediately
+and only relax the layout a little:
+
+1. A hierarchical seed by device role (MX -> MS -> MR -> clients): devices sit
+   on tiers under their upstream device, clients are packed in blocks below
+   the device they hang from. Pure Python, O(n).
+2. With NumPy installed, a vectorized force-directed pass (Fruchterman-Reingold
+   with tier gravity) relaxes the seed. Without NumPy the seed is returned as is.
+
+Layouts are cached per topology version. A new version is seeded from the
+previous version's coordinates, so nodes that did not change keep their place
+and only new nodes are positioned from scratch.
+"""
+
+import os
+import math
+import logging
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+LAYER_GAP = 180.0
+DEVICE_SPACING = 120.0
+CLIENT_SPACING = 28.0
+# Force relaxation is O(n^2) per iteration; bigger graphs keep the hierarchical seed
+MAX_FORCE_NODES = int(os.getenv('TOPOLOGY_LAYOUT_MAX_FORCE_NODES', 2000))
+DEFAULT_ITERATIONS = 40
+INCREMENTAL_ITERATIONS = 15
+LAYOUT_CACHE_SIZE = int(os.getenv('TOPOLOGY_LAYOUT_CACHE', 64))
+
+# Tier per node role (engine types, get_network_topology names and QSR groups)
+ROLE_TIERS = {
+    'appliance': 0, 'security_appliance': 0, 'firewall': 0, 'fortigate': 0, 'gateway': 0, 'internet': 0,
+    'switch': 1, 'core_switch': 1, 'network_switch': 1,
+    'wireless': 2, 'access_point': 2, 'fortiap': 2, 'camera': 2,
+}
+CLIENT_TIER = 3
+
+
+def _tiers(roles, adjacency):
+    """Tier of each node: its role when known, else one below its highest known neighbour."""
+    tiers = [ROLE_TIERS.get(role) for role in roles]
+    for i, tier in enumerate(tiers):
+        if tier is None:
+            known = [tiers[j] for j in adjacency[i] if tiers[j] is not None and tiers[j] < CLIENT_TIER]
+            tiers[i] = min(known) + 1 if known and roles[i] not in ('client', 'client_group') else CLIENT_TIER
+    return tiers
+
+
+def hierarchical_layout(count, roles, edges, previous=None):
+    """
+    Place nodes on role tiers, children under their upstream device.
+
+    Args:
+        count (int): Number of nodes
+        roles (list): Role (type/group) of each node
+        edges (list): (i, j) node index pairs
+        previous (dict, optional): {index: (x, y)} coordinates to keep
+
+    Returns:
+        tuple: (list of [x, y], list of tiers)
+    """
+    adjacency = [[] for _ in range(count)]
+    for i, j in edges:
+        adjacency[i].append(j)
+        adjacency[j].append(i)
+    tiers = _tiers(roles, adjacency)
+
+    # Parent = first neighbour on a higher tier; the tier strictly decreases so there are no cycles
+    children = [[] for _ in range(count)]
+    roots = []
+    for i in range(count):
+        parent = next((j for j in adjacency[i] if tiers[j] < tiers[i]), None)
+        if parent is None:
+            roots.append(i)
+        else:
+            children[parent].append(i)
+
+    positions = [None] * count
+
+    def place(node, left):
+        """Lay out a subtree starting at x=left and return its right edge."""
+        right = left
+        clients = []
+        for child in children[node]:
+            if tiers[child] >= CLIENT_TIER:
+                clients.append(child)
+            else:
+                right = place(child, right)
+        if clients:
+            columns = max(1, int(math.ceil(math.sqrt(len(clients)))))
+            for k, client in enumerate(clients):
+                positions[client] = [right + (k % columns) * CLIENT_SPACING,
+                                     CLIENT_TIER * LAYER_GAP + (k // columns) * CLIENT_SPACING]
+            right += columns * CLIENT_SPACING
+        right = max(right, left + DEVICE_SPACING)
+        positions[node] = [(left + right - DEVICE_SPACING) / 2.0 if right > left + DEVICE_SPACING else left,
+                           tiers[node] * LAYER_GAP]
+        return right
+
+    right = 0.0
+    # Devices first so orphan clients end up to the right of the tree
+    for root in sorted(roots, key=lambda i: tiers[i]):
+        right = place(root, right)
+
+    # Centre on the origin; the page adds its own offset
+    middle = right / 2.0
+    for position in positions:
+        position[0] -= middle
+    if previous:
+        for i, xy in previous.items():
+            positions[i] = [float(xy[0]), float(xy[1])]
+    return positions, tiers
+
+
+def force_relax(positions, tiers, edges, iterations=DEFAULT_ITERATIONS, pinned=None):
+    """
+    Relax a layout with a vectorized Fruchterman-Reingold pass (requires NumPy).
+
+    Args:
+        positions (list): [x, y] per node (the seed)
+        tiers (list): Tier per node; y is pulled back towards its tier
+        edges (list): (i, j) node index pairs
+        iterations (int): Simulation steps
+        pinned (list, optional): Per-node flags; pinned nodes move five times less
+
+    Returns:
+        list: Relaxed [x, y] per node
+    """
+    count = len(positions)
+    if not NUMPY_AVAILABLE or count < 2 or count > MAX_FORCE_NODES:
+        return positions
+
+    x = np.asarray([xy[0] for xy in positions], dtype=np.float64)
+    y = np.asarray([xy[1] for xy in positions], dtype=np.float64)
+    tier_y = np.asarray(tiers, dtype=np.float64) * LAYER_GAP
+    mobility = np.ones(count)
+    if pinned is not None:
+        mobility[np.asarray(pinned, dtype=bool)] = 0.2
+    edge_array = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    sources, targets = edge_array[:, 0], edge_array[:, 1]
+    k_sq = (DEVICE_SPACING / 2.0) ** 2
+    temperature = DEVICE_SPACING
+    # Rows per repulsion block: bounds the n x block temporaries to ~8 MB each
+    chunk = max(1, min(count, 1000000 // count))
+
+    for step in range(iterations):
+        dx_total = np.empty(count)
+        dy_total = np.empty(count)
+        # Repulsion k^2 / d between every pair
+        for start in range(0, count, chunk):
+            dx = x[start:start + chunk, None] - x[None, :]
+            dy = y[start:start + chunk, None] - y[None, :]
+            force = dx * dx
+            force += dy * dy
+            np.maximum(force, 1e-2, out=force)
+            np.divide(k_sq, force, out=force)
+            dx_total[start:start + chunk] = (dx * force).sum(axis=1)
+            dy_total[start:start + chunk] = (dy * force).sum(axis=1)
+        # Attraction d^2 / k along edges
+        if len(edge_array):
+            dx = x[sources] - x[targets]
+            dy = y[sources] - y[targets]
+            pull = np.sqrt(dx * dx + dy * dy) / math.sqrt(k_sq)
+            np.subtract.at(dx_total, sources, dx * pull)
+            np.subtract.at(dy_total, sources, dy * pull)
+            np.add.at(dx_total, targets, dx * pull)
+            np.add.at(dy_total, targets, dy * pull)
+
+        length = np.maximum(np.sqrt(dx_total * dx_total + dy_total * dy_total), 1e-2)
+        scale = np.minimum(length, temperature) / length * mobility
+        x += dx_total * scale
+        y += dy_total * scale
+        # Tier gravity keeps the MX -> MS -> MR -> client ordering readable
+        y += (tier_y - y) * 0.3
+        temperature *= 1.0 - 1.0 / (iterations - step + 1)
+
+    pos = np.column_stack((x, y))
+    return pos.round(1).tolist()
+
+
+def compute_layout(node_ids, roles, edges, previous=None, iterations=None):
+    """
+    Lay out a graph: hierarchical seed, then force relaxation when NumPy is available.
+
+    Args:
+        node_ids (list): Node ids
+        roles (list): Role (type/group) of each node
+        edges (list): (i, j) node index pairs
+        previous (dict, optional): {node_id: [x, y]} from an earlier version;
+            those nodes keep their place and only relax slightly
+        iterations (int, optional): Force steps (default: fewer when seeded
+            from a previous layout)
+
+    Returns:
+        dict: {node_id: [x, y]}
+    """
+    kept = {}
+    if previous:
+        kept = {i: previous[node_id] for i, node_id in enumerate(node_ids) if node_id in previous}
+    positions, tiers = hierarchical_layout(len(node_ids), roles, edges, kept)
+    if iterations is None:
+        iterations = INCREMENTAL_ITERATIONS if kept else DEFAULT_ITERATIONS
+    pinned = [i in kept for i in range(len(node_ids))] if kept else None
+    positions = force_relax(positions, tiers, edges, iterations, pinned)
+    return {node_id: [round(xy[0], 1), round(xy[1], 1)] for node_id, xy in zip(node_ids, positions)}
+
+
+def layout_payload(data, previous=None):
+    """
+    Lay out a D3 payload (nodes with id/group, edges with source/target ids).
+
+    Args:
+        data (dict): D3 nodes and edges
+        previous (dict, optional): Positions of an earlier version
+
+    Returns:
+        dict: {node_id: [x, y]}
+    """
+    nodes = data.get('nodes', [])
+    index = {node['id']: i for i, node in enumerate(nodes)}
+    edges = []
+    for edge in data.get('edges', []):
+        source, target = index.get(edge.get('source')), index.get(edge.get('target'))
+        if source is not None and target is not None:
+            edges.append((source, target))
+    return compute_layout([node['id'] for node in nodes], [node.get('group') for node in nodes], edges, previous)
+
+
+def layout_topology(topology, previous=None):
+    """
+    Lay out an engine Topology.
+
+    Args:
+        topology (Topology): Built topology
+        previous (dict, optional): Positions of an earlier version
+
+    Returns:
+        dict: {node_id: [x, y]}
+    """
+    links = topology.links
+    edges = list(zip(links.sources, links.targets))
+    return compute_layout([node.id for node in topology.nodes], [node.type for node in topology.nodes],
+                          edges, previous)
+
+
+class LayoutCache:
+    """
+    Layouts per topology version, plus the latest layout per network to seed the next one.
+    """
+
+    def __init__(self, max_entries=LAYOUT_CACHE_SIZE):
+        """
+        Args:
+            max_entries (int): Versions kept before the least recently used is dropped
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._layouts = OrderedDict()
+        self._latest = OrderedDict()
+
+    def get_or_compute(self, key, version, data):
+        """
+        Layout of one topology version, computed on first use.
+
+        Args:
+            key (tuple): Network/view key of the version store
+            version (int): Topology version
+            data (dict): D3 payload of that version
+
+        Returns:
+            dict: {node_id: [x, y]}
+        """
+        with self._lock:
+            positions = self._layouts.get(version)
+            if positions is not None:
+                self._layouts.move_to_end(version)
+                return positions
+            previous = self._latest.get(key)
+
+        positions = layout_payload(data, previous)
+        logger.debug(f"Computed layout for {key} v{version} ({len(positions)} nodes, "
+                     f"{'seeded' if previous else 'fresh'}, numpy={NUMPY_AVAILABLE})")
+
+        with self._lock:
+            self._layouts[version] = positions
+            self._latest[key] = positions
+            self._latest.move_to_end(key)
+            while len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+            while len(self._latest) > self.max_entries:
+                self._latest.popitem(last=False)
+        return positions
+
+
+_layout_cache = None
+_layout_cache_lock = threading.Lock()
+
+
+def get_layout_cache():
+    """
+    Get the process-wide layout cache.
+
+    Returns:
+        LayoutCache: Shared cache
+    """
+    global _layout_cache
+    if _layout_cache is None:
+        with _layout_cache_lock:
+            if _layout_cache is None:
+                _layout_cache = LayoutCache()
+    return _layout_cache
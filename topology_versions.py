@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Versioned Topology Snapshots
+
+The visualization pages used to rebuild and re-ship the whole graph on every
+refresh, even when only a few clients had roamed. The TopologyVersionStore
+keeps the last serialized topology per network/view together with a version
+number, and diffs every new build against it:
+
+- nodes/edges added (full entries)
+- nodes/edges removed (ids / endpoints only)
+- nodes/edges changed (id plus the attributes that differ)
+
+/api/visualization/<network_id>/delta?since=<version> answers from the stored
+diffs, so the D3 page can patch its graph in place. Builds are fingerprinted
+on their Dashboard inputs (minus counters the views never render), so a
+steady-state network is not rebuilt at all.
+
+Versions come from one store-wide counter seeded from the clock, so a version
+held by a browser from before a restart is never mistaken for a current one;
+unknown or expired versions get a full payload instead of a delta.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = int(os.getenv('TOPOLOGY_DELTA_HISTORY', 32))
+DEFAULT_MAX_NETWORKS = int(os.getenv('TOPOLOGY_VERSION_NETWORKS', 256))
+
+# Dashboard fields that change on every poll but are not rendered by the D3 views
+VOLATILE_FIELDS = frozenset({'usage', 'lastSeen', 'firstSeen', 'lastReportedAt'})
+
+
+def input_fingerprint(*parts):
+    """
+    Fingerprint the Dashboard data a topology is built from.
+
+    Args:
+        *parts: Lists or iterators of device/client/link dicts (or any
+            JSON-able values); iterators are consumed
+
+    Returns:
+        str: Hex digest, stable across dict key order
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, (dict, str)) and hasattr(part, '__iter__'):
+            for item in part:
+                if isinstance(item, dict):
+                    item = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+                digest.update(json.dumps(item, sort_keys=True, default=str).encode())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b'\x1e')
+    return digest.hexdigest()
+
+
+def edge_key(edge):
+    """
+    Identity of a D3 edge: its endpoints and connection type.
+
+    Args:
+        edge (dict): D3 edge with source, target and type
+
+    Returns:
+        str: Edge key
+    """
+    return f"{edge.get('source')}|{edge.get('target')}|{edge.get('type')}"
+
+
+NODE_IDENTITY = ('id',)
+EDGE_IDENTITY = ('source', 'target', 'type')
+
+
+def _changed_attributes(old, new):
+    changes = {key: value for key, value in new.items() if old.get(key) != value}
+    for key in old.keys() - new.keys():
+        changes[key] = None
+    return changes
+
+
+def _diff_items(old, new, identity):
+    """Diff two {key: item} maps into added items, removed identities and changed attributes."""
+    added = {key: item for key, item in new.items() if key not in old}
+    removed = {key: {field: item.get(field) for field in identity}
+               for key, item in old.items() if key not in new}
+    changed = {}
+    for key, item in new.items():
+        previous = old.get(key)
+        if previous is not None and previous is not item and previous != item:
+            attributes = _changed_attributes(previous, item)
+            attributes.update((field, item.get(field)) for field in identity)
+            changed[key] = attributes
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def _compose(first, second):
+    """Fold a later diff into an earlier one so both apply as one."""
+    added, removed, changed = dict(first['added']), dict(first['removed']), dict(first['changed'])
+    for key, identity in second['removed'].items():
+        if added.pop(key, None) is None:
+            changed.pop(key, None)
+            removed[key] = identity
+    for key, item in second['added'].items():
+        if key in removed:
+            # Removed then re-added: the client still holds the old entry
+            del removed[key]
+            changed[key] = dict(item)
+        else:
+            added[key] = item
+    for key, attributes in second['changed'].items():
+        if key in added:
+            added[key] = {**added[key], **attributes}
+        else:
+            changed[key] = {**changed.get(key, {}), **attributes}
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+class TopologySnapshot:
+    """
+    Last serialized topology of one network/view.
+    """
+
+    __slots__ = ('version', 'fingerprint', 'nodes', 'edges', 'extra', 'history')
+
+    def __init__(self, version, fingerprint, nodes, edges, extra, history_size):
+        self.version = version
+        self.fingerprint = fingerprint
+        self.nodes = nodes
+        self.edges = edges
+        self.extra = extra
+        # (from_version, to_version, node_diff, edge_diff), oldest first
+        self.history = deque(maxlen=history_size)
+
+    def payload(self):
+        """Full D3 payload for this version."""
+        payload = dict(self.extra)
+        payload['nodes'] = list(self.nodes.values())
+        payload['edges'] = list(self.edges.values())
+        payload['version'] = self.version
+        return payload
+
+
+class TopologyVersionStore:
+    """
+    Per-network topology versions and the diffs between them.
+    """
+
+    def __init__(self, history_size=DEFAULT_HISTORY, max_networks=DEFAULT_MAX_NETWORKS):
+        """
+        Initialize an empty store.
+
+        Args:
+            history_size (int): Diffs kept per network; older versions get a full payload
+            max_networks (int): Networks kept before the least recently used is dropped
+        """
+        self.history_size = history_size
+        self.max_networks = max_networks
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()
+        self._next_version = int(time.time() * 1000)
+        self._stats = {'builds': 0, 'unchanged': 0, 'deltas': 0, 'full': 0}
+
+    def _snapshot(self, key):
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            self._snapshots.move_to_end(key)
+        return snapshot
+
+    def is_current(self, key, fingerprint):
+        """
+        Whether the stored topology was built from the same inputs.
+
+        Args:
+            key (tuple): (network_id, view, node_budget)
+            fingerprint (str): input_fingerprint() of the new inputs
+
+        Returns:
+            bool: True when a rebuild can be skipped
+        """
+        with self._lock:
+            snapshot = self._snapshot(key)
+            current = snapshot is not None and fingerprint is not None and snapshot.fingerprint == fingerprint
+            if current:
+                self._stats['unchanged'] += 1
+            return current
+
+    def current_version(self, key):
+        """
+        Args:
+            key (tuple): (network_id, view, node_budget)
+
+        Returns:
+            int or None: Latest version, None when the network was never built
+        """
+        with self._lock:
+            snapshot = self._snapshot(key)
+            return snapshot.version if snapshot is not None else None
+
+    def current_payload(self, key):
+        """
+        Args:
+            key (tuple): (network_id, view, node_budget)
+
+        Returns:
+            dict or None: Full D3 payload of the latest version
+        """
+        with self._lock:
+            snapshot = self._snapshot(key)
+            return snapshot.payload() if snapshot is not None else None
+
+    def record(self, key, data, fingerprint=None):
+        """
+        Store a freshly built D3 payload and diff it against the previous one.
+
+        Args:
+            key (tuple): (network_id, view, node_budget)
+            data (dict): D3 payload with nodes and edges; other keys (stats,
+                qsr_stats, ...) are kept and returned with full payloads
+            fingerprint (str, optional): input_fingerprint() of the build inputs
+
+        Returns:
+            int: Version of the stored topology (unchanged if nothing differs)
+        """
+        nodes = {node['id']: node for node in data.get('nodes', [])}
+        edges = {edge_key(edge): edge for edge in data.get('edges', [])}
+        extra = {k: v for k, v in data.items() if k not in ('nodes', 'edges', 'version')}
+
+        with self._lock:
+            self._stats['builds'] += 1
+            previous = self._snapshot(key)
+            if previous is None:
+                self._next_version += 1
+                self._snapshots[key] = TopologySnapshot(self._next_version, fingerprint, nodes, edges,
+                                                        extra, self.history_size)
+                while len(self._snapshots) > self.max_networks:
+                    self._snapshots.popitem(last=False)
+                return self._next_version
+
+            node_diff = _diff_items(previous.nodes, nodes, NODE_IDENTITY)
+            edge_diff = _diff_items(previous.edges, edges, EDGE_IDENTITY)
+            previous.fingerprint = fingerprint
+            previous.extra = extra
+            if not any(node_diff.values()) and not any(edge_diff.values()):
+                return previous.version
+
+            self._next_version += 1
+            previous.history.append((previous.version, self._next_version, node_diff, edge_diff))
+            previous.version = self._next_version
+            previous.nodes = nodes
+            previous.edges = edges
+            logger.debug(f"Topology {key} -> v{previous.version}: "
+                         f"+{len(node_diff['added'])}/-{len(node_diff['removed'])}/~{len(node_diff['changed'])} nodes")
+            return previous.version
+
+    def delta_since(self, key, since):
+        """
+        Changes between a client's version and the current one.
+
+        Args:
+            key (tuple): (network_id, view, node_budget)
+            since (int or None): Version the client holds
+
+        Returns:
+            dict or None: {'version', 'since', 'full': False, 'nodes': {...},
+                'edges': {...}} or, when the version is unknown or too old, the
+                full payload with 'full': True; None if the network was never built
+        """
+        with self._lock:
+            snapshot = self._snapshot(key)
+            if snapshot is None:
+                return None
+
+            empty = {'added': {}, 'removed': {}, 'changed': {}}
+            node_diff = edge_diff = empty
+            if since != snapshot.version:
+                steps = list(snapshot.history)
+                start = next((i for i, step in enumerate(steps) if step[0] == since), None)
+                if since is None or start is None:
+                    self._stats['full'] += 1
+                    payload = snapshot.payload()
+                    payload['full'] = True
+                    return payload
+                for _, _, step_nodes, step_edges in steps[start:]:
+                    node_diff = _compose(node_diff, step_nodes)
+                    edge_diff = _compose(edge_diff, step_edges)
+
+            self._stats['deltas'] += 1
+            return {
+                'version': snapshot.version,
+                'since': since,
+                'full': False,
+                'nodes': {
+                    'added': list(node_diff['added'].values()),
+                    'removed': [identity['id'] for identity in node_diff['removed'].values()],
+                    'changed': list(node_diff['changed'].values())
+                },
+                'edges': {
+                    'added': list(edge_diff['added'].values()),
+                    'removed': list(edge_diff['removed'].values()),
+                    'changed': list(edge_diff['changed'].values())
+                }
+            }
+
+    def stats(self):
+        """
+        Returns:
+            dict: Build / skip / delta counters and stored network count
+        """
+        with self._lock:
+            return dict(self._stats, networks=len(self._snapshots))
+
+
+_topology_versions = None
+_topology_versions_lock = threading.Lock()
+
+
+def get_topology_versions():
+    """
+    Get the process-wide topology version store.
+
+    Returns:
+        TopologyVersionStore: Shared store
+    """
+    global _topology_versions
+    if _topology_versions is None:
+        with _topology_versions_lock:
+            if _topology_versions is None:
+                _topology_versions = TopologyVersionStore()
+    return _topology_versions
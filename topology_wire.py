@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Compact Topology Wire Format
+
+/api/visualization/<network_id>/data and .../multi-vendor/data return one
+JSON object per node and edge, repeating every field name and an HTML title
+per node. Clients that ask for it through Accept get a columnar encoding
+instead:
+
+    {
+      "format": "columnar",
+      "strings": ["Q2MX-...", "MX-1000", "appliance", ...],
+      "nodes": {"length": 2, "columns": {"id": [0, 3], "label": [1, 4],
+                "size": [12, 10], ...}, "strings": ["id", "label", ...]},
+      "edges": {"length": 1, "columns": {...}, "strings": [...]},
+      "version": ..., "stats": ...
+    }
+
+- every column holds one value per node/edge (null where a node lacks the field)
+- string columns (listed under "strings") hold indices into the shared string
+  table, so ids, groups and types are sent once
+- the HTML 'title' is dropped; the page renders tooltips from the fields
+- server-side layout positions become x/y columns aligned with the nodes
+
+Media types (JSON stays the default, including for */*):
+
+    application/json                          current payload
+    application/vnd.topology.columnar+json    columnar, JSON encoded
+    application/vnd.topology.columnar+msgpack columnar, MessagePack (needs msgpack)
+
+Compact responses are gzip or brotli (needs brotli) compressed when the client
+sends a matching Accept-Encoding.
+"""
+
+import gzip
+import json
+import logging
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = 'application/json'
+COLUMNAR_JSON_MEDIA_TYPE = 'application/vnd.topology.columnar+json'
+COLUMNAR_MSGPACK_MEDIA_TYPE = 'application/vnd.topology.columnar+msgpack'
+
+# Rendered client-side from the node fields in compact payloads
+DROPPED_NODE_FIELDS = frozenset({'title'})
+# Smaller bodies are not worth the compression overhead
+COMPRESS_MIN_BYTES = 1024
+
+
+def _parse_header(header):
+    """Parse an Accept / Accept-Encoding header into {value: q}."""
+    values = {}
+    for part in (header or '').split(','):
+        fields = part.strip().split(';')
+        value = fields[0].strip().lower()
+        if not value:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, number = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        values[value] = max(q, values.get(value, 0.0))
+    return values
+
+
+def negotiate_media_type(accept):
+    """
+    Pick the response format for an Accept header.
+
+    Only an explicit compact media type selects it; wildcards and a missing
+    header keep the JSON default. MessagePack is skipped without msgpack.
+
+    Args:
+        accept (str or None): Accept request header
+
+    Returns:
+        str: One of JSON_MEDIA_TYPE, COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_MSGPACK_MEDIA_TYPE
+    """
+    accepted = _parse_header(accept)
+    candidates = [COLUMNAR_JSON_MEDIA_TYPE]
+    if MSGPACK_AVAILABLE:
+        candidates.append(COLUMNAR_MSGPACK_MEDIA_TYPE)
+    best, best_q = JSON_MEDIA_TYPE, 0.0
+    for media_type in candidates:
+        q = accepted.get(media_type, 0.0)
+        # Ties prefer the later (more compact) candidate
+        if q > 0 and q >= best_q:
+            best, best_q = media_type, q
+    if best != JSON_MEDIA_TYPE:
+        json_q = max(accepted.get(JSON_MEDIA_TYPE, 0.0), accepted.get('application/*', 0.0),
+                     accepted.get('*/*', 0.0))
+        if json_q > best_q:
+            return JSON_MEDIA_TYPE
+    return best
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick a content encoding for a compact response.
+
+    Args:
+        accept_encoding (str or None): Accept-Encoding request header
+
+    Returns:
+        str or None: 'br', 'gzip' or None (identity)
+    """
+    accepted = _parse_header(accept_encoding)
+    options = []
+    if BROTLI_AVAILABLE:
+        options.append(('br', accepted.get('br', 0.0)))
+    options.append(('gzip', accepted.get('gzip', accepted.get('*', 0.0))))
+    # max() keeps the first of equal weights, so brotli wins ties
+    encoding, q = max(options, key=lambda option: option[1])
+    return encoding if q > 0 else None
+
+
+def _encode_columns(items, intern, dropped=frozenset()):
+    """Turn a list of dicts into one column per field; all-string columns go through the string table."""
+    names = {}
+    for item in items:
+        for name in item:
+            if name not in dropped:
+                names[name] = None
+
+    columns = {}
+    coded = []
+    for name in names:
+        values = [item.get(name) for item in items]
+        if all(value is None or isinstance(value, str) for value in values):
+            columns[name] = [None if value is None else intern(value) for value in values]
+            coded.append(name)
+        else:
+            columns[name] = values
+    return {'length': len(items), 'columns': columns, 'strings': coded}
+
+
+def _decode_columns(table, strings):
+    """Rebuild the list of dicts; fields a row did not have (null) are left out."""
+    coded = set(table['strings'])
+    rows = [{} for _ in range(table['length'])]
+    for name, values in table['columns'].items():
+        lookup = name in coded
+        for row, value in zip(rows, values):
+            if value is not None:
+                row[name] = strings[value] if lookup else value
+    return rows
+
+
+def to_columnar(data):
+    """
+    Encode a D3 topology payload column-wise.
+
+    Args:
+        data (dict): Payload of to_d3()/to_multi_vendor_d3() plus optional
+            version, stats, qsr_stats and layout
+
+    Returns:
+        dict: Columnar payload (see module docstring)
+    """
+    strings = []
+    index = {}
+
+    def intern(value):
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(strings)
+            strings.append(value)
+        return position
+
+    nodes = data.get('nodes', [])
+    payload = {k: v for k, v in data.items() if k not in ('nodes', 'edges', 'layout')}
+    payload['format'] = 'columnar'
+    payload['nodes'] = _encode_columns(nodes, intern, DROPPED_NODE_FIELDS)
+    payload['edges'] = _encode_columns(data.get('edges', []), intern)
+
+    layout = data.get('layout')
+    if layout is not None:
+        positions = layout.get('positions', {})
+        placed = [positions.get(node['id']) for node in nodes]
+        payload['layout'] = {k: v for k, v in layout.items() if k != 'positions'}
+        payload['layout']['x'] = [xy[0] if xy else None for xy in placed]
+        payload['layout']['y'] = [xy[1] if xy else None for xy in placed]
+
+    payload['strings'] = strings
+    return payload
+
+
+def from_columnar(payload):
+    """
+    Decode a columnar payload back into the D3 shape (without node titles).
+
+    Args:
+        payload (dict): Output of to_columnar()
+
+    Returns:
+        dict: nodes, edges and the other top-level keys
+    """
+    strings = payload['strings']
+    data = {k: v for k, v in payload.items() if k not in ('format', 'strings', 'nodes', 'edges', 'layout')}
+    data['nodes'] = _decode_columns(payload['nodes'], strings)
+    data['edges'] = _decode_columns(payload['edges'], strings)
+
+    layout = payload.get('layout')
+    if layout is not None:
+        data['layout'] = {k: v for k, v in layout.items() if k not in ('x', 'y')}
+        data['layout']['positions'] = {node['id']: [x, y] for node, x, y in zip(data['nodes'], layout['x'], layout['y'])
+                                       if x is not None}
+    return data
+
+
+def encode_topology(data, media_type, encoding=None):
+    """
+    Serialize a topology payload in a compact format.
+
+    Args:
+        data (dict): D3 payload
+        media_type (str): COLUMNAR_JSON_MEDIA_TYPE or COLUMNAR_MSGPACK_MEDIA_TYPE
+        encoding (str, optional): 'gzip' or 'br' from negotiate_encoding()
+
+    Returns:
+        tuple: (body bytes, response headers dict)
+    """
+    payload = to_columnar(data)
+    if media_type == COLUMNAR_MSGPACK_MEDIA_TYPE:
+        body = msgpack.packb(payload, use_bin_type=True)
+    else:
+        body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+    headers = {'Content-Type': media_type, 'Vary': 'Accept, Accept-Encoding'}
+    if encoding and len(body) >= COMPRESS_MIN_BYTES:
+        size = len(body)
+        if encoding == 'br':
+            body = brotli.compress(body, quality=5)
+        else:
+            body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = encoding
+        logger.debug(f"Compact topology: {size} -> {len(body)} bytes ({encoding})")
+    return body, headers
+
+
+def decode_topology(body, media_type, encoding=None):
+    """
+    Inverse of encode_topology(), for Python clients and tests.
+
+    Args:
+        body (bytes): Response body
+        media_type (str): Content-Type of the response
+        encoding (str, optional): Content-Encoding of the response
+
+    Returns:
+        dict: D3 payload (without node titles)
+    """
+    if encoding == 'br':
+        body = brotli.decompress(body)
+    elif encoding == 'gzip':
+        body = gzip.decompress(body)
+    if media_type == COLUMNAR_MSGPACK_MEDIA_TYPE:
+        payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    else:
+        payload = json.loads(body)
+    return from_columnar(payload)
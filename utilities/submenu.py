@@ -245,9 +245,10 @@ def submenu_network_wide(api_key):
                         sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
                         from enhanced_visualizer import create_enhanced_visualization, build_topology_from_api_data, create_vis_network_data
                         
-                        # Create SDK dashboard object for enhanced visualizer
-                        import meraki
-                        dashboard = meraki.DashboardAPI(api_key, suppress_logging=True)
+                        # Blocking facade over the asyncio client - same calls as the SDK
+                        # dashboard, scheduled through the shared org rate limiter
+                        from modules.meraki.meraki_async_client import create_async_dashboard_object
+                        dashboard = create_async_dashboard_object(api_key)
                         
                         # Fetch data using enhanced methods
                         print(colored("\n🔍 Fetching network devices and clients...", "cyan"))
@@ -994,8 +995,8 @@ def network_wide_operations(api_key, organization_id):
                         # Get network devices
                         devices = meraki_api.get_network_devices(api_key, network_id)
                         
-                        # Get network clients
-                        clients = meraki_api.get_network_clients(api_key, network_id)
+                        # Stream network clients - pages are consumed as they arrive
+                        clients = meraki_api.iter_network_clients(api_key, network_id)
                         
                         # Try to get topology links from API
                         links = None